@@ -81,6 +81,10 @@ class AppExecutionConfig(BaseSettings):
         description="Maximum number of concurrent active requests per app (0 for unlimited)",
         default=0,
     )
+    APP_STOP_FLAG_CHECK_INTERVAL_MS: PositiveInt = Field(
+        description="Minimum interval in milliseconds between Redis checks of a running task's stop flag",
+        default=1000,
+    )
 
 
 class CodeExecutionSandboxConfig(BaseSettings):
@@ -173,6 +177,41 @@ class CodeExecutionSandboxConfig(BaseSettings):
         default=True,
     )
 
+    CODE_EXECUTION_BATCH_SIZE: NonNegativeInt = Field(
+        description="Maximum number of iteration items a code node executes per code execution request when it is"
+        " the only node of the iteration and the iteration does not terminate on error (0 or 1 disables batching)."
+        " The items of a batch run in the same interpreter, sharing its globals, and the code execution timeout"
+        " applies to the whole batch, a batch timing out is executed again one item at a time",
+        default=1,
+    )
+
+    CODE_EXECUTION_JINJA2_ENGINE: Literal["local", "sandbox"] = Field(
+        description="Engine rendering Jinja2 templates: 'local' renders them in-process with a sandboxed"
+        " environment, 'sandbox' sends them to the code execution service. 'local' runs the templates in the"
+        " API and worker processes, limited in CPU time and output length",
+        default="sandbox",
+    )
+
+    CODE_EXECUTION_JINJA2_SANDBOX_FALLBACK: bool = Field(
+        description="Render templates rejected by the local Jinja2 sandbox in the code execution service instead",
+        default=True,
+    )
+
+    CODE_EXECUTION_JINJA2_CPU_TIME_LIMIT: PositiveFloat = Field(
+        description="Maximum CPU time in seconds of a Jinja2 template rendered locally",
+        default=5.0,
+    )
+
+    CODE_EXECUTION_JINJA2_MAX_OUTPUT_LENGTH: PositiveInt = Field(
+        description="Maximum number of characters of a Jinja2 template rendered locally",
+        default=1_000_000,
+    )
+
+    CODE_EXECUTION_JINJA2_TEMPLATE_CACHE_SIZE: PositiveInt = Field(
+        description="Maximum number of compiled Jinja2 templates kept by each process",
+        default=512,
+    )
+
 
 class TriggerConfig(BaseSettings):
     """
@@ -184,6 +223,17 @@ class TriggerConfig(BaseSettings):
         default=10485760,
     )
 
+    WEBHOOK_ROUTE_CACHE_TTL: NonNegativeInt = Field(
+        description="Seconds the route of a webhook to its published workflow is cached in each process and in"
+        " Redis (set to 0 to disable the cache)",
+        default=300,
+    )
+
+    WEBHOOK_ROUTE_CACHE_MAX_ENTRIES: PositiveInt = Field(
+        description="Maximum number of webhook routes cached per process",
+        default=4096,
+    )
+
 
 class AsyncWorkflowConfig(BaseSettings):
     """
@@ -221,6 +271,53 @@ class PluginConfig(BaseSettings):
         default=600.0,
     )
 
+    PLUGIN_DAEMON_POOL_MAX_CONNECTIONS: PositiveInt = Field(
+        description="Maximum number of concurrent connections for the plugin daemon HTTP client",
+        default=100,
+    )
+
+    PLUGIN_DAEMON_POOL_MAX_KEEPALIVE_CONNECTIONS: PositiveInt = Field(
+        description="Maximum number of persistent keep-alive connections for the plugin daemon HTTP client",
+        default=20,
+    )
+
+    PLUGIN_DAEMON_POOL_KEEPALIVE_EXPIRY: PositiveFloat | None = Field(
+        description="Keep-alive expiry in seconds for idle plugin daemon connections (set to None to disable)",
+        default=30.0,
+    )
+
+    PLUGIN_DAEMON_HTTP2_ENABLED: bool = Field(
+        description="Use HTTP/2 for https plugin daemon URLs, requires the h2 package",
+        default=False,
+    )
+
+    PLUGIN_MODEL_CACHE_TTL: NonNegativeInt = Field(
+        description="Seconds the plugin model providers and model schemas are cached across requests"
+        " (set to 0 to only cache them within a request)",
+        default=300,
+    )
+
+    PLUGIN_MODEL_CACHE_MAX_ENTRIES: PositiveInt = Field(
+        description="Maximum number of plugin model provider lists and model schemas cached per process",
+        default=4096,
+    )
+
+    PLUGIN_MODEL_CACHE_REDIS_ENABLED: bool = Field(
+        description="Share cached plugin model providers and model schemas between processes through Redis",
+        default=False,
+    )
+
+    PROVIDER_CONFIGURATIONS_CACHE_TTL: NonNegativeInt = Field(
+        description="Seconds the model provider configurations of a workspace are cached in each process"
+        " (set to 0 to disable the cache)",
+        default=60,
+    )
+
+    PROVIDER_CONFIGURATIONS_CACHE_MAX_ENTRIES: PositiveInt = Field(
+        description="Maximum number of workspaces whose model provider configurations are cached per process",
+        default=1024,
+    )
+
     INNER_API_KEY_FOR_PLUGIN: str = Field(description="Inner api key for plugin", default="inner-api-key")
 
     PLUGIN_REMOTE_INSTALL_HOST: str = Field(
@@ -319,6 +416,28 @@ class FileAccessConfig(BaseSettings):
         default=300,
     )
 
+    FILE_CONTENT_CACHE_MEMORY_MAX_BYTES: NonNegativeInt = Field(
+        description="Maximum size in bytes of the file contents and base64 views cached in the memory of each"
+        " process, 0 to disable the memory cache",
+        default=128 * 1024 * 1024,
+    )
+
+    FILE_CONTENT_CACHE_DISK_MAX_BYTES: NonNegativeInt = Field(
+        description="Maximum size in bytes of the file contents cached on the local disk, 0 to disable the disk cache",
+        default=1024 * 1024 * 1024,
+    )
+
+    FILE_CONTENT_CACHE_MAX_ITEM_BYTES: NonNegativeInt = Field(
+        description="Maximum size in bytes of a single file kept in the file content cache",
+        default=32 * 1024 * 1024,
+    )
+
+    FILE_CONTENT_CACHE_DIR: str = Field(
+        description="Directory of the file content cache on the local disk, defaults to a directory in the system"
+        " temporary directory",
+        default="",
+    )
+
 
 class FileUploadConfig(BaseSettings):
     """
@@ -705,6 +824,17 @@ class WorkflowConfig(BaseSettings):
         default=400_000,
     )
 
+    DOCUMENT_EXTRACTOR_MAX_TEXT_LENGTH: PositiveInt = Field(
+        description="Maximum number of characters extracted from a single file by the Document Extractor node,"
+        " longer texts are truncated",
+        default=10_000_000,
+    )
+
+    DOCUMENT_EXTRACTOR_MAX_WORKERS: PositiveInt = Field(
+        description="Maximum number of files a Document Extractor node extracts concurrently",
+        default=4,
+    )
+
     # GraphEngine Worker Pool Configuration
     GRAPH_ENGINE_MIN_WORKERS: PositiveInt = Field(
         description="Minimum number of workers per GraphEngine instance",
@@ -864,6 +994,31 @@ class ToolConfig(BaseSettings):
         default=3600,
     )
 
+    MCP_SESSION_POOL_ENABLED: bool = Field(
+        description="Reuse initialized MCP client sessions across MCP tool calls in each process",
+        default=True,
+    )
+
+    MCP_SESSION_POOL_MAX_SESSIONS_PER_SERVER: PositiveInt = Field(
+        description="Maximum number of concurrent sessions per MCP server and credentials in each process",
+        default=8,
+    )
+
+    MCP_SESSION_POOL_IDLE_TIMEOUT: PositiveInt = Field(
+        description="Seconds an unused MCP session is kept open before it is closed",
+        default=60,
+    )
+
+    MCP_SESSION_POOL_HEALTH_CHECK_INTERVAL: NonNegativeInt = Field(
+        description="Seconds an MCP session can stay unused before it is pinged ahead of being reused",
+        default=15,
+    )
+
+    MCP_SESSION_POOL_ACQUIRE_TIMEOUT: PositiveFloat = Field(
+        description="Seconds to wait for a session when an MCP server already has the maximum number of sessions",
+        default=30.0,
+    )
+
 
 class TemplateMode(StrEnum):
     # unsafe mode allows flexible operations in templates, but may cause security vulnerabilities
@@ -968,7 +1123,7 @@ class RagEtlConfig(BaseSettings):
 
     KEYWORD_DATA_SOURCE_TYPE: str = Field(
         description="Data source type for keyword extraction"
-        " ('database' or other supported types), default to 'database'",
+        " ('database', 'index' for a per-keyword row index, or other supported types), default to 'database'",
         default="database",
     )
 
@@ -1033,6 +1188,16 @@ class DataSetConfig(BaseSettings):
         default=0,
     )
 
+    DATASET_CLEANUP_CHUNK_SIZE: PositiveInt = Field(
+        description="Number of rows deleted per transaction when cleaning up deleted datasets and documents",
+        default=1000,
+    )
+
+    DATASET_CLEANUP_STORAGE_WORKERS: PositiveInt = Field(
+        description="Number of files deleted from storage in parallel when cleaning up deleted datasets and documents",
+        default=8,
+    )
+
 
 class WorkspaceConfig(BaseSettings):
     """
@@ -1060,6 +1225,17 @@ class IndexingConfig(BaseSettings):
         default=50,
     )
 
+    EMBEDDING_MAX_CONCURRENT_REQUESTS: PositiveInt = Field(
+        description="Maximum number of embedding requests a single indexing task keeps in flight",
+        default=1,
+    )
+
+    EMBEDDING_CACHE_FLOAT32_FORMAT: bool = Field(
+        description="Store cached document embeddings as compact float32 binary instead of pickled float lists."
+        " Entries in either format can always be read.",
+        default=False,
+    )
+
 
 class MultiModalTransferConfig(BaseSettings):
     MULTIMODAL_SEND_FORMAT: Literal["base64", "url"] = Field(
@@ -1147,6 +1323,23 @@ class CeleryScheduleTasksConfig(BaseSettings):
         default=60 * 60,
     )
 
+    ENABLE_APP_DAILY_STATISTICS_TASK: bool = Field(
+        description="Enable the task rolling up daily statistics served by the app dashboards",
+        default=True,
+    )
+    APP_DAILY_STATISTICS_INTERVAL: PositiveInt = Field(
+        description="Interval in minutes between roll ups of the daily statistics",
+        default=60,
+    )
+    APP_DAILY_STATISTICS_RECOMPUTE_DAYS: NonNegativeInt = Field(
+        description="Number of past days rolled up again on every run, to count late feedbacks and messages",
+        default=2,
+    )
+    APP_DAILY_STATISTICS_TRACKING_DAYS: PositiveInt = Field(
+        description="Number of days the statistics of an app keep being rolled up after its dashboard was opened",
+        default=30,
+    )
+
 
 class PositionConfig(BaseSettings):
     POSITION_PROVIDER_PINS: str = Field(
@@ -1249,6 +1442,11 @@ class WorkflowLogConfig(BaseSettings):
     WORKFLOW_LOG_CLEANUP_BATCH_SIZE: int = Field(
         default=100, description="Batch size for workflow run log cleanup operations"
     )
+    WORKFLOW_APP_LOG_EXACT_COUNT_LIMIT: NonNegativeInt = Field(
+        default=10000,
+        description="Number of workflow app logs counted exactly when listing them, larger totals are estimated"
+        " from the query plan on PostgreSQL. 0 always counts exactly",
+    )
 
 
 class SwaggerUIConfig(BaseSettings):
@@ -1270,6 +1468,19 @@ class TenantIsolatedTaskQueueConfig(BaseSettings):
     )
 
 
+class OpsTraceConfig(BaseSettings):
+    OPS_TRACE_INSTANCE_CACHE_TTL: NonNegativeInt = Field(
+        description="Seconds the tracing instance of an app, or that its tracing is disabled, is cached in each"
+        " process (set to 0 to disable the cache)",
+        default=300,
+    )
+
+    OPS_TRACE_INSTANCE_CACHE_MAX_ENTRIES: PositiveInt = Field(
+        description="Maximum number of apps whose tracing instance is cached per process",
+        default=4096,
+    )
+
+
 class SandboxExpiredRecordsCleanConfig(BaseSettings):
     SANDBOX_EXPIRED_RECORDS_CLEAN_GRACEFUL_PERIOD: NonNegativeInt = Field(
         description="Graceful period in days for sandbox records clean after subscription expiration",
@@ -1307,6 +1518,7 @@ class FeatureConfig(
     ModelLoadBalanceConfig,
     ModerationConfig,
     MultiModalTransferConfig,
+    OpsTraceConfig,
     PositionConfig,
     RagEtlConfig,
     RepositoryConfig,
@@ -1,9 +1,13 @@
+from collections.abc import Callable
 from decimal import Decimal
+from operator import itemgetter
+from typing import Any
 
 import sqlalchemy as sa
 from flask import abort, jsonify, request
 from flask_restx import Resource, fields
 from pydantic import BaseModel, Field, field_validator
+from sqlalchemy.orm import Session
 
 from controllers.console import console_ns
 from controllers.console.app.wraps import get_app_model
@@ -13,7 +17,8 @@ from extensions.ext_database import db
 from libs.datetime_utils import parse_time_range
 from libs.helper import convert_datetime_to_date
 from libs.login import current_account_with_tenant, login_required
-from models import AppMode
+from models import App, AppDailyStatistic, AppMode
+from services.app_daily_statistic_service import AppDailyStatisticService
 
 DEFAULT_REF_TEMPLATE_SWAGGER_2_0 = "#/definitions/{model}"
 
@@ -36,6 +41,58 @@ console_ns.schema_model(
 )
 
 
+def _get_daily_statistics(
+    app_model: App,
+    sql_query: str,
+    created_at_column: str,
+    row_to_data: Callable[[Any], dict],
+    rollup_to_data: Callable[[AppDailyStatistic], dict | None],
+    group_by: str = " GROUP BY date ORDER BY date",
+):
+    """
+    Answer the whole days of the requested range from the daily statistics rolled up for the app, and scan the
+    raw tables with `sql_query` for the rest of the range, such as the current day.
+    """
+    account, _ = current_account_with_tenant()
+
+    args = StatisticTimeRangeQuery.model_validate(request.args.to_dict(flat=True))  # type: ignore
+    assert account.timezone is not None
+
+    try:
+        start_datetime_utc, end_datetime_utc = parse_time_range(args.start, args.end, account.timezone)
+    except ValueError as e:
+        abort(400, description=str(e))
+
+    AppDailyStatisticService.track_app(app_model.id, account.timezone)
+    with Session(db.engine) as session:
+        plan = AppDailyStatisticService.get_daily_statistics_plan(
+            session, app_model.id, account.timezone, start_datetime_utc, end_datetime_utc
+        )
+
+    response_data = [data for rollup in plan.rollups if (data := rollup_to_data(rollup)) is not None]
+
+    with db.engine.begin() as conn:
+        for start, end in plan.raw_ranges:
+            range_query = sql_query
+            arg_dict = {"tz": account.timezone, "app_id": app_model.id, "invoke_from": InvokeFrom.DEBUGGER}
+
+            if start:
+                range_query += f" AND {created_at_column} >= :start"
+                arg_dict["start"] = start
+
+            if end:
+                range_query += f" AND {created_at_column} < :end"
+                arg_dict["end"] = end
+
+            range_query += group_by
+
+            rs = conn.execute(sa.text(range_query), arg_dict)
+            response_data.extend(row_to_data(i) for i in rs)
+
+    response_data.sort(key=itemgetter("date"))
+    return jsonify({"data": response_data})
+
+
 @console_ns.route("/apps/<uuid:app_id>/statistics/daily-messages")
 class DailyMessageStatistic(Resource):
     @console_ns.doc("get_daily_message_statistics")
@@ -52,10 +109,6 @@ class DailyMessageStatistic(Resource):
     @login_required
     @account_initialization_required
     def get(self, app_model):
-        account, _ = current_account_with_tenant()
-
-        args = StatisticTimeRangeQuery.model_validate(request.args.to_dict(flat=True))  # type: ignore
-
         converted_created_at = convert_datetime_to_date("created_at")
         sql_query = f"""SELECT
     {converted_created_at} AS date,
@@ -65,32 +118,16 @@ FROM
 WHERE
     app_id = :app_id
     AND invoke_from != :invoke_from"""
-        arg_dict = {"tz": account.timezone, "app_id": app_model.id, "invoke_from": InvokeFrom.DEBUGGER}
-        assert account.timezone is not None
-
-        try:
-            start_datetime_utc, end_datetime_utc = parse_time_range(args.start, args.end, account.timezone)
-        except ValueError as e:
-            abort(400, description=str(e))
-
-        if start_datetime_utc:
-            sql_query += " AND created_at >= :start"
-            arg_dict["start"] = start_datetime_utc
-
-        if end_datetime_utc:
-            sql_query += " AND created_at < :end"
-            arg_dict["end"] = end_datetime_utc
-
-        sql_query += " GROUP BY date ORDER BY date"
-
-        response_data = []
 
-        with db.engine.begin() as conn:
-            rs = conn.execute(sa.text(sql_query), arg_dict)
-            for i in rs:
-                response_data.append({"date": str(i.date), "message_count": i.message_count})
-
-        return jsonify({"data": response_data})
+        return _get_daily_statistics(
+            app_model,
+            sql_query,
+            "created_at",
+            lambda i: {"date": str(i.date), "message_count": i.message_count},
+            lambda rollup: (
+                {"date": str(rollup.stat_date), "message_count": rollup.message_count} if rollup.message_count else None
+            ),
+        )
 
 
 @console_ns.route("/apps/<uuid:app_id>/statistics/daily-conversations")
@@ -109,10 +146,6 @@ class DailyConversationStatistic(Resource):
     @login_required
     @account_initialization_required
     def get(self, app_model):
-        account, _ = current_account_with_tenant()
-
-        args = StatisticTimeRangeQuery.model_validate(request.args.to_dict(flat=True))  # type: ignore
-
         converted_created_at = convert_datetime_to_date("created_at")
         sql_query = f"""SELECT
     {converted_created_at} AS date,
@@ -122,31 +155,18 @@ FROM
 WHERE
     app_id = :app_id
     AND invoke_from != :invoke_from"""
-        arg_dict = {"tz": account.timezone, "app_id": app_model.id, "invoke_from": InvokeFrom.DEBUGGER}
-        assert account.timezone is not None
-
-        try:
-            start_datetime_utc, end_datetime_utc = parse_time_range(args.start, args.end, account.timezone)
-        except ValueError as e:
-            abort(400, description=str(e))
-
-        if start_datetime_utc:
-            sql_query += " AND created_at >= :start"
-            arg_dict["start"] = start_datetime_utc
 
-        if end_datetime_utc:
-            sql_query += " AND created_at < :end"
-            arg_dict["end"] = end_datetime_utc
-
-        sql_query += " GROUP BY date ORDER BY date"
-
-        response_data = []
-        with db.engine.begin() as conn:
-            rs = conn.execute(sa.text(sql_query), arg_dict)
-            for i in rs:
-                response_data.append({"date": str(i.date), "conversation_count": i.conversation_count})
-
-        return jsonify({"data": response_data})
+        return _get_daily_statistics(
+            app_model,
+            sql_query,
+            "created_at",
+            lambda i: {"date": str(i.date), "conversation_count": i.conversation_count},
+            lambda rollup: (
+                {"date": str(rollup.stat_date), "conversation_count": rollup.conversation_count}
+                if rollup.message_count
+                else None
+            ),
+        )
 
 
 @console_ns.route("/apps/<uuid:app_id>/statistics/daily-end-users")
@@ -165,10 +185,6 @@ class DailyTerminalsStatistic(Resource):
     @login_required
     @account_initialization_required
     def get(self, app_model):
-        account, _ = current_account_with_tenant()
-
-        args = StatisticTimeRangeQuery.model_validate(request.args.to_dict(flat=True))  # type: ignore
-
         converted_created_at = convert_datetime_to_date("created_at")
         sql_query = f"""SELECT
     {converted_created_at} AS date,
@@ -178,32 +194,18 @@ FROM
 WHERE
     app_id = :app_id
     AND invoke_from != :invoke_from"""
-        arg_dict = {"tz": account.timezone, "app_id": app_model.id, "invoke_from": InvokeFrom.DEBUGGER}
-        assert account.timezone is not None
-
-        try:
-            start_datetime_utc, end_datetime_utc = parse_time_range(args.start, args.end, account.timezone)
-        except ValueError as e:
-            abort(400, description=str(e))
-
-        if start_datetime_utc:
-            sql_query += " AND created_at >= :start"
-            arg_dict["start"] = start_datetime_utc
-
-        if end_datetime_utc:
-            sql_query += " AND created_at < :end"
-            arg_dict["end"] = end_datetime_utc
-
-        sql_query += " GROUP BY date ORDER BY date"
 
-        response_data = []
-
-        with db.engine.begin() as conn:
-            rs = conn.execute(sa.text(sql_query), arg_dict)
-            for i in rs:
-                response_data.append({"date": str(i.date), "terminal_count": i.terminal_count})
-
-        return jsonify({"data": response_data})
+        return _get_daily_statistics(
+            app_model,
+            sql_query,
+            "created_at",
+            lambda i: {"date": str(i.date), "terminal_count": i.terminal_count},
+            lambda rollup: (
+                {"date": str(rollup.stat_date), "terminal_count": rollup.end_user_count}
+                if rollup.message_count
+                else None
+            ),
+        )
 
 
 @console_ns.route("/apps/<uuid:app_id>/statistics/token-costs")
@@ -222,10 +224,6 @@ class DailyTokenCostStatistic(Resource):
     @login_required
     @account_initialization_required
     def get(self, app_model):
-        account, _ = current_account_with_tenant()
-
-        args = StatisticTimeRangeQuery.model_validate(request.args.to_dict(flat=True))  # type: ignore
-
         converted_created_at = convert_datetime_to_date("created_at")
         sql_query = f"""SELECT
     {converted_created_at} AS date,
@@ -236,34 +234,28 @@ FROM
 WHERE
     app_id = :app_id
     AND invoke_from != :invoke_from"""
-        arg_dict = {"tz": account.timezone, "app_id": app_model.id, "invoke_from": InvokeFrom.DEBUGGER}
-        assert account.timezone is not None
 
-        try:
-            start_datetime_utc, end_datetime_utc = parse_time_range(args.start, args.end, account.timezone)
-        except ValueError as e:
-            abort(400, description=str(e))
-
-        if start_datetime_utc:
-            sql_query += " AND created_at >= :start"
-            arg_dict["start"] = start_datetime_utc
-
-        if end_datetime_utc:
-            sql_query += " AND created_at < :end"
-            arg_dict["end"] = end_datetime_utc
-
-        sql_query += " GROUP BY date ORDER BY date"
-
-        response_data = []
-
-        with db.engine.begin() as conn:
-            rs = conn.execute(sa.text(sql_query), arg_dict)
-            for i in rs:
-                response_data.append(
-                    {"date": str(i.date), "token_count": i.token_count, "total_price": i.total_price, "currency": "USD"}
-                )
-
-        return jsonify({"data": response_data})
+        return _get_daily_statistics(
+            app_model,
+            sql_query,
+            "created_at",
+            lambda i: {
+                "date": str(i.date),
+                "token_count": i.token_count,
+                "total_price": i.total_price,
+                "currency": "USD",
+            },
+            lambda rollup: (
+                {
+                    "date": str(rollup.stat_date),
+                    "token_count": rollup.token_count,
+                    "total_price": rollup.total_price,
+                    "currency": "USD",
+                }
+                if rollup.message_count
+                else None
+            ),
+        )
 
 
 @console_ns.route("/apps/<uuid:app_id>/statistics/average-session-interactions")
@@ -282,10 +274,6 @@ class AverageSessionInteractionStatistic(Resource):
     @account_initialization_required
     @get_app_model(mode=[AppMode.CHAT, AppMode.AGENT_CHAT, AppMode.ADVANCED_CHAT])
     def get(self, app_model):
-        account, _ = current_account_with_tenant()
-
-        args = StatisticTimeRangeQuery.model_validate(request.args.to_dict(flat=True))  # type: ignore
-
         converted_created_at = convert_datetime_to_date("c.created_at")
         sql_query = f"""SELECT
     {converted_created_at} AS date,
@@ -303,23 +291,8 @@ FROM
         WHERE
             c.app_id = :app_id
             AND m.invoke_from != :invoke_from"""
-        arg_dict = {"tz": account.timezone, "app_id": app_model.id, "invoke_from": InvokeFrom.DEBUGGER}
-        assert account.timezone is not None
-
-        try:
-            start_datetime_utc, end_datetime_utc = parse_time_range(args.start, args.end, account.timezone)
-        except ValueError as e:
-            abort(400, description=str(e))
 
-        if start_datetime_utc:
-            sql_query += " AND c.created_at >= :start"
-            arg_dict["start"] = start_datetime_utc
-
-        if end_datetime_utc:
-            sql_query += " AND c.created_at < :end"
-            arg_dict["end"] = end_datetime_utc
-
-        sql_query += """
+        group_by = """
         GROUP BY m.conversation_id
     ) subquery
 LEFT JOIN
@@ -330,16 +303,25 @@ GROUP BY
 ORDER BY
     date"""
 
-        response_data = []
-
-        with db.engine.begin() as conn:
-            rs = conn.execute(sa.text(sql_query), arg_dict)
-            for i in rs:
-                response_data.append(
-                    {"date": str(i.date), "interactions": float(i.interactions.quantize(Decimal("0.01")))}
-                )
-
-        return jsonify({"data": response_data})
+        return _get_daily_statistics(
+            app_model,
+            sql_query,
+            "c.created_at",
+            lambda i: {"date": str(i.date), "interactions": float(i.interactions.quantize(Decimal("0.01")))},
+            lambda rollup: (
+                {
+                    "date": str(rollup.stat_date),
+                    "interactions": float(
+                        (Decimal(rollup.interaction_message_count) / rollup.interaction_conversation_count).quantize(
+                            Decimal("0.01")
+                        )
+                    ),
+                }
+                if rollup.interaction_conversation_count
+                else None
+            ),
+            group_by=group_by,
+        )
 
 
 @console_ns.route("/apps/<uuid:app_id>/statistics/user-satisfaction-rate")
@@ -358,10 +340,6 @@ class UserSatisfactionRateStatistic(Resource):
     @login_required
     @account_initialization_required
     def get(self, app_model):
-        account, _ = current_account_with_tenant()
-
-        args = StatisticTimeRangeQuery.model_validate(request.args.to_dict(flat=True))  # type: ignore
-
         converted_created_at = convert_datetime_to_date("m.created_at")
         sql_query = f"""SELECT
     {converted_created_at} AS date,
@@ -375,37 +353,21 @@ LEFT JOIN
 WHERE
     m.app_id = :app_id
     AND m.invoke_from != :invoke_from"""
-        arg_dict = {"tz": account.timezone, "app_id": app_model.id, "invoke_from": InvokeFrom.DEBUGGER}
-        assert account.timezone is not None
-
-        try:
-            start_datetime_utc, end_datetime_utc = parse_time_range(args.start, args.end, account.timezone)
-        except ValueError as e:
-            abort(400, description=str(e))
-
-        if start_datetime_utc:
-            sql_query += " AND m.created_at >= :start"
-            arg_dict["start"] = start_datetime_utc
-
-        if end_datetime_utc:
-            sql_query += " AND m.created_at < :end"
-            arg_dict["end"] = end_datetime_utc
 
-        sql_query += " GROUP BY date ORDER BY date"
-
-        response_data = []
-
-        with db.engine.begin() as conn:
-            rs = conn.execute(sa.text(sql_query), arg_dict)
-            for i in rs:
-                response_data.append(
-                    {
-                        "date": str(i.date),
-                        "rate": round((i.feedback_count * 1000 / i.message_count) if i.message_count > 0 else 0, 2),
-                    }
-                )
-
-        return jsonify({"data": response_data})
+        return _get_daily_statistics(
+            app_model,
+            sql_query,
+            "m.created_at",
+            lambda i: {
+                "date": str(i.date),
+                "rate": round((i.feedback_count * 1000 / i.message_count) if i.message_count > 0 else 0, 2),
+            },
+            lambda rollup: (
+                {"date": str(rollup.stat_date), "rate": round(rollup.like_count * 1000 / rollup.message_count, 2)}
+                if rollup.message_count
+                else None
+            ),
+        )
 
 
 @console_ns.route("/apps/<uuid:app_id>/statistics/average-response-time")
@@ -424,10 +386,6 @@ class AverageResponseTimeStatistic(Resource):
     @account_initialization_required
     @get_app_model(mode=AppMode.COMPLETION)
     def get(self, app_model):
-        account, _ = current_account_with_tenant()
-
-        args = StatisticTimeRangeQuery.model_validate(request.args.to_dict(flat=True))  # type: ignore
-
         converted_created_at = convert_datetime_to_date("created_at")
         sql_query = f"""SELECT
     {converted_created_at} AS date,
@@ -437,32 +395,21 @@ FROM
 WHERE
     app_id = :app_id
     AND invoke_from != :invoke_from"""
-        arg_dict = {"tz": account.timezone, "app_id": app_model.id, "invoke_from": InvokeFrom.DEBUGGER}
-        assert account.timezone is not None
-
-        try:
-            start_datetime_utc, end_datetime_utc = parse_time_range(args.start, args.end, account.timezone)
-        except ValueError as e:
-            abort(400, description=str(e))
-
-        if start_datetime_utc:
-            sql_query += " AND created_at >= :start"
-            arg_dict["start"] = start_datetime_utc
-
-        if end_datetime_utc:
-            sql_query += " AND created_at < :end"
-            arg_dict["end"] = end_datetime_utc
-
-        sql_query += " GROUP BY date ORDER BY date"
 
-        response_data = []
-
-        with db.engine.begin() as conn:
-            rs = conn.execute(sa.text(sql_query), arg_dict)
-            for i in rs:
-                response_data.append({"date": str(i.date), "latency": round(i.latency * 1000, 4)})
-
-        return jsonify({"data": response_data})
+        return _get_daily_statistics(
+            app_model,
+            sql_query,
+            "created_at",
+            lambda i: {"date": str(i.date), "latency": round(i.latency * 1000, 4)},
+            lambda rollup: (
+                {
+                    "date": str(rollup.stat_date),
+                    "latency": round(rollup.provider_response_latency / rollup.message_count * 1000, 4),
+                }
+                if rollup.message_count
+                else None
+            ),
+        )
 
 
 @console_ns.route("/apps/<uuid:app_id>/statistics/tokens-per-second")
@@ -481,9 +428,6 @@ class TokensPerSecondStatistic(Resource):
     @login_required
     @account_initialization_required
     def get(self, app_model):
-        account, _ = current_account_with_tenant()
-        args = StatisticTimeRangeQuery.model_validate(request.args.to_dict(flat=True))  # type: ignore
-
         converted_created_at = convert_datetime_to_date("created_at")
         sql_query = f"""SELECT
     {converted_created_at} AS date,
@@ -496,29 +440,22 @@ FROM
 WHERE
     app_id = :app_id
     AND invoke_from != :invoke_from"""
-        arg_dict = {"tz": account.timezone, "app_id": app_model.id, "invoke_from": InvokeFrom.DEBUGGER}
-        assert account.timezone is not None
-
-        try:
-            start_datetime_utc, end_datetime_utc = parse_time_range(args.start, args.end, account.timezone)
-        except ValueError as e:
-            abort(400, description=str(e))
-
-        if start_datetime_utc:
-            sql_query += " AND created_at >= :start"
-            arg_dict["start"] = start_datetime_utc
-
-        if end_datetime_utc:
-            sql_query += " AND created_at < :end"
-            arg_dict["end"] = end_datetime_utc
-
-        sql_query += " GROUP BY date ORDER BY date"
-
-        response_data = []
-
-        with db.engine.begin() as conn:
-            rs = conn.execute(sa.text(sql_query), arg_dict)
-            for i in rs:
-                response_data.append({"date": str(i.date), "tps": round(i.tokens_per_second, 4)})
 
-        return jsonify({"data": response_data})
+        return _get_daily_statistics(
+            app_model,
+            sql_query,
+            "created_at",
+            lambda i: {"date": str(i.date), "tps": round(i.tokens_per_second, 4)},
+            lambda rollup: (
+                {
+                    "date": str(rollup.stat_date),
+                    "tps": (
+                        round(rollup.answer_tokens / rollup.provider_response_latency, 4)
+                        if rollup.provider_response_latency
+                        else 0
+                    ),
+                }
+                if rollup.message_count
+                else None
+            ),
+        )
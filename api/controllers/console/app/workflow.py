@@ -46,6 +46,7 @@ from models.workflow import Workflow
 from services.app_generate_service import AppGenerateService
 from services.errors.app import WorkflowHashNotEqualError
 from services.errors.llm import InvokeRateLimitError
+from services.trigger.webhook_route_cache import WebhookRouteCache
 from services.workflow_service import DraftWorkflowDeletionError, WorkflowInUseError, WorkflowService
 
 logger = logging.getLogger(__name__)
@@ -698,6 +699,8 @@ class PublishedWorkflowApi(Resource):
             workflow_created_at = TimestampField().format(workflow.created_at)
 
             session.commit()
+        # webhooks route to the latest published workflow
+        WebhookRouteCache.invalidate_app(app_model.id)
 
         return {
             "result": "success",
@@ -3,8 +3,9 @@ from datetime import datetime
 from dateutil.parser import isoparse
 from flask import request
 from flask_restx import Resource, marshal_with
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, ValidationInfo, field_validator
 from sqlalchemy.orm import Session
+from werkzeug.exceptions import NotFound
 
 from controllers.console import console_ns
 from controllers.console.app.wraps import get_app_model
@@ -15,6 +16,7 @@ from fields.workflow_app_log_fields import build_workflow_app_log_pagination_mod
 from libs.login import login_required
 from models import App
 from models.model import AppMode
+from services.errors.app import LastWorkflowAppLogNotExistsError
 from services.workflow_app_service import WorkflowAppService
 
 DEFAULT_REF_TEMPLATE_SWAGGER_2_0 = "#/definitions/{model}"
@@ -32,6 +34,10 @@ class WorkflowAppLogQuery(BaseModel):
     detail: bool = Field(default=False, description="Whether to return detailed logs")
     page: int = Field(default=1, ge=1, le=99999, description="Page number (1-99999)")
     limit: int = Field(default=20, ge=1, le=100, description="Number of items per page (1-100)")
+    last_id: str | None = Field(
+        default=None, description="ID of the last log of the previous page, pages by cursor instead of page number"
+    )
+    include_total: bool = Field(default=True, description="Whether to count the logs, large totals are estimated")
 
     @field_validator("created_at__before", "created_at__after", mode="before")
     @classmethod
@@ -40,9 +46,9 @@ class WorkflowAppLogQuery(BaseModel):
             return None
         return isoparse(value)  # type: ignore
 
-    @field_validator("detail", mode="before")
+    @field_validator("detail", "include_total", mode="before")
     @classmethod
-    def parse_bool(cls, value: bool | str | None) -> bool:
+    def parse_bool(cls, value: bool | str | None, info: ValidationInfo) -> bool:
         if isinstance(value, bool):
             return value
         if value is None:
@@ -52,7 +58,7 @@ class WorkflowAppLogQuery(BaseModel):
             return True
         if lowered in {"0", "false", "no", "off"}:
             return False
-        raise ValueError("Invalid boolean value for detail")
+        raise ValueError(f"Invalid boolean value for {info.field_name}")
 
 
 console_ns.schema_model(
@@ -84,18 +90,23 @@ class WorkflowAppLogApi(Resource):
         # get paginate workflow app logs
         workflow_app_service = WorkflowAppService()
         with Session(db.engine) as session:
-            workflow_app_log_pagination = workflow_app_service.get_paginate_workflow_app_logs(
-                session=session,
-                app_model=app_model,
-                keyword=args.keyword,
-                status=args.status,
-                created_at_before=args.created_at__before,
-                created_at_after=args.created_at__after,
-                page=args.page,
-                limit=args.limit,
-                detail=args.detail,
-                created_by_end_user_session_id=args.created_by_end_user_session_id,
-                created_by_account=args.created_by_account,
-            )
+            try:
+                workflow_app_log_pagination = workflow_app_service.get_paginate_workflow_app_logs(
+                    session=session,
+                    app_model=app_model,
+                    keyword=args.keyword,
+                    status=args.status,
+                    created_at_before=args.created_at__before,
+                    created_at_after=args.created_at__after,
+                    page=args.page,
+                    limit=args.limit,
+                    detail=args.detail,
+                    created_by_end_user_session_id=args.created_by_end_user_session_id,
+                    created_by_account=args.created_by_account,
+                    last_id=args.last_id,
+                    include_total=args.include_total,
+                )
+            except LastWorkflowAppLogNotExistsError:
+                raise NotFound("Last Workflow App Log Not Exists.")
 
             return workflow_app_log_pagination
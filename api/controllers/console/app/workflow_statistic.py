@@ -1,7 +1,13 @@
+from collections.abc import Callable, Sequence
+from decimal import Decimal
+from functools import partial
+from operator import itemgetter
+from typing import Any
+
 from flask import abort, jsonify, request
 from flask_restx import Resource
 from pydantic import BaseModel, Field, field_validator
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from controllers.console import console_ns
 from controllers.console.app.wraps import get_app_model
@@ -10,8 +16,9 @@ from extensions.ext_database import db
 from libs.datetime_utils import parse_time_range
 from libs.login import current_account_with_tenant, login_required
 from models.enums import WorkflowRunTriggeredFrom
-from models.model import AppMode
+from models.model import App, AppDailyStatistic, AppMode
 from repositories.factory import DifyAPIRepositoryFactory
+from services.app_daily_statistic_service import AppDailyStatisticService
 
 DEFAULT_REF_TEMPLATE_SWAGGER_2_0 = "#/definitions/{model}"
 
@@ -34,6 +41,40 @@ console_ns.schema_model(
 )
 
 
+def _get_daily_statistics(
+    app_model: App,
+    get_statistics: Callable[..., Sequence[Any]],
+    rollup_to_data: Callable[[AppDailyStatistic], dict | None],
+):
+    """
+    Answer the whole days of the requested range from the daily statistics rolled up for the app, and get the
+    rest of the range, such as the current day, from the workflow runs with `get_statistics`.
+    """
+    account, _ = current_account_with_tenant()
+
+    args = WorkflowStatisticQuery.model_validate(request.args.to_dict(flat=True))  # type: ignore
+
+    assert account.timezone is not None
+
+    try:
+        start_date, end_date = parse_time_range(args.start, args.end, account.timezone)
+    except ValueError as e:
+        abort(400, description=str(e))
+
+    AppDailyStatisticService.track_app(app_model.id, account.timezone)
+    with Session(db.engine) as session:
+        plan = AppDailyStatisticService.get_daily_statistics_plan(
+            session, app_model.id, account.timezone, start_date, end_date
+        )
+
+    response_data = [data for rollup in plan.rollups if (data := rollup_to_data(rollup)) is not None]
+    for range_start, range_end in plan.raw_ranges:
+        response_data.extend(get_statistics(start_date=range_start, end_date=range_end, timezone=account.timezone))
+
+    response_data.sort(key=itemgetter("date"))
+    return jsonify({"data": response_data})
+
+
 @console_ns.route("/apps/<uuid:app_id>/workflow/statistics/daily-conversations")
 class WorkflowDailyRunsStatistic(Resource):
     def __init__(self, *args, **kwargs):
@@ -51,28 +92,21 @@ class WorkflowDailyRunsStatistic(Resource):
     @login_required
     @account_initialization_required
     def get(self, app_model):
-        account, _ = current_account_with_tenant()
-
-        args = WorkflowStatisticQuery.model_validate(request.args.to_dict(flat=True))  # type: ignore
-
-        assert account.timezone is not None
-
-        try:
-            start_date, end_date = parse_time_range(args.start, args.end, account.timezone)
-        except ValueError as e:
-            abort(400, description=str(e))
-
-        response_data = self._workflow_run_repo.get_daily_runs_statistics(
-            tenant_id=app_model.tenant_id,
-            app_id=app_model.id,
-            triggered_from=WorkflowRunTriggeredFrom.APP_RUN,
-            start_date=start_date,
-            end_date=end_date,
-            timezone=account.timezone,
+        return _get_daily_statistics(
+            app_model,
+            partial(
+                self._workflow_run_repo.get_daily_runs_statistics,
+                tenant_id=app_model.tenant_id,
+                app_id=app_model.id,
+                triggered_from=WorkflowRunTriggeredFrom.APP_RUN,
+            ),
+            lambda rollup: (
+                {"date": str(rollup.stat_date), "runs": rollup.workflow_run_count}
+                if rollup.workflow_run_count
+                else None
+            ),
         )
 
-        return jsonify({"data": response_data})
-
 
 @console_ns.route("/apps/<uuid:app_id>/workflow/statistics/daily-terminals")
 class WorkflowDailyTerminalsStatistic(Resource):
@@ -91,28 +125,21 @@ class WorkflowDailyTerminalsStatistic(Resource):
     @login_required
     @account_initialization_required
     def get(self, app_model):
-        account, _ = current_account_with_tenant()
-
-        args = WorkflowStatisticQuery.model_validate(request.args.to_dict(flat=True))  # type: ignore
-
-        assert account.timezone is not None
-
-        try:
-            start_date, end_date = parse_time_range(args.start, args.end, account.timezone)
-        except ValueError as e:
-            abort(400, description=str(e))
-
-        response_data = self._workflow_run_repo.get_daily_terminals_statistics(
-            tenant_id=app_model.tenant_id,
-            app_id=app_model.id,
-            triggered_from=WorkflowRunTriggeredFrom.APP_RUN,
-            start_date=start_date,
-            end_date=end_date,
-            timezone=account.timezone,
+        return _get_daily_statistics(
+            app_model,
+            partial(
+                self._workflow_run_repo.get_daily_terminals_statistics,
+                tenant_id=app_model.tenant_id,
+                app_id=app_model.id,
+                triggered_from=WorkflowRunTriggeredFrom.APP_RUN,
+            ),
+            lambda rollup: (
+                {"date": str(rollup.stat_date), "terminal_count": rollup.workflow_end_user_count}
+                if rollup.workflow_run_count
+                else None
+            ),
         )
 
-        return jsonify({"data": response_data})
-
 
 @console_ns.route("/apps/<uuid:app_id>/workflow/statistics/token-costs")
 class WorkflowDailyTokenCostStatistic(Resource):
@@ -131,28 +158,21 @@ class WorkflowDailyTokenCostStatistic(Resource):
     @login_required
     @account_initialization_required
     def get(self, app_model):
-        account, _ = current_account_with_tenant()
-
-        args = WorkflowStatisticQuery.model_validate(request.args.to_dict(flat=True))  # type: ignore
-
-        assert account.timezone is not None
-
-        try:
-            start_date, end_date = parse_time_range(args.start, args.end, account.timezone)
-        except ValueError as e:
-            abort(400, description=str(e))
-
-        response_data = self._workflow_run_repo.get_daily_token_cost_statistics(
-            tenant_id=app_model.tenant_id,
-            app_id=app_model.id,
-            triggered_from=WorkflowRunTriggeredFrom.APP_RUN,
-            start_date=start_date,
-            end_date=end_date,
-            timezone=account.timezone,
+        return _get_daily_statistics(
+            app_model,
+            partial(
+                self._workflow_run_repo.get_daily_token_cost_statistics,
+                tenant_id=app_model.tenant_id,
+                app_id=app_model.id,
+                triggered_from=WorkflowRunTriggeredFrom.APP_RUN,
+            ),
+            lambda rollup: (
+                {"date": str(rollup.stat_date), "token_count": rollup.workflow_token_count}
+                if rollup.workflow_run_count
+                else None
+            ),
         )
 
-        return jsonify({"data": response_data})
-
 
 @console_ns.route("/apps/<uuid:app_id>/workflow/statistics/average-app-interactions")
 class WorkflowAverageAppInteractionStatistic(Resource):
@@ -171,24 +191,22 @@ class WorkflowAverageAppInteractionStatistic(Resource):
     @account_initialization_required
     @get_app_model(mode=[AppMode.WORKFLOW])
     def get(self, app_model):
-        account, _ = current_account_with_tenant()
-
-        args = WorkflowStatisticQuery.model_validate(request.args.to_dict(flat=True))  # type: ignore
-
-        assert account.timezone is not None
-
-        try:
-            start_date, end_date = parse_time_range(args.start, args.end, account.timezone)
-        except ValueError as e:
-            abort(400, description=str(e))
-
-        response_data = self._workflow_run_repo.get_average_app_interaction_statistics(
-            tenant_id=app_model.tenant_id,
-            app_id=app_model.id,
-            triggered_from=WorkflowRunTriggeredFrom.APP_RUN,
-            start_date=start_date,
-            end_date=end_date,
-            timezone=account.timezone,
+        return _get_daily_statistics(
+            app_model,
+            partial(
+                self._workflow_run_repo.get_average_app_interaction_statistics,
+                tenant_id=app_model.tenant_id,
+                app_id=app_model.id,
+                triggered_from=WorkflowRunTriggeredFrom.APP_RUN,
+            ),
+            lambda rollup: (
+                {
+                    "date": str(rollup.stat_date),
+                    "interactions": float(
+                        (Decimal(rollup.workflow_run_count) / rollup.workflow_end_user_count).quantize(Decimal("0.01"))
+                    ),
+                }
+                if rollup.workflow_end_user_count
+                else None
+            ),
         )
-
-        return jsonify({"data": response_data})
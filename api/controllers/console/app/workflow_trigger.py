@@ -14,6 +14,7 @@ from libs.login import current_user, login_required
 from models.enums import AppTriggerStatus
 from models.model import Account, App, AppMode
 from models.trigger import AppTrigger, WorkflowWebhookTrigger
+from services.trigger.webhook_route_cache import WebhookRouteCache
 
 from .. import console_ns
 from ..app.wraps import get_app_model
@@ -146,6 +147,7 @@ class AppTriggerEnableApi(Resource):
 
             session.commit()
             session.refresh(trigger)
+        WebhookRouteCache.invalidate_app(app_model.id)
 
         # Add computed icon field
         url_prefix = dify_config.CONSOLE_API_URL + "/console/api/workspaces/current/tool-provider/builtin/"
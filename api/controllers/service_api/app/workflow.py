@@ -37,7 +37,12 @@ from libs.helper import TimestampField
 from models.model import App, AppMode, EndUser
 from repositories.factory import DifyAPIRepositoryFactory
 from services.app_generate_service import AppGenerateService
-from services.errors.app import IsDraftWorkflowError, WorkflowIdFormatError, WorkflowNotFoundError
+from services.errors.app import (
+    IsDraftWorkflowError,
+    LastWorkflowAppLogNotExistsError,
+    WorkflowIdFormatError,
+    WorkflowNotFoundError,
+)
 from services.errors.llm import InvokeRateLimitError
 from services.workflow_app_service import WorkflowAppService
 
@@ -59,6 +64,8 @@ class WorkflowLogQuery(BaseModel):
     created_by_account: str | None = None
     page: int = Field(default=1, ge=1, le=99999)
     limit: int = Field(default=20, ge=1, le=100)
+    last_id: str | None = None
+    include_total: bool = True
 
 
 register_schema_models(service_api_ns, WorkflowRunPayload, WorkflowLogQuery)
@@ -296,17 +303,22 @@ class WorkflowAppLogApi(Resource):
         # get paginate workflow app logs
         workflow_app_service = WorkflowAppService()
         with Session(db.engine) as session:
-            workflow_app_log_pagination = workflow_app_service.get_paginate_workflow_app_logs(
-                session=session,
-                app_model=app_model,
-                keyword=args.keyword,
-                status=status,
-                created_at_before=created_at_before,
-                created_at_after=created_at_after,
-                page=args.page,
-                limit=args.limit,
-                created_by_end_user_session_id=args.created_by_end_user_session_id,
-                created_by_account=args.created_by_account,
-            )
+            try:
+                workflow_app_log_pagination = workflow_app_service.get_paginate_workflow_app_logs(
+                    session=session,
+                    app_model=app_model,
+                    keyword=args.keyword,
+                    status=status,
+                    created_at_before=created_at_before,
+                    created_at_after=created_at_after,
+                    page=args.page,
+                    limit=args.limit,
+                    created_by_end_user_session_id=args.created_by_end_user_session_id,
+                    created_by_account=args.created_by_account,
+                    last_id=args.last_id,
+                    include_total=args.include_total,
+                )
+            except LastWorkflowAppLogNotExistsError:
+                raise NotFound("Last Workflow App Log Not Exists.")
 
             return workflow_app_log_pagination
@@ -7,6 +7,8 @@ from werkzeug.exceptions import NotFound, RequestEntityTooLarge
 from controllers.trigger import bp
 from core.trigger.debug.event_bus import TriggerDebugEventBus
 from core.trigger.debug.events import WebhookDebugEvent, build_webhook_pool_key
+from models.trigger import WorkflowWebhookTrigger
+from services.trigger.webhook_route_cache import WebhookRoute
 from services.trigger.webhook_service import WebhookService
 
 logger = logging.getLogger(__name__)
@@ -19,14 +21,20 @@ def _prepare_webhook_execution(webhook_id: str, is_debug: bool = False):
         webhook_id: The webhook ID to process
         is_debug: If True, skip status validation for debug mode
     """
-    webhook_trigger, workflow, node_config = WebhookService.get_webhook_trigger_and_workflow(
-        webhook_id, is_debug=is_debug
-    )
+    webhook_trigger: WorkflowWebhookTrigger | WebhookRoute
+    if is_debug:
+        webhook_trigger, workflow, node_config = WebhookService.get_webhook_trigger_and_workflow(
+            webhook_id, is_debug=True
+        )
+        workflow_id = workflow.id
+    else:
+        webhook_trigger = WebhookService.get_webhook_route(webhook_id)
+        workflow_id, node_config = webhook_trigger.workflow_id, webhook_trigger.node_config
 
     try:
         # Use new unified extraction and validation
         webhook_data = WebhookService.extract_and_validate_webhook_data(webhook_trigger, node_config)
-        return webhook_trigger, workflow, node_config, webhook_data, None
+        return webhook_trigger, workflow_id, node_config, webhook_data, None
     except ValueError as e:
         # Provide minimal context for error reporting without risking another parse failure
         webhook_data = {
@@ -36,7 +44,7 @@ def _prepare_webhook_execution(webhook_id: str, is_debug: bool = False):
             "body": {},
             "files": {},
         }
-        return webhook_trigger, workflow, node_config, webhook_data, str(e)
+        return webhook_trigger, workflow_id, node_config, webhook_data, str(e)
 
 
 @bp.route("/webhook/<string:webhook_id>", methods=["GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"])
@@ -48,12 +56,12 @@ def handle_webhook(webhook_id: str):
     configured webhook trigger settings.
     """
     try:
-        webhook_trigger, workflow, node_config, webhook_data, error = _prepare_webhook_execution(webhook_id)
+        webhook_trigger, workflow_id, node_config, webhook_data, error = _prepare_webhook_execution(webhook_id)
         if error:
             return jsonify({"error": "Bad Request", "message": error}), 400
 
         # Process webhook call (send to Celery)
-        WebhookService.trigger_workflow_execution(webhook_trigger, webhook_data, workflow)
+        WebhookService.trigger_workflow_execution(webhook_trigger, webhook_data, workflow_id)
 
         # Return configured response
         response_data, status_code = WebhookService.generate_webhook_response(node_config)
@@ -1,12 +1,19 @@
+import functools
 import logging
 import queue
 import threading
 import time
+import types
+import uuid
+import weakref
 from abc import abstractmethod
-from enum import IntEnum, auto
-from typing import Any
+from collections.abc import Mapping, Sequence
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum, IntEnum, auto
+from typing import Annotated, Any, Literal, Union, get_args, get_origin
 
-from cachetools import TTLCache, cachedmethod
+from pydantic import BaseModel
 from redis.exceptions import RedisError
 from sqlalchemy.orm import DeclarativeMeta
 
@@ -25,6 +32,49 @@ from extensions.ext_redis import redis_client
 
 logger = logging.getLogger(__name__)
 
+# Leaf types that can never carry a SQLAlchemy model instance
+_PLAIN_DATA_TYPES = (str, int, float, bool, bytes, type(None), date, datetime, Decimal, uuid.UUID, Enum)
+# Generic containers whose type arguments fully describe what they may contain
+_PLAIN_CONTAINER_ORIGINS = (list, tuple, set, frozenset, dict, Sequence, Mapping, Union, types.UnionType)
+
+
+def _is_plain_data_type(annotation: Any, seen: set[type[BaseModel]]) -> bool:
+    """Return whether values validated against `annotation` can only contain plain data."""
+    origin = get_origin(annotation)
+    if origin is Literal:
+        return True
+    if origin is Annotated:
+        return _is_plain_data_type(get_args(annotation)[0], seen)
+    if origin is not None:
+        return origin in _PLAIN_CONTAINER_ORIGINS and all(
+            arg is Ellipsis or _is_plain_data_type(arg, seen) for arg in get_args(annotation)
+        )
+    if not isinstance(annotation, type):
+        # Any, TypeVars and unresolved forward references
+        return False
+    if issubclass(annotation, _PLAIN_DATA_TYPES):
+        return True
+    if issubclass(annotation, BaseModel):
+        if annotation in seen:
+            return True
+        seen.add(annotation)
+        return all(_is_plain_data_type(field.annotation, seen) for field in annotation.model_fields.values())
+    return False
+
+
+@functools.cache
+def _fields_to_check_for_sqlalchemy_models(event_type: type[AppQueueEvent]) -> frozenset[str]:
+    """
+    Return the fields of an event class whose declared types could hold arbitrary objects.
+
+    Fields typed with plain data only (e.g. `QueueTextChunkEvent.text`) are validated by pydantic
+    and can never contain a SQLAlchemy model, so they are skipped when publishing. This is computed
+    once per event class.
+    """
+    return frozenset(
+        name for name, field in event_type.model_fields.items() if not _is_plain_data_type(field.annotation, set())
+    )
+
 
 class PublishFrom(IntEnum):
     APPLICATION_MANAGER = auto()
@@ -32,6 +82,10 @@ class PublishFrom(IntEnum):
 
 
 class AppQueueManager:
+    # Managers listening in this process, so stops issued here reach them without waiting for a Redis poll
+    _local_managers: "weakref.WeakValueDictionary[str, AppQueueManager]" = weakref.WeakValueDictionary()
+    _local_managers_lock = threading.Lock()
+
     def __init__(self, task_id: str, user_id: str, invoke_from: InvokeFrom):
         if not user_id:
             raise ValueError("user is required")
@@ -49,8 +103,13 @@ class AppQueueManager:
 
         self._q = q
         self._graph_runtime_state: GraphRuntimeState | None = None
-        self._stopped_cache: TTLCache[tuple, bool] = TTLCache(maxsize=1, ttl=1)
-        self._cache_lock = threading.Lock()
+        self._stopped = False
+        self._next_stop_check_at = 0.0
+        self._stop_check_interval = dify_config.APP_STOP_FLAG_CHECK_INTERVAL_MS / 1000
+        self._stop_check_lock = threading.Lock()
+
+        with AppQueueManager._local_managers_lock:
+            AppQueueManager._local_managers[self._task_id] = self
 
     def listen(self):
         """
@@ -89,6 +148,9 @@ class AppQueueManager:
         :return:
         """
         self._clear_task_belong_cache()
+        with AppQueueManager._local_managers_lock:
+            if AppQueueManager._local_managers.get(self._task_id) is self:
+                del AppQueueManager._local_managers[self._task_id]
         self._q.put(None)
 
     def _clear_task_belong_cache(self) -> None:
@@ -128,7 +190,11 @@ class AppQueueManager:
         :param pub_from:
         :return:
         """
-        self._check_for_sqlalchemy_models(event.model_dump())
+        # High-frequency events such as text and LLM chunks only have plain data fields,
+        # so this skips both the dump and the walk for them
+        fields_to_check = _fields_to_check_for_sqlalchemy_models(type(event))
+        if fields_to_check:
+            self._check_for_sqlalchemy_models(event.model_dump(include=set(fields_to_check)))
         self._publish(event, pub_from)
 
     @abstractmethod
@@ -157,6 +223,7 @@ class AppQueueManager:
 
         stopped_cache_key = cls._generate_stopped_cache_key(task_id)
         redis_client.setex(stopped_cache_key, 600, 1)
+        cls._stop_local_manager(task_id)
 
     @classmethod
     def set_stop_flag_no_user_check(cls, task_id: str) -> None:
@@ -172,19 +239,47 @@ class AppQueueManager:
 
         stopped_cache_key = cls._generate_stopped_cache_key(task_id)
         redis_client.setex(stopped_cache_key, 600, 1)
+        cls._stop_local_manager(task_id)
+
+    @classmethod
+    def _stop_local_manager(cls, task_id: str) -> None:
+        """
+        Stop the manager of the task right away if it is listening in this process.
+        Managers in other processes pick the stop flag up on their next Redis check.
+        :param task_id: task id
+        :return:
+        """
+        with cls._local_managers_lock:
+            manager = cls._local_managers.get(task_id)
+        if manager is None or manager._stopped:
+            return
+
+        manager._stopped = True
+        # wake up the listener in case it is waiting for the next message
+        manager.publish(QueueStopEvent(stopped_by=QueueStopEvent.StopBy.USER_MANUAL), PublishFrom.TASK_PIPELINE)
 
-    @cachedmethod(lambda self: self._stopped_cache, lock=lambda self: self._cache_lock)
     def _is_stopped(self) -> bool:
         """
-        Check if task is stopped
+        Check if task is stopped.
+        Redis is queried at most once per APP_STOP_FLAG_CHECK_INTERVAL_MS, and a stop is remembered once seen.
         :return:
         """
-        stopped_cache_key = AppQueueManager._generate_stopped_cache_key(self._task_id)
-        result = redis_client.get(stopped_cache_key)
-        if result is not None:
+        if self._stopped:
             return True
+        if time.monotonic() < self._next_stop_check_at:
+            return False
 
-        return False
+        with self._stop_check_lock:
+            now = time.monotonic()
+            if self._stopped or now < self._next_stop_check_at:
+                return self._stopped
+
+            stopped_cache_key = AppQueueManager._generate_stopped_cache_key(self._task_id)
+            if redis_client.get(stopped_cache_key) is not None:
+                self._stopped = True
+            self._next_stop_check_at = now + self._stop_check_interval
+
+        return self._stopped
 
     @classmethod
     def _generate_task_belong_cache_key(cls, task_id: str) -> str:
@@ -0,0 +1,261 @@
+import base64
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+import httpx
+from cachetools import LRUCache
+
+from configs import dify_config
+from core.helper import ssrf_proxy
+from extensions.ext_storage import storage
+
+logger = logging.getLogger(__name__)
+
+# headers of a remote file that are replayed when it is answered from the cache
+_CACHED_RESPONSE_HEADERS = ("Content-Type", "Content-Disposition", "ETag", "Last-Modified")
+
+# the disk tier is shared by the processes of the host, so each process rescans it after writing this fraction
+# of its budget or after this many seconds, to account for the files written by the others
+_DISK_RESCAN_FRACTION = 0.1
+_DISK_RESCAN_INTERVAL = 60
+
+# temporary files older than this were left behind by processes killed while writing them
+_DISK_TEMP_FILE_MAX_AGE = 5 * 60
+
+
+class FileContentCache:
+    """
+    Tiered cache of the file contents read by workflow nodes and the RAG extractors.
+
+    Files in storage are keyed by their storage key, which is never reused for other contents. Remote files
+    are keyed by their URL plus the ETag or Last-Modified validator of the response and are revalidated with
+    a conditional request on every read, so responses without a validator are not cached.
+
+    Contents are kept in a process-local LRU bounded in bytes, together with the base64 views sent to
+    multimodal models, and in a directory on the local disk shared by the processes of the host, which
+    drops the least recently read files once it grows past FILE_CONTENT_CACHE_DISK_MAX_BYTES.
+    """
+
+    _memory: LRUCache[str, bytes | str] = LRUCache(
+        maxsize=max(dify_config.FILE_CONTENT_CACHE_MEMORY_MAX_BYTES, 1), getsizeof=len
+    )
+    _lock = Lock()
+    _disk_lock = Lock()
+    # size of each directory at its last scan, bytes this process wrote since, and the time of the scan
+    _disk_usage: dict[Path, tuple[int, int, float]] = {}
+
+    @classmethod
+    def get_storage_file(cls, storage_key: str) -> bytes:
+        """Get the contents of a file in storage."""
+        key = f"storage:{storage_key}"
+        content = cls._get(key)
+        if content is None:
+            content = storage.load(storage_key, stream=False)
+            if not isinstance(content, bytes):
+                raise ValueError(f"file {storage_key} is not a bytes object")
+            cls._set(key, content)
+        return content
+
+    @classmethod
+    def get_cached_storage_file(cls, storage_key: str) -> bytes | None:
+        """Get the contents of a file in storage if they are cached, without loading them."""
+        return cls._get(f"storage:{storage_key}")
+
+    @classmethod
+    def get_storage_file_base64(cls, storage_key: str) -> str:
+        """Get the contents of a file in storage encoded in base64."""
+        return cls._get_base64(f"storage:{storage_key}", lambda: cls.get_storage_file(storage_key))
+
+    @classmethod
+    def get_remote_file(cls, url: str, /, **kwargs: Any) -> httpx.Response:
+        """
+        Fetch a remote file with `ssrf_proxy.get`, answering from the cache while the server confirms the
+        cached contents are still current. The keyword arguments are passed on to `ssrf_proxy.get`.
+        """
+        return cls._get_remote_file(url, **kwargs)[1]
+
+    @classmethod
+    def get_remote_file_base64(cls, url: str, /, **kwargs: Any) -> str:
+        """Fetch a remote file like `get_remote_file` and return its contents encoded in base64."""
+        key, response = cls._get_remote_file(url, **kwargs)
+        response.raise_for_status()
+        if key is None:
+            return base64.b64encode(response.content).decode("utf-8")
+        return cls._get_base64(key, lambda: response.content)
+
+    @classmethod
+    def clear(cls):
+        """Drop the contents kept in the memory of this process."""
+        with cls._lock:
+            cls._memory.clear()
+
+    @classmethod
+    def _get_remote_file(cls, url: str, **kwargs: Any) -> tuple[str | None, httpx.Response]:
+        metadata_key = f"remote_metadata:{url}"
+        cached_metadata = cls._get(metadata_key)
+        if cached_metadata is not None:
+            metadata: dict[str, str] = json.loads(cached_metadata)
+            key = cls._remote_key(url, metadata)
+            content = cls._get(key)
+            if key is not None and content is not None:
+                headers = dict(kwargs.pop("headers", None) or {})
+                if "ETag" in metadata:
+                    headers["If-None-Match"] = metadata["ETag"]
+                if "Last-Modified" in metadata:
+                    headers["If-Modified-Since"] = metadata["Last-Modified"]
+                response = ssrf_proxy.get(url, headers=headers, **kwargs)
+                if response.status_code == 304:
+                    return key, httpx.Response(
+                        200, headers=metadata, content=content, request=httpx.Request("GET", url)
+                    )
+                return cls._store_remote_file(url, metadata_key, response), response
+
+        response = ssrf_proxy.get(url, **kwargs)
+        return cls._store_remote_file(url, metadata_key, response), response
+
+    @classmethod
+    def _store_remote_file(cls, url: str, metadata_key: str, response: httpx.Response) -> str | None:
+        if response.status_code != 200:
+            return None
+        metadata = {name: response.headers[name] for name in _CACHED_RESPONSE_HEADERS if name in response.headers}
+        key = cls._remote_key(url, metadata)
+        if key is None or not cls._set(key, response.content):
+            return None
+        cls._set(metadata_key, json.dumps(metadata).encode())
+        return key
+
+    @staticmethod
+    def _remote_key(url: str, metadata: dict[str, str]) -> str | None:
+        validator = metadata.get("ETag") or metadata.get("Last-Modified")
+        if not validator:
+            return None
+        return f"remote:{url}#{validator}"
+
+    @classmethod
+    def _get_base64(cls, key: str, load: Callable[[], bytes]) -> str:
+        base64_key = f"base64:{key}"
+        with cls._lock:
+            encoded = cls._memory.get(base64_key)
+        if isinstance(encoded, str):
+            return encoded
+
+        encoded = base64.b64encode(load()).decode("utf-8")
+        cls._set_memory(base64_key, encoded)
+        return encoded
+
+    @classmethod
+    def _get(cls, key: str) -> bytes | None:
+        with cls._lock:
+            content = cls._memory.get(key)
+        if isinstance(content, bytes):
+            return content
+
+        path = cls._disk_path(key)
+        if path is None:
+            return None
+        try:
+            content = path.read_bytes()
+            # the modification time orders the files for eviction
+            os.utime(path)
+        except OSError:
+            return None
+        cls._set_memory(key, content)
+        return content
+
+    @classmethod
+    def _set(cls, key: str, content: bytes) -> bool:
+        """Cache content in every tier, returning False when it is too large to be cached."""
+        if len(content) > dify_config.FILE_CONTENT_CACHE_MAX_ITEM_BYTES:
+            return False
+        cls._set_memory(key, content)
+        path = cls._disk_path(key)
+        if path is not None:
+            cls._write_disk(path, content)
+        return True
+
+    @classmethod
+    def _set_memory(cls, key: str, value: bytes | str):
+        if dify_config.FILE_CONTENT_CACHE_MEMORY_MAX_BYTES <= 0:
+            return
+        if len(value) > min(cls._memory.maxsize, dify_config.FILE_CONTENT_CACHE_MAX_ITEM_BYTES):
+            return
+        with cls._lock:
+            cls._memory[key] = value
+
+    @staticmethod
+    def _disk_path(key: str) -> Path | None:
+        if dify_config.FILE_CONTENT_CACHE_DISK_MAX_BYTES <= 0:
+            return None
+        directory = dify_config.FILE_CONTENT_CACHE_DIR or os.path.join(tempfile.gettempdir(), "dify-file-content-cache")
+        return Path(directory) / hashlib.sha256(key.encode()).hexdigest()
+
+    @classmethod
+    def _write_disk(cls, path: Path, content: bytes):
+        directory = path.parent
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            # write to a temporary file first so other processes never read a partial file
+            with tempfile.NamedTemporaryFile(dir=directory, prefix=".", delete=False) as temp_file:
+                temp_file.write(content)
+            os.replace(temp_file.name, path)
+        except OSError:
+            logger.warning("Failed to write file content cache entry %s", path, exc_info=True)
+            return
+
+        max_bytes = dify_config.FILE_CONTENT_CACHE_DISK_MAX_BYTES
+        with cls._disk_lock:
+            now = time.monotonic()
+            # a directory this process never scanned is scanned on its first write
+            usage, written, scanned_at = cls._disk_usage.get(directory, (0, 0, float("-inf")))
+            written += len(content)
+            if (
+                now - scanned_at > _DISK_RESCAN_INTERVAL
+                or written > max_bytes * _DISK_RESCAN_FRACTION
+                or usage + written > max_bytes
+            ):
+                usage, written, scanned_at = cls._evict_disk(directory), 0, now
+            cls._disk_usage[directory] = (usage, written, scanned_at)
+
+    @staticmethod
+    def _evict_disk(directory: Path) -> int:
+        """
+        Delete the least recently read files until the directory fits its budget, and the stale temporary files,
+        returning its size.
+        """
+        entries: list[tuple[float, int, str]] = []
+        stale_before = time.time() - _DISK_TEMP_FILE_MAX_AGE
+        with os.scandir(directory) as it:
+            for entry in it:
+                if not entry.is_file():
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                if not entry.name.startswith("."):
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                elif stat.st_mtime < stale_before:
+                    with contextlib.suppress(OSError):
+                        os.remove(entry.path)
+
+        usage = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if usage <= dify_config.FILE_CONTENT_CACHE_DISK_MAX_BYTES:
+                break
+            try:
+                os.remove(entry_path)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue
+            usage -= size
+        return usage
@@ -1,8 +1,6 @@
-import base64
-from collections.abc import Mapping
+from collections.abc import Iterator, Mapping
 
 from configs import dify_config
-from core.helper import ssrf_proxy
 from core.model_runtime.entities import (
     AudioPromptMessageContent,
     DocumentPromptMessageContent,
@@ -16,6 +14,7 @@ from extensions.ext_storage import storage
 
 from . import helpers
 from .enums import FileAttribute
+from .file_content_cache import FileContentCache
 from .models import File, FileTransferMethod, FileType
 
 
@@ -104,17 +103,38 @@ def download(f: File, /):
     ):
         return _download_file_content(f.storage_key)
     elif f.transfer_method == FileTransferMethod.REMOTE_URL:
-        response = ssrf_proxy.get(f.remote_url, follow_redirects=True)
+        if f.remote_url is None:
+            raise ValueError("Missing file remote_url")
+        response = FileContentCache.get_remote_file(f.remote_url, follow_redirects=True)
         response.raise_for_status()
         return response.content
     raise ValueError(f"unsupported transfer method: {f.transfer_method}")
 
 
+def download_stream(f: File, /) -> Iterator[bytes]:
+    """
+    Stream the contents of a file in chunks.
+
+    Files in storage are read with `storage.load_stream` unless their contents are already cached, so they
+    are never held in memory as a whole. Remote files are downloaded at once.
+    """
+    if f.transfer_method in (
+        FileTransferMethod.TOOL_FILE,
+        FileTransferMethod.LOCAL_FILE,
+        FileTransferMethod.DATASOURCE_FILE,
+    ):
+        content = FileContentCache.get_cached_storage_file(f.storage_key)
+        if content is not None:
+            return iter((content,))
+        return storage.load_stream(f.storage_key)
+    return iter((download(f),))
+
+
 def _download_file_content(path: str, /):
     """
     Download and return the contents of a file as bytes.
 
-    This function loads the file from storage and ensures it's in bytes format.
+    This function loads the file from storage through the file content cache and ensures it's in bytes format.
 
     Args:
         path (str): The path to the file in storage.
@@ -125,26 +145,22 @@ def _download_file_content(path: str, /):
     Raises:
         ValueError: If the loaded file is not a bytes object.
     """
-    data = storage.load(path, stream=False)
-    if not isinstance(data, bytes):
-        raise ValueError(f"file {path} is not a bytes object")
-    return data
+    return FileContentCache.get_storage_file(path)
 
 
 def _get_encoded_string(f: File, /):
     match f.transfer_method:
         case FileTransferMethod.REMOTE_URL:
-            response = ssrf_proxy.get(f.remote_url, follow_redirects=True)
-            response.raise_for_status()
-            data = response.content
+            if f.remote_url is None:
+                raise ValueError("Missing file remote_url")
+            encoded_string = FileContentCache.get_remote_file_base64(f.remote_url, follow_redirects=True)
         case FileTransferMethod.LOCAL_FILE:
-            data = _download_file_content(f.storage_key)
+            encoded_string = FileContentCache.get_storage_file_base64(f.storage_key)
         case FileTransferMethod.TOOL_FILE:
-            data = _download_file_content(f.storage_key)
+            encoded_string = FileContentCache.get_storage_file_base64(f.storage_key)
         case FileTransferMethod.DATASOURCE_FILE:
-            data = _download_file_content(f.storage_key)
+            encoded_string = FileContentCache.get_storage_file_base64(f.storage_key)
 
-    encoded_string = base64.b64encode(data).decode("utf-8")
     return encoded_string
 
 
@@ -1,5 +1,5 @@
 import logging
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 from enum import StrEnum
 from threading import Lock
 from typing import Any
@@ -10,9 +10,14 @@ from yarl import URL
 
 from configs import dify_config
 from core.helper.code_executor.javascript.javascript_transformer import NodeJsTemplateTransformer
+from core.helper.code_executor.jinja2.jinja2_renderer import (
+    Jinja2Renderer,
+    Jinja2RenderError,
+    Jinja2UnsafeTemplateError,
+)
 from core.helper.code_executor.jinja2.jinja2_transformer import Jinja2TemplateTransformer
 from core.helper.code_executor.python3.python3_transformer import Python3TemplateTransformer
-from core.helper.code_executor.template_transformer import TemplateTransformer
+from core.helper.code_executor.template_transformer import BatchTemplateTransformer, TemplateTransformer
 from core.helper.http_client_pooling import get_pooled_http_client
 
 logger = logging.getLogger(__name__)
@@ -71,6 +76,8 @@ class CodeExecutor:
 
     supported_dependencies_languages: set[CodeLanguage] = {CodeLanguage.PYTHON3}
 
+    supported_batch_languages: set[CodeLanguage] = {CodeLanguage.PYTHON3, CodeLanguage.JAVASCRIPT}
+
     @classmethod
     def execute_code(cls, language: CodeLanguage, preload: str, code: str) -> str:
         """
@@ -151,6 +158,58 @@ class CodeExecutor:
         if not template_transformer:
             raise CodeExecutionError(f"Unsupported language {language}")
 
+        if language == CodeLanguage.JINJA2 and dify_config.CODE_EXECUTION_JINJA2_ENGINE == "local":
+            try:
+                return {"result": Jinja2Renderer.render(code, inputs)}
+            except Jinja2UnsafeTemplateError as e:
+                if not dify_config.CODE_EXECUTION_JINJA2_SANDBOX_FALLBACK:
+                    raise CodeExecutionError(str(e)) from e
+                logger.info("Template is not allowed by the local Jinja2 sandbox, rendering it in the code sandbox")
+            except Jinja2RenderError as e:
+                raise CodeExecutionError(str(e)) from e
+
         runner, preload = template_transformer.transform_caller(code, inputs)
         response = cls.execute_code(language, preload, runner)
         return template_transformer.transform_response(response)
+
+    @classmethod
+    def execute_workflow_code_template_batch(
+        cls, language: CodeLanguage, code: str, inputs_list: Sequence[Mapping[str, Any]]
+    ) -> list[Mapping[str, Any] | CodeExecutionError]:
+        """
+        Execute code once for each inputs, in a single sandbox run when the language supports it
+        :param language: code language
+        :param code: code
+        :param inputs_list: inputs of each execution
+        :return: the result, or the error, of each execution in the order of the inputs
+        """
+        template_transformer = cls.code_template_transformers.get(language)
+        if not template_transformer:
+            raise CodeExecutionError(f"Unsupported language {language}")
+
+        if (
+            language in cls.supported_batch_languages
+            and issubclass(template_transformer, BatchTemplateTransformer)
+            and len(inputs_list) > 1
+        ):
+            runner, preload = template_transformer.transform_batch_caller(code, inputs_list)
+            try:
+                response = cls.execute_code(language, preload, runner)
+                results = template_transformer.transform_batch_response(response)
+            except (CodeExecutionError, ValueError):
+                # the run failed as a whole, e.g. it timed out, so the failing inputs are unknown
+                logger.warning("Batch code execution failed, executing %s inputs one by one", len(inputs_list))
+            else:
+                if len(results) == len(inputs_list):
+                    return [CodeExecutionError(str(r)) if isinstance(r, ValueError) else r for r in results]
+                logger.warning("Batch code execution returned %s results for %s inputs", len(results), len(inputs_list))
+
+        outcomes: list[Mapping[str, Any] | CodeExecutionError] = []
+        for inputs in inputs_list:
+            try:
+                outcomes.append(cls.execute_workflow_code_template(language, code, inputs))
+            except CodeExecutionError as e:
+                outcomes.append(e)
+            except ValueError as e:
+                outcomes.append(CodeExecutionError(str(e)))
+        return outcomes
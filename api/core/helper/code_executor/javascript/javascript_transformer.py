@@ -1,9 +1,9 @@
 from textwrap import dedent
 
-from core.helper.code_executor.template_transformer import TemplateTransformer
+from core.helper.code_executor.template_transformer import BatchTemplateTransformer
 
 
-class NodeJsTemplateTransformer(TemplateTransformer):
+class NodeJsTemplateTransformer(BatchTemplateTransformer):
     @classmethod
     def get_runner_script(cls) -> str:
         runner_script = dedent(f"""            {cls._code_placeholder}
@@ -20,3 +20,26 @@ class NodeJsTemplateTransformer(TemplateTransformer):
             console.log(result)
             """)
         return runner_script
+
+    @classmethod
+    def get_batch_runner_script(cls) -> str:
+        runner_script = dedent(f"""            {cls._code_placeholder}
+
+            // decode and prepare the input object of each call
+            var inputs_list = JSON.parse(Buffer.from('{cls._inputs_placeholder}', 'base64').toString('utf-8'))
+
+            // execute main function for each input object, a failing call does not stop the others
+            var results = inputs_list.map(function (inputs_obj) {{
+                try {{
+                    return {{ result: JSON.stringify(main(inputs_obj)) }}
+                }} catch (e) {{
+                    return {{ error: String(e && e.stack ? e.stack : e) }}
+                }}
+            }})
+
+            // convert results to json and print
+            var output_json = JSON.stringify(results)
+            var result = `<<RESULT>>${{output_json}}<<RESULT>>`
+            console.log(result)
+            """)
+        return runner_script
@@ -0,0 +1,295 @@
+import functools
+import hashlib
+import json
+import re
+import threading
+import time
+from collections.abc import Callable, Iterable, Mapping, Sized
+from string import Formatter
+from typing import Any
+
+from cachetools import LRUCache
+from jinja2 import Template, TemplateError
+from jinja2.runtime import Context
+from jinja2.sandbox import SandboxedEnvironment, SecurityError
+
+from configs import dify_config
+from core.variables.utils import dumps_with_segments
+
+
+class Jinja2RenderError(Exception):
+    pass
+
+
+class Jinja2UnsafeTemplateError(Jinja2RenderError):
+    """The template accesses something the sandboxed environment does not allow."""
+
+
+# methods of strings that can build a string much larger than the string and their arguments
+_LIMITED_STR_METHODS = frozenset(
+    ["center", "ljust", "rjust", "zfill", "expandtabs", "replace", "join", "format", "format_map", "translate"]
+)
+
+
+# conversion specifiers of printf-style formats
+_PERCENT_SPEC_PATTERN = re.compile(r"%(?:\([^)]*\))?[#0 +-]*(?:\*|\d+)?(?:\.(?:\*|\d+))?[a-zA-Z%]")
+
+
+def _check_length(length: int):
+    max_length = dify_config.CODE_EXECUTION_JINJA2_MAX_OUTPUT_LENGTH
+    if length > max_length:
+        raise Jinja2RenderError(f"Template output exceeds {max_length} characters")
+
+
+def _check_int_arguments(args: Iterable[Any]):
+    for value in args:
+        if isinstance(value, int) and not isinstance(value, bool):
+            _check_length(value)
+
+
+def _check_percent_format(template: Any, args: Any):
+    """Check the widths and precisions of a ``%`` format, including the ``*`` ones taken from its arguments."""
+    if not isinstance(template, str):
+        return
+    for spec in _PERCENT_SPEC_PATTERN.findall(template):
+        _check_int_arguments(int(number) for number in re.findall(r"\d+", spec))
+        if "*" in spec:
+            _check_int_arguments(args if isinstance(args, tuple) else (args,))
+
+
+def _check_str_format(template: str, args: tuple[Any, ...], kwargs: Mapping[str, Any]):
+    """Check the widths and precisions of a ``str.format`` template, including the nested ones."""
+    try:
+        fields = list(Formatter().parse(template))
+    except ValueError:
+        # the call itself raises the error of the malformed template
+        return
+    for _, _, format_spec, _ in fields:
+        if not format_spec:
+            continue
+        _check_int_arguments(int(number) for number in re.findall(r"\d+", format_spec))
+        if "{" in format_spec:
+            _check_int_arguments((*args, *kwargs.values()))
+
+
+def _check_replace(value: Any, old: Any, new: Any, count: Any = -1):
+    if not (isinstance(value, str) and isinstance(old, str) and isinstance(new, str)):
+        return
+    occurrences = len(value) + 1 if not old else value.count(old)
+    if isinstance(count, int) and count >= 0:
+        occurrences = min(occurrences, count)
+    _check_length(len(value) + occurrences * (len(new) - len(old)))
+
+
+def _check_join(separator: Any, items: Any):
+    if isinstance(separator, str) and isinstance(items, Sized):
+        _check_length(len(separator) * max(len(items) - 1, 0))
+
+
+def _check_str_call(value: str, method: str, args: tuple[Any, ...], kwargs: Mapping[str, Any]):
+    """Check the size of the string built by calling a method of a string from a template."""
+    if method in ("center", "ljust", "rjust", "zfill"):
+        _check_int_arguments(args[:1])
+    elif method == "expandtabs":
+        tabsize = args[0] if args else kwargs.get("tabsize", 8)
+        if isinstance(tabsize, int):
+            _check_length(len(value) + value.count("\t") * tabsize)
+    elif method == "replace":
+        _check_replace(value, *args[:3])
+    elif method == "join":
+        _check_join(value, args[0] if args else None)
+    elif method == "format":
+        _check_str_format(value, args, kwargs)
+    elif method == "format_map":
+        _check_str_format(value, (), args[0] if args and isinstance(args[0], Mapping) else {})
+    elif method == "translate" and args and isinstance(args[0], Mapping):
+        replacements = [len(replacement) for replacement in args[0].values() if isinstance(replacement, str)]
+        _check_length(len(value) * max(replacements, default=1))
+
+
+def _check_indent(value: Any, width: Any = 4, *args: Any, **kwargs: Any):
+    lines = str(value).count("\n") + 1
+    if isinstance(width, str):
+        _check_length(len(str(value)) + lines * len(width))
+    elif isinstance(width, int):
+        _check_length(len(str(value)) + lines * width)
+
+
+def _check_wordwrap(value: Any, width: Any = 79, break_long_words: Any = True, wrapstring: Any = None, **kwargs: Any):
+    wrapstring = kwargs.get("wrapstring", wrapstring)
+    if isinstance(wrapstring, str):
+        _check_length(len(str(value)) * (len(wrapstring) + 1))
+
+
+def _check_tojson(value: Any, indent: Any = None):
+    if isinstance(indent, int) and indent > 0:
+        # every value of the document starts a new indented line
+        _check_length(indent * len(repr(value)))
+
+
+def _check_batch(value: Any, linecount: Any = None, fill_with: Any = None):
+    if fill_with is not None:
+        _check_int_arguments((linecount,))
+
+
+# filters that can build a value much larger than their arguments, with the check of their arguments
+_SIZE_FILTER_CHECKS: dict[str, Callable[..., None]] = {
+    "batch": _check_batch,
+    "center": lambda value, width=80: _check_int_arguments((width,)),
+    "format": lambda value, *args, **kwargs: _check_percent_format(value, args or tuple(kwargs.values())),
+    "indent": _check_indent,
+    "join": lambda value, d="", attribute=None: _check_join(d, value),
+    "replace": lambda value, old, new, count=None: _check_replace(value, old, new, -1 if count is None else count),
+    "slice": lambda value, slices, fill_with=None: _check_int_arguments((slices,)),
+    "tojson": _check_tojson,
+    "wordwrap": _check_wordwrap,
+}
+
+
+def _limit_filter(filter_func: Callable[..., Any], check: Callable[..., None]) -> Callable[..., Any]:
+    # filters passed the context, eval context or environment get it as their first argument
+    passes_context = hasattr(filter_func, "jinja_pass_arg")
+
+    @functools.wraps(filter_func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        check(*(args[1:] if passes_context else args), **kwargs)
+        return filter_func(*args, **kwargs)
+
+    return wrapper
+
+
+class _LimitedSandboxedEnvironment(SandboxedEnvironment):
+    """
+    Sandboxed environment that checks the CPU time of the render on every call, attribute and item
+    access, and caps the size of the values built by operators, filters and string and list methods
+    before building them, as a single C call can allocate gigabytes before the CPU time is checked again.
+    """
+
+    intercepted_binops = frozenset(["*", "**", "+", "%"])
+
+    def __init__(self):
+        super().__init__()
+        self._limits = threading.local()
+        for name, check in _SIZE_FILTER_CHECKS.items():
+            self.filters[name] = _limit_filter(self.filters[name], check)
+
+    def start_render(self, cpu_time_limit: float):
+        self._limits.cpu_time_limit = cpu_time_limit
+        self._limits.deadline = time.thread_time() + cpu_time_limit
+
+    def check_cpu_time(self):
+        deadline = getattr(self._limits, "deadline", None)
+        if deadline is not None and time.thread_time() > deadline:
+            raise Jinja2RenderError(
+                f"Template rendering exceeded the CPU time limit of {self._limits.cpu_time_limit} seconds"
+            )
+
+    def call(self, context: Context, obj: Any, /, *args: Any, **kwargs: Any) -> Any:
+        self.check_cpu_time()
+        return super().call(context, obj, *args, **kwargs)
+
+    def getattr(self, obj: Any, attribute: str) -> Any:
+        self.check_cpu_time()
+        return self._limit_method(obj, attribute, super().getattr(obj, attribute))
+
+    def getitem(self, obj: Any, argument: Any) -> Any:
+        self.check_cpu_time()
+        return self._limit_method(obj, argument, super().getitem(obj, argument))
+
+    def call_binop(self, context: Context, operator: str, left: Any, right: Any) -> Any:
+        self.check_cpu_time()
+        if operator == "*":
+            for sequence, count in ((left, right), (right, left)):
+                if isinstance(sequence, (str, list, tuple)) and isinstance(count, int):
+                    _check_length(len(sequence) * count)
+        elif operator == "**" and isinstance(left, int) and isinstance(right, int):
+            # a decimal digit takes a bit more than 3 bits
+            if abs(left) > 1:
+                _check_length(right * abs(left).bit_length() // 4)
+        elif operator == "+" and isinstance(left, (str, list, tuple)) and isinstance(right, (str, list, tuple)):
+            _check_length(len(left) + len(right))
+        elif operator == "%":
+            _check_percent_format(left, right)
+        return super().call_binop(context, operator, left, right)
+
+    @staticmethod
+    def _limit_method(obj: Any, name: Any, value: Any) -> Any:
+        """Wrap the methods of strings and lists that can build large values, to check their arguments first."""
+        if not callable(value):
+            return value
+        if isinstance(obj, str) and name in _LIMITED_STR_METHODS:
+
+            def limited_str_method(*args: Any, **kwargs: Any) -> Any:
+                _check_str_call(obj, name, args, kwargs)
+                return value(*args, **kwargs)
+
+            return limited_str_method
+        if isinstance(obj, list) and name == "extend":
+
+            def limited_extend(items: Any) -> Any:
+                if isinstance(items, Sized):
+                    _check_length(len(obj) + len(items))
+                return value(items)
+
+            return limited_extend
+        return value
+
+
+class Jinja2Renderer:
+    """
+    Renders Jinja2 templates in-process with a sandboxed environment.
+
+    Compiled templates are kept in a bounded LRU keyed by the hash of their source, so a template used by
+    every item of an iteration is only compiled once. Renders are limited in CPU time and output length.
+    """
+
+    _environment = _LimitedSandboxedEnvironment()
+    _templates: LRUCache[str, Template] = LRUCache(maxsize=dify_config.CODE_EXECUTION_JINJA2_TEMPLATE_CACHE_SIZE)
+    _lock = threading.Lock()
+
+    @classmethod
+    def render(cls, template: str, inputs: Mapping[str, Any]) -> str:
+        """
+        Render template
+        :param template: template source
+        :param inputs: inputs
+        :return: rendered text
+        """
+        compiled = cls._get_template(template)
+        # inputs go through the same JSON serialization as the code execution sandbox
+        variables = json.loads(dumps_with_segments(inputs, ensure_ascii=False))
+
+        max_length = dify_config.CODE_EXECUTION_JINJA2_MAX_OUTPUT_LENGTH
+        cls._environment.start_render(dify_config.CODE_EXECUTION_JINJA2_CPU_TIME_LIMIT)
+        chunks: list[str] = []
+        length = 0
+        try:
+            for chunk in compiled.generate(**variables):
+                length += len(chunk)
+                if length > max_length:
+                    raise Jinja2RenderError(f"Template output exceeds {max_length} characters")
+                cls._environment.check_cpu_time()
+                chunks.append(chunk)
+        except SecurityError as e:
+            raise Jinja2UnsafeTemplateError(str(e)) from e
+        except Jinja2RenderError:
+            raise
+        except Exception as e:
+            raise Jinja2RenderError(f"{type(e).__name__}: {e}") from e
+        return "".join(chunks)
+
+    @classmethod
+    def _get_template(cls, template: str) -> Template:
+        key = hashlib.sha256(template.encode()).hexdigest()
+        with cls._lock:
+            compiled = cls._templates.get(key)
+        if compiled is not None:
+            return compiled
+
+        try:
+            compiled = cls._environment.from_string(template)
+        except TemplateError as e:
+            raise Jinja2RenderError(f"{type(e).__name__}: {e}") from e
+        with cls._lock:
+            cls._templates[key] = compiled
+        return compiled
@@ -1,9 +1,9 @@
 from textwrap import dedent
 
-from core.helper.code_executor.template_transformer import TemplateTransformer
+from core.helper.code_executor.template_transformer import BatchTemplateTransformer
 
 
-class Python3TemplateTransformer(TemplateTransformer):
+class Python3TemplateTransformer(BatchTemplateTransformer):
     @classmethod
     def get_runner_script(cls) -> str:
         runner_script = dedent(f"""            {cls._code_placeholder}
@@ -23,3 +23,30 @@ class Python3TemplateTransformer(TemplateTransformer):
             print(result)
             """)
         return runner_script
+
+    @classmethod
+    def get_batch_runner_script(cls) -> str:
+        runner_script = dedent(f"""            {cls._code_placeholder}
+
+            import json
+            import traceback
+            from base64 import b64decode
+
+            # decode and prepare the input dict of each call
+            inputs_list = json.loads(b64decode('{cls._inputs_placeholder}').decode('utf-8'))
+
+            # execute main function for each input dict, a failing call does not stop the others
+            results = []
+            for inputs_obj in inputs_list:
+                try:
+                    output_obj = main(**inputs_obj)
+                    results.append({{'result': json.dumps(output_obj)}})
+                except Exception:
+                    results.append({{'error': traceback.format_exc()}})
+
+            # convert results to json and print
+            output_json = json.dumps(results)
+            result = f'''<<RESULT>>{{output_json}}<<RESULT>>'''
+            print(result)
+            """)
+        return runner_script
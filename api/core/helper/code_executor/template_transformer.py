@@ -2,7 +2,7 @@ import json
 import re
 from abc import ABC, abstractmethod
 from base64 import b64encode
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 from typing import Any
 
 from core.variables.utils import dumps_with_segments
@@ -40,17 +40,14 @@ class TemplateTransformer(ABC):
         :param response: response
         :return:
         """
+        return cls._parse_result(cls.extract_result_str_from_response(response))
 
+    @classmethod
+    def _parse_result(cls, result_str: str) -> Mapping[str, Any]:
         try:
-            result_str = cls.extract_result_str_from_response(response)
             result = json.loads(result_str)
         except json.JSONDecodeError as e:
             raise ValueError(f"Failed to parse JSON response: {str(e)}.")
-        except ValueError as e:
-            # Re-raise ValueError from extract_result_str_from_response
-            raise e
-        except Exception as e:
-            raise ValueError(f"Unexpected error during response transformation: {str(e)}")
 
         if not isinstance(result, dict):
             raise ValueError(f"Result must be a dict, got {type(result).__name__}")
@@ -92,7 +89,7 @@ class TemplateTransformer(ABC):
         pass
 
     @classmethod
-    def serialize_inputs(cls, inputs: Mapping[str, Any]) -> str:
+    def serialize_inputs(cls, inputs: Mapping[str, Any] | Sequence[Mapping[str, Any]]) -> str:
         inputs_json_str = dumps_with_segments(inputs, ensure_ascii=False).encode()
         input_base64_encoded = b64encode(inputs_json_str).decode("utf-8")
         return input_base64_encoded
@@ -112,3 +109,60 @@ class TemplateTransformer(ABC):
         Get preload script
         """
         return ""
+
+
+class BatchTemplateTransformer(TemplateTransformer):
+    """
+    Template transformer of the languages whose code can be called for many inputs in one sandbox run,
+    see CodeExecutor.supported_batch_languages
+    """
+
+    @classmethod
+    def transform_batch_caller(cls, code: str, inputs_list: Sequence[Mapping[str, Any]]) -> tuple[str, str]:
+        """
+        Transform code to a runner calling it once for each inputs
+        :param code: code
+        :param inputs_list: inputs of each call
+        :return: runner, preload
+        """
+        script = cls.get_batch_runner_script()
+        script = script.replace(cls._code_placeholder, code)
+        script = script.replace(cls._inputs_placeholder, cls.serialize_inputs(inputs_list))
+
+        return script, cls.get_preload_script()
+
+    @classmethod
+    def transform_batch_response(cls, response: str) -> list[Mapping[str, Any] | ValueError]:
+        """
+        Transform the response of a batch runner to one dict, or the error raised by the code, per call
+        :param response: response
+        :return:
+        """
+        try:
+            items = json.loads(cls.extract_result_str_from_response(response))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Failed to parse JSON response: {str(e)}.")
+        if not isinstance(items, list):
+            raise ValueError(f"Batch result must be a list, got {type(items).__name__}")
+
+        results: list[Mapping[str, Any] | ValueError] = []
+        for item in items:
+            if not isinstance(item, dict):
+                raise ValueError(f"Batch result item must be a dict, got {type(item).__name__}")
+            if "error" in item:
+                results.append(ValueError(str(item["error"])))
+                continue
+            try:
+                results.append(cls._parse_result(str(item.get("result"))))
+            except ValueError as e:
+                results.append(e)
+        return results
+
+    @classmethod
+    @abstractmethod
+    def get_batch_runner_script(cls) -> str:
+        """
+        Get runner script calling the code once for each inputs, the result of each call is reported
+        separately so one failing call does not fail the others
+        """
+        pass
@@ -2,6 +2,7 @@ import json
 from enum import StrEnum
 from json import JSONDecodeError
 
+from core.helper.plugin_model_cache import PluginModelCache
 from extensions.ext_redis import redis_client
 
 
@@ -13,6 +14,7 @@ class ProviderCredentialsCacheType(StrEnum):
 
 class ProviderCredentialsCache:
     def __init__(self, tenant_id: str, identity_id: str, cache_type: ProviderCredentialsCacheType):
+        self.tenant_id = tenant_id
         self.cache_key = f"{cache_type}_credentials:tenant_id:{tenant_id}:id:{identity_id}"
 
     def get(self) -> dict | None:
@@ -49,3 +51,5 @@ class ProviderCredentialsCache:
         :return:
         """
         redis_client.delete(self.cache_key)
+        # model schemas of customizable models are derived from the credentials
+        PluginModelCache.invalidate(self.tenant_id)
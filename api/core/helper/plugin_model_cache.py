@@ -0,0 +1,175 @@
+import hashlib
+import logging
+from collections import Counter
+from collections.abc import Callable, Iterable
+from threading import Lock
+from typing import Any, TypeVar
+
+from cachetools import TTLCache
+from pydantic import TypeAdapter, ValidationError
+
+from configs import dify_config
+from core.helper.provider_configurations_cache import ProviderConfigurationsCache
+from core.model_runtime.entities.model_entities import AIModelEntity
+from core.plugin.entities.plugin_daemon import PluginModelProviderEntity
+from extensions.ext_redis import redis_client, redis_fallback
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_MODEL_PROVIDERS_ADAPTER = TypeAdapter(list[PluginModelProviderEntity])
+_MODEL_SCHEMA_ADAPTER = TypeAdapter(AIModelEntity)
+
+# how long a finished installation task is remembered, it is polled until its result is shown
+INSTALLATION_TASK_TTL = 24 * 60 * 60
+
+
+class PluginModelCache:
+    """
+    Process-wide cache of the plugin model providers and model schemas of each tenant.
+
+    Entries expire after PLUGIN_MODEL_CACHE_TTL seconds and can be shared between processes through Redis
+    with PLUGIN_MODEL_CACHE_REDIS_ENABLED. Each tenant has a version counter in Redis, `invalidate` bumps it
+    so every process drops the entries of the tenant on their next lookup.
+
+    The cached entities are handed out as is to every caller, like the per-request cache in `contexts` does,
+    they must be treated as read-only and copied before being changed.
+    """
+
+    _entries: TTLCache[tuple[str, str, str], tuple[int, Any]] = TTLCache(
+        maxsize=dify_config.PLUGIN_MODEL_CACHE_MAX_ENTRIES,
+        ttl=max(dify_config.PLUGIN_MODEL_CACHE_TTL, 1),
+    )
+    _lock = Lock()
+    _counters: Counter[str] = Counter()
+
+    @classmethod
+    def get_model_providers(
+        cls, tenant_id: str, loader: Callable[[], list[PluginModelProviderEntity]]
+    ) -> list[PluginModelProviderEntity]:
+        """Get the plugin model providers of a tenant, calling ``loader`` on a cache miss."""
+        return cls._get(tenant_id, "model_providers", "", loader, _MODEL_PROVIDERS_ADAPTER)
+
+    @classmethod
+    def get_model_schema(
+        cls, tenant_id: str, schema_key: str, loader: Callable[[], AIModelEntity | None]
+    ) -> AIModelEntity | None:
+        """Get a model schema of a tenant, calling ``loader`` on a cache miss. Missing schemas are not cached."""
+        return cls._get(tenant_id, "model_schema", schema_key, loader, _MODEL_SCHEMA_ADAPTER)
+
+    @classmethod
+    def invalidate(cls, tenant_id: str):
+        """Drop the cached providers and schemas of a tenant in every process."""
+        with cls._lock:
+            for key in [key for key in cls._entries if key[0] == tenant_id]:
+                cls._entries.pop(key, None)
+        cls._bump_version(tenant_id)
+        # the provider configurations are built from the plugin model providers
+        ProviderConfigurationsCache.invalidate(tenant_id)
+
+    @classmethod
+    def invalidate_for_installation_tasks(cls, tenant_id: str, task_ids: Iterable[str]):
+        """
+        Invalidate the cache of a tenant once its plugin installation tasks finished. The tasks are polled until
+        the user dismisses them, only the first poll seeing a task finished invalidates.
+        """
+        task_ids = list(task_ids)
+        if task_ids and cls._claim_installation_tasks(tenant_id, task_ids):
+            cls.invalidate(tenant_id)
+
+    @classmethod
+    def stats(cls) -> dict[str, int]:
+        """Hit and miss counters of this process."""
+        with cls._lock:
+            return {name: cls._counters[name] for name in ("hits", "redis_hits", "misses")}
+
+    @classmethod
+    def _get(
+        cls, tenant_id: str, kind: str, key: str, loader: Callable[[], T | None], adapter: TypeAdapter
+    ) -> T | None:
+        if dify_config.PLUGIN_MODEL_CACHE_TTL <= 0:
+            return loader()
+
+        version = cls._get_version(tenant_id)
+        entry_key = (tenant_id, kind, key)
+        with cls._lock:
+            entry = cls._entries.get(entry_key)
+            if entry is not None and entry[0] == version:
+                cls._counters["hits"] += 1
+            else:
+                entry = None
+        if entry is not None:
+            return entry[1]
+
+        redis_key = cls._redis_key(tenant_id, kind, key, version)
+        if dify_config.PLUGIN_MODEL_CACHE_REDIS_ENABLED:
+            value = cls._load_from_redis(redis_key, adapter)
+            if value is not None:
+                with cls._lock:
+                    cls._counters["redis_hits"] += 1
+                    cls._entries[entry_key] = (version, value)
+                return value
+
+        with cls._lock:
+            cls._counters["misses"] += 1
+        value = loader()
+        if value is None:
+            return None
+
+        with cls._lock:
+            cls._entries[entry_key] = (version, value)
+        if dify_config.PLUGIN_MODEL_CACHE_REDIS_ENABLED:
+            cls._save_to_redis(redis_key, adapter.dump_json(value))
+        return value
+
+    @staticmethod
+    def _version_key(tenant_id: str) -> str:
+        return f"plugin_model_cache:version:tenant_id:{tenant_id}"
+
+    @staticmethod
+    def _redis_key(tenant_id: str, kind: str, key: str, version: int) -> str:
+        key_hash = hashlib.sha256(key.encode()).hexdigest()
+        return f"plugin_model_cache:{kind}:tenant_id:{tenant_id}:version:{version}:{key_hash}"
+
+    @classmethod
+    @redis_fallback(default_return=0)
+    def _get_version(cls, tenant_id: str) -> int:
+        version = redis_client.get(cls._version_key(tenant_id))
+        return int(version) if version else 0
+
+    @classmethod
+    @redis_fallback()
+    def _bump_version(cls, tenant_id: str):
+        redis_client.incr(cls._version_key(tenant_id))
+
+    @staticmethod
+    @redis_fallback(default_return=True)
+    def _claim_installation_tasks(tenant_id: str, task_ids: list[str]) -> bool:
+        """Claim the tasks in a single pipelined round-trip, returns whether any of them was not claimed yet."""
+        pipe = redis_client.pipeline(transaction=False)
+        for task_id in task_ids:
+            pipe.set(
+                f"plugin_model_cache:installation_task:tenant_id:{tenant_id}:{task_id}",
+                1,
+                nx=True,
+                ex=INSTALLATION_TASK_TTL,
+            )
+        return any(pipe.execute())
+
+    @staticmethod
+    @redis_fallback(default_return=None)
+    def _load_from_redis(redis_key: str, adapter: TypeAdapter) -> Any:
+        cached_data = redis_client.get(redis_key)
+        if not cached_data:
+            return None
+        try:
+            return adapter.validate_json(cached_data)
+        except ValidationError:
+            logger.warning("Failed to decode cached plugin model data: %s", redis_key)
+            return None
+
+    @staticmethod
+    @redis_fallback()
+    def _save_to_redis(redis_key: str, data: bytes):
+        redis_client.setex(redis_key, dify_config.PLUGIN_MODEL_CACHE_TTL, data)
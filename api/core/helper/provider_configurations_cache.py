@@ -0,0 +1,94 @@
+import copy
+from collections.abc import Callable
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from cachetools import TTLCache
+from sqlalchemy import ColumnElement, select
+from sqlalchemy.orm import Session
+
+from configs import dify_config
+from extensions.ext_redis import redis_client, redis_fallback
+from models.provider import Provider
+
+if TYPE_CHECKING:
+    from core.entities.provider_configuration import ProviderConfigurations
+
+
+class ProviderConfigurationsCache:
+    """
+    Process-local cache of the provider configurations of each tenant.
+
+    The configurations hold decrypted credentials, so they are never written to Redis. Redis only keeps a
+    config version per tenant: `invalidate` bumps it and every process rebuilds the configurations of the
+    tenant on its next lookup. Entries also expire after PROVIDER_CONFIGURATIONS_CACHE_TTL seconds so that
+    changes made outside of the model provider services are picked up.
+
+    Hosted quota usage changes on every LLM call, so it is only refreshed by the expiry: deductions invalidate
+    the configurations when they exhaust the quota, see `invalidate_if_quota_exhausted`.
+    """
+
+    _entries: TTLCache[str, tuple[int, "ProviderConfigurations"]] = TTLCache(
+        maxsize=dify_config.PROVIDER_CONFIGURATIONS_CACHE_MAX_ENTRIES,
+        ttl=max(dify_config.PROVIDER_CONFIGURATIONS_CACHE_TTL, 1),
+    )
+    _lock = Lock()
+
+    @classmethod
+    def get(cls, tenant_id: str, loader: Callable[[], "ProviderConfigurations"]) -> "ProviderConfigurations":
+        """Get the provider configurations of a tenant, calling ``loader`` to build them on a cache miss."""
+        if dify_config.PROVIDER_CONFIGURATIONS_CACHE_TTL <= 0:
+            return loader()
+
+        version = cls._get_version(tenant_id)
+        with cls._lock:
+            entry = cls._entries.get(tenant_id)
+        if entry is not None and entry[0] == version:
+            # callers switch credentials and preferred types on the returned configurations
+            return copy.deepcopy(entry[1])
+
+        provider_configurations = loader()
+        with cls._lock:
+            cls._entries[tenant_id] = (version, copy.deepcopy(provider_configurations))
+        return provider_configurations
+
+    @classmethod
+    def invalidate(cls, tenant_id: str):
+        """Drop the cached provider configurations of a tenant in every process."""
+        with cls._lock:
+            cls._entries.pop(tenant_id, None)
+        cls._bump_version(tenant_id)
+
+    @classmethod
+    def invalidate_if_quota_exhausted(cls, session: Session, tenant_id: str, *conditions: ColumnElement[bool]):
+        """
+        Invalidate the provider configurations of a tenant after a quota deduction exhausted the quota of the
+        system provider records matching ``conditions``, so that no process keeps invoking models on it.
+        """
+        stmt = (
+            select(Provider.id)
+            .where(
+                Provider.tenant_id == tenant_id,
+                *conditions,
+                Provider.quota_limit != -1,
+                Provider.quota_limit <= Provider.quota_used,
+            )
+            .limit(1)
+        )
+        if session.scalar(stmt) is not None:
+            cls.invalidate(tenant_id)
+
+    @staticmethod
+    def _version_key(tenant_id: str) -> str:
+        return f"provider_configurations:version:tenant_id:{tenant_id}"
+
+    @classmethod
+    @redis_fallback(default_return=0)
+    def _get_version(cls, tenant_id: str) -> int:
+        version = redis_client.get(cls._version_key(tenant_id))
+        return int(version) if version else 0
+
+    @classmethod
+    @redis_fallback()
+    def _bump_version(cls, tenant_id: str):
+        redis_client.incr(cls._version_key(tenant_id))
@@ -0,0 +1,199 @@
+"""
+Per-process pool of initialized MCP client sessions.
+
+Connecting to an MCP server and running the `initialize` handshake costs a few round trips, which an agent
+calling the same server several times per turn would otherwise pay on every call. Sessions are pooled by server
+and credentials, lent to one caller at a time, and closed after staying unused for a while.
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from configs import dify_config
+from core.mcp.auth_client import MCPClientWithAuthRetry
+from core.mcp.error import MCPConnectionError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PooledSession:
+    client: MCPClientWithAuthRetry
+    # the headers the session was opened with, they change when the client refreshes its token
+    headers: dict[str, str]
+    last_used_at: float = field(default_factory=time.monotonic)
+
+
+class MCPSessionPool:
+    """Thread-safe pool of MCP client sessions, keyed by server and credentials, see `build_key`."""
+
+    def __init__(
+        self,
+        max_sessions_per_key: int,
+        idle_timeout: float,
+        health_check_interval: float,
+        acquire_timeout: float,
+    ) -> None:
+        self._max_sessions_per_key = max_sessions_per_key
+        self._idle_timeout = idle_timeout
+        self._health_check_interval = health_check_interval
+        self._acquire_timeout = acquire_timeout
+        self._idle_sessions: dict[str, list[_PooledSession]] = defaultdict(list)
+        self._open_counts: dict[str, int] = defaultdict(int)
+        self._condition = threading.Condition()
+        self._reaper: threading.Thread | None = None
+
+    @staticmethod
+    def build_key(
+        tenant_id: str,
+        provider_id: str,
+        server_url: str,
+        headers: dict[str, str],
+        timeout: float | None,
+        sse_read_timeout: float | None,
+    ) -> str:
+        """Build the key of the sessions of a server, without keeping its credentials in memory in clear."""
+        payload = json.dumps([tenant_id, provider_id, server_url, headers, timeout, sse_read_timeout], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @contextmanager
+    def session(self, key: str, factory: Callable[[], MCPClientWithAuthRetry]) -> Iterator[MCPClientWithAuthRetry]:
+        """
+        Lend an initialized client of the server identified by ``key``, calling ``factory`` to create the client
+        of a new session.
+
+        The session goes back to the pool when the block succeeds, and is closed when it raises or when the
+        client refreshed its token, as the key then no longer matches its credentials.
+        """
+        pooled = self._acquire(key, factory)
+        reusable = False
+        try:
+            yield pooled.client
+            reusable = pooled.client.headers == pooled.headers
+        finally:
+            if reusable:
+                self._release(key, pooled)
+            else:
+                self._discard(key, pooled)
+
+    def evict_idle_sessions(self) -> None:
+        """Close the sessions that stayed unused longer than the idle timeout."""
+        expired_at = time.monotonic() - self._idle_timeout
+        expired: list[tuple[str, _PooledSession]] = []
+        with self._condition:
+            for key, sessions in list(self._idle_sessions.items()):
+                for pooled in [pooled for pooled in sessions if pooled.last_used_at <= expired_at]:
+                    sessions.remove(pooled)
+                    expired.append((key, pooled))
+                if not sessions:
+                    del self._idle_sessions[key]
+        for key, pooled in expired:
+            self._discard(key, pooled)
+
+    def close_all(self) -> None:
+        """Close every idle session, sessions in use are closed when they are given back."""
+        with self._condition:
+            idle = [(key, pooled) for key, sessions in self._idle_sessions.items() for pooled in sessions]
+            self._idle_sessions.clear()
+        for key, pooled in idle:
+            self._discard(key, pooled)
+
+    def _acquire(self, key: str, factory: Callable[[], MCPClientWithAuthRetry]) -> _PooledSession:
+        deadline = time.monotonic() + self._acquire_timeout
+        with self._condition:
+            while True:
+                if sessions := self._idle_sessions.get(key):
+                    # the most recently used session is the most likely to still be alive
+                    pooled: _PooledSession | None = sessions.pop()
+                    break
+                if self._open_counts[key] < self._max_sessions_per_key:
+                    self._open_counts[key] += 1
+                    pooled = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise MCPConnectionError(
+                        f"Timed out waiting for one of the {self._max_sessions_per_key} sessions to the MCP server"
+                    )
+                self._condition.wait(remaining)
+
+        if pooled is not None:
+            if time.monotonic() - pooled.last_used_at < self._health_check_interval or self._is_healthy(pooled):
+                return pooled
+            # reconnect in place of the dead session, which keeps its slot
+            self._close(pooled)
+
+        try:
+            client = factory()
+            client.__enter__()
+        except BaseException:
+            self._free_slot(key)
+            raise
+        self._start_reaper()
+        return _PooledSession(client=client, headers=dict(client.headers))
+
+    def _release(self, key: str, pooled: _PooledSession) -> None:
+        pooled.last_used_at = time.monotonic()
+        with self._condition:
+            self._idle_sessions[key].append(pooled)
+            self._condition.notify()
+
+    def _discard(self, key: str, pooled: _PooledSession) -> None:
+        self._close(pooled)
+        self._free_slot(key)
+
+    def _free_slot(self, key: str) -> None:
+        with self._condition:
+            self._open_counts[key] -= 1
+            if self._open_counts[key] <= 0:
+                del self._open_counts[key]
+            self._condition.notify()
+
+    @staticmethod
+    def _is_healthy(pooled: _PooledSession) -> bool:
+        try:
+            pooled.client.ping()
+        except Exception:
+            logger.debug("Pooled MCP session is no longer alive, reconnecting", exc_info=True)
+            return False
+        return True
+
+    @staticmethod
+    def _close(pooled: _PooledSession) -> None:
+        try:
+            pooled.client.cleanup()
+        except Exception:
+            logger.warning("Failed to close pooled MCP session", exc_info=True)
+
+    def _start_reaper(self) -> None:
+        if self._reaper is not None:
+            return
+        with self._condition:
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap, name="mcp_session_pool_reaper", daemon=True)
+                self._reaper.start()
+
+    def _reap(self) -> None:
+        while True:
+            time.sleep(self._idle_timeout)
+            try:
+                self.evict_idle_sessions()
+            except Exception:
+                logger.exception("Failed to evict idle MCP sessions")
+
+
+mcp_session_pool = MCPSessionPool(
+    max_sessions_per_key=dify_config.MCP_SESSION_POOL_MAX_SESSIONS_PER_SERVER,
+    idle_timeout=dify_config.MCP_SESSION_POOL_IDLE_TIMEOUT,
+    health_check_interval=dify_config.MCP_SESSION_POOL_HEALTH_CHECK_INTERVAL,
+    acquire_timeout=dify_config.MCP_SESSION_POOL_ACQUIRE_TIMEOUT,
+)
+atexit.register(mcp_session_pool.close_all)
@@ -1,3 +1,4 @@
+from collections import defaultdict
 from collections.abc import Sequence
 
 from sqlalchemy import select
@@ -17,6 +18,7 @@ from core.model_runtime.entities import (
 from core.model_runtime.entities.message_entities import PromptMessageContentUnionTypes
 from core.prompt.utils.extract_thread_messages import extract_thread_messages
 from extensions.ext_database import db
+from extensions.ext_redis import redis_client, redis_fallback
 from factories import file_factory
 from models.model import AppMode, Conversation, Message, MessageFile
 from models.workflow import Workflow
@@ -25,6 +27,8 @@ from repositories.factory import DifyAPIRepositoryFactory
 
 
 class TokenBufferMemory:
+    MESSAGE_TOKENS_CACHE_TTL = 86400  # 1 day
+
     def __init__(
         self,
         conversation: Conversation,
@@ -148,16 +152,25 @@ class TokenBufferMemory:
 
         messages = list(reversed(thread_messages))
 
-        curr_message_tokens = 0
+        # load the files of all messages at once instead of two queries per message
+        user_files_by_message: dict[str, list[MessageFile]] = defaultdict(list)
+        assistant_files_by_message: dict[str, list[MessageFile]] = defaultdict(list)
+        if messages:
+            message_files = db.session.scalars(
+                select(MessageFile).where(MessageFile.message_id.in_([message.id for message in messages]))
+            ).all()
+            for message_file in message_files:
+                if message_file.belongs_to == "assistant":
+                    assistant_files_by_message[message_file.message_id].append(message_file)
+                else:
+                    user_files_by_message[message_file.message_id].append(message_file)
+
         prompt_messages: list[PromptMessage] = []
+        # cache key of each prompt message's token count, aligned with prompt_messages
+        token_cache_keys: list[str] = []
         for message in messages:
             # Process user message with files
-            user_files = db.session.scalars(
-                select(MessageFile).where(
-                    MessageFile.message_id == message.id,
-                    (MessageFile.belongs_to == "user") | (MessageFile.belongs_to.is_(None)),
-                )
-            ).all()
+            user_files = user_files_by_message.get(message.id)
 
             if user_files:
                 user_prompt_message = self._build_prompt_message_with_files(
@@ -170,11 +183,10 @@ class TokenBufferMemory:
                 prompt_messages.append(user_prompt_message)
             else:
                 prompt_messages.append(UserPromptMessage(content=message.query))
+            token_cache_keys.append(self._message_tokens_cache_key(message, "user"))
 
             # Process assistant message with files
-            assistant_files = db.session.scalars(
-                select(MessageFile).where(MessageFile.message_id == message.id, MessageFile.belongs_to == "assistant")
-            ).all()
+            assistant_files = assistant_files_by_message.get(message.id)
 
             if assistant_files:
                 assistant_prompt_message = self._build_prompt_message_with_files(
@@ -187,19 +199,59 @@ class TokenBufferMemory:
                 prompt_messages.append(assistant_prompt_message)
             else:
                 prompt_messages.append(AssistantPromptMessage(content=message.answer))
+            token_cache_keys.append(self._message_tokens_cache_key(message, "assistant"))
 
         if not prompt_messages:
             return []
 
-        # prune the chat message if it exceeds the max token limit
-        curr_message_tokens = self.model_instance.get_llm_num_tokens(prompt_messages)
+        return self._prune_prompt_messages(prompt_messages, token_cache_keys, max_token_limit)
 
-        if curr_message_tokens > max_token_limit:
-            while curr_message_tokens > max_token_limit and len(prompt_messages) > 1:
-                prompt_messages.pop(0)
-                curr_message_tokens = self.model_instance.get_llm_num_tokens(prompt_messages)
+    def _message_tokens_cache_key(self, message: Message, role: str) -> str:
+        # updated_at is part of the key so edited messages are counted again
+        return (
+            f"memory_message_tokens:{self.model_instance.provider}:{self.model_instance.model}:"
+            f"{message.id}:{role}:{message.updated_at.timestamp() if message.updated_at else 0}"
+        )
 
-        return prompt_messages
+    def _prune_prompt_messages(
+        self, prompt_messages: list[PromptMessage], token_cache_keys: list[str], max_token_limit: int
+    ) -> list[PromptMessage]:
+        """
+        Drop the oldest prompt messages until the rest fit in max_token_limit, keeping at least one.
+
+        Each prompt message is counted on its own once and the count is cached, so pruning is a running sum
+        instead of recounting the whole history after every dropped message.
+        :param prompt_messages: prompt messages, oldest first
+        :param token_cache_keys: token count cache key of each prompt message
+        :param max_token_limit: max token limit
+        :return: the newest prompt messages that fit
+        """
+        message_tokens = _get_cached_message_tokens(token_cache_keys)
+
+        newly_counted: dict[str, int] = {}
+        history_counted = False
+        kept_tokens = 0
+        first_kept = len(prompt_messages)
+        while first_kept > 0:
+            index = first_kept - 1
+            tokens = message_tokens[index]
+            if tokens is None:
+                if not history_counted:
+                    # one call for the whole history settles the common case where everything fits
+                    history_counted = True
+                    if self.model_instance.get_llm_num_tokens(prompt_messages) <= max_token_limit:
+                        return prompt_messages
+                tokens = self.model_instance.get_llm_num_tokens([prompt_messages[index]])
+                newly_counted[token_cache_keys[index]] = tokens
+            if kept_tokens + tokens > max_token_limit and first_kept < len(prompt_messages):
+                break
+            kept_tokens += tokens
+            first_kept = index
+
+        if newly_counted:
+            _set_cached_message_tokens(newly_counted, self.MESSAGE_TOKENS_CACHE_TTL)
+
+        return prompt_messages[first_kept:]
 
     def get_history_prompt_text(
         self,
@@ -241,3 +293,24 @@ class TokenBufferMemory:
                 string_messages.append(message)
 
         return "\n".join(string_messages)
+
+
+@redis_fallback(default_return=None)
+def _fetch_cached_message_tokens(cache_keys: list[str]) -> list[bytes | None] | None:
+    return redis_client.mget(cache_keys)
+
+
+def _get_cached_message_tokens(cache_keys: list[str]) -> list[int | None]:
+    """Fetch cached token counts in one round trip, None for each count that is missing."""
+    cached = _fetch_cached_message_tokens(cache_keys) if cache_keys else None
+    if not cached:
+        return [None] * len(cache_keys)
+    return [int(value) if value is not None else None for value in cached]
+
+
+@redis_fallback()
+def _set_cached_message_tokens(message_tokens: dict[str, int], ttl: int) -> None:
+    pipeline = redis_client.pipeline(transaction=False)
+    for cache_key, tokens in message_tokens.items():
+        pipeline.setex(cache_key, ttl, tokens)
+    pipeline.execute()
@@ -4,6 +4,7 @@ from collections.abc import Sequence
 from threading import Lock
 
 import contexts
+from core.helper.plugin_model_cache import PluginModelCache
 from core.model_runtime.entities.model_entities import AIModelEntity, ModelType
 from core.model_runtime.entities.provider_entities import ProviderConfig, ProviderEntity, SimpleProviderEntity
 from core.model_runtime.model_providers.__base.ai_model import AIModel
@@ -55,18 +56,20 @@ class ModelProviderFactory:
             if plugin_model_providers is not None:
                 return plugin_model_providers
 
-            plugin_model_providers = []
+            plugin_model_providers = PluginModelCache.get_model_providers(
+                self.tenant_id, self._fetch_plugin_model_providers
+            )
             contexts.plugin_model_providers.set(plugin_model_providers)
 
-            # Fetch plugin model providers
-            plugin_providers = self.plugin_model_manager.fetch_model_providers(self.tenant_id)
-
-            for provider in plugin_providers:
-                provider.declaration.provider = provider.plugin_id + "/" + provider.declaration.provider
-                plugin_model_providers.append(provider)
-
             return plugin_model_providers
 
+    def _fetch_plugin_model_providers(self) -> list["PluginModelProviderEntity"]:
+        plugin_model_providers = []
+        for provider in self.plugin_model_manager.fetch_model_providers(self.tenant_id):
+            provider.declaration.provider = provider.plugin_id + "/" + provider.declaration.provider
+            plugin_model_providers.append(provider)
+        return plugin_model_providers
+
     def get_provider_schema(self, provider: str) -> ProviderEntity:
         """
         Get provider schema
@@ -187,14 +190,18 @@ class ModelProviderFactory:
             if cache_key in contexts.plugin_model_schemas.get():
                 return contexts.plugin_model_schemas.get()[cache_key]
 
-            schema = self.plugin_model_manager.get_model_schema(
-                tenant_id=self.tenant_id,
-                user_id="unknown",
-                plugin_id=plugin_id,
-                provider=provider_name,
-                model_type=model_type.value,
-                model=model,
-                credentials=credentials or {},
+            schema = PluginModelCache.get_model_schema(
+                self.tenant_id,
+                cache_key,
+                lambda: self.plugin_model_manager.get_model_schema(
+                    tenant_id=self.tenant_id,
+                    user_id="unknown",
+                    plugin_id=plugin_id,
+                    provider=provider_name,
+                    model_type=model_type.value,
+                    model=model,
+                    credentials=credentials or {},
+                ),
             )
 
             if schema:
@@ -3,7 +3,7 @@ from datetime import datetime
 from enum import StrEnum
 from typing import Any, Union
 
-from pydantic import BaseModel, ConfigDict, field_serializer, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_serializer, field_validator
 
 
 class BaseTraceInfo(BaseModel):
@@ -118,6 +118,12 @@ class TaskData(BaseModel):
     app_id: str
     trace_info_type: str
     trace_info: Any = None
+    # unix time the trace was queued at, to measure how long it waited before being exported
+    enqueued_at: float | None = None
+
+
+class TaskBatchData(BaseModel):
+    tasks: list[TaskData] = Field(default_factory=list)
 
 
 trace_info_info_map = {
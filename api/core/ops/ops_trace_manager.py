@@ -9,14 +9,15 @@ from datetime import timedelta
 from typing import TYPE_CHECKING, Any, Optional, Union
 from uuid import UUID, uuid4
 
-from cachetools import LRUCache
+from cachetools import LRUCache, TTLCache
 from flask import current_app
 from sqlalchemy import select
 from sqlalchemy.orm import Session, sessionmaker
 
+from configs import dify_config
 from core.helper.encrypter import batch_decrypt_token, encrypt_token, obfuscated_token
 from core.ops.entities.config_entity import (
-    OPS_FILE_PATH,
+    OPS_BATCH_FILE_PATH,
     TracingProviderEnum,
 )
 from core.ops.entities.trace_entity import (
@@ -25,6 +26,7 @@ from core.ops.entities.trace_entity import (
     MessageTraceInfo,
     ModerationTraceInfo,
     SuggestedQuestionTraceInfo,
+    TaskBatchData,
     TaskData,
     ToolTraceInfo,
     TraceTaskName,
@@ -32,11 +34,12 @@ from core.ops.entities.trace_entity import (
 )
 from core.ops.utils import get_message_data
 from extensions.ext_database import db
+from extensions.ext_redis import redis_client, redis_fallback
 from extensions.ext_storage import storage
 from models.model import App, AppModelConfig, Conversation, Message, MessageFile, TraceAppConfig
 from models.workflow import WorkflowAppLog
 from repositories.factory import DifyAPIRepositoryFactory
-from tasks.ops_trace_task import process_trace_tasks
+from tasks.ops_trace_task import process_trace_batch_tasks
 
 if TYPE_CHECKING:
     from core.workflow.entities import WorkflowExecution
@@ -163,6 +166,12 @@ class OpsTraceManager:
     ops_trace_instances_cache: LRUCache = LRUCache(maxsize=128)
     decrypted_configs_cache: LRUCache = LRUCache(maxsize=128)
     _decryption_cache_lock = threading.RLock()
+    # tracing instance of each app, None when its tracing is disabled, with the config version it was resolved at
+    app_trace_instances_cache: TTLCache[str, tuple[int, Any]] = TTLCache(
+        maxsize=dify_config.OPS_TRACE_INSTANCE_CACHE_MAX_ENTRIES,
+        ttl=max(dify_config.OPS_TRACE_INSTANCE_CACHE_TTL, 1),
+    )
+    _app_trace_instances_lock = threading.Lock()
 
     @classmethod
     def encrypt_tracing_config(
@@ -309,6 +318,9 @@ class OpsTraceManager:
     ):
         """
         Get ops trace through model config
+
+        The result is cached in each process until the tracing config of the app changes, see
+        invalidate_app_trace_instance, so apps that don't trace cost no database query.
         :param app_id: app_id
         :return:
         """
@@ -318,6 +330,44 @@ class OpsTraceManager:
         if app_id is None:
             return None
 
+        if dify_config.OPS_TRACE_INSTANCE_CACHE_TTL <= 0:
+            return cls._resolve_ops_trace_instance(app_id)
+
+        version = cls._get_app_trace_config_version(app_id)
+        with cls._app_trace_instances_lock:
+            entry = cls.app_trace_instances_cache.get(app_id)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        tracing_instance = cls._resolve_ops_trace_instance(app_id)
+        with cls._app_trace_instances_lock:
+            cls.app_trace_instances_cache[app_id] = (version, tracing_instance)
+        return tracing_instance
+
+    @classmethod
+    def invalidate_app_trace_instance(cls, app_id: str):
+        """Drop the cached tracing instance of an app in every process, after its tracing config changed."""
+        with cls._app_trace_instances_lock:
+            cls.app_trace_instances_cache.pop(app_id, None)
+        cls._bump_app_trace_config_version(app_id)
+
+    @staticmethod
+    def _app_trace_config_version_key(app_id: str) -> str:
+        return f"ops_trace:config_version:app_id:{app_id}"
+
+    @classmethod
+    @redis_fallback(default_return=0)
+    def _get_app_trace_config_version(cls, app_id: str) -> int:
+        version = redis_client.get(cls._app_trace_config_version_key(app_id))
+        return int(version) if version else 0
+
+    @classmethod
+    @redis_fallback()
+    def _bump_app_trace_config_version(cls, app_id: str):
+        redis_client.incr(cls._app_trace_config_version_key(app_id))
+
+    @classmethod
+    def _resolve_ops_trace_instance(cls, app_id: str):
         app: App | None = db.session.query(App).where(App.id == app_id).first()
 
         if app is None:
@@ -402,6 +452,7 @@ class OpsTraceManager:
             }
         )
         db.session.commit()
+        cls.invalidate_app_trace_instance(app_id)
 
     @classmethod
     def get_app_tracing_config(cls, app_id: str):
@@ -496,6 +547,7 @@ class TraceTask:
         self.file_base_url = os.getenv("FILES_URL", "http://127.0.0.1:5001")
         self.app_id = None
         self.trace_id = None
+        self.enqueued_at: float | None = None
         self.kwargs = kwargs
         external_trace_id = kwargs.get("external_trace_id")
         if external_trace_id:
@@ -944,6 +996,7 @@ class TraceQueueManager:
         try:
             if self.trace_instance:
                 trace_task.app_id = self.app_id
+                trace_task.enqueued_at = time.time()
                 trace_manager_queue.put(trace_task)
         except Exception:
             logger.exception("Error adding trace task, trace_type %s", trace_task.trace_type)
@@ -961,8 +1014,8 @@ class TraceQueueManager:
 
     def run(self):
         try:
-            tasks = self.collect_tasks()
-            if tasks:
+            # drain the queue, sending at most trace_manager_batch_size traces per batch
+            while tasks := self.collect_tasks():
                 self.send_to_celery(tasks)
         except Exception:
             logger.exception("Error processing trace tasks")
@@ -976,22 +1029,32 @@ class TraceQueueManager:
             trace_manager_timer.start()
 
     def send_to_celery(self, tasks: list[TraceTask]):
+        """Save the traces of the tasks to a single file and send it to the worker in a single message."""
         with self.flask_app.app_context():
+            batch = TaskBatchData()
             for task in tasks:
                 if task.app_id is None:
                     continue
-                file_id = uuid4().hex
-                trace_info = task.execute()
+                try:
+                    trace_info = task.execute()
+                except Exception:
+                    logger.exception(
+                        "Error preparing trace task, app_id: %s, trace_type %s", task.app_id, task.trace_type
+                    )
+                    continue
 
-                task_data = TaskData(
-                    app_id=task.app_id,
-                    trace_info_type=type(trace_info).__name__,
-                    trace_info=trace_info.model_dump() if trace_info else None,
+                batch.tasks.append(
+                    TaskData(
+                        app_id=task.app_id,
+                        trace_info_type=type(trace_info).__name__,
+                        trace_info=trace_info.model_dump() if trace_info else None,
+                        enqueued_at=task.enqueued_at,
+                    )
                 )
-                file_path = f"{OPS_FILE_PATH}{task.app_id}/{file_id}.json"
-                storage.save(file_path, task_data.model_dump_json().encode("utf-8"))
-                file_info = {
-                    "file_id": file_id,
-                    "app_id": task.app_id,
-                }
-                process_trace_tasks.delay(file_info)  # type: ignore
+            if not batch.tasks:
+                return
+
+            file_id = uuid4().hex
+            file_path = f"{OPS_BATCH_FILE_PATH}{file_id}.json"
+            storage.save(file_path, batch.model_dump_json().encode("utf-8"))
+            process_trace_batch_tasks.delay({"file_id": file_id})  # type: ignore
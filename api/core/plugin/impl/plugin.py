@@ -1,7 +1,9 @@
+import time
 from collections.abc import Sequence
 
 from requests import HTTPError
 
+from core.helper.plugin_model_cache import PluginModelCache
 from core.plugin.entities.bundle import PluginBundleDependency
 from core.plugin.entities.plugin import (
     MissingPluginDependency,
@@ -14,12 +16,15 @@ from core.plugin.entities.plugin_daemon import (
     PluginDecodeResponse,
     PluginInstallTask,
     PluginInstallTaskStartResponse,
+    PluginInstallTaskStatus,
     PluginListResponse,
     PluginReadmeResponse,
 )
 from core.plugin.impl.base import BasePluginClient
 from models.provider_ids import GenericProviderID
 
+_FINISHED_TASK_STATUSES = (PluginInstallTaskStatus.Success, PluginInstallTaskStatus.Failed)
+
 
 class PluginInstaller(BasePluginClient):
     def fetch_plugin_readme(self, tenant_id: str, plugin_unique_identifier: str, language: str) -> str:
@@ -126,7 +131,7 @@ class PluginInstaller(BasePluginClient):
         Install a plugin from an identifier.
         """
         # exception will be raised if the request failed
-        return self._request_with_plugin_daemon_response(
+        response = self._request_with_plugin_daemon_response(
             "POST",
             f"plugin/{tenant_id}/management/install/identifiers",
             PluginInstallTaskStartResponse,
@@ -137,27 +142,56 @@ class PluginInstaller(BasePluginClient):
             },
             headers={"Content-Type": "application/json"},
         )
+        # otherwise the plugins are installed by a background task, the cache is invalidated once it finished
+        if response.all_installed:
+            PluginModelCache.invalidate(tenant_id)
+        return response
 
     def fetch_plugin_installation_tasks(self, tenant_id: str, page: int, page_size: int) -> Sequence[PluginInstallTask]:
         """
         Fetch plugin installation tasks.
         """
-        return self._request_with_plugin_daemon_response(
+        tasks = self._request_with_plugin_daemon_response(
             "GET",
             f"plugin/{tenant_id}/management/install/tasks",
             list[PluginInstallTask],
             params={"page": page, "page_size": page_size},
         )
+        # installations run in the background, the model providers change once the tasks are done
+        PluginModelCache.invalidate_for_installation_tasks(
+            tenant_id, [task.id for task in tasks if task.status in _FINISHED_TASK_STATUSES]
+        )
+        return tasks
 
     def fetch_plugin_installation_task(self, tenant_id: str, task_id: str) -> PluginInstallTask:
         """
         Fetch a plugin installation task.
         """
-        return self._request_with_plugin_daemon_response(
+        task = self._request_with_plugin_daemon_response(
             "GET",
             f"plugin/{tenant_id}/management/install/tasks/{task_id}",
             PluginInstallTask,
         )
+        # installations run in the background, the model providers change once the task is done
+        if task.status in _FINISHED_TASK_STATUSES:
+            PluginModelCache.invalidate_for_installation_tasks(tenant_id, [task_id])
+        return task
+
+    def wait_plugin_installation_task(
+        self, tenant_id: str, task_id: str, timeout: float = 600, interval: float = 1
+    ) -> PluginInstallTask | None:
+        """
+        Poll a plugin installation task until it finished, so the cached model providers of the tenant are
+        invalidated even when no user polls it. Returns None if it is still running after ``timeout`` seconds.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            task = self.fetch_plugin_installation_task(tenant_id, task_id)
+            if task.status in _FINISHED_TASK_STATUSES:
+                return task
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(interval)
 
     def delete_plugin_installation_task(self, tenant_id: str, task_id: str) -> bool:
         """
@@ -245,7 +279,7 @@ class PluginInstaller(BasePluginClient):
         """
         Uninstall a plugin.
         """
-        return self._request_with_plugin_daemon_response(
+        result = self._request_with_plugin_daemon_response(
             "POST",
             f"plugin/{tenant_id}/management/uninstall",
             bool,
@@ -254,6 +288,8 @@ class PluginInstaller(BasePluginClient):
             },
             headers={"Content-Type": "application/json"},
         )
+        PluginModelCache.invalidate(tenant_id)
+        return result
 
     def upgrade_plugin(
         self,
@@ -266,7 +302,7 @@ class PluginInstaller(BasePluginClient):
         """
         Upgrade a plugin.
         """
-        return self._request_with_plugin_daemon_response(
+        response = self._request_with_plugin_daemon_response(
             "POST",
             f"plugin/{tenant_id}/management/install/upgrade",
             PluginInstallTaskStartResponse,
@@ -278,6 +314,10 @@ class PluginInstaller(BasePluginClient):
             },
             headers={"Content-Type": "application/json"},
         )
+        # otherwise the plugin is upgraded by a background task, the cache is invalidated once it finished
+        if response.all_installed:
+            PluginModelCache.invalidate(tenant_id)
+        return response
 
     def check_tools_existence(self, tenant_id: str, provider_ids: Sequence[GenericProviderID]) -> Sequence[bool]:
         """
@@ -7,6 +7,7 @@ from sqlalchemy import select
 
 from configs import dify_config
 from core.rag.datasource.keyword.jieba.jieba_keyword_table_handler import JiebaKeywordTableHandler
+from core.rag.datasource.keyword.jieba.keyword_index_store import KeywordIndexStore
 from core.rag.datasource.keyword.keyword_base import BaseKeyword
 from core.rag.models.document import Document
 from extensions.ext_database import db
@@ -14,6 +15,9 @@ from extensions.ext_redis import redis_client
 from extensions.ext_storage import storage
 from models.dataset import Dataset, DatasetKeywordTable, DocumentSegment
 
+# Keyword tables of this data source type keep their keywords in the dataset_keyword_indexes table
+INDEX_DATA_SOURCE_TYPE = "index"
+
 
 class KeywordTableConfig(BaseModel):
     max_keywords_per_chunk: int = 10
@@ -25,55 +29,30 @@ class Jieba(BaseKeyword):
         self._config = KeywordTableConfig()
 
     def create(self, texts: list[Document], **kwargs) -> BaseKeyword:
-        lock_name = f"keyword_indexing_lock_{self.dataset.id}"
-        with redis_client.lock(lock_name, timeout=600):
-            keyword_table_handler = JiebaKeywordTableHandler()
-            keyword_table = self._get_dataset_keyword_table()
-            keyword_number = self.dataset.keyword_number or self._config.max_keywords_per_chunk
-
-            for text in texts:
-                keywords = keyword_table_handler.extract_keywords(text.page_content, keyword_number)
-                if text.metadata is not None:
-                    self._update_segment_keywords(self.dataset.id, text.metadata["doc_id"], list(keywords))
-                    keyword_table = self._add_text_to_keyword_table(
-                        keyword_table or {}, text.metadata["doc_id"], list(keywords)
-                    )
-
-            self._save_dataset_keyword_table(keyword_table)
-
-            return self
+        self._index_texts(texts)
+        return self
 
     def add_texts(self, texts: list[Document], **kwargs):
-        lock_name = f"keyword_indexing_lock_{self.dataset.id}"
-        with redis_client.lock(lock_name, timeout=600):
-            keyword_table_handler = JiebaKeywordTableHandler()
-
-            keyword_table = self._get_dataset_keyword_table()
-            keywords_list = kwargs.get("keywords_list")
-            keyword_number = self.dataset.keyword_number or self._config.max_keywords_per_chunk
-            for i in range(len(texts)):
-                text = texts[i]
-                if keywords_list:
-                    keywords = keywords_list[i]
-                    if not keywords:
-                        keywords = keyword_table_handler.extract_keywords(text.page_content, keyword_number)
-                else:
-                    keywords = keyword_table_handler.extract_keywords(text.page_content, keyword_number)
-                if text.metadata is not None:
-                    self._update_segment_keywords(self.dataset.id, text.metadata["doc_id"], list(keywords))
-                    keyword_table = self._add_text_to_keyword_table(
-                        keyword_table or {}, text.metadata["doc_id"], list(keywords)
-                    )
-
-            self._save_dataset_keyword_table(keyword_table)
+        self._index_texts(texts, kwargs.get("keywords_list"))
 
     def text_exists(self, id: str) -> bool:
+        keyword_index = self._get_keyword_index()
+        if keyword_index is not None:
+            return keyword_index.exists(id)
+        if not self.dataset.dataset_keyword_table:
+            return False
+
         keyword_table = self._get_dataset_keyword_table()
         if keyword_table is None:
             return False
-        return id in set.union(*keyword_table.values())
+        return any(id in node_ids for node_ids in keyword_table.values())
 
     def delete_by_ids(self, ids: list[str]):
+        keyword_index = self._get_or_create_keyword_index()
+        if keyword_index is not None:
+            keyword_index.delete_by_node_ids(ids)
+            return
+
         lock_name = f"keyword_indexing_lock_{self.dataset.id}"
         with redis_client.lock(lock_name, timeout=600):
             keyword_table = self._get_dataset_keyword_table()
@@ -83,11 +62,18 @@ class Jieba(BaseKeyword):
             self._save_dataset_keyword_table(keyword_table)
 
     def search(self, query: str, **kwargs: Any) -> list[Document]:
-        keyword_table = self._get_dataset_keyword_table()
-
         k = kwargs.get("top_k", 4)
         document_ids_filter = kwargs.get("document_ids_filter")
-        sorted_chunk_indices = self._retrieve_ids_by_query(keyword_table or {}, query, k)
+
+        keyword_index = self._get_keyword_index()
+        if keyword_index is not None:
+            keywords = JiebaKeywordTableHandler().extract_keywords(query)
+            sorted_chunk_indices = keyword_index.search(keywords, k)
+        elif self.dataset.dataset_keyword_table:
+            keyword_table = self._get_dataset_keyword_table()
+            sorted_chunk_indices = self._retrieve_ids_by_query(keyword_table or {}, query, k)
+        else:
+            return []
 
         documents = []
 
@@ -124,10 +110,98 @@ class Jieba(BaseKeyword):
             if dataset_keyword_table:
                 db.session.delete(dataset_keyword_table)
                 db.session.commit()
-                if dataset_keyword_table.data_source_type != "database":
+                if dataset_keyword_table.data_source_type == INDEX_DATA_SOURCE_TYPE:
+                    KeywordIndexStore(self.dataset.id).delete_all()
+                elif dataset_keyword_table.data_source_type != "database":
                     file_key = "keyword_files/" + self.dataset.tenant_id + "/" + self.dataset.id + ".txt"
                     storage.delete(file_key)
 
+    def _index_texts(self, texts: list[Document], keywords_list: list[list[str]] | None = None):
+        keyword_index = self._get_or_create_keyword_index()
+        if keyword_index is not None:
+            keyword_index.add(self._extract_text_keywords(texts, keywords_list))
+            return
+
+        lock_name = f"keyword_indexing_lock_{self.dataset.id}"
+        with redis_client.lock(lock_name, timeout=600):
+            keyword_table = self._get_dataset_keyword_table()
+            for node_id, keywords in self._extract_text_keywords(texts, keywords_list).items():
+                keyword_table = self._add_text_to_keyword_table(keyword_table or {}, node_id, keywords)
+
+            self._save_dataset_keyword_table(keyword_table)
+
+    def _extract_text_keywords(
+        self, texts: list[Document], keywords_list: list[list[str]] | None = None
+    ) -> dict[str, list[str]]:
+        """Extract the keywords of each text, record them on its segment and return them by chunk id."""
+        keyword_table_handler = JiebaKeywordTableHandler()
+        keyword_number = self.dataset.keyword_number or self._config.max_keywords_per_chunk
+        keywords_by_node_id: dict[str, list[str]] = {}
+        for i, text in enumerate(texts):
+            keywords = keywords_list[i] if keywords_list else None
+            if not keywords:
+                keywords = list(keyword_table_handler.extract_keywords(text.page_content, keyword_number))
+            if text.metadata is not None:
+                self._update_segment_keywords(self.dataset.id, text.metadata["doc_id"], list(keywords))
+                keywords_by_node_id[text.metadata["doc_id"]] = list(keywords)
+        return keywords_by_node_id
+
+    def _get_keyword_index(self) -> KeywordIndexStore | None:
+        """
+        Return the keyword index of the dataset for reading, or None if its keyword table is stored as a
+        single JSON document or does not exist yet. Reads never create nor migrate the keyword table.
+        """
+        dataset_keyword_table = self.dataset.dataset_keyword_table
+        if dataset_keyword_table and dataset_keyword_table.data_source_type == INDEX_DATA_SOURCE_TYPE:
+            return KeywordIndexStore(self.dataset.id)
+        return None
+
+    def _get_or_create_keyword_index(self) -> KeywordIndexStore | None:
+        """
+        Return the keyword index of the dataset for writing, or None if its keyword table is stored as a
+        single JSON document. Once KEYWORD_DATA_SOURCE_TYPE is set to "index", the keyword table is created
+        as an index, and existing JSON keyword tables are moved to the index on their first write.
+        """
+        keyword_index = self._get_keyword_index()
+        if keyword_index is not None or dify_config.KEYWORD_DATA_SOURCE_TYPE != INDEX_DATA_SOURCE_TYPE:
+            return keyword_index
+
+        return self._create_or_migrate_keyword_index()
+
+    def _create_or_migrate_keyword_index(self) -> KeywordIndexStore:
+        keyword_index = KeywordIndexStore(self.dataset.id)
+        lock_name = f"keyword_indexing_lock_{self.dataset.id}"
+        with redis_client.lock(lock_name, timeout=600):
+            # another worker may have created or migrated the table while we waited for the lock
+            dataset_keyword_table = self.dataset.dataset_keyword_table
+            if not dataset_keyword_table:
+                dataset_keyword_table = DatasetKeywordTable(
+                    dataset_id=self.dataset.id,
+                    keyword_table="",
+                    data_source_type=INDEX_DATA_SOURCE_TYPE,
+                )
+                db.session.add(dataset_keyword_table)
+                db.session.commit()
+                return keyword_index
+            if dataset_keyword_table.data_source_type == INDEX_DATA_SOURCE_TYPE:
+                return keyword_index
+
+            keywords_by_node_id: dict[str, set[str]] = defaultdict(set)
+            for keyword, node_ids in (self._get_dataset_keyword_table() or {}).items():
+                for node_id in node_ids:
+                    keywords_by_node_id[node_id].add(keyword)
+            keyword_index.add(keywords_by_node_id)
+
+            previous_data_source_type = dataset_keyword_table.data_source_type
+            dataset_keyword_table.data_source_type = INDEX_DATA_SOURCE_TYPE
+            dataset_keyword_table.keyword_table = ""
+            db.session.commit()
+            if previous_data_source_type != "database":
+                file_key = "keyword_files/" + self.dataset.tenant_id + "/" + self.dataset.id + ".txt"
+                storage.delete(file_key)
+
+        return keyword_index
+
     def _save_dataset_keyword_table(self, keyword_table):
         keyword_table_dict = {
             "__type__": "keyword_table",
@@ -223,6 +297,12 @@ class Jieba(BaseKeyword):
             db.session.commit()
 
     def create_segment_keywords(self, node_id: str, keywords: list[str]):
+        keyword_index = self._get_or_create_keyword_index()
+        if keyword_index is not None:
+            self._update_segment_keywords(self.dataset.id, node_id, keywords)
+            keyword_index.add({node_id: keywords})
+            return
+
         keyword_table = self._get_dataset_keyword_table()
         self._update_segment_keywords(self.dataset.id, node_id, keywords)
         keyword_table = self._add_text_to_keyword_table(keyword_table or {}, node_id, keywords)
@@ -230,27 +310,31 @@ class Jieba(BaseKeyword):
 
     def multi_create_segment_keywords(self, pre_segment_data_list: list):
         keyword_table_handler = JiebaKeywordTableHandler()
-        keyword_table = self._get_dataset_keyword_table()
+        keywords_by_node_id: dict[str, list[str]] = {}
         for pre_segment_data in pre_segment_data_list:
             segment = pre_segment_data["segment"]
             if pre_segment_data["keywords"]:
                 segment.keywords = pre_segment_data["keywords"]
-                keyword_table = self._add_text_to_keyword_table(
-                    keyword_table or {}, segment.index_node_id, pre_segment_data["keywords"]
-                )
             else:
                 keyword_number = self.dataset.keyword_number or self._config.max_keywords_per_chunk
 
                 keywords = keyword_table_handler.extract_keywords(segment.content, keyword_number)
                 segment.keywords = list(keywords)
-                keyword_table = self._add_text_to_keyword_table(
-                    keyword_table or {}, segment.index_node_id, list(keywords)
-                )
-        self._save_dataset_keyword_table(keyword_table)
+            keywords_by_node_id[segment.index_node_id] = segment.keywords
+        self._add_keywords_to_index(keywords_by_node_id)
 
     def update_segment_keywords_index(self, node_id: str, keywords: list[str]):
+        self._add_keywords_to_index({node_id: keywords})
+
+    def _add_keywords_to_index(self, keywords_by_node_id: dict[str, list[str]]):
+        keyword_index = self._get_or_create_keyword_index()
+        if keyword_index is not None:
+            keyword_index.add(keywords_by_node_id)
+            return
+
         keyword_table = self._get_dataset_keyword_table()
-        keyword_table = self._add_text_to_keyword_table(keyword_table or {}, node_id, keywords)
+        for node_id, keywords in keywords_by_node_id.items():
+            keyword_table = self._add_text_to_keyword_table(keyword_table or {}, node_id, keywords)
         self._save_dataset_keyword_table(keyword_table)
 
 
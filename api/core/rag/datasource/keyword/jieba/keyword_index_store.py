@@ -0,0 +1,86 @@
+from collections.abc import Iterable, Mapping
+
+from sqlalchemy import delete, exists, func, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from configs import dify_config
+from extensions.ext_database import db
+from models.dataset import DatasetKeywordIndex
+
+# Rows written per insert statement
+INSERT_BATCH_SIZE = 1000
+# Chunk ids per delete statement
+DELETE_BATCH_SIZE = 500
+# Longer keywords do not fit the keyword column, they are left out of the index
+MAX_KEYWORD_LENGTH = 255
+
+
+class KeywordIndexStore:
+    """
+    Keyword to chunk mapping of a dataset, stored as one row per keyword and chunk.
+
+    Writes only touch the rows of the chunks they change and rely on the primary key for
+    idempotency, so they need no dataset-wide lock. Reads only load the rows they need.
+    """
+
+    def __init__(self, dataset_id: str):
+        self._dataset_id = dataset_id
+
+    def add(self, keywords_by_node_id: Mapping[str, Iterable[str]]):
+        rows = [
+            {"dataset_id": self._dataset_id, "keyword": keyword, "index_node_id": node_id}
+            for node_id, keywords in keywords_by_node_id.items()
+            for keyword in set(keywords)
+            if keyword and len(keyword) <= MAX_KEYWORD_LENGTH
+        ]
+        for i in range(0, len(rows), INSERT_BATCH_SIZE):
+            batch = rows[i : i + INSERT_BATCH_SIZE]
+            if dify_config.SQLALCHEMY_DATABASE_URI_SCHEME == "postgresql":
+                stmt = pg_insert(DatasetKeywordIndex).values(batch).on_conflict_do_nothing()
+            else:
+                stmt = mysql_insert(DatasetKeywordIndex).values(batch).prefix_with("IGNORE")  # type: ignore[assignment]
+            db.session.execute(stmt)
+        db.session.commit()
+
+    def delete_by_node_ids(self, node_ids: list[str]):
+        for i in range(0, len(node_ids), DELETE_BATCH_SIZE):
+            db.session.execute(
+                delete(DatasetKeywordIndex).where(
+                    DatasetKeywordIndex.dataset_id == self._dataset_id,
+                    DatasetKeywordIndex.index_node_id.in_(node_ids[i : i + DELETE_BATCH_SIZE]),
+                )
+            )
+        db.session.commit()
+
+    def delete_all(self):
+        db.session.execute(delete(DatasetKeywordIndex).where(DatasetKeywordIndex.dataset_id == self._dataset_id))
+        db.session.commit()
+
+    def exists(self, node_id: str) -> bool:
+        return bool(
+            db.session.scalar(
+                select(
+                    exists().where(
+                        DatasetKeywordIndex.dataset_id == self._dataset_id,
+                        DatasetKeywordIndex.index_node_id == node_id,
+                    )
+                )
+            )
+        )
+
+    def search(self, keywords: Iterable[str], k: int) -> list[str]:
+        """Return the ids of the k chunks matching most of the keywords."""
+        keywords = [keyword for keyword in set(keywords) if keyword and len(keyword) <= MAX_KEYWORD_LENGTH]
+        if not keywords:
+            return []
+
+        match_count = func.count(DatasetKeywordIndex.keyword)
+        stmt = (
+            select(DatasetKeywordIndex.index_node_id)
+            .where(DatasetKeywordIndex.dataset_id == self._dataset_id, DatasetKeywordIndex.keyword.in_(keywords))
+            .group_by(DatasetKeywordIndex.index_node_id)
+            .order_by(match_count.desc(), DatasetKeywordIndex.index_node_id)
+            .limit(k)
+        )
+        return list(db.session.scalars(stmt).all())
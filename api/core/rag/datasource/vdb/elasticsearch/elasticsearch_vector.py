@@ -175,6 +175,13 @@ class ElasticSearchVector(BaseVector):
     def text_exists(self, id: str) -> bool:
         return bool(self._client.exists(index=self._collection_name, id=id))
 
+    def texts_exist(self, ids: list[str]) -> set[str]:
+        existing_ids: set[str] = set()
+        for batch in self._batch_ids(ids):
+            response = self._client.mget(index=self._collection_name, ids=batch, source=False)
+            existing_ids.update(doc["_id"] for doc in response["docs"] if doc.get("found"))
+        return existing_ids
+
     def delete_by_ids(self, ids: list[str]):
         if not ids:
             return
@@ -170,6 +170,23 @@ class OpenSearchVector(BaseVector):
         except:
             return False
 
+    def texts_exist(self, ids: list[str]) -> set[str]:
+        index_name = self._collection_name.lower()
+        if not ids or not self._client.indices.exists(index=index_name):
+            return set()
+
+        # documents are indexed under random ids, look them up by their doc_id
+        existing_ids: set[str] = set()
+        for batch in self._batch_ids(ids):
+            query = {
+                "size": 0,
+                "query": {"terms": {f"{Field.METADATA_KEY}.doc_id": batch}},
+                "aggs": {"doc_ids": {"terms": {"field": f"{Field.METADATA_KEY}.doc_id", "size": len(batch)}}},
+            }
+            response = self._client.search(index=index_name, body=query)
+            existing_ids.update(bucket["key"] for bucket in response["aggregations"]["doc_ids"]["buckets"])
+        return existing_ids
+
     def search_by_vector(self, query_vector: list[float], **kwargs: Any) -> list[Document]:
         # Make sure query_vector is a list
         if not isinstance(query_vector, list):
@@ -138,6 +138,14 @@ class PGVector(BaseVector):
             cur.execute(f"SELECT id FROM {self.table_name} WHERE id = %s", (id,))
             return cur.fetchone() is not None
 
+    def texts_exist(self, ids: list[str]) -> set[str]:
+        existing_ids: set[str] = set()
+        with self._get_cursor() as cur:
+            for batch in self._batch_ids(ids):
+                cur.execute(f"SELECT id FROM {self.table_name} WHERE id IN %s", (tuple(batch),))
+                existing_ids.update(str(record[0]) for record in cur)
+        return existing_ids
+
     def get_by_ids(self, ids: list[str]) -> list[Document]:
         with self._get_cursor() as cur:
             cur.execute(f"SELECT meta, text FROM {self.table_name} WHERE id IN %s", (tuple(ids),))
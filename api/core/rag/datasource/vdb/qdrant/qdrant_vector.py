@@ -338,6 +338,21 @@ class QdrantVector(BaseVector):
 
         return len(response) > 0
 
+    def texts_exist(self, ids: list[str]) -> set[str]:
+        if not ids:
+            return set()
+        collection_names = [collection.name for collection in self._client.get_collections().collections]
+        if self._collection_name not in collection_names:
+            return set()
+
+        existing_ids: set[str] = set()
+        for batch in self._batch_ids(ids):
+            response = self._client.retrieve(
+                collection_name=self._collection_name, ids=batch, with_payload=False, with_vectors=False
+            )
+            existing_ids.update(str(record.id) for record in response)
+        return existing_ids
+
     def search_by_vector(self, query_vector: list[float], **kwargs: Any) -> list[Document]:
         from qdrant_client.http import models
 
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 from typing import Any
 
 from core.rag.models.document import Document
 
+# ids looked up at once by `texts_exist`, bounding the size of the queries sent to the stores
+TEXTS_EXIST_BATCH_SIZE = 1000
+
 
 class BaseVector(ABC):
     def __init__(self, collection_name: str):
@@ -26,6 +30,14 @@ class BaseVector(ABC):
     def text_exists(self, id: str) -> bool:
         raise NotImplementedError
 
+    def texts_exist(self, ids: list[str]) -> set[str]:
+        """
+        Get the ids among `ids` of the texts in the collection.
+
+        Stores able to look up many ids in one request override this, by default the ids are checked one by one.
+        """
+        return {id for id in ids if self.text_exists(id)}
+
     @abstractmethod
     def delete_by_ids(self, ids: list[str]):
         raise NotImplementedError
@@ -50,18 +62,20 @@ class BaseVector(ABC):
         raise NotImplementedError
 
     def _filter_duplicate_texts(self, texts: list[Document]) -> list[Document]:
-        for text in texts.copy():
-            if text.metadata and "doc_id" in text.metadata:
-                doc_id = text.metadata["doc_id"]
-                exists_duplicate_node = self.text_exists(doc_id)
-                if exists_duplicate_node:
-                    texts.remove(text)
+        existing_ids = self.texts_exist(self._get_uuids(texts))
+        if not existing_ids:
+            return texts
 
-        return texts
+        return [text for text in texts if not (text.metadata and text.metadata.get("doc_id") in existing_ids)]
 
     def _get_uuids(self, texts: list[Document]) -> list[str]:
         return [text.metadata["doc_id"] for text in texts if text.metadata and "doc_id" in text.metadata]
 
+    @staticmethod
+    def _batch_ids(ids: list[str]) -> Iterator[list[str]]:
+        for i in range(0, len(ids), TEXTS_EXIST_BATCH_SIZE):
+            yield ids[i : i + TEXTS_EXIST_BATCH_SIZE]
+
     @property
     def collection_name(self):
         return self._collection_name
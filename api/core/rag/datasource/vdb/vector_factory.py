@@ -2,8 +2,10 @@ import base64
 import logging
 import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
+from flask import Flask, current_app
 from sqlalchemy import select
 
 from configs import dify_config
@@ -199,18 +201,38 @@ class Vector:
             start = time.time()
             logger.info("start embedding %s texts %s", len(texts), start)
             batch_size = 1000
-            total_batches = len(texts) + batch_size - 1
-            for i in range(0, len(texts), batch_size):
-                batch = texts[i : i + batch_size]
-                batch_start = time.time()
-                logger.info("Processing batch %s/%s (%s texts)", i // batch_size + 1, total_batches, len(batch))
-                batch_embeddings = self._embeddings.embed_documents([document.page_content for document in batch])
-                logger.info(
-                    "Embedding batch %s/%s took %s s", i // batch_size + 1, total_batches, time.time() - batch_start
-                )
-                self._vector_processor.create(texts=batch, embeddings=batch_embeddings, **kwargs)
+            batches = [texts[i : i + batch_size] for i in range(0, len(texts), batch_size)]
+            total_batches = len(batches)
+            if total_batches == 1:
+                batch_embeddings = self._embed_batch(batches[0], 1, total_batches)
+                self._vector_processor.create(texts=batches[0], embeddings=batch_embeddings, **kwargs)
+            else:
+                # embed the next batch while the current one is written to the vector store
+                flask_app: Flask = current_app._get_current_object()  # type: ignore
+                with ThreadPoolExecutor(max_workers=1, thread_name_prefix="vector_embedding") as executor:
+                    next_embeddings = executor.submit(self._embed_batch, batches[0], 1, total_batches, flask_app)
+                    for index, batch in enumerate(batches):
+                        batch_embeddings = next_embeddings.result()
+                        if index + 1 < total_batches:
+                            next_embeddings = executor.submit(
+                                self._embed_batch, batches[index + 1], index + 2, total_batches, flask_app
+                            )
+                        self._vector_processor.create(texts=batch, embeddings=batch_embeddings, **kwargs)
             logger.info("Embedding %s texts took %s s", len(texts), time.time() - start)
 
+    def _embed_batch(
+        self, batch: list[Document], batch_number: int, total_batches: int, flask_app: Flask | None = None
+    ) -> list[list[float]]:
+        if flask_app:
+            with flask_app.app_context():
+                return self._embed_batch(batch, batch_number, total_batches)
+
+        batch_start = time.time()
+        logger.info("Processing batch %s/%s (%s texts)", batch_number, total_batches, len(batch))
+        batch_embeddings = self._embeddings.embed_documents([document.page_content for document in batch])
+        logger.info("Embedding batch %s/%s took %s s", batch_number, total_batches, time.time() - batch_start)
+        return batch_embeddings
+
     def create_multimodal(self, file_documents: list | None = None, **kwargs):
         if file_documents:
             start = time.time()
@@ -262,6 +284,9 @@ class Vector:
     def text_exists(self, id: str) -> bool:
         return self._vector_processor.text_exists(id)
 
+    def texts_exist(self, ids: list[str]) -> set[str]:
+        return self._vector_processor.texts_exist(ids)
+
     def delete_by_ids(self, ids: list[str]):
         self._vector_processor.delete_by_ids(ids)
 
@@ -310,16 +335,12 @@ class Vector:
         return CacheEmbedding(embedding_model)
 
     def _filter_duplicate_texts(self, texts: list[Document]) -> list[Document]:
-        for text in texts.copy():
-            if text.metadata is None:
-                continue
-            doc_id = text.metadata["doc_id"]
-            if doc_id:
-                exists_duplicate_node = self.text_exists(doc_id)
-                if exists_duplicate_node:
-                    texts.remove(text)
-
-        return texts
+        doc_ids = [text.metadata["doc_id"] for text in texts if text.metadata and text.metadata.get("doc_id")]
+        if not doc_ids:
+            return texts
+
+        existing_ids = self._vector_processor.texts_exist(doc_ids)
+        return [text for text in texts if not (text.metadata and text.metadata.get("doc_id") in existing_ids)]
 
     def __getattr__(self, name):
         if self._vector_processor is not None:
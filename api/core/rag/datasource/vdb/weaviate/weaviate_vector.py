@@ -324,6 +324,29 @@ class WeaviateVector(BaseVector):
 
         return len(res.objects) > 0
 
+    def texts_exist(self, ids: list[str]) -> set[str]:
+        """Checks which of the given doc_ids exist in the collection."""
+        if not ids or not self._client.collections.exists(self._collection_name):
+            return set()
+
+        col = self._client.collections.use(self._collection_name)
+        existing_ids: set[str] = set()
+        for batch in self._batch_ids(ids):
+            remaining = batch
+            # a doc_id may be stored more than once, query the ones not found yet until a page is not full
+            while remaining:
+                res = col.query.fetch_objects(
+                    filters=Filter.by_property("doc_id").contains_any(remaining),
+                    limit=len(remaining),
+                    return_properties=["doc_id"],
+                )
+                found = {str(obj.properties["doc_id"]) for obj in res.objects}
+                existing_ids.update(found)
+                if len(res.objects) < len(remaining) or not found:
+                    break
+                remaining = [id for id in remaining if id not in found]
+        return existing_ids
+
     def delete_by_ids(self, ids: list[str]) -> None:
         """
         Deletes objects by their UUID identifiers.
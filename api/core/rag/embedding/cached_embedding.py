@@ -1,15 +1,22 @@
 import base64
 import logging
-import pickle
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, cast
+from uuid import uuid4
 
 import numpy as np
+from flask import Flask, current_app
+from sqlalchemy import select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 
 from configs import dify_config
 from core.entities.embedding_type import EmbeddingInputType
 from core.model_manager import ModelInstance
 from core.model_runtime.entities.model_entities import ModelPropertyKey
+from core.model_runtime.entities.text_embedding_entities import EmbeddingResult
 from core.model_runtime.model_providers.__base.text_embedding_model import TextEmbeddingModel
 from core.rag.embedding.embedding_base import Embeddings
 from extensions.ext_database import db
@@ -19,6 +26,11 @@ from models.dataset import Embedding
 
 logger = logging.getLogger(__name__)
 
+# Hashes looked up per query against the embedding cache
+CACHE_LOOKUP_BATCH_SIZE = 1000
+# Rows written per insert statement, each row holds a whole vector
+CACHE_WRITE_BATCH_SIZE = 200
+
 
 class CacheEmbedding(Embeddings):
     def __init__(self, model_instance: ModelInstance, user: str | None = None):
@@ -30,17 +42,11 @@ class CacheEmbedding(Embeddings):
         # use doc embedding cache or store if not exists
         text_embeddings: list[Any] = [None for _ in range(len(texts))]
         embedding_queue_indices = []
-        for i, text in enumerate(texts):
-            hash = helper.generate_text_hash(text)
-            embedding = (
-                db.session.query(Embedding)
-                .filter_by(
-                    model_name=self._model_instance.model, hash=hash, provider_name=self._model_instance.provider
-                )
-                .first()
-            )
-            if embedding:
-                text_embeddings[i] = embedding.get_embedding()
+        hashes = [helper.generate_text_hash(text) for text in texts]
+        cached_embeddings = self._get_cached_embeddings(hashes)
+        for i, hash in enumerate(hashes):
+            if hash in cached_embeddings:
+                text_embeddings[i] = cached_embeddings[hash]
             else:
                 embedding_queue_indices.append(i)
 
@@ -59,13 +65,14 @@ class CacheEmbedding(Embeddings):
                     if model_schema and ModelPropertyKey.MAX_CHUNKS in model_schema.model_properties
                     else 1
                 )
-                for i in range(0, len(embedding_queue_texts), max_chunks):
-                    batch_texts = embedding_queue_texts[i : i + max_chunks]
-
-                    embedding_result = self._model_instance.invoke_text_embedding(
+                embedding_results = self._invoke_in_batches(
+                    embedding_queue_texts,
+                    max_chunks,
+                    lambda batch_texts: self._model_instance.invoke_text_embedding(
                         texts=batch_texts, user=self._user, input_type=EmbeddingInputType.DOCUMENT
-                    )
-
+                    ),
+                )
+                for embedding_result in embedding_results:
                     for vector in embedding_result.embeddings:
                         try:
                             # FIXME: type ignore for numpy here
@@ -80,23 +87,11 @@ class CacheEmbedding(Embeddings):
                             db.session.rollback()
                         except Exception:
                             logger.exception("Failed transform embedding")
-                cache_embeddings = []
-                try:
-                    for i, n_embedding in zip(embedding_queue_indices, embedding_queue_embeddings):
-                        text_embeddings[i] = n_embedding
-                        hash = helper.generate_text_hash(texts[i])
-                        if hash not in cache_embeddings:
-                            embedding_cache = Embedding(
-                                model_name=self._model_instance.model,
-                                hash=hash,
-                                provider_name=self._model_instance.provider,
-                                embedding=pickle.dumps(n_embedding, protocol=pickle.HIGHEST_PROTOCOL),
-                            )
-                            db.session.add(embedding_cache)
-                            cache_embeddings.append(hash)
-                    db.session.commit()
-                except IntegrityError:
-                    db.session.rollback()
+                new_embeddings: dict[str, list[float]] = {}
+                for i, n_embedding in zip(embedding_queue_indices, embedding_queue_embeddings):
+                    text_embeddings[i] = n_embedding
+                    new_embeddings.setdefault(hashes[i], n_embedding)
+                self._save_embeddings_to_cache(new_embeddings)
             except Exception as ex:
                 db.session.rollback()
                 logger.exception("Failed to embed documents")
@@ -109,17 +104,11 @@ class CacheEmbedding(Embeddings):
         # use doc embedding cache or store if not exists
         multimodel_embeddings: list[Any] = [None for _ in range(len(multimodel_documents))]
         embedding_queue_indices = []
-        for i, multimodel_document in enumerate(multimodel_documents):
-            file_id = multimodel_document["file_id"]
-            embedding = (
-                db.session.query(Embedding)
-                .filter_by(
-                    model_name=self._model_instance.model, hash=file_id, provider_name=self._model_instance.provider
-                )
-                .first()
-            )
-            if embedding:
-                multimodel_embeddings[i] = embedding.get_embedding()
+        file_ids = [multimodel_document["file_id"] for multimodel_document in multimodel_documents]
+        cached_embeddings = self._get_cached_embeddings(file_ids)
+        for i, file_id in enumerate(file_ids):
+            if file_id in cached_embeddings:
+                multimodel_embeddings[i] = cached_embeddings[file_id]
             else:
                 embedding_queue_indices.append(i)
 
@@ -138,15 +127,16 @@ class CacheEmbedding(Embeddings):
                     if model_schema and ModelPropertyKey.MAX_CHUNKS in model_schema.model_properties
                     else 1
                 )
-                for i in range(0, len(embedding_queue_multimodel_documents), max_chunks):
-                    batch_multimodel_documents = embedding_queue_multimodel_documents[i : i + max_chunks]
-
-                    embedding_result = self._model_instance.invoke_multimodal_embedding(
+                embedding_results = self._invoke_in_batches(
+                    embedding_queue_multimodel_documents,
+                    max_chunks,
+                    lambda batch_multimodel_documents: self._model_instance.invoke_multimodal_embedding(
                         multimodel_documents=batch_multimodel_documents,
                         user=self._user,
                         input_type=EmbeddingInputType.DOCUMENT,
-                    )
-
+                    ),
+                )
+                for embedding_result in embedding_results:
                     for vector in embedding_result.embeddings:
                         try:
                             # FIXME: type ignore for numpy here
@@ -161,24 +151,11 @@ class CacheEmbedding(Embeddings):
                             db.session.rollback()
                         except Exception:
                             logger.exception("Failed transform embedding")
-                cache_embeddings = []
-                try:
-                    for i, n_embedding in zip(embedding_queue_indices, embedding_queue_embeddings):
-                        multimodel_embeddings[i] = n_embedding
-                        file_id = multimodel_documents[i]["file_id"]
-                        if file_id not in cache_embeddings:
-                            embedding_cache = Embedding(
-                                model_name=self._model_instance.model,
-                                hash=file_id,
-                                provider_name=self._model_instance.provider,
-                                embedding=pickle.dumps(n_embedding, protocol=pickle.HIGHEST_PROTOCOL),
-                            )
-                            embedding_cache.set_embedding(n_embedding)
-                            db.session.add(embedding_cache)
-                            cache_embeddings.append(file_id)
-                    db.session.commit()
-                except IntegrityError:
-                    db.session.rollback()
+                new_embeddings: dict[str, list[float]] = {}
+                for i, n_embedding in zip(embedding_queue_indices, embedding_queue_embeddings):
+                    multimodel_embeddings[i] = n_embedding
+                    new_embeddings.setdefault(file_ids[i], n_embedding)
+                self._save_embeddings_to_cache(new_embeddings)
             except Exception as ex:
                 db.session.rollback()
                 logger.exception("Failed to embed documents")
@@ -186,6 +163,81 @@ class CacheEmbedding(Embeddings):
 
         return multimodel_embeddings
 
+    @staticmethod
+    def _invoke_in_batches(
+        items: list[Any], batch_size: int, invoke: Callable[[list[Any]], EmbeddingResult]
+    ) -> list[EmbeddingResult]:
+        """
+        Embed items in batches of batch_size, with up to EMBEDDING_MAX_CONCURRENT_REQUESTS requests in flight.
+        Results are returned in batch order. Each request still goes through the model instance, so load
+        balancing cooldowns apply per request; the first failure cancels the batches not started yet.
+        """
+        batches = [items[i : i + batch_size] for i in range(0, len(items), batch_size)]
+        max_workers = min(dify_config.EMBEDDING_MAX_CONCURRENT_REQUESTS, len(batches))
+        if max_workers <= 1:
+            return [invoke(batch) for batch in batches]
+
+        flask_app: Flask = current_app._get_current_object()  # type: ignore
+
+        def invoke_in_app_context(batch: list[Any]) -> EmbeddingResult:
+            with flask_app.app_context():
+                return invoke(batch)
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="embedding") as executor:
+            futures = [executor.submit(invoke_in_app_context, batch) for batch in batches]
+            try:
+                return [future.result() for future in futures]
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def _get_cached_embeddings(self, hashes: list[str]) -> dict[str, list[float]]:
+        """Look hashes up in the document embedding cache in batches, returning the hits by hash."""
+        cached_embeddings: dict[str, list[float]] = {}
+        unique_hashes = list(dict.fromkeys(hashes))
+        for i in range(0, len(unique_hashes), CACHE_LOOKUP_BATCH_SIZE):
+            rows = db.session.execute(
+                select(Embedding.hash, Embedding.embedding).where(
+                    Embedding.model_name == self._model_instance.model,
+                    Embedding.provider_name == self._model_instance.provider,
+                    Embedding.hash.in_(unique_hashes[i : i + CACHE_LOOKUP_BATCH_SIZE]),
+                )
+            ).all()
+            for hash, embedding in rows:
+                cached_embeddings[hash] = Embedding.load_embedding(embedding)
+        return cached_embeddings
+
+    def _save_embeddings_to_cache(self, embeddings: dict[str, list[float]]):
+        """
+        Write embeddings to the document embedding cache with multi-row inserts.
+        Entries another worker stored in the meantime are left as they are.
+        """
+        rows = [
+            {
+                "id": str(uuid4()),
+                "model_name": self._model_instance.model,
+                "hash": hash,
+                "provider_name": self._model_instance.provider,
+                "embedding": Embedding.dump_embedding(embedding),
+            }
+            for hash, embedding in embeddings.items()
+        ]
+        if not rows:
+            return
+        try:
+            for i in range(0, len(rows), CACHE_WRITE_BATCH_SIZE):
+                batch = rows[i : i + CACHE_WRITE_BATCH_SIZE]
+                if dify_config.SQLALCHEMY_DATABASE_URI_SCHEME == "postgresql":
+                    stmt = pg_insert(Embedding).values(batch)
+                    stmt = stmt.on_conflict_do_nothing(index_elements=["model_name", "hash", "provider_name"])
+                else:
+                    stmt = mysql_insert(Embedding).values(batch).prefix_with("IGNORE")  # type: ignore[assignment]
+                db.session.execute(stmt)
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+
     def embed_query(self, text: str) -> list[float]:
         """Embed query text."""
         # use doc embedding cache or store if not exists
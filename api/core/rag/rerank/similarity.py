@@ -0,0 +1,87 @@
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+
+from core.rag.datasource.keyword.jieba.jieba_keyword_table_handler import JiebaKeywordTableHandler
+from core.rag.models.document import Document
+
+
+def calculate_keyword_scores(query: str, documents: Sequence[Document]) -> list[float]:
+    """
+    Score documents by the TF-IDF cosine similarity of their keywords to the query keywords.
+    The keywords of each document are stored in its metadata.
+    :param query: search query
+    :param documents: documents to score
+
+    :return: one score per document, in the order of the documents
+    """
+    keyword_table_handler = JiebaKeywordTableHandler()
+    query_keywords = keyword_table_handler.extract_keywords(query, None)
+    documents_keywords = []
+    for document in documents:
+        document_keywords = keyword_table_handler.extract_keywords(document.page_content, None)
+        document.metadata["keywords"] = document_keywords
+        documents_keywords.append(document_keywords)
+
+    return keyword_cosine_similarities(query_keywords, documents_keywords)
+
+
+def keyword_cosine_similarities(
+    query_keywords: Iterable[str], documents_keywords: Sequence[Iterable[str]]
+) -> list[float]:
+    """
+    TF-IDF cosine similarity between the query keywords and the keywords of each document.
+
+    The documents are encoded as a sparse term matrix (one entry per document and keyword),
+    so the work grows with the number of keywords rather than with documents x vocabulary.
+    The IDF of a keyword is computed over the given documents, keywords that appear in no
+    document do not contribute to the score.
+    """
+    total_documents = len(documents_keywords)
+    if not total_documents:
+        return []
+
+    vocabulary: dict[str, int] = {}
+    rows: list[int] = []
+    columns: list[int] = []
+    for row, document_keywords in enumerate(documents_keywords):
+        for keyword in document_keywords:
+            rows.append(row)
+            columns.append(vocabulary.setdefault(keyword, len(vocabulary)))
+    if not vocabulary:
+        return [0.0] * total_documents
+
+    # merge repeated keywords of a document into one entry holding the term frequency
+    entries, term_frequencies = np.unique(
+        np.array(rows, dtype=np.int64) * len(vocabulary) + np.array(columns, dtype=np.int64), return_counts=True
+    )
+    entry_rows, entry_columns = np.divmod(entries, len(vocabulary))
+
+    document_frequencies = np.bincount(entry_columns, minlength=len(vocabulary))
+    idf = np.log((1 + total_documents) / (1 + document_frequencies)) + 1
+    entry_weights = term_frequencies * idf[entry_columns]
+
+    query_vector = np.zeros(len(vocabulary))
+    for keyword in query_keywords:
+        column = vocabulary.get(keyword)
+        if column is not None:
+            query_vector[column] += idf[column]
+
+    # sparse matrix-vector product and row norms, accumulated per document
+    dot_products = np.bincount(
+        entry_rows, weights=entry_weights * query_vector[entry_columns], minlength=total_documents
+    )
+    document_norms = np.sqrt(np.bincount(entry_rows, weights=entry_weights**2, minlength=total_documents))
+    denominators = document_norms * np.linalg.norm(query_vector)
+
+    scores = np.divide(dot_products, denominators, out=np.zeros(total_documents), where=denominators != 0)
+    return scores.tolist()
+
+
+def vector_cosine_similarities(query_vector: Sequence[float], vectors: Sequence[Sequence[float]]) -> list[float]:
+    """Cosine similarity between the query vector and each vector, computed as one matrix-vector product."""
+    if not vectors:
+        return []
+    query = np.asarray(query_vector, dtype=np.float64)
+    matrix = np.asarray(vectors, dtype=np.float64)
+    return ((matrix @ query) / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(query))).tolist()
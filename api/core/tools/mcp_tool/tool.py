@@ -4,8 +4,10 @@ import logging
 from collections.abc import Generator
 from typing import Any
 
+from configs import dify_config
 from core.mcp.auth_client import MCPClientWithAuthRetry
 from core.mcp.error import MCPConnectionError
+from core.mcp.session_pool import mcp_session_pool
 from core.mcp.types import AudioContent, CallToolResult, ImageContent, TextContent
 from core.tools.__base.tool import Tool
 from core.tools.__base.tool_runtime import ToolRuntime
@@ -159,14 +161,25 @@ class MCPTool(Tool):
 
         # Step 2: Session is now closed, perform network operations without holding database connection
         # MCPClientWithAuthRetry will create a new session lazily only if auth retry is needed
-        try:
-            with MCPClientWithAuthRetry(
+        def create_client() -> MCPClientWithAuthRetry:
+            return MCPClientWithAuthRetry(
                 server_url=server_url,
                 headers=headers,
                 timeout=self.timeout,
                 sse_read_timeout=self.sse_read_timeout,
                 provider_entity=provider_entity,
-            ) as mcp_client:
+            )
+
+        try:
+            if not dify_config.MCP_SESSION_POOL_ENABLED:
+                with create_client() as mcp_client:
+                    return mcp_client.invoke_tool(tool_name=self.entity.identity.name, tool_args=tool_parameters)
+
+            # reuse an initialized session to the server instead of connecting and initializing one per call
+            key = mcp_session_pool.build_key(
+                self.tenant_id, self.provider_id, server_url, headers, self.timeout, self.sse_read_timeout
+            )
+            with mcp_session_pool.session(key, create_client) as mcp_client:
                 return mcp_client.invoke_tool(tool_name=self.entity.identity.name, tool_args=tool_parameters)
         except MCPConnectionError as e:
             raise ToolInvokeError(f"Failed to connect to MCP server: {e}") from e
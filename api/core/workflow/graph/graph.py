@@ -8,6 +8,7 @@ from core.workflow.nodes.base.node import Node
 from libs.typing import is_str, is_str_dict
 
 from .edge import Edge
+from .graph_template import GraphTemplate
 from .validation import get_graph_validator
 
 logger = logging.getLogger(__name__)
@@ -130,12 +131,13 @@ class Graph:
 
     @classmethod
     def _build_edges(
-        cls, edge_configs: list[dict[str, object]]
+        cls, edge_configs: list[dict[str, object]], edge_ids: Sequence[str] | None = None
     ) -> tuple[dict[str, Edge], dict[str, list[str]], dict[str, list[str]]]:
         """
         Build edge objects and mappings from edge configurations.
 
         :param edge_configs: list of edge configurations
+        :param edge_ids: id of each edge configuration, numbered in order by default
         :return: tuple of (edges dict, in_edges dict, out_edges dict)
         """
         edges: dict[str, Edge] = {}
@@ -151,7 +153,7 @@ class Graph:
                 continue
 
             # Create edge
-            edge_id = f"edge_{edge_counter}"
+            edge_id = edge_ids[edge_counter] if edge_ids is not None else f"edge_{edge_counter}"
             edge_counter += 1
 
             source_handle = edge_config.get("sourceHandle", "source")
@@ -295,6 +297,17 @@ class Graph:
         :param root_node_id: root node id
         :return: graph instance
         """
+        return cls._init(graph_config=graph_config, node_factory=node_factory, root_node_id=root_node_id)
+
+    @classmethod
+    def _init(
+        cls,
+        *,
+        graph_config: Mapping[str, object],
+        node_factory: "NodeFactory",
+        root_node_id: str | None = None,
+        edge_ids: Sequence[str] | None = None,
+    ) -> "Graph":
         # Parse configs
         edge_configs = graph_config.get("edges", [])
         node_configs = graph_config.get("nodes", [])
@@ -314,7 +327,7 @@ class Graph:
         root_node_id = cls._find_root_node_id(node_configs_map, edge_configs, root_node_id)
 
         # Build edges
-        edges, in_edges, out_edges = cls._build_edges(edge_configs)
+        edges, in_edges, out_edges = cls._build_edges(edge_configs, edge_ids)
 
         # Create node instances
         nodes = cls._create_node_instances(node_configs_map, node_factory)
@@ -342,6 +355,25 @@ class Graph:
 
         return graph
 
+    @classmethod
+    def init_from_template(cls, *, template: GraphTemplate, node_factory: "NodeFactory") -> "Graph":
+        """
+        Initialize a graph from a compiled template
+
+        :param template: compiled graph template, see `GraphTemplate.from_graph_config`
+        :param node_factory: factory for creating node instances from config data
+        :return: graph instance
+        """
+        if len(template.root_ids) != 1:
+            raise ValueError(f"Graph template must have exactly one root node, got {len(template.root_ids)}")
+
+        return cls._init(
+            graph_config=template.to_graph_config(),
+            node_factory=node_factory,
+            root_node_id=template.root_ids[0],
+            edge_ids=list(template.edges),
+        )
+
     @property
     def node_ids(self) -> list[str]:
         """
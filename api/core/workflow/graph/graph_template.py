@@ -1,6 +1,11 @@
-from typing import Any
+from collections import deque
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+if TYPE_CHECKING:
+    from core.workflow.nodes.base.entities import BaseNodeData
 
 
 class GraphTemplate(BaseModel):
@@ -12,9 +17,84 @@ class GraphTemplate(BaseModel):
     - edges: mapping of edge definitions
     - root_ids: list of root node IDs
     - output_selectors: list of output selectors for the template
+
+    Templates are immutable, so a container node can compile its subgraph once and
+    instantiate a fresh `Graph` from it for every iteration or loop round. Edges keep the
+    ids a `Graph.init` of the full graph config gives them.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     nodes: dict[str, dict[str, Any]] = Field(default_factory=dict, description="node definitions mapping")
     edges: dict[str, dict[str, Any]] = Field(default_factory=dict, description="edge definitions mapping")
     root_ids: list[str] = Field(default_factory=list, description="root node IDs")
     output_selectors: list[str] = Field(default_factory=list, description="output selectors")
+
+    _node_data_cache: dict[str, "BaseNodeData"] = PrivateAttr(default_factory=dict)
+
+    @property
+    def node_data_cache(self) -> dict[str, "BaseNodeData"]:
+        """
+        Node data parsed when the template was first instantiated, by node id. Pass it to the node factory
+        so the nodes of the next instances are not validated again.
+        """
+        return self._node_data_cache
+
+    @classmethod
+    def from_graph_config(cls, graph_config: Mapping[str, Any], *, root_node_id: str) -> "GraphTemplate":
+        """
+        Compile the subgraph reachable from `root_node_id` out of a full graph config.
+
+        Only the nodes reachable from the root via edges and the edges between them are kept,
+        so instantiating the template does not build the nodes of the rest of the workflow.
+
+        :param graph_config: graph config containing nodes and edges
+        :param root_node_id: entry node of the subgraph, e.g. the iteration-start node
+        :return: compiled graph template
+        :raises ValueError: if the root node does not exist in the graph config
+        """
+        node_configs: dict[str, dict[str, Any]] = {}
+        for node_config in graph_config.get("nodes", []):
+            node_id = node_config.get("id")
+            if not node_id or not isinstance(node_id, str) or node_config.get("type", "") == "custom-note":
+                continue
+            node_configs[node_id] = node_config
+
+        if root_node_id not in node_configs:
+            raise ValueError(f"Root node id {root_node_id} not found in the graph")
+
+        outgoing: dict[str, list[dict[str, Any]]] = {}
+        for edge_config in graph_config.get("edges", []):
+            source = edge_config.get("source")
+            if isinstance(source, str):
+                outgoing.setdefault(source, []).append(edge_config)
+
+        reachable: set[str] = {root_node_id}
+        queue: deque[str] = deque([root_node_id])
+        while queue:
+            for edge_config in outgoing.get(queue.popleft(), []):
+                target = edge_config.get("target")
+                if isinstance(target, str) and target in node_configs and target not in reachable:
+                    reachable.add(target)
+                    queue.append(target)
+
+        # Number the edges like `Graph.init` of the full graph config does, so edge ids match
+        edges: dict[str, dict[str, Any]] = {}
+        edge_index = 0
+        for edge_config in graph_config.get("edges", []):
+            source, target = edge_config.get("source"), edge_config.get("target")
+            if not isinstance(source, str) or not isinstance(target, str):
+                continue
+            if source in reachable and target in reachable:
+                edges[f"edge_{edge_index}"] = edge_config
+            edge_index += 1
+
+        return cls(
+            nodes={node_id: config for node_id, config in node_configs.items() if node_id in reachable},
+            edges=edges,
+            root_ids=[root_node_id],
+        )
+
+    def to_graph_config(self) -> dict[str, Any]:
+        """Return the template in the graph config format accepted by `Graph.init`."""
+        return {"nodes": list(self.nodes.values()), "edges": list(self.edges.values())}
@@ -4,7 +4,6 @@ Unified event manager for collecting and emitting events.
 
 import logging
 import threading
-import time
 from collections.abc import Generator
 from contextlib import contextmanager
 from typing import final
@@ -90,6 +89,8 @@ class EventManager:
         self._lock = ReadWriteLock()
         self._layers: list[GraphEngineLayer] = []
         self._execution_complete = threading.Event()
+        # Signalled whenever an event is collected or execution completes
+        self._new_event = threading.Condition()
 
     def set_layers(self, layers: list[GraphEngineLayer]) -> None:
         """
@@ -114,6 +115,9 @@ class EventManager:
         with self._lock.write_lock():
             self._events.append(event)
 
+        with self._new_event:
+            self._new_event.notify_all()
+
         # NOTE: `_notify_layers` is intentionally called outside the critical section
         # to minimize lock contention and avoid blocking other readers or writers.
         #
@@ -147,6 +151,8 @@ class EventManager:
     def mark_complete(self) -> None:
         """Mark execution as complete to stop the event emission generator."""
         self._execution_complete.set()
+        with self._new_event:
+            self._new_event.notify_all()
 
     def emit_events(self) -> Generator[GraphEngineEvent, None, None]:
         """
@@ -166,9 +172,11 @@ class EventManager:
                 yield event
                 yielded_count += 1
 
-            # Small sleep to avoid busy waiting
-            if not self._execution_complete.is_set() and not new_events:
-                time.sleep(0.001)
+            # Block until the next event is collected or execution completes
+            if not new_events:
+                with self._new_event:
+                    while not self._execution_complete.is_set() and self._event_count() <= yielded_count:
+                        self._new_event.wait()
 
     def _notify_layers(self, event: GraphEngineEvent) -> None:
         """
@@ -30,9 +30,14 @@ class Dispatcher:
     Main dispatcher that processes events from the event queue.
 
     This runs in a separate thread and coordinates event processing
-    with timeout and completion detection.
+    with timeout and completion detection. The loop blocks on the event
+    queue and wakes up as soon as a worker publishes an event; worker
+    scaling is checked when a node finishes or when the queue stays idle.
     """
 
+    # How long to block on an empty event queue before re-checking stop and scaling conditions
+    _IDLE_WAIT_TIMEOUT = 0.1
+
     _COMMAND_TRIGGER_EVENTS = (
         NodeRunSucceededEvent,
         NodeRunFailedEvent,
@@ -84,6 +89,7 @@ class Dispatcher:
         """Main dispatcher loop."""
         try:
             self._process_commands()
+            self._execution_coordinator.check_scaling()
             while not self._stop_event.is_set():
                 if (
                     self._execution_coordinator.aborted
@@ -92,14 +98,19 @@ class Dispatcher:
                 ):
                     break
 
-                self._execution_coordinator.check_scaling()
                 try:
-                    event = self._event_queue.get(timeout=0.1)
-                    self._event_handler.dispatch(event)
-                    self._event_queue.task_done()
-                    self._process_commands(event)
+                    event = self._event_queue.get(timeout=self._IDLE_WAIT_TIMEOUT)
                 except queue.Empty:
-                    time.sleep(0.1)
+                    # Nothing arrived for a while, give idle workers a chance to scale down
+                    self._execution_coordinator.check_scaling()
+                    continue
+
+                self._event_handler.dispatch(event)
+                self._event_queue.task_done()
+                self._process_commands(event)
+                if isinstance(event, self._COMMAND_TRIGGER_EVENTS):
+                    # A finished node may have enqueued its successors
+                    self._execution_coordinator.check_scaling()
 
             self._process_commands()
             while True:
@@ -1,11 +1,16 @@
 """
 In-memory implementation of the ReadyQueue protocol.
 
-This implementation wraps Python's standard queue.Queue and adds
-serialization capabilities for state storage.
+This implementation keeps node IDs in a deque guarded by a condition
+variable, so consumers are woken up as soon as work arrives or when they
+are explicitly interrupted, and adds serialization capabilities for state
+storage.
 """
 
 import queue
+import threading
+import time
+from collections import deque
 from typing import final
 
 from .protocol import ReadyQueue, ReadyQueueState
@@ -16,8 +21,9 @@ class InMemoryReadyQueue(ReadyQueue):
     """
     In-memory ready queue implementation with serialization support.
 
-    This implementation uses Python's queue.Queue internally and provides
-    methods to serialize and restore the queue state.
+    The semantics of `put`, `get` and `task_done` follow Python's queue.Queue,
+    with the addition of `wake_waiters` to release blocked consumers without
+    waiting for their timeout.
     """
 
     def __init__(self, maxsize: int = 0) -> None:
@@ -27,7 +33,14 @@ class InMemoryReadyQueue(ReadyQueue):
         Args:
             maxsize: Maximum size of the queue (0 for unlimited)
         """
-        self._queue: queue.Queue[str] = queue.Queue(maxsize=maxsize)
+        self._maxsize = maxsize
+        self._items: deque[str] = deque()
+        self._mutex = threading.Lock()
+        self._not_empty = threading.Condition(self._mutex)
+        self._not_full = threading.Condition(self._mutex)
+        self._unfinished_tasks = 0
+        # Incremented by wake_waiters so consumers blocked before the wake-up give up waiting
+        self._wake_generation = 0
 
     def put(self, item: str) -> None:
         """
@@ -36,7 +49,12 @@ class InMemoryReadyQueue(ReadyQueue):
         Args:
             item: The node ID to add to the queue
         """
-        self._queue.put(item)
+        with self._not_full:
+            while 0 < self._maxsize <= len(self._items):
+                self._not_full.wait()
+            self._items.append(item)
+            self._unfinished_tasks += 1
+            self._not_empty.notify()
 
     def get(self, timeout: float | None = None) -> str:
         """
@@ -49,11 +67,24 @@ class InMemoryReadyQueue(ReadyQueue):
             The node ID retrieved from the queue
 
         Raises:
-            queue.Empty: If timeout expires and no item is available
-        """
-        if timeout is None:
-            return self._queue.get(block=True)
-        return self._queue.get(timeout=timeout)
+            queue.Empty: If timeout expires or `wake_waiters` is called before an item is available
+        """
+        with self._not_empty:
+            generation = self._wake_generation
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not self._items:
+                if self._wake_generation != generation:
+                    raise queue.Empty
+                if deadline is None:
+                    self._not_empty.wait()
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise queue.Empty
+                self._not_empty.wait(remaining)
+            item = self._items.popleft()
+            self._not_full.notify()
+            return item
 
     def task_done(self) -> None:
         """
@@ -62,7 +93,21 @@ class InMemoryReadyQueue(ReadyQueue):
         Used by worker threads to signal task completion for
         join() synchronization.
         """
-        self._queue.task_done()
+        with self._mutex:
+            if self._unfinished_tasks <= 0:
+                raise ValueError("task_done() called too many times")
+            self._unfinished_tasks -= 1
+
+    def wake_waiters(self) -> None:
+        """
+        Wake up all consumers currently blocked in get().
+
+        Consumers that are woken while the queue is still empty raise queue.Empty,
+        which lets them re-check their stop conditions immediately.
+        """
+        with self._not_empty:
+            self._wake_generation += 1
+            self._not_empty.notify_all()
 
     def empty(self) -> bool:
         """
@@ -71,7 +116,8 @@ class InMemoryReadyQueue(ReadyQueue):
         Returns:
             True if the queue has no items, False otherwise
         """
-        return self._queue.empty()
+        with self._mutex:
+            return not self._items
 
     def qsize(self) -> int:
         """
@@ -80,7 +126,8 @@ class InMemoryReadyQueue(ReadyQueue):
         Returns:
             The approximate number of items in the queue
         """
-        return self._queue.qsize()
+        with self._mutex:
+            return len(self._items)
 
     def dumps(self) -> str:
         """
@@ -89,22 +136,9 @@ class InMemoryReadyQueue(ReadyQueue):
         Returns:
             A JSON string containing the serialized queue state
         """
-        # Extract all items from the queue without removing them
-        items: list[str] = []
-        temp_items: list[str] = []
-
-        # Drain the queue temporarily to get all items
-        while not self._queue.empty():
-            try:
-                item = self._queue.get_nowait()
-                temp_items.append(item)
-                items.append(item)
-            except queue.Empty:
-                break
-
-        # Put items back in the same order
-        for item in temp_items:
-            self._queue.put(item)
+        # Snapshot the items without removing them
+        with self._mutex:
+            items = list(self._items)
 
         state = ReadyQueueState(
             type="InMemoryReadyQueue",
@@ -128,13 +162,9 @@ class InMemoryReadyQueue(ReadyQueue):
         if state.version != "1.0":
             raise ValueError(f"Unsupported version: {state.version}")
 
-        # Clear the current queue
-        while not self._queue.empty():
-            try:
-                self._queue.get_nowait()
-            except queue.Empty:
-                break
-
-        # Restore items
-        for item in state.items:
-            self._queue.put(item)
+        # Replace the current items with the restored ones
+        with self._not_empty:
+            self._items.clear()
+            self._items.extend(state.items)
+            self._unfinished_tasks = len(self._items)
+            self._not_empty.notify_all()
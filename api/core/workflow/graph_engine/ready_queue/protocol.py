@@ -66,6 +66,15 @@ class ReadyQueue(Protocol):
         """
         ...
 
+    def wake_waiters(self) -> None:
+        """
+        Wake up all consumers currently blocked in get().
+
+        Woken consumers raise queue.Empty if no item is available, so they can
+        re-check their stop conditions without waiting for their timeout.
+        """
+        ...
+
     def empty(self) -> bool:
         """
         Check if the queue is empty.
@@ -36,6 +36,8 @@ class Worker(threading.Thread):
     for the dispatcher to process.
     """
 
+    _IDLE_WAIT_TIMEOUT = 1.0
+
     def __init__(
         self,
         ready_queue: ReadyQueue,
@@ -98,9 +100,10 @@ class Worker(threading.Thread):
         and pushes events to event_queue until stopped.
         """
         while not self._stop_event.is_set():
-            # Try to get a node ID from the ready queue (with timeout)
+            # Block until a node ID is ready. The pool wakes us up via `wake_waiters` when stopping,
+            # the timeout is only a safety net for a wake-up racing with this call.
             try:
-                node_id = self._ready_queue.get(timeout=0.1)
+                node_id = self._ready_queue.get(timeout=self._IDLE_WAIT_TIMEOUT)
             except queue.Empty:
                 continue
 
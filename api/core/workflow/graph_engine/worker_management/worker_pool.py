@@ -128,9 +128,10 @@ class WorkerPool:
             if worker_count > 0:
                 logger.debug("Stopping worker pool: %d workers", worker_count)
 
-            # Stop all workers
+            # Stop all workers and wake those blocked on the ready queue
             for worker in self._workers:
                 worker.stop()
+            self._ready_queue.wake_waiters()
 
             # Wait for workers to finish
             for worker in self._workers:
@@ -159,8 +160,9 @@ class WorkerPool:
 
     def _remove_worker(self, worker: Worker, worker_id: int) -> None:
         """Remove a specific worker from the pool."""
-        # Stop the worker
+        # Stop the worker and wake it if it is blocked on the ready queue
         worker.stop()
+        self._ready_queue.wake_waiters()
 
         # Wait for it to finish
         if worker.is_alive():
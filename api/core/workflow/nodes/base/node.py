@@ -62,6 +62,8 @@ class Node(Generic[NodeDataT]):
     node_type: ClassVar["NodeType"]
     execution_type: NodeExecutionType = NodeExecutionType.EXECUTABLE
     _node_data_type: ClassVar[type[BaseNodeData]] = BaseNodeData
+    # nodes changing their node data while running can't share the node data parsed by a graph template
+    mutates_node_data: ClassVar[bool] = False
 
     def __init_subclass__(cls, **kwargs: Any) -> None:
         """
@@ -229,11 +231,14 @@ class Node(Generic[NodeDataT]):
         self._start_at = naive_utc_now()
 
         raw_node_data = config.get("data") or {}
-        if not isinstance(raw_node_data, Mapping):
+        if isinstance(raw_node_data, self._node_data_type) and not self.mutates_node_data:
+            # already parsed for another instance of the node, see GraphTemplate.node_data_cache
+            self._node_data: NodeDataT = cast(NodeDataT, raw_node_data)
+        elif isinstance(raw_node_data, Mapping):
+            self._node_data = self._hydrate_node_data(raw_node_data)
+        else:
             raise ValueError("Node config data must be a mapping.")
 
-        self._node_data: NodeDataT = self._hydrate_node_data(raw_node_data)
-
         self.post_init()
 
     def post_init(self) -> None:
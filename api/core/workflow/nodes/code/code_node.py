@@ -24,6 +24,8 @@ from .exc import (
 class CodeNode(Node[CodeNodeData]):
     node_type = NodeType.CODE
 
+    _code_execution_result: Mapping[str, Any] | CodeExecutionError | None = None
+
     @classmethod
     def get_default_config(cls, filters: Mapping[str, object] | None = None) -> Mapping[str, object]:
         """
@@ -44,13 +46,9 @@ class CodeNode(Node[CodeNodeData]):
     def version(cls) -> str:
         return "1"
 
-    def _run(self) -> NodeRunResult:
-        # Get code language
-        code_language = self.node_data.code_language
-        code = self.node_data.code
-
-        # Get variables
-        variables = {}
+    def get_code_inputs(self) -> dict[str, Any]:
+        """Resolve the input variables of the code from the variable pool."""
+        variables: dict[str, Any] = {}
         for variable_selector in self.node_data.variables:
             variable_name = variable_selector.variable
             variable = self.graph_runtime_state.variable_pool.get(variable_selector.value_selector)
@@ -58,13 +56,34 @@ class CodeNode(Node[CodeNodeData]):
                 variables[variable_name] = [v.to_dict() for v in variable.value] if variable.value else None
             else:
                 variables[variable_name] = variable.to_object() if variable else None
+        return variables
+
+    def set_code_execution_result(self, result: Mapping[str, Any] | CodeExecutionError):
+        """
+        Use the result of an execution made ahead of the run, e.g. by an iteration executing the code
+        for all of its items in one sandbox request, instead of executing the code when the node runs.
+        """
+        self._code_execution_result = result
+
+    def _run(self) -> NodeRunResult:
+        # Get code language
+        code_language = self.node_data.code_language
+        code = self.node_data.code
+
+        # Get variables
+        variables = self.get_code_inputs()
         # Run code
         try:
-            result = CodeExecutor.execute_workflow_code_template(
-                language=code_language,
-                code=code,
-                inputs=variables,
-            )
+            if self._code_execution_result is None:
+                result = CodeExecutor.execute_workflow_code_template(
+                    language=code_language,
+                    code=code,
+                    inputs=variables,
+                )
+            elif isinstance(self._code_execution_result, CodeExecutionError):
+                raise self._code_execution_result
+            else:
+                result = self._code_execution_result
 
             # Transform result
             result = self._transform_result(result=result, output_schema=self.node_data.outputs)
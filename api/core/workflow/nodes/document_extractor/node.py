@@ -1,11 +1,15 @@
+import codecs
+import contextvars
 import csv
 import io
 import json
 import logging
 import os
 import tempfile
-from collections.abc import Mapping, Sequence
-from typing import Any
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import IO, Any
 
 import charset_normalizer
 import docx
@@ -22,7 +26,7 @@ from docx.text.paragraph import Paragraph
 
 from configs import dify_config
 from core.file import File, FileTransferMethod, file_manager
-from core.helper import ssrf_proxy
+from core.file.file_content_cache import FileContentCache
 from core.variables import ArrayFileSegment
 from core.variables.segments import ArrayStringSegment, FileSegment
 from core.workflow.enums import NodeType, WorkflowNodeExecutionStatus
@@ -34,6 +38,9 @@ from .exc import DocumentExtractorError, FileDownloadError, TextExtractionError,
 
 logger = logging.getLogger(__name__)
 
+# bytes read from the start of a streamed file to detect its encoding
+_ENCODING_DETECTION_SAMPLE_SIZE = 64 * 1024
+
 
 class DocumentExtractorNode(Node[DocumentExtractorNodeData]):
     """
@@ -64,7 +71,7 @@ class DocumentExtractorNode(Node[DocumentExtractorNodeData]):
 
         try:
             if isinstance(value, list):
-                extracted_text_list = list(map(_extract_text_from_file, value))
+                extracted_text_list = _extract_text_from_files(value)
                 return NodeRunResult(
                     status=WorkflowNodeExecutionStatus.SUCCEEDED,
                     inputs=inputs,
@@ -227,25 +234,20 @@ def _extract_text_by_file_extension(*, file_content: bytes, file_extension: str)
 
 
 def _extract_text_from_plain_text(file_content: bytes) -> str:
-    try:
-        # Detect encoding using charset_normalizer
-        result = charset_normalizer.from_bytes(file_content, cp_isolation=["utf_8", "latin_1", "cp1252"]).best()
-        if result:
-            encoding = result.encoding
-        else:
-            encoding = "utf-8"
+    return _extract_text_from_plain_text_stream((file_content,))
 
-        # Fallback to utf-8 if detection fails
-        if not encoding:
-            encoding = "utf-8"
 
-        return file_content.decode(encoding, errors="ignore")
-    except (UnicodeDecodeError, LookupError) as e:
-        # If decoding fails, try with utf-8 as last resort
-        try:
-            return file_content.decode("utf-8", errors="ignore")
-        except UnicodeDecodeError:
-            raise TextExtractionError(f"Failed to decode plain text file: {e}") from e
+def _extract_text_from_plain_text_stream(chunks: Iterable[bytes]) -> str:
+    try:
+        extracted_text = _ExtractedText()
+        for text in _decode_stream(chunks, cp_isolation=["utf_8", "latin_1", "cp1252"]):
+            if not extracted_text.write(text):
+                break
+        return extracted_text.getvalue()
+    except DocumentExtractorError:
+        raise
+    except Exception as e:
+        raise TextExtractionError(f"Failed to decode plain text file: {e}") from e
 
 
 def _extract_text_from_json(file_content: bytes) -> str:
@@ -298,16 +300,27 @@ def _extract_text_from_yaml(file_content: bytes) -> str:
 
 
 def _extract_text_from_pdf(file_content: bytes) -> str:
+    return _extract_text_from_pdf_document(io.BytesIO(file_content))
+
+
+def _extract_text_from_pdf_stream(chunks: Iterable[bytes]) -> str:
+    with _spool_to_temporary_file(chunks, suffix=".pdf") as file_path:
+        return _extract_text_from_pdf_document(file_path)
+
+
+def _extract_text_from_pdf_document(pdf_file: str | IO[bytes]) -> str:
     try:
-        pdf_file = io.BytesIO(file_content)
         pdf_document = pypdfium2.PdfDocument(pdf_file, autoclose=True)
-        text = ""
+        extracted_text = _ExtractedText()
+        # pages are loaded one at a time, so only the pages needed to fill the text are parsed
         for page in pdf_document:
             text_page = page.get_textpage()
-            text += text_page.get_text_range()
+            text = text_page.get_text_range()
             text_page.close()
             page.close()
-        return text
+            if not extracted_text.write(text):
+                break
+        return extracted_text.getvalue()
     except Exception as e:
         raise TextExtractionError(f"Failed to extract text from PDF: {str(e)}") from e
 
@@ -411,7 +424,7 @@ def _download_file_content(file: File) -> bytes:
         if file.transfer_method == FileTransferMethod.REMOTE_URL:
             if file.remote_url is None:
                 raise FileDownloadError("Missing URL for remote file")
-            response = ssrf_proxy.get(file.remote_url)
+            response = FileContentCache.get_remote_file(file.remote_url)
             response.raise_for_status()
             return response.content
         else:
@@ -420,7 +433,35 @@ def _download_file_content(file: File) -> bytes:
         raise FileDownloadError(f"Error downloading file: {str(e)}") from e
 
 
+def _download_file_stream(file: File) -> Iterator[bytes]:
+    """Stream the content of a file based on its transfer method."""
+    try:
+        if file.transfer_method == FileTransferMethod.REMOTE_URL:
+            yield _download_file_content(file)
+        else:
+            yield from file_manager.download_stream(file)
+    except FileDownloadError:
+        raise
+    except Exception as e:
+        raise FileDownloadError(f"Error downloading file: {str(e)}") from e
+
+
+def _extract_text_from_files(files: Sequence[File]) -> list[str]:
+    """Extract the text of several files concurrently, keeping their order."""
+    if len(files) <= 1:
+        return list(map(_extract_text_from_file, files))
+
+    max_workers = min(len(files), dify_config.DOCUMENT_EXTRACTOR_MAX_WORKERS)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="document_extractor") as executor:
+        futures = [executor.submit(contextvars.copy_context().run, _extract_text_from_file, file) for file in files]
+        return [future.result() for future in futures]
+
+
 def _extract_text_from_file(file: File):
+    stream_extractor = _get_stream_extractor(file)
+    if stream_extractor is not None:
+        return stream_extractor(_download_file_stream(file))
+
     file_content = _download_file_content(file)
     if file.extension:
         extracted_text = _extract_text_by_file_extension(file_content=file_content, file_extension=file.extension)
@@ -428,76 +469,171 @@ def _extract_text_from_file(file: File):
         extracted_text = _extract_text_by_mime_type(file_content=file_content, mime_type=file.mime_type)
     else:
         raise UnsupportedFileTypeError("Unable to determine file type: MIME type or file extension is missing")
-    return extracted_text
+    return extracted_text[: dify_config.DOCUMENT_EXTRACTOR_MAX_TEXT_LENGTH]
 
 
-def _extract_text_from_csv(file_content: bytes) -> str:
+def _get_stream_extractor(file: File) -> Callable[[Iterable[bytes]], str] | None:
+    """Get the extractor that reads a file as a stream of chunks, for the file types that support it."""
+    if file.extension:
+        match file.extension:
+            case ".txt":
+                return _extract_text_from_plain_text_stream
+            case ".csv":
+                return _extract_text_from_csv_stream
+            case ".pdf":
+                return _extract_text_from_pdf_stream
+            case ".xls" | ".xlsx":
+                return _extract_text_from_excel_stream
+            case _:
+                return None
+    match file.mime_type:
+        case "text/plain":
+            return _extract_text_from_plain_text_stream
+        case "text/csv":
+            return _extract_text_from_csv_stream
+        case "application/pdf":
+            return _extract_text_from_pdf_stream
+        case "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet" | "application/vnd.ms-excel":
+            return _extract_text_from_excel_stream
+        case _:
+            return None
+
+
+class _ExtractedText:
+    """Collects the text extracted from a file, up to DOCUMENT_EXTRACTOR_MAX_TEXT_LENGTH characters."""
+
+    def __init__(self):
+        self._parts: list[str] = []
+        self._remaining = dify_config.DOCUMENT_EXTRACTOR_MAX_TEXT_LENGTH
+
+    @property
+    def is_full(self) -> bool:
+        return self._remaining <= 0
+
+    def write(self, text: str) -> bool:
+        """Append text, truncated to the remaining length. Returns False once the text is full."""
+        text = text[: self._remaining]
+        self._parts.append(text)
+        self._remaining -= len(text)
+        return not self.is_full
+
+    def getvalue(self) -> str:
+        return "".join(self._parts)
+
+
+def _decode_stream(chunks: Iterable[bytes], cp_isolation: list[str] | None = None) -> Iterator[str]:
+    """Decode a stream of chunks, detecting the encoding from the start of the stream."""
+    chunk_iterator = iter(chunks)
+    sample = b""
+    for chunk in chunk_iterator:
+        sample += chunk
+        if len(sample) >= _ENCODING_DETECTION_SAMPLE_SIZE:
+            break
+
+    detection_sample = sample
+    if len(sample) >= _ENCODING_DETECTION_SAMPLE_SIZE:
+        # cut the sample after a line break so a multi-byte character split at its end does not skew detection
+        detection_sample = sample[: sample.rfind(b"\n") + 1] or sample
+    # Detect encoding using charset_normalizer
+    result = charset_normalizer.from_bytes(detection_sample, cp_isolation=cp_isolation).best()
+    # Fallback to utf-8 if detection fails
+    encoding = (result.encoding if result else None) or "utf-8"
     try:
-        # Detect encoding using charset_normalizer
-        result = charset_normalizer.from_bytes(file_content).best()
-        if result:
-            encoding = result.encoding
-        else:
-            encoding = "utf-8"
+        decoder = codecs.getincrementaldecoder(encoding)(errors="ignore")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
 
-        # Fallback to utf-8 if detection fails
-        if not encoding:
-            encoding = "utf-8"
+    yield decoder.decode(sample)
+    for chunk in chunk_iterator:
+        yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
 
-        try:
-            csv_file = io.StringIO(file_content.decode(encoding, errors="ignore"))
-        except (UnicodeDecodeError, LookupError):
-            # If decoding fails, try with utf-8 as last resort
-            csv_file = io.StringIO(file_content.decode("utf-8", errors="ignore"))
 
-        csv_reader = csv.reader(csv_file)
-        rows = list(csv_reader)
+def _iter_lines(texts: Iterable[str]) -> Iterator[str]:
+    """Split decoded text into lines the way iterating over an `io.StringIO` does."""
+    pending = ""
+    for text in texts:
+        *lines, pending = (pending + text).split("\n")
+        for line in lines:
+            yield line + "\n"
+    if pending:
+        yield pending
+
+
+@contextmanager
+def _spool_to_temporary_file(chunks: Iterable[bytes], suffix: str | None = None) -> Iterator[str]:
+    """Write a stream of chunks to a temporary file for the parsers that need random access."""
+    with tempfile.NamedTemporaryFile(suffix=suffix) as temp_file:
+        for chunk in chunks:
+            temp_file.write(chunk)
+        temp_file.flush()
+        yield temp_file.name
+
+
+def _extract_text_from_csv(file_content: bytes) -> str:
+    return _extract_text_from_csv_stream((file_content,))
+
 
-        if not rows:
+def _extract_text_from_csv_stream(chunks: Iterable[bytes]) -> str:
+    try:
+        csv_reader = csv.reader(_iter_lines(_decode_stream(chunks)))
+        header = next(csv_reader, None)
+
+        if header is None:
             return ""
 
         # Combine multi-line text in the header row
-        header_row = [cell.replace("\n", " ").replace("\r", "") for cell in rows[0]]
+        header_row = [cell.replace("\n", " ").replace("\r", "") for cell in header]
 
         # Create Markdown table
-        markdown_table = "| " + " | ".join(header_row) + " |\n"
-        markdown_table += "| " + " | ".join(["-" * len(col) for col in rows[0]]) + " |\n"
+        markdown_table = _ExtractedText()
+        markdown_table.write("| " + " | ".join(header_row) + " |\n")
+        markdown_table.write("| " + " | ".join(["-" * len(col) for col in header]) + " |\n")
 
-        # Process each data row and combine multi-line text in each cell
-        for row in rows[1:]:
+        # Process each data row and combine multi-line text in each cell, reading rows only until the text is full
+        for row in csv_reader:
             processed_row = [cell.replace("\n", " ").replace("\r", "") for cell in row]
-            markdown_table += "| " + " | ".join(processed_row) + " |\n"
+            if not markdown_table.write("| " + " | ".join(processed_row) + " |\n"):
+                break
 
-        return markdown_table
+        return markdown_table.getvalue()
+    except DocumentExtractorError:
+        raise
     except Exception as e:
         raise TextExtractionError(f"Failed to extract text from CSV: {str(e)}") from e
 
 
 def _extract_text_from_excel(file_content: bytes) -> str:
     """Extract text from an Excel file using pandas."""
+    return _extract_text_from_excel_file(io.BytesIO(file_content))
+
+
+def _extract_text_from_excel_stream(chunks: Iterable[bytes]) -> str:
+    with _spool_to_temporary_file(chunks) as file_path:
+        return _extract_text_from_excel_file(file_path)
 
-    def _construct_markdown_table(df: pd.DataFrame) -> str:
-        """Manually construct a Markdown table from a DataFrame."""
+
+def _extract_text_from_excel_file(excel_source: str | IO[bytes]) -> str:
+    """Extract text from an Excel file using pandas, one sheet at a time."""
+
+    def _iter_markdown_table_lines(df: pd.DataFrame) -> Iterator[str]:
+        """Manually construct a Markdown table from a DataFrame, one line at a time."""
         # Construct the header row
-        header_row = "| " + " | ".join(df.columns) + " |"
+        yield "| " + " | ".join(df.columns) + " |\n"
 
         # Construct the separator row
-        separator_row = "| " + " | ".join(["-" * len(col) for col in df.columns]) + " |"
+        yield "| " + " | ".join(["-" * len(col) for col in df.columns]) + " |\n"
 
         # Construct the data rows
-        data_rows = []
         for _, row in df.iterrows():
-            data_row = "| " + " | ".join(map(str, row)) + " |"
-            data_rows.append(data_row)
-
-        # Combine all rows into a single string
-        markdown_table = "\n".join([header_row, separator_row] + data_rows)
-        return markdown_table
+            yield "| " + " | ".join(map(str, row)) + " |\n"
 
     try:
-        excel_file = pd.ExcelFile(io.BytesIO(file_content))
-        markdown_table = ""
+        excel_file = pd.ExcelFile(excel_source)
+        markdown_table = _ExtractedText()
         for sheet_name in excel_file.sheet_names:
+            if markdown_table.is_full:
+                break
             try:
                 df = excel_file.parse(sheet_name=sheet_name)
                 df.dropna(how="all", inplace=True)
@@ -509,10 +645,13 @@ def _extract_text_from_excel(file_content: bytes) -> str:
                 df.columns = pd.Index([" ".join(str(col).splitlines()) for col in df.columns])
 
                 # Manually construct the Markdown table
-                markdown_table += _construct_markdown_table(df) + "\n\n"
+                for line in _iter_markdown_table_lines(df):
+                    if not markdown_table.write(line):
+                        break
+                markdown_table.write("\n")
             except Exception:
                 continue
-        return markdown_table
+        return markdown_table.getvalue()
     except Exception as e:
         raise TextExtractionError(f"Failed to extract text from Excel file: {str(e)}") from e
 
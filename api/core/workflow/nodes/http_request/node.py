@@ -33,6 +33,8 @@ logger = logging.getLogger(__name__)
 
 class HttpRequestNode(Node[HttpRequestNodeData]):
     node_type = NodeType.HTTP_REQUEST
+    # the executor renders the API key of the authorization in place
+    mutates_node_data = True
 
     @classmethod
     def get_default_config(cls, filters: Mapping[str, object] | None = None) -> Mapping[str, object]:
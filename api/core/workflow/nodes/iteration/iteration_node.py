@@ -8,6 +8,8 @@ from typing import TYPE_CHECKING, Any, NewType, cast
 from flask import Flask, current_app
 from typing_extensions import TypeIs
 
+from configs import dify_config
+from core.helper.code_executor.code_executor import CodeExecutor
 from core.model_runtime.entities.llm_entities import LLMUsage
 from core.variables import IntegerVariable, NoneSegment
 from core.variables.segments import ArrayAnySegment, ArraySegment
@@ -24,6 +26,8 @@ from core.workflow.graph_events import (
     GraphRunFailedEvent,
     GraphRunPartialSucceededEvent,
     GraphRunSucceededEvent,
+    NodeRunFailedEvent,
+    NodeRunSucceededEvent,
 )
 from core.workflow.node_events import (
     IterationFailedEvent,
@@ -36,8 +40,10 @@ from core.workflow.node_events import (
 )
 from core.workflow.nodes.base import LLMUsageTrackingMixin
 from core.workflow.nodes.base.node import Node
+from core.workflow.nodes.code.code_node import CodeNode
+from core.workflow.nodes.code.entities import CodeNodeData
 from core.workflow.nodes.iteration.entities import ErrorHandleMode, IterationNodeData
-from core.workflow.runtime import VariablePool
+from core.workflow.runtime import GraphRuntimeState, VariablePool
 from libs.datetime_utils import naive_utc_now
 from libs.flask_utils import preserve_flask_contexts
 
@@ -51,6 +57,7 @@ from .exc import (
 )
 
 if TYPE_CHECKING:
+    from core.workflow.graph import GraphTemplate
     from core.workflow.graph_engine import GraphEngine
 
 logger = logging.getLogger(__name__)
@@ -66,6 +73,8 @@ class IterationNode(LLMUsageTrackingMixin, Node[IterationNodeData]):
     node_type = NodeType.ITERATION
     execution_type = NodeExecutionType.CONTAINER
 
+    _graph_template: "GraphTemplate | None" = None
+
     @classmethod
     def get_default_config(cls, filters: Mapping[str, object] | None = None) -> Mapping[str, object]:
         return {
@@ -183,7 +192,16 @@ class IterationNode(LLMUsageTrackingMixin, Node[IterationNodeData]):
         iter_run_map: dict[str, float],
         usage_accumulator: list[LLMUsage],
     ) -> Generator[GraphNodeEventBase | NodeEventBase, None, None]:
-        if self.node_data.is_parallel:
+        code_node_config = self._get_batch_code_node_config()
+        if code_node_config is not None:
+            # Batched code execution, replaces both the sequential and the parallel mode
+            yield from self._execute_code_iterations_in_batches(
+                code_node_config=code_node_config,
+                iterator_list_value=iterator_list_value,
+                outputs=outputs,
+                iter_run_map=iter_run_map,
+            )
+        elif self.node_data.is_parallel:
             # Parallel mode execution
             yield from self._execute_parallel_iterations(
                 iterator_list_value=iterator_list_value,
@@ -219,6 +237,106 @@ class IterationNode(LLMUsageTrackingMixin, Node[IterationNodeData]):
                 )
                 iter_run_map[str(index)] = (datetime.now(UTC).replace(tzinfo=None) - iter_start_at).total_seconds()
 
+    def _get_batch_code_node_config(self) -> dict[str, Any] | None:
+        """
+        Return the config of the code node when it is the only node of the iteration and its code can run
+        for many items in one sandbox request. The node must not retry or handle its own errors, as those
+        are applied by the graph engine.
+
+        Batching is opt-in through CODE_EXECUTION_BATCH_SIZE and differs from running the items one by one:
+        the items of a batch share the globals of one interpreter and one execution timeout. It is not used
+        when the iteration terminates on error, as the items after the failing one would already be executed.
+        """
+        if dify_config.CODE_EXECUTION_BATCH_SIZE <= 1 or self.node_data.error_handle_mode == ErrorHandleMode.TERMINATED:
+            return None
+
+        node_configs = [
+            node_config
+            for node_id, node_config in self._get_graph_template().nodes.items()
+            if node_id != self.node_data.start_node_id
+        ]
+        if len(node_configs) != 1:
+            return None
+
+        node_config = node_configs[0]
+        node_data = node_config.get("data", {})
+        if node_data.get("type") != NodeType.CODE or self.node_data.output_selector[:1] != [node_config.get("id")]:
+            return None
+
+        code_node_data = CodeNodeData.model_validate(node_data)
+        if (
+            code_node_data.code_language not in CodeExecutor.supported_batch_languages
+            or code_node_data.error_strategy is not None
+            or code_node_data.retry_config.retry_enabled
+        ):
+            return None
+        return node_config
+
+    def _execute_code_iterations_in_batches(
+        self,
+        code_node_config: dict[str, Any],
+        iterator_list_value: Sequence[object],
+        outputs: list[object],
+        iter_run_map: dict[str, float],
+    ) -> Generator[GraphNodeEventBase | NodeEventBase, None, None]:
+        from core.workflow.nodes.node_factory import DifyNodeFactory
+
+        batch_size = dify_config.CODE_EXECUTION_BATCH_SIZE
+        for batch_start in range(0, len(iterator_list_value), batch_size):
+            batch_start_at = datetime.now(UTC).replace(tzinfo=None)
+            batch_items = iterator_list_value[batch_start : batch_start + batch_size]
+
+            code_nodes: list[CodeNode] = []
+            for index, item in enumerate(batch_items, start=batch_start):
+                node_factory = DifyNodeFactory(
+                    graph_init_params=self.graph_init_params,
+                    graph_runtime_state=self._create_iteration_runtime_state(index, item),
+                    node_data_cache=self._get_graph_template().node_data_cache,
+                )
+                code_nodes.append(cast(CodeNode, node_factory.create_node(code_node_config)))
+
+            code_node_data = code_nodes[0].node_data
+            results = CodeExecutor.execute_workflow_code_template_batch(
+                language=code_node_data.code_language,
+                code=code_node_data.code,
+                inputs_list=[code_node.get_code_inputs() for code_node in code_nodes],
+            )
+            batch_duration = (datetime.now(UTC).replace(tzinfo=None) - batch_start_at).total_seconds()
+
+            for index, (code_node, result) in enumerate(zip(code_nodes, results), start=batch_start):
+                iter_start_at = datetime.now(UTC).replace(tzinfo=None)
+                yield IterationNextEvent(index=index)
+
+                code_node.set_code_execution_result(result)
+                yield from self._run_code_node(code_node=code_node, index=index, outputs=outputs)
+
+                iter_run_map[str(index)] = (
+                    datetime.now(UTC).replace(tzinfo=None) - iter_start_at
+                ).total_seconds() + batch_duration / len(code_nodes)
+
+    def _run_code_node(
+        self, *, code_node: CodeNode, index: int, outputs: list[object]
+    ) -> Generator[GraphNodeEventBase, None, None]:
+        """Run the code node of an iteration item and collect its output like `_run_single_iter` does."""
+        variable_pool = code_node.graph_runtime_state.variable_pool
+        for event in code_node.run():
+            self._append_iteration_info_to_event(event=event, iter_run_index=index)
+            yield event
+
+            if isinstance(event, NodeRunSucceededEvent):
+                for variable_name, variable_value in event.node_run_result.outputs.items():
+                    variable_pool.add((event.node_id, variable_name), variable_value)
+                result = variable_pool.get(self.node_data.output_selector)
+                outputs.append(None if result is None else result.to_object())
+            elif isinstance(event, NodeRunFailedEvent):
+                match self.node_data.error_handle_mode:
+                    case ErrorHandleMode.TERMINATED:
+                        raise IterationNodeError(event.error)
+                    case ErrorHandleMode.CONTINUE_ON_ERROR:
+                        outputs.append(None)
+                    case ErrorHandleMode.REMOVE_ABNORMAL_OUTPUT:
+                        pass
+
     def _execute_parallel_iterations(
         self,
         iterator_list_value: Sequence[object],
@@ -232,6 +350,11 @@ class IterationNode(LLMUsageTrackingMixin, Node[IterationNodeData]):
         # Determine the number of parallel workers
         max_workers = min(self.node_data.parallel_nums, len(iterator_list_value))
 
+        # Every item reads from the same snapshot of the pool taken before the items start, so they neither
+        # see the conversation variables synced from the items finished before them nor the pool changing
+        # while they read it
+        parent_pool = self.graph_runtime_state.variable_pool.snapshot()
+
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             # Submit all iteration tasks
             future_to_index: dict[
@@ -252,6 +375,7 @@ class IterationNode(LLMUsageTrackingMixin, Node[IterationNodeData]):
                     self._execute_single_iteration_parallel,
                     index=index,
                     item=item,
+                    parent_pool=parent_pool,
                     flask_app=current_app._get_current_object(),  # type: ignore
                     context_vars=contextvars.copy_context(),
                 )
@@ -306,6 +430,7 @@ class IterationNode(LLMUsageTrackingMixin, Node[IterationNodeData]):
         self,
         index: int,
         item: object,
+        parent_pool: VariablePool,
         flask_app: Flask,
         context_vars: contextvars.Context,
     ) -> tuple[datetime, list[GraphNodeEventBase], object | None, dict[str, VariableUnion], LLMUsage]:
@@ -315,7 +440,7 @@ class IterationNode(LLMUsageTrackingMixin, Node[IterationNodeData]):
             events: list[GraphNodeEventBase] = []
             outputs_temp: list[object] = []
 
-            graph_engine = self._create_graph_engine(index, item)
+            graph_engine = self._create_graph_engine(index, item, parent_pool=parent_pool)
 
             # Collect events instead of yielding them directly
             for event in self._run_single_iter(
@@ -516,14 +641,13 @@ class IterationNode(LLMUsageTrackingMixin, Node[IterationNodeData]):
         return variable_mapping
 
     def _extract_conversation_variable_snapshot(self, *, variable_pool: VariablePool) -> dict[str, VariableUnion]:
-        conversation_variables = variable_pool.variable_dictionary.get(CONVERSATION_VARIABLE_NODE_ID, {})
+        conversation_variables = variable_pool.get_node_variables(CONVERSATION_VARIABLE_NODE_ID)
         return {name: variable.model_copy(deep=True) for name, variable in conversation_variables.items()}
 
     def _sync_conversation_variables_from_snapshot(self, snapshot: dict[str, VariableUnion]) -> None:
         parent_pool = self.graph_runtime_state.variable_pool
-        parent_conversations = parent_pool.variable_dictionary.get(CONVERSATION_VARIABLE_NODE_ID, {})
-
-        current_keys = set(parent_conversations.keys())
+        # the pool of a nested iteration is itself a child pool, include the variables it inherits
+        current_keys = set(parent_pool.get_node_variables(CONVERSATION_VARIABLE_NODE_ID))
         snapshot_keys = set(snapshot.keys())
 
         for removed_key in current_keys - snapshot_keys:
@@ -584,50 +708,35 @@ class IterationNode(LLMUsageTrackingMixin, Node[IterationNodeData]):
                     case ErrorHandleMode.REMOVE_ABNORMAL_OUTPUT:
                         return
 
-    def _create_graph_engine(self, index: int, item: object):
+    def _get_graph_template(self) -> "GraphTemplate":
+        # The iteration subgraph is the same for every item, compile it once per node
+        if self._graph_template is None:
+            from core.workflow.graph import GraphTemplate
+
+            self._graph_template = GraphTemplate.from_graph_config(
+                self.graph_config, root_node_id=self.node_data.start_node_id
+            )
+        return self._graph_template
+
+    def _create_graph_engine(self, index: int, item: object, *, parent_pool: VariablePool | None = None):
         # Import dependencies
-        from core.workflow.entities import GraphInitParams
         from core.workflow.graph import Graph
         from core.workflow.graph_engine import GraphEngine
         from core.workflow.graph_engine.command_channels import InMemoryChannel
         from core.workflow.nodes.node_factory import DifyNodeFactory
-        from core.workflow.runtime import GraphRuntimeState
-
-        # Create GraphInitParams from node attributes
-        graph_init_params = GraphInitParams(
-            tenant_id=self.tenant_id,
-            app_id=self.app_id,
-            workflow_id=self.workflow_id,
-            graph_config=self.graph_config,
-            user_id=self.user_id,
-            user_from=self.user_from.value,
-            invoke_from=self.invoke_from.value,
-            call_depth=self.workflow_call_depth,
-        )
-        # Create a deep copy of the variable pool for each iteration
-        variable_pool_copy = self.graph_runtime_state.variable_pool.model_copy(deep=True)
 
-        # append iteration variable (item, index) to variable pool
-        variable_pool_copy.add([self._node_id, "index"], index)
-        variable_pool_copy.add([self._node_id, "item"], item)
-
-        # Create a new GraphRuntimeState for this iteration
-        graph_runtime_state_copy = GraphRuntimeState(
-            variable_pool=variable_pool_copy,
-            start_at=self.graph_runtime_state.start_at,
-            total_tokens=0,
-            node_run_steps=0,
-        )
+        graph_runtime_state_copy = self._create_iteration_runtime_state(index, item, parent_pool=parent_pool)
 
         # Create a new node factory with the new GraphRuntimeState
+        graph_template = self._get_graph_template()
         node_factory = DifyNodeFactory(
-            graph_init_params=graph_init_params, graph_runtime_state=graph_runtime_state_copy
+            graph_init_params=self.graph_init_params,
+            graph_runtime_state=graph_runtime_state_copy,
+            node_data_cache=graph_template.node_data_cache,
         )
 
-        # Initialize the iteration graph with the new node factory
-        iteration_graph = Graph.init(
-            graph_config=self.graph_config, node_factory=node_factory, root_node_id=self.node_data.start_node_id
-        )
+        # Initialize the iteration graph from the compiled template with the new node factory
+        iteration_graph = Graph.init_from_template(template=graph_template, node_factory=node_factory)
 
         if not iteration_graph:
             raise IterationGraphNotFoundError("iteration graph not found")
@@ -641,3 +750,24 @@ class IterationNode(LLMUsageTrackingMixin, Node[IterationNodeData]):
         )
 
         return graph_engine
+
+    def _create_iteration_runtime_state(
+        self, index: int, item: object, *, parent_pool: VariablePool | None = None
+    ) -> GraphRuntimeState:
+        # Create a copy-on-write child of the variable pool, or of the given snapshot of it, for each
+        # iteration, the iteration only stores its own writes and reads everything else through the parent
+        if parent_pool is None:
+            parent_pool = self.graph_runtime_state.variable_pool
+        variable_pool_copy = parent_pool.create_child()
+
+        # append iteration variable (item, index) to variable pool
+        variable_pool_copy.add([self._node_id, "index"], index)
+        variable_pool_copy.add([self._node_id, "item"], item)
+
+        # Create a new GraphRuntimeState for this iteration
+        return GraphRuntimeState(
+            variable_pool=variable_pool_copy,
+            start_at=self.graph_runtime_state.start_at,
+            total_tokens=0,
+            node_run_steps=0,
+        )
@@ -8,6 +8,7 @@ from configs import dify_config
 from core.app.entities.app_invoke_entities import ModelConfigWithCredentialsEntity
 from core.entities.provider_entities import QuotaUnit
 from core.file.models import File
+from core.helper.provider_configurations_cache import ProviderConfigurationsCache
 from core.memory.token_buffer_memory import TokenBufferMemory
 from core.model_manager import ModelInstance, ModelManager
 from core.model_runtime.entities.llm_entities import LLMUsage
@@ -136,15 +137,18 @@ def deduct_llm_quota(tenant_id: str, model_instance: ModelInstance, usage: LLMUs
             used_quota = 1
 
     if used_quota is not None and system_configuration.current_quota_type is not None:
+        provider_conditions = [
+            # TODO: Use provider name with prefix after the data migration.
+            Provider.provider_name == ModelProviderID(model_instance.provider).provider_name,
+            Provider.provider_type == ProviderType.SYSTEM,
+            Provider.quota_type == system_configuration.current_quota_type.value,
+        ]
         with Session(db.engine) as session:
             stmt = (
                 update(Provider)
                 .where(
                     Provider.tenant_id == tenant_id,
-                    # TODO: Use provider name with prefix after the data migration.
-                    Provider.provider_name == ModelProviderID(model_instance.provider).provider_name,
-                    Provider.provider_type == ProviderType.SYSTEM,
-                    Provider.quota_type == system_configuration.current_quota_type.value,
+                    *provider_conditions,
                     Provider.quota_limit > Provider.quota_used,
                 )
                 .values(
@@ -154,3 +158,5 @@ def deduct_llm_quota(tenant_id: str, model_instance: ModelInstance, usage: LLMUs
             )
             session.execute(stmt)
             session.commit()
+
+            ProviderConfigurationsCache.invalidate_if_quota_exhausted(session, tenant_id, *provider_conditions)
@@ -107,6 +107,8 @@ logger = logging.getLogger(__name__)
 
 class LLMNode(Node[LLMNodeData]):
     node_type = NodeType.LLM
+    # the prompt template and completion params are rewritten before invoking the model
+    mutates_node_data = True
 
     # Compiled regex for extracting <think> blocks (with compatibility for attributes)
     _THINK_PATTERN = re.compile(r"<think[^>]*>(.*?)</think>", re.IGNORECASE | re.DOTALL)
@@ -35,6 +35,7 @@ from factories.variable_factory import TypeMismatchError, build_segment_with_typ
 from libs.datetime_utils import naive_utc_now
 
 if TYPE_CHECKING:
+    from core.workflow.graph import GraphTemplate
     from core.workflow.graph_engine import GraphEngine
 
 logger = logging.getLogger(__name__)
@@ -47,6 +48,10 @@ class LoopNode(LLMUsageTrackingMixin, Node[LoopNodeData]):
 
     node_type = NodeType.LOOP
     execution_type = NodeExecutionType.CONTAINER
+    # the loop variables are written to the outputs of the node data
+    mutates_node_data = True
+
+    _graph_template: "GraphTemplate | None" = None
 
     @classmethod
     def version(cls) -> str:
@@ -411,27 +416,22 @@ class LoopNode(LLMUsageTrackingMixin, Node[LoopNodeData]):
                 raise type_exc
             return build_segment_with_type(var_type, value)
 
+    def _get_graph_template(self, root_node_id: str) -> "GraphTemplate":
+        # The loop subgraph is the same for every round, compile it once per node
+        if self._graph_template is None or self._graph_template.root_ids != [root_node_id]:
+            from core.workflow.graph import GraphTemplate
+
+            self._graph_template = GraphTemplate.from_graph_config(self.graph_config, root_node_id=root_node_id)
+        return self._graph_template
+
     def _create_graph_engine(self, start_at: datetime, root_node_id: str):
         # Import dependencies
-        from core.workflow.entities import GraphInitParams
         from core.workflow.graph import Graph
         from core.workflow.graph_engine import GraphEngine
         from core.workflow.graph_engine.command_channels import InMemoryChannel
         from core.workflow.nodes.node_factory import DifyNodeFactory
         from core.workflow.runtime import GraphRuntimeState
 
-        # Create GraphInitParams from node attributes
-        graph_init_params = GraphInitParams(
-            tenant_id=self.tenant_id,
-            app_id=self.app_id,
-            workflow_id=self.workflow_id,
-            graph_config=self.graph_config,
-            user_id=self.user_id,
-            user_from=self.user_from.value,
-            invoke_from=self.invoke_from.value,
-            call_depth=self.workflow_call_depth,
-        )
-
         # Create a new GraphRuntimeState for this iteration
         graph_runtime_state_copy = GraphRuntimeState(
             variable_pool=self.graph_runtime_state.variable_pool,
@@ -439,12 +439,15 @@ class LoopNode(LLMUsageTrackingMixin, Node[LoopNodeData]):
         )
 
         # Create a new node factory with the new GraphRuntimeState
+        graph_template = self._get_graph_template(root_node_id)
         node_factory = DifyNodeFactory(
-            graph_init_params=graph_init_params, graph_runtime_state=graph_runtime_state_copy
+            graph_init_params=self.graph_init_params,
+            graph_runtime_state=graph_runtime_state_copy,
+            node_data_cache=graph_template.node_data_cache,
         )
 
-        # Initialize the loop graph with the new node factory
-        loop_graph = Graph.init(graph_config=self.graph_config, node_factory=node_factory, root_node_id=root_node_id)
+        # Initialize the loop graph from the compiled template with the new node factory
+        loop_graph = Graph.init_from_template(template=graph_template, node_factory=node_factory)
 
         # Create a new GraphEngine for this iteration
         graph_engine = GraphEngine(
@@ -1,9 +1,11 @@
+from collections.abc import MutableMapping
 from typing import TYPE_CHECKING, final
 
 from typing_extensions import override
 
 from core.workflow.enums import NodeType
 from core.workflow.graph import NodeFactory
+from core.workflow.nodes.base.entities import BaseNodeData
 from core.workflow.nodes.base.node import Node
 from libs.typing import is_str, is_str_dict
 
@@ -27,9 +29,15 @@ class DifyNodeFactory(NodeFactory):
         self,
         graph_init_params: "GraphInitParams",
         graph_runtime_state: "GraphRuntimeState",
+        node_data_cache: MutableMapping[str, BaseNodeData] | None = None,
     ) -> None:
+        """
+        :param node_data_cache: node data parsed by the nodes created before, by node id, shared with the nodes
+            created for the same configs, see GraphTemplate.node_data_cache
+        """
         self.graph_init_params = graph_init_params
         self.graph_runtime_state = graph_runtime_state
+        self._node_data_cache = node_data_cache
 
     @override
     def create_node(self, node_config: dict[str, object]) -> Node:
@@ -71,10 +79,17 @@ class DifyNodeFactory(NodeFactory):
         if not node_class:
             raise ValueError(f"No latest version class found for node type: {node_type}")
 
+        cache = None if node_class.mutates_node_data else self._node_data_cache
+        if cache is not None and node_id in cache:
+            node_config = {**node_config, "data": cache[node_id]}
+
         # Create node instance
-        return node_class(
+        node = node_class(
             id=node_id,
             config=node_config,
             graph_init_params=self.graph_init_params,
             graph_runtime_state=self.graph_runtime_state,
         )
+        if cache is not None:
+            cache.setdefault(node_id, node.node_data)
+        return node
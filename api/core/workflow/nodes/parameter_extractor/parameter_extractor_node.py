@@ -89,6 +89,8 @@ class ParameterExtractorNode(Node[ParameterExtractorNodeData]):
     """
 
     node_type = NodeType.PARAMETER_EXTRACTOR
+    # the stop words are popped from the completion params of the model
+    mutates_node_data = True
 
     _model_instance: ModelInstance | None = None
     _model_config: ModelConfigWithCredentialsEntity | None = None
@@ -46,6 +46,8 @@ if TYPE_CHECKING:
 class QuestionClassifierNode(Node[QuestionClassifierNodeData]):
     node_type = NodeType.QUESTION_CLASSIFIER
     execution_type = NodeExecutionType.BRANCH
+    # the instruction is rendered in place
+    mutates_node_data = True
 
     _file_outputs: list["File"]
     _llm_file_saver: LLMFileSaver
@@ -52,6 +52,8 @@ def _source_mapping_from_item(mapping: MutableMapping[str, Sequence[str]], node_
 
 class VariableAssignerNode(Node[VariableAssignerNodeData]):
     node_type = NodeType.VARIABLE_ASSIGNER
+    # the values of variable inputs are resolved into the operation items
+    mutates_node_data = True
 
     def blocks_variable_output(self, variable_selectors: set[tuple[str, ...]]) -> bool:
         """
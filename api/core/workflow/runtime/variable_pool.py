@@ -4,7 +4,7 @@ from collections.abc import Mapping, Sequence
 from copy import deepcopy
 from typing import Annotated, Any, Union, cast
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, SerializerFunctionWrapHandler, model_serializer
 
 from core.file import File, FileAttribute, file_manager
 from core.variables import Segment, SegmentGroup, Variable
@@ -57,6 +57,14 @@ class VariablePool(BaseModel):
         default_factory=list,
     )
 
+    # Copy-on-write layering, see `create_child`. A child pool only stores its own writes in
+    # `variable_dictionary` and reads through to `_parent` for everything else.
+    _parent: "VariablePool | None" = PrivateAttr(default=None)
+    # Selectors removed in this layer which may still exist in an ancestor layer.
+    _removed_keys: set[tuple[str, str]] = PrivateAttr(default_factory=set)
+    # Node ids cleared in this layer, ancestor layers are not consulted for them anymore.
+    _cleared_nodes: set[str] = PrivateAttr(default_factory=set)
+
     def model_post_init(self, context: Any, /):
         # Create a mapping from field names to SystemVariableKey enum values
         self._add_system_variables(self.system_variables)
@@ -112,6 +120,7 @@ class VariablePool(BaseModel):
             variable = variable_factory.segment_to_variable(segment=segment, selector=selector)
 
         node_id, name = self._selector_to_keys(selector)
+        self._removed_keys.discard((node_id, name))
         # Based on the definition of `VariableUnion`,
         # `list[Variable]` can be safely used as `list[VariableUnion]` since they are compatible.
         self.variable_dictionary[node_id][name] = cast(VariableUnion, variable)
@@ -122,11 +131,18 @@ class VariablePool(BaseModel):
 
     def _has(self, selector: Sequence[str]) -> bool:
         node_id, name = self._selector_to_keys(selector)
-        if node_id not in self.variable_dictionary:
-            return False
-        if name not in self.variable_dictionary[node_id]:
-            return False
-        return True
+        return self._lookup(node_id, name) is not None
+
+    def _lookup(self, node_id: str, name: str) -> VariableUnion | None:
+        pool: VariablePool | None = self
+        while pool is not None:
+            node_map = pool.variable_dictionary.get(node_id)
+            if node_map is not None and name in node_map:
+                return node_map[name]
+            if node_id in pool._cleared_nodes or (node_id, name) in pool._removed_keys:
+                return None
+            pool = pool._parent
+        return None
 
     def get(self, selector: Sequence[str], /) -> Segment | None:
         """
@@ -153,11 +169,7 @@ class VariablePool(BaseModel):
             return None
 
         node_id, name = self._selector_to_keys(selector)
-        node_map = self.variable_dictionary.get(node_id)
-        if node_map is None:
-            return None
-
-        segment: Segment | None = node_map.get(name)
+        segment: Segment | None = self._lookup(node_id, name)
 
         if segment is None:
             return None
@@ -220,9 +232,13 @@ class VariablePool(BaseModel):
             return
         if len(selector) == 1:
             self.variable_dictionary[selector[0]] = {}
+            if self._parent is not None:
+                self._cleared_nodes.add(selector[0])
             return
         key, hash_key = self._selector_to_keys(selector)
         self.variable_dictionary[key].pop(hash_key, None)
+        if self._parent is not None:
+            self._removed_keys.add((key, hash_key))
 
     def convert_template(self, template: str, /):
         parts = VARIABLE_PATTERN.split(template)
@@ -243,7 +259,7 @@ class VariablePool(BaseModel):
     def get_by_prefix(self, prefix: str, /) -> Mapping[str, object]:
         """Return a copy of all variables stored under the given node prefix."""
 
-        nodes = self.variable_dictionary.get(prefix)
+        nodes = self.get_node_variables(prefix)
         if not nodes:
             return {}
 
@@ -254,6 +270,76 @@ class VariablePool(BaseModel):
 
         return result
 
+    def get_node_variables(self, node_id: str, /) -> Mapping[str, VariableUnion]:
+        """
+        Return all variables visible under the given node id.
+
+        Unlike reading `variable_dictionary` directly, this also includes variables inherited
+        from parent pools. The returned mapping is a new dict, but the variables are not copied.
+        """
+        own = self.variable_dictionary.get(node_id, {})
+        if self._parent is None or node_id in self._cleared_nodes:
+            return dict(own)
+
+        variables = {
+            name: variable
+            for name, variable in self._parent.get_node_variables(node_id).items()
+            if (node_id, name) not in self._removed_keys
+        }
+        variables.update(own)
+        return variables
+
+    def create_child(self) -> "VariablePool":
+        """
+        Create a copy-on-write child of this pool.
+
+        The child reads through to this pool and keeps only its own writes and removals, so
+        creating it costs O(1) regardless of the size of this pool. Variables are shared with
+        this pool rather than copied, and later writes and removals in this pool are visible
+        from the child. Children read from other threads while this pool keeps changing must
+        be created from a `snapshot` instead. The parent must outlive the child.
+        """
+        child = self.model_copy()
+        child.variable_dictionary = defaultdict(dict)
+        child._parent = self
+        child._removed_keys = set()
+        child._cleared_nodes = set()
+        return child
+
+    def flatten(self) -> "VariablePool":
+        """Return a standalone pool holding every variable visible from this pool."""
+        if self._parent is None:
+            return self
+        return self.snapshot()
+
+    def snapshot(self) -> "VariablePool":
+        """
+        Return a new standalone pool holding every variable visible from this pool.
+
+        Only the per-node dicts are copied, the variables are shared, so later writes and removals
+        in this pool do not change the snapshot.
+        """
+        node_ids: set[str] = set()
+        pool: VariablePool | None = self
+        while pool is not None:
+            node_ids.update(pool.variable_dictionary.keys())
+            pool = pool._parent
+
+        pool_snapshot = self.model_copy()
+        pool_snapshot.variable_dictionary = defaultdict(dict)
+        for node_id in node_ids:
+            if variables := self.get_node_variables(node_id):
+                pool_snapshot.variable_dictionary[node_id] = dict(variables)
+        pool_snapshot._parent = None
+        pool_snapshot._removed_keys = set()
+        pool_snapshot._cleared_nodes = set()
+        return pool_snapshot
+
+    @model_serializer(mode="wrap")
+    def _serialize(self, handler: SerializerFunctionWrapHandler) -> Any:
+        # Child pools are serialized as the full view so snapshots can be restored standalone.
+        return handler(self.flatten())
+
     def _add_system_variables(self, system_variable: SystemVariable):
         sys_var_mapping = system_variable.to_dict()
         for key, value in sys_var_mapping.items():
@@ -11,6 +11,7 @@ from sqlalchemy.orm import Session
 from configs import dify_config
 from core.app.entities.app_invoke_entities import AgentChatAppGenerateEntity, ChatAppGenerateEntity
 from core.entities.provider_entities import QuotaUnit, SystemConfiguration
+from core.helper.provider_configurations_cache import ProviderConfigurationsCache
 from events.message_event import message_was_created
 from extensions.ext_database import db
 from extensions.ext_redis import redis_client, redis_fallback
@@ -155,6 +156,9 @@ def handle(sender: Message, **kwargs):
     start_time = time_module.perf_counter()
     try:
         _execute_provider_updates(updates_to_perform)
+        for update_operation in updates_to_perform:
+            if update_operation.description == "quota_deduction_update":
+                _invalidate_provider_configurations_if_quota_exhausted(update_operation.filters)
 
         # Log successful completion with timing
         duration = time_module.perf_counter() - start_time
@@ -181,6 +185,18 @@ def handle(sender: Message, **kwargs):
         raise
 
 
+def _invalidate_provider_configurations_if_quota_exhausted(filters: _ProviderUpdateFilters):
+    """The cached provider configurations of the tenant must not keep using an exhausted quota."""
+    conditions = [Provider.provider_name == filters.provider_name]
+    if filters.provider_type is not None:
+        conditions.append(Provider.provider_type == filters.provider_type)
+    if filters.quota_type is not None:
+        conditions.append(Provider.quota_type == filters.quota_type)
+
+    with Session(db.engine) as session:
+        ProviderConfigurationsCache.invalidate_if_quota_exhausted(session, filters.tenant_id, *conditions)
+
+
 def _calculate_quota_usage(
     *, message: Message, system_configuration: SystemConfiguration, model_name: str
 ) -> int | None:
@@ -172,6 +172,12 @@ def init_app(app: DifyApp) -> Celery:
             "task": "schedule.trigger_provider_refresh_task.trigger_provider_refresh",
             "schedule": timedelta(minutes=dify_config.TRIGGER_PROVIDER_REFRESH_INTERVAL),
         }
+    if dify_config.ENABLE_APP_DAILY_STATISTICS_TASK:
+        imports.append("schedule.app_daily_statistics_task")
+        beat_schedule["app_daily_statistics_task"] = {
+            "task": "schedule.app_daily_statistics_task.app_daily_statistics_task",
+            "schedule": timedelta(minutes=dify_config.APP_DAILY_STATISTICS_INTERVAL),
+        }
     celery_app.conf.update(beat_schedule=beat_schedule, imports=imports)
 
     return celery_app
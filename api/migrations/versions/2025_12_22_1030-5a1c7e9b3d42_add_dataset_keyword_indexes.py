@@ -0,0 +1,34 @@
+"""add dataset keyword indexes
+
+Revision ID: 5a1c7e9b3d42
+Revises: 03ea244985ce
+Create Date: 2025-12-22 10:30:00.000000
+
+"""
+
+from alembic import op
+import models as models
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "5a1c7e9b3d42"
+down_revision = "03ea244985ce"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "dataset_keyword_indexes",
+        sa.Column("dataset_id", models.types.StringUUID(), nullable=False),
+        sa.Column("keyword", sa.String(length=255), nullable=False),
+        sa.Column("index_node_id", sa.String(length=255), nullable=False),
+        sa.PrimaryKeyConstraint("dataset_id", "keyword", "index_node_id", name="dataset_keyword_index_pkey"),
+    )
+    with op.batch_alter_table("dataset_keyword_indexes", schema=None) as batch_op:
+        batch_op.create_index("dataset_keyword_index_node_idx", ["dataset_id", "index_node_id"], unique=False)
+
+
+def downgrade():
+    op.drop_table("dataset_keyword_indexes")
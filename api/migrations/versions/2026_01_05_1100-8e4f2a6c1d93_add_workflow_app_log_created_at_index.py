@@ -0,0 +1,58 @@
+"""add workflow app log created at index
+
+Revision ID: 8e4f2a6c1d93
+Revises: 5a1c7e9b3d42
+Create Date: 2026-01-05 11:00:00.000000
+
+"""
+
+from alembic import op
+import models as models
+
+
+def _is_pg(conn):
+    return conn.dialect.name == "postgresql"
+
+
+# revision identifiers, used by Alembic.
+revision = "8e4f2a6c1d93"
+down_revision = "5a1c7e9b3d42"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    if _is_pg(conn):
+        # `workflow_app_logs` is large and written continuously, build the index without locking writes.
+        # `CREATE INDEX CONCURRENTLY` cannot run within a transaction, so use the `autocommit_block`.
+        with op.get_context().autocommit_block():
+            op.create_index(
+                "workflow_app_log_app_created_at_idx",
+                "workflow_app_logs",
+                ["tenant_id", "app_id", "created_at", "id"],
+                unique=False,
+                postgresql_concurrently=True,
+            )
+    else:
+        op.create_index(
+            "workflow_app_log_app_created_at_idx",
+            "workflow_app_logs",
+            ["tenant_id", "app_id", "created_at", "id"],
+            unique=False,
+        )
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    if _is_pg(conn):
+        with op.get_context().autocommit_block():
+            op.drop_index(
+                "workflow_app_log_app_created_at_idx",
+                table_name="workflow_app_logs",
+                postgresql_concurrently=True,
+            )
+    else:
+        op.drop_index("workflow_app_log_app_created_at_idx", table_name="workflow_app_logs")
@@ -0,0 +1,46 @@
+"""add app daily statistics
+
+Revision ID: b7d3e1f5a2c8
+Revises: 8e4f2a6c1d93
+Create Date: 2026-01-12 09:30:00.000000
+
+"""
+
+from alembic import op
+import models as models
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b7d3e1f5a2c8"
+down_revision = "8e4f2a6c1d93"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "app_daily_statistics",
+        sa.Column("app_id", models.types.StringUUID(), nullable=False),
+        sa.Column("timezone", sa.String(length=255), nullable=False),
+        sa.Column("stat_date", sa.Date(), nullable=False),
+        sa.Column("tenant_id", models.types.StringUUID(), nullable=False),
+        sa.Column("message_count", sa.Integer(), nullable=False),
+        sa.Column("conversation_count", sa.Integer(), nullable=False),
+        sa.Column("end_user_count", sa.Integer(), nullable=False),
+        sa.Column("token_count", sa.BigInteger(), nullable=False),
+        sa.Column("answer_tokens", sa.BigInteger(), nullable=False),
+        sa.Column("total_price", sa.Numeric(precision=20, scale=7), nullable=True),
+        sa.Column("provider_response_latency", sa.Float(), nullable=False),
+        sa.Column("like_count", sa.Integer(), nullable=False),
+        sa.Column("interaction_conversation_count", sa.Integer(), nullable=False),
+        sa.Column("interaction_message_count", sa.Integer(), nullable=False),
+        sa.Column("workflow_run_count", sa.Integer(), nullable=False),
+        sa.Column("workflow_end_user_count", sa.Integer(), nullable=False),
+        sa.Column("workflow_token_count", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("app_id", "timezone", "stat_date", name="app_daily_statistic_pkey"),
+    )
+
+
+def downgrade():
+    op.drop_table("app_daily_statistics")
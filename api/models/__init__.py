@@ -13,6 +13,7 @@ from .dataset import (
     AppDatasetJoin,
     Dataset,
     DatasetCollectionBinding,
+    DatasetKeywordIndex,
     DatasetKeywordTable,
     DatasetPermission,
     DatasetPermissionEnum,
@@ -40,6 +41,7 @@ from .model import (
     App,
     AppAnnotationHitHistory,
     AppAnnotationSetting,
+    AppDailyStatistic,
     AppMCPServer,
     AppMode,
     AppModelConfig,
@@ -119,6 +121,7 @@ __all__ = [
     "App",
     "AppAnnotationHitHistory",
     "AppAnnotationSetting",
+    "AppDailyStatistic",
     "AppDatasetJoin",
     "AppMCPServer",
     "AppMode",
@@ -136,6 +139,7 @@ __all__ = [
     "DataSourceOauthBinding",
     "Dataset",
     "DatasetCollectionBinding",
+    "DatasetKeywordIndex",
     "DatasetKeywordTable",
     "DatasetPermission",
     "DatasetPermissionEnum",
@@ -13,6 +13,7 @@ from json import JSONDecodeError
 from typing import Any, cast
 from uuid import uuid4
 
+import numpy as np
 import sqlalchemy as sa
 from sqlalchemy import DateTime, String, func, select
 from sqlalchemy.orm import Mapped, Session, mapped_column
@@ -1094,6 +1095,23 @@ class DatasetKeywordTable(TypeBase):
                 return None
 
 
+class DatasetKeywordIndex(TypeBase):
+    """
+    Keyword index of a dataset whose keyword table uses the "index" data source,
+    stored as one row per keyword and chunk instead of a single JSON document.
+    """
+
+    __tablename__ = "dataset_keyword_indexes"
+    __table_args__ = (
+        sa.PrimaryKeyConstraint("dataset_id", "keyword", "index_node_id", name="dataset_keyword_index_pkey"),
+        sa.Index("dataset_keyword_index_node_idx", "dataset_id", "index_node_id"),
+    )
+
+    dataset_id: Mapped[str] = mapped_column(StringUUID, nullable=False)
+    keyword: Mapped[str] = mapped_column(String(255), nullable=False)
+    index_node_id: Mapped[str] = mapped_column(String(255), nullable=False)
+
+
 class Embedding(TypeBase):
     __tablename__ = "embeddings"
     __table_args__ = (
@@ -1119,11 +1137,26 @@ class Embedding(TypeBase):
     )
     provider_name: Mapped[str] = mapped_column(String(255), nullable=False, server_default=sa.text("''"))
 
+    # Marks the compact format: little-endian float32 values. Pickles never start with a NUL byte.
+    _FLOAT32_PREFIX = b"\x00f32"
+
+    @classmethod
+    def dump_embedding(cls, embedding_data: list[float]) -> bytes:
+        if dify_config.EMBEDDING_CACHE_FLOAT32_FORMAT:
+            return cls._FLOAT32_PREFIX + np.asarray(embedding_data, dtype="<f4").tobytes()
+        return pickle.dumps(embedding_data, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load_embedding(cls, data: bytes) -> list[float]:
+        if data.startswith(cls._FLOAT32_PREFIX):
+            return cast(list[float], np.frombuffer(data, dtype="<f4", offset=len(cls._FLOAT32_PREFIX)).tolist())
+        return cast(list[float], pickle.loads(data))  # noqa: S301
+
     def set_embedding(self, embedding_data: list[float]):
-        self.embedding = pickle.dumps(embedding_data, protocol=pickle.HIGHEST_PROTOCOL)
+        self.embedding = self.dump_embedding(embedding_data)
 
     def get_embedding(self) -> list[float]:
-        return cast(list[float], pickle.loads(self.embedding))  # noqa: S301
+        return self.load_embedding(self.embedding)
 
 
 class DatasetCollectionBinding(TypeBase):
@@ -2,7 +2,7 @@ import json
 import re
 import uuid
 from collections.abc import Mapping
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from enum import StrEnum, auto
 from typing import TYPE_CHECKING, Any, Literal, Optional, cast
@@ -1542,6 +1542,38 @@ class OperationLog(TypeBase):
     )
 
 
+class AppDailyStatistic(TypeBase):
+    """
+    Aggregates of the messages and workflow runs of an app over one day in a timezone, served by the
+    statistics of the app dashboards instead of scanning the raw tables.
+
+    Days are rolled up once they are over, for every day since the app was created, so the rows of an
+    app and timezone cover a contiguous range of days.
+    """
+
+    __tablename__ = "app_daily_statistics"
+    __table_args__ = (sa.PrimaryKeyConstraint("app_id", "timezone", "stat_date", name="app_daily_statistic_pkey"),)
+
+    app_id: Mapped[str] = mapped_column(StringUUID, nullable=False)
+    timezone: Mapped[str] = mapped_column(String(255), nullable=False)
+    stat_date: Mapped[date] = mapped_column(sa.Date, nullable=False)
+    tenant_id: Mapped[str] = mapped_column(StringUUID, nullable=False)
+    message_count: Mapped[int] = mapped_column(sa.Integer, nullable=False, default=0)
+    conversation_count: Mapped[int] = mapped_column(sa.Integer, nullable=False, default=0)
+    end_user_count: Mapped[int] = mapped_column(sa.Integer, nullable=False, default=0)
+    token_count: Mapped[int] = mapped_column(sa.BigInteger, nullable=False, default=0)
+    answer_tokens: Mapped[int] = mapped_column(sa.BigInteger, nullable=False, default=0)
+    total_price: Mapped[Decimal | None] = mapped_column(sa.Numeric(20, 7), nullable=True, default=None)
+    provider_response_latency: Mapped[float] = mapped_column(sa.Float, nullable=False, default=0)
+    like_count: Mapped[int] = mapped_column(sa.Integer, nullable=False, default=0)
+    # conversations created on the day and all their messages, for the average session interactions
+    interaction_conversation_count: Mapped[int] = mapped_column(sa.Integer, nullable=False, default=0)
+    interaction_message_count: Mapped[int] = mapped_column(sa.Integer, nullable=False, default=0)
+    workflow_run_count: Mapped[int] = mapped_column(sa.Integer, nullable=False, default=0)
+    workflow_end_user_count: Mapped[int] = mapped_column(sa.Integer, nullable=False, default=0)
+    workflow_token_count: Mapped[int] = mapped_column(sa.BigInteger, nullable=False, default=0)
+
+
 class DefaultEndUserSessionID(StrEnum):
     """
     End User Session ID enum.
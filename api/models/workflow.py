@@ -1111,6 +1111,7 @@ class WorkflowAppLog(TypeBase):
         sa.PrimaryKeyConstraint("id", name="workflow_app_log_pkey"),
         sa.Index("workflow_app_log_app_idx", "tenant_id", "app_id"),
         sa.Index("workflow_app_log_workflow_run_id_idx", "workflow_run_id"),
+        sa.Index("workflow_app_log_app_created_at_idx", "tenant_id", "app_id", "created_at", "id"),
     )
 
     id: Mapped[str] = mapped_column(
@@ -0,0 +1,55 @@
+import logging
+import time
+
+import click
+from redis.exceptions import LockError
+from sqlalchemy.orm import sessionmaker
+
+import app
+from configs import dify_config
+from extensions.ext_database import db
+from extensions.ext_redis import redis_client
+from models.model import App
+from services.app_daily_statistic_service import AppDailyStatisticService
+
+logger = logging.getLogger(__name__)
+
+LOCK_KEY = "app_daily_statistics_task:lock"
+
+
+@app.celery.task(queue="dataset")
+def app_daily_statistics_task():
+    """Roll up the days that are over for the apps whose dashboards were opened recently."""
+    lock = redis_client.lock(LOCK_KEY, timeout=dify_config.APP_DAILY_STATISTICS_INTERVAL * 60)
+    if not lock.acquire(blocking=False):
+        logger.info("Skip rolling up daily statistics, another roll up is running")
+        return
+
+    click.echo(click.style("Start rolling up app daily statistics.", fg="green"))
+    start_at = time.perf_counter()
+    rolled_up_days = 0
+    session_maker = sessionmaker(db.engine, expire_on_commit=False)
+    try:
+        for app_id, timezone in AppDailyStatisticService.get_tracked_apps():
+            with session_maker() as session:
+                app_model = session.get(App, app_id)
+                if app_model is None:
+                    AppDailyStatisticService.untrack_app(app_id, timezone)
+                    continue
+                try:
+                    rolled_up_days += AppDailyStatisticService.rollup_app(session, app_model, timezone)
+                except Exception:
+                    session.rollback()
+                    logger.exception("Failed to roll up daily statistics of app %s in %s", app_id, timezone)
+    finally:
+        try:
+            lock.release()
+        except LockError:
+            logger.warning("Lock of the daily statistics roll up expired before it finished")
+
+    end_at = time.perf_counter()
+    click.echo(
+        click.style(
+            f"Rolled up {rolled_up_days} days of app daily statistics, latency: {end_at - start_at}", fg="green"
+        )
+    )
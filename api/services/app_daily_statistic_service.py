@@ -0,0 +1,276 @@
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+
+import pytz
+import sqlalchemy as sa
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from configs import dify_config
+from core.app.entities.app_invoke_entities import InvokeFrom
+from extensions.ext_redis import redis_client
+from libs.helper import convert_datetime_to_date
+from models import App, AppDailyStatistic
+from models.enums import WorkflowRunTriggeredFrom
+
+# sorted set of the "{app_id}:{timezone}" whose dashboards were opened, scored by the time they were last opened
+TRACKED_APPS_KEY = "app_daily_statistics:tracked_apps"
+
+_MESSAGE_STATISTICS_SQL = """SELECT
+    {date} AS date,
+    COUNT(*) AS message_count,
+    COUNT(DISTINCT conversation_id) AS conversation_count,
+    COUNT(DISTINCT from_end_user_id) AS end_user_count,
+    SUM(message_tokens) + SUM(answer_tokens) AS token_count,
+    SUM(answer_tokens) AS answer_tokens,
+    SUM(total_price) AS total_price,
+    SUM(provider_response_latency) AS provider_response_latency
+FROM
+    messages
+WHERE
+    app_id = :app_id
+    AND invoke_from != :invoke_from
+    AND created_at >= :start
+    AND created_at < :end
+GROUP BY date"""
+
+_FEEDBACK_STATISTICS_SQL = """SELECT
+    {date} AS date,
+    COUNT(mf.id) AS like_count
+FROM
+    messages m
+JOIN
+    message_feedbacks mf
+    ON mf.message_id = m.id AND mf.rating = 'like'
+WHERE
+    m.app_id = :app_id
+    AND m.invoke_from != :invoke_from
+    AND m.created_at >= :start
+    AND m.created_at < :end
+GROUP BY date"""
+
+_INTERACTION_STATISTICS_SQL = """SELECT
+    {date} AS date,
+    COUNT(*) AS conversation_count,
+    SUM(subquery.message_count) AS message_count
+FROM
+    (
+        SELECT
+            m.conversation_id,
+            COUNT(m.id) AS message_count
+        FROM
+            conversations c
+        JOIN
+            messages m
+            ON c.id = m.conversation_id
+        WHERE
+            c.app_id = :app_id
+            AND m.invoke_from != :invoke_from
+            AND c.created_at >= :start
+            AND c.created_at < :end
+        GROUP BY m.conversation_id
+    ) subquery
+JOIN
+    conversations c
+    ON c.id = subquery.conversation_id
+GROUP BY date"""
+
+_WORKFLOW_RUN_STATISTICS_SQL = """SELECT
+    {date} AS date,
+    COUNT(id) AS run_count,
+    COUNT(DISTINCT created_by) AS end_user_count,
+    SUM(total_tokens) AS token_count
+FROM
+    workflow_runs
+WHERE
+    tenant_id = :tenant_id
+    AND app_id = :app_id
+    AND triggered_from = :triggered_from
+    AND created_at >= :start
+    AND created_at < :end
+GROUP BY date"""
+
+
+@dataclass
+class DailyStatisticsPlan:
+    """
+    How to answer the daily statistics of a time range: the rollups of the whole days they cover, and the
+    UTC ranges left over, such as the current day, that still have to be scanned in the raw tables.
+    """
+
+    rollups: list[AppDailyStatistic] = field(default_factory=list)
+    raw_ranges: list[tuple[datetime | None, datetime | None]] = field(default_factory=list)
+
+
+class AppDailyStatisticService:
+    @staticmethod
+    def track_app(app_id: str, timezone: str):
+        """Keep rolling up the statistics of an app in a timezone, as its dashboard was opened in it."""
+        if not dify_config.ENABLE_APP_DAILY_STATISTICS_TASK:
+            return
+        redis_client.zadd(TRACKED_APPS_KEY, {f"{app_id}:{timezone}": time.time()})
+
+    @staticmethod
+    def get_tracked_apps() -> list[tuple[str, str]]:
+        """Get the app ids and timezones to roll up, forgetting the dashboards not opened for a while."""
+        expired_at = time.time() - dify_config.APP_DAILY_STATISTICS_TRACKING_DAYS * 24 * 60 * 60
+        redis_client.zremrangebyscore(TRACKED_APPS_KEY, 0, expired_at)
+        tracked_apps = []
+        for member in redis_client.zrange(TRACKED_APPS_KEY, 0, -1):
+            if isinstance(member, bytes):
+                member = member.decode()
+            app_id, timezone = member.split(":", 1)
+            tracked_apps.append((app_id, timezone))
+        return tracked_apps
+
+    @staticmethod
+    def untrack_app(app_id: str, timezone: str):
+        redis_client.zrem(TRACKED_APPS_KEY, f"{app_id}:{timezone}")
+
+    @staticmethod
+    def rollup_app(session: Session, app: App, timezone: str) -> int:
+        """
+        Roll up the days of an app that are over in a timezone, returning the number of days rolled up.
+
+        The first roll up covers every day since the app was created, later ones the days since the last roll
+        up and the last APP_DAILY_STATISTICS_RECOMPUTE_DAYS days again, which may have gotten feedbacks or
+        messages in conversations since.
+        """
+        tz = pytz.timezone(timezone)
+        today = datetime.now(tz).date()
+        last_date = session.scalar(
+            select(func.max(AppDailyStatistic.stat_date)).where(
+                AppDailyStatistic.app_id == app.id, AppDailyStatistic.timezone == timezone
+            )
+        )
+        if last_date is None:
+            start_date = pytz.utc.localize(app.created_at).astimezone(tz).date()
+        else:
+            start_date = min(
+                last_date + timedelta(days=1), today - timedelta(days=dify_config.APP_DAILY_STATISTICS_RECOMPUTE_DAYS)
+            )
+        if start_date >= today:
+            return 0
+
+        statistics = {
+            start_date + timedelta(days=i): AppDailyStatistic(
+                app_id=app.id, timezone=timezone, stat_date=start_date + timedelta(days=i), tenant_id=app.tenant_id
+            )
+            for i in range((today - start_date).days)
+        }
+        params = {
+            "tz": timezone,
+            "app_id": app.id,
+            "tenant_id": app.tenant_id,
+            "invoke_from": InvokeFrom.DEBUGGER,
+            "triggered_from": WorkflowRunTriggeredFrom.APP_RUN,
+            "start": _local_midnight_utc(tz, start_date),
+            "end": _local_midnight_utc(tz, today),
+        }
+
+        rs = session.execute(
+            sa.text(_MESSAGE_STATISTICS_SQL.format(date=convert_datetime_to_date("created_at"))), params
+        )
+        for row in rs:
+            if statistic := statistics.get(row.date):
+                statistic.message_count = row.message_count
+                statistic.conversation_count = row.conversation_count
+                statistic.end_user_count = row.end_user_count
+                statistic.token_count = row.token_count or 0
+                statistic.answer_tokens = row.answer_tokens or 0
+                statistic.total_price = row.total_price
+                statistic.provider_response_latency = row.provider_response_latency or 0
+
+        rs = session.execute(
+            sa.text(_FEEDBACK_STATISTICS_SQL.format(date=convert_datetime_to_date("m.created_at"))), params
+        )
+        for row in rs:
+            if statistic := statistics.get(row.date):
+                statistic.like_count = row.like_count
+
+        rs = session.execute(
+            sa.text(_INTERACTION_STATISTICS_SQL.format(date=convert_datetime_to_date("c.created_at"))), params
+        )
+        for row in rs:
+            if statistic := statistics.get(row.date):
+                statistic.interaction_conversation_count = row.conversation_count
+                statistic.interaction_message_count = row.message_count or 0
+
+        rs = session.execute(
+            sa.text(_WORKFLOW_RUN_STATISTICS_SQL.format(date=convert_datetime_to_date("created_at"))), params
+        )
+        for row in rs:
+            if statistic := statistics.get(row.date):
+                statistic.workflow_run_count = row.run_count
+                statistic.workflow_end_user_count = row.end_user_count
+                statistic.workflow_token_count = row.token_count or 0
+
+        session.execute(
+            delete(AppDailyStatistic).where(
+                AppDailyStatistic.app_id == app.id,
+                AppDailyStatistic.timezone == timezone,
+                AppDailyStatistic.stat_date >= start_date,
+            )
+        )
+        session.add_all(statistics.values())
+        session.commit()
+        return len(statistics)
+
+    @staticmethod
+    def get_daily_statistics_plan(
+        session: Session, app_id: str, timezone: str, start: datetime | None, end: datetime | None
+    ) -> DailyStatisticsPlan:
+        """Split the UTC time range of a dashboard into the rollups of its whole days and the ranges left over."""
+        first_date, last_date = session.execute(
+            select(func.min(AppDailyStatistic.stat_date), func.max(AppDailyStatistic.stat_date)).where(
+                AppDailyStatistic.app_id == app_id, AppDailyStatistic.timezone == timezone
+            )
+        ).one()
+        if first_date is None or last_date is None:
+            return DailyStatisticsPlan(raw_ranges=[(start, end)])
+
+        tz = pytz.timezone(timezone)
+        start_date = first_date
+        if start is not None:
+            # a day started before the range is only partly in it
+            local_start = _as_utc(start).astimezone(tz)
+            first_whole_date = local_start.date()
+            if local_start.time() != datetime.min.time():
+                first_whole_date += timedelta(days=1)
+            start_date = max(start_date, first_whole_date)
+        end_date = last_date + timedelta(days=1)
+        if end is not None:
+            end_date = min(end_date, _as_utc(end).astimezone(tz).date())
+        if start_date >= end_date:
+            return DailyStatisticsPlan(raw_ranges=[(start, end)])
+
+        rollups = session.scalars(
+            select(AppDailyStatistic)
+            .where(
+                AppDailyStatistic.app_id == app_id,
+                AppDailyStatistic.timezone == timezone,
+                AppDailyStatistic.stat_date >= start_date,
+                AppDailyStatistic.stat_date < end_date,
+            )
+            .order_by(AppDailyStatistic.stat_date)
+        ).all()
+
+        plan = DailyStatisticsPlan(rollups=list(rollups))
+        rollup_start = _local_midnight_utc(tz, start_date)
+        rollup_end = _local_midnight_utc(tz, end_date)
+        if start is None or _as_utc(start).replace(tzinfo=None) < rollup_start:
+            plan.raw_ranges.append((start, rollup_start))
+        if end is None or _as_utc(end).replace(tzinfo=None) > rollup_end:
+            plan.raw_ranges.append((rollup_end, end))
+        return plan
+
+
+def _as_utc(value: datetime) -> datetime:
+    # naive datetimes are in UTC like the columns they are compared with
+    return pytz.utc.localize(value) if value.tzinfo is None else value
+
+
+def _local_midnight_utc(tz: pytz.BaseTzInfo, day: date) -> datetime:
+    """Get the naive UTC time at which a day starts in a timezone."""
+    return tz.localize(datetime.combine(day, datetime.min.time())).astimezone(pytz.utc).replace(tzinfo=None)
@@ -0,0 +1,255 @@
+"""
+Chunked deletion of the rows and files left behind by deleted datasets and documents.
+
+Rows are read in primary key order a chunk at a time and deleted with one ``DELETE ... WHERE id IN`` per chunk,
+each chunk in its own transaction, so a dataset with millions of segments is never loaded in memory nor deleted
+in a single transaction. The files of a chunk are deleted from storage in parallel before its rows.
+"""
+
+import json
+import logging
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy import ColumnElement, Row, delete, select
+from sqlalchemy.orm import InstrumentedAttribute
+
+from configs import dify_config
+from core.tools.utils.web_reader_tool import get_image_upload_file_ids
+from extensions.ext_database import db
+from extensions.ext_redis import redis_client, redis_fallback
+from extensions.ext_storage import storage
+from models.dataset import Dataset, Document, DocumentSegment, SegmentAttachmentBinding
+from models.model import UploadFile
+
+if TYPE_CHECKING:
+    from core.rag.index_processor.index_processor_base import BaseIndexProcessor
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_TTL = 24 * 60 * 60
+
+
+class _CheckpointProgress(BaseModel):
+    # last deleted id of the steps in progress
+    cursors: dict[str, str] = Field(default_factory=dict)
+    finished_steps: set[str] = Field(default_factory=set)
+
+
+class DatasetCleanupCheckpoint:
+    """
+    Progress of a cleanup saved in Redis after each chunk, so a cleanup run again after a failure skips the
+    steps it finished and goes on with the others after the last chunk they deleted.
+    """
+
+    def __init__(self, cleanup_id: str):
+        self._key = f"dataset_cleanup:checkpoint:{cleanup_id}"
+        self._progress = self._load() or _CheckpointProgress()
+
+    def is_finished(self, step: str) -> bool:
+        return step in self._progress.finished_steps
+
+    def get_cursor(self, step: str) -> str | None:
+        return self._progress.cursors.get(step)
+
+    def advance(self, step: str, cursor: str):
+        self._progress.cursors[step] = cursor
+        self._save()
+
+    def finish(self, step: str):
+        self._progress.cursors.pop(step, None)
+        self._progress.finished_steps.add(step)
+        self._save()
+
+    @redis_fallback()
+    def clear(self):
+        redis_client.delete(self._key)
+
+    @redis_fallback(default_return=None)
+    def _load(self) -> _CheckpointProgress | None:
+        saved_progress = redis_client.get(self._key)
+        if not saved_progress:
+            return None
+        try:
+            return _CheckpointProgress.model_validate_json(saved_progress)
+        except ValidationError:
+            logger.warning("Failed to decode dataset cleanup checkpoint %s", self._key)
+            return None
+
+    @redis_fallback()
+    def _save(self):
+        redis_client.setex(self._key, CHECKPOINT_TTL, self._progress.model_dump_json())
+
+
+class DatasetCleanupService:
+    """
+    Deletes the segments, attachments, documents and upload files of a dataset, or of some of its documents.
+
+    Every ``clean_*`` method is a step of the cleanup identified by ``cleanup_id``, see DatasetCleanupCheckpoint.
+    Call `finish` once the whole cleanup succeeded, and use the service as a context manager so the storage
+    workers are stopped.
+
+    Usage:
+        with DatasetCleanupService(dataset, f"document:{document_id}") as cleanup:
+            cleanup.clean_segments(DocumentSegment.document_id == document_id, index_processor=index_processor)
+            cleanup.finish()
+    """
+
+    def __init__(self, dataset: Dataset, cleanup_id: str):
+        self._dataset = dataset
+        self._checkpoint = DatasetCleanupCheckpoint(cleanup_id)
+        self._chunk_size = dify_config.DATASET_CLEANUP_CHUNK_SIZE
+        self._executor = ThreadPoolExecutor(
+            max_workers=dify_config.DATASET_CLEANUP_STORAGE_WORKERS, thread_name_prefix="dataset_cleanup"
+        )
+
+    def __enter__(self) -> "DatasetCleanupService":
+        return self
+
+    def __exit__(self, *args: Any):
+        self._executor.shutdown(wait=True)
+
+    def clean_index(self, index_processor: "BaseIndexProcessor"):
+        """Delete the whole index of the dataset, with its keywords and child chunks."""
+        if self._checkpoint.is_finished("index"):
+            return
+        index_processor.clean(self._dataset, None, with_keywords=True, delete_child_chunks=True)
+        self._checkpoint.finish("index")
+
+    def clean_segments(
+        self, *conditions: ColumnElement[bool], index_processor: "BaseIndexProcessor | None" = None
+    ) -> int:
+        """
+        Delete the segments matching ``conditions`` and the images in their content, and their index nodes when
+        ``index_processor`` is given.
+        """
+
+        def delete_chunk(rows: Sequence[Row[Any]]):
+            if index_processor is not None:
+                index_node_ids = [row.index_node_id for row in rows if row.index_node_id]
+                if index_node_ids:
+                    index_processor.clean(self._dataset, index_node_ids, with_keywords=True, delete_child_chunks=True)
+            image_file_ids = [file_id for row in rows for file_id in get_image_upload_file_ids(row.content)]
+            self._delete_upload_files(image_file_ids)
+            db.session.execute(delete(DocumentSegment).where(DocumentSegment.id.in_([row.id for row in rows])))
+
+        return self._delete_in_chunks(
+            "segments",
+            DocumentSegment.id,
+            [DocumentSegment.index_node_id, DocumentSegment.content],
+            conditions,
+            delete_chunk,
+        )
+
+    def clean_attachments(self, *conditions: ColumnElement[bool]) -> int:
+        """Delete the segment attachment bindings matching ``conditions`` and their attached files."""
+
+        def delete_chunk(rows: Sequence[Row[Any]]):
+            self._delete_upload_files([row.attachment_id for row in rows])
+            db.session.execute(
+                delete(SegmentAttachmentBinding).where(SegmentAttachmentBinding.id.in_([row.id for row in rows]))
+            )
+
+        return self._delete_in_chunks(
+            "attachments",
+            SegmentAttachmentBinding.id,
+            [SegmentAttachmentBinding.attachment_id],
+            conditions,
+            delete_chunk,
+        )
+
+    def clean_documents(self, *conditions: ColumnElement[bool]) -> int:
+        """Delete the documents matching ``conditions`` and the files they were uploaded from."""
+
+        def delete_chunk(rows: Sequence[Row[Any]]):
+            upload_file_ids = []
+            for row in rows:
+                if row.data_source_type != "upload_file" or not row.data_source_info:
+                    continue
+                try:
+                    data_source_info = json.loads(row.data_source_info)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(data_source_info, dict) and data_source_info.get("upload_file_id"):
+                    upload_file_ids.append(data_source_info["upload_file_id"])
+            self._delete_upload_files(upload_file_ids)
+            db.session.execute(delete(Document).where(Document.id.in_([row.id for row in rows])))
+
+        return self._delete_in_chunks(
+            "documents",
+            Document.id,
+            [Document.data_source_type, Document.data_source_info],
+            conditions,
+            delete_chunk,
+        )
+
+    def clean_upload_files(self, file_ids: Sequence[str]) -> int:
+        """Delete upload files by id, such as the files the deleted documents were uploaded from."""
+        deleted_count = 0
+        for start in range(0, len(file_ids), self._chunk_size):
+            deleted_count += self._delete_upload_files(file_ids[start : start + self._chunk_size])
+            db.session.commit()
+        return deleted_count
+
+    def finish(self):
+        """Forget the progress of the cleanup once all its steps succeeded."""
+        self._checkpoint.clear()
+
+    def _delete_in_chunks(
+        self,
+        step: str,
+        id_column: InstrumentedAttribute[Any],
+        columns: list[InstrumentedAttribute[Any]],
+        conditions: Sequence[ColumnElement[bool]],
+        delete_chunk: Callable[[Sequence[Row[Any]]], None],
+    ) -> int:
+        if self._checkpoint.is_finished(step):
+            return 0
+
+        cursor = self._checkpoint.get_cursor(step)
+        deleted_count = 0
+        while True:
+            stmt = select(id_column, *columns).where(*conditions).order_by(id_column).limit(self._chunk_size)
+            if cursor is not None:
+                stmt = stmt.where(id_column > cursor)
+            rows = db.session.execute(stmt).all()
+            if not rows:
+                break
+
+            delete_chunk(rows)
+            db.session.commit()
+            deleted_count += len(rows)
+            cursor = str(rows[-1].id)
+            self._checkpoint.advance(step, cursor)
+            logger.info("Deleted %s %s of dataset %s", deleted_count, step, self._dataset.id)
+
+        self._checkpoint.finish(step)
+        return deleted_count
+
+    def _delete_upload_files(self, file_ids: Sequence[str]) -> int:
+        """Delete upload files of the tenant from storage and from the database, the caller commits."""
+        if not file_ids:
+            return 0
+        files = db.session.execute(
+            select(UploadFile.id, UploadFile.key).where(
+                UploadFile.tenant_id == self._dataset.tenant_id, UploadFile.id.in_(set(file_ids))
+            )
+        ).all()
+        if not files:
+            return 0
+
+        # the files are deleted from the database even when their deletion from storage failed, as before
+        list(self._executor.map(self._delete_from_storage, files))
+        db.session.execute(delete(UploadFile).where(UploadFile.id.in_([file.id for file in files])))
+        return len(files)
+
+    @staticmethod
+    def _delete_from_storage(file: Row[Any]):
+        if not file.key:
+            return
+        try:
+            storage.delete(file.key)
+        except Exception:
+            logger.exception("Delete file failed when storage deleted, upload_file_id: %s", file.id)
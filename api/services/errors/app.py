@@ -18,6 +18,10 @@ class WorkflowIdFormatError(Exception):
     pass
 
 
+class LastWorkflowAppLogNotExistsError(Exception):
+    pass
+
+
 class InvokeRateLimitError(Exception):
     """Raised when rate limit is exceeded for workflow invocations."""
 
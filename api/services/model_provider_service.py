@@ -1,6 +1,7 @@
 import logging
 
 from core.entities.model_entities import ModelWithProviderEntity, ProviderModelWithStatusEntity
+from core.helper.provider_configurations_cache import ProviderConfigurationsCache
 from core.model_runtime.entities.model_entities import ModelType, ParameterRule
 from core.model_runtime.model_providers.model_provider_factory import ModelProviderFactory
 from core.provider_manager import ProviderManager
@@ -184,6 +185,7 @@ class ModelProviderService:
         """
         provider_configuration = self._get_provider_configuration(tenant_id, provider)
         provider_configuration.create_provider_credential(credentials, credential_name)
+        ProviderConfigurationsCache.invalidate(tenant_id)
 
     def update_provider_credential(
         self,
@@ -209,6 +211,7 @@ class ModelProviderService:
             credentials=credentials,
             credential_name=credential_name,
         )
+        ProviderConfigurationsCache.invalidate(tenant_id)
 
     def remove_provider_credential(self, tenant_id: str, provider: str, credential_id: str):
         """
@@ -220,6 +223,7 @@ class ModelProviderService:
         """
         provider_configuration = self._get_provider_configuration(tenant_id, provider)
         provider_configuration.delete_provider_credential(credential_id=credential_id)
+        ProviderConfigurationsCache.invalidate(tenant_id)
 
     def switch_active_provider_credential(self, tenant_id: str, provider: str, credential_id: str):
         """
@@ -230,6 +234,7 @@ class ModelProviderService:
         """
         provider_configuration = self._get_provider_configuration(tenant_id, provider)
         provider_configuration.switch_active_provider_credential(credential_id=credential_id)
+        ProviderConfigurationsCache.invalidate(tenant_id)
 
     def get_model_credential(
         self, tenant_id: str, provider: str, model_type: str, model: str, credential_id: str | None
@@ -286,6 +291,7 @@ class ModelProviderService:
             credentials=credentials,
             credential_name=credential_name,
         )
+        ProviderConfigurationsCache.invalidate(tenant_id)
 
     def update_model_credential(
         self,
@@ -317,6 +323,7 @@ class ModelProviderService:
             credential_id=credential_id,
             credential_name=credential_name,
         )
+        ProviderConfigurationsCache.invalidate(tenant_id)
 
     def remove_model_credential(self, tenant_id: str, provider: str, model_type: str, model: str, credential_id: str):
         """
@@ -333,6 +340,7 @@ class ModelProviderService:
         provider_configuration.delete_custom_model_credential(
             model_type=ModelType.value_of(model_type), model=model, credential_id=credential_id
         )
+        ProviderConfigurationsCache.invalidate(tenant_id)
 
     def switch_active_custom_model_credential(
         self, tenant_id: str, provider: str, model_type: str, model: str, credential_id: str
@@ -351,6 +359,7 @@ class ModelProviderService:
         provider_configuration.switch_custom_model_credential(
             model_type=ModelType.value_of(model_type), model=model, credential_id=credential_id
         )
+        ProviderConfigurationsCache.invalidate(tenant_id)
 
     def add_model_credential_to_model_list(
         self, tenant_id: str, provider: str, model_type: str, model: str, credential_id: str
@@ -369,6 +378,7 @@ class ModelProviderService:
         provider_configuration.add_model_credential_to_model(
             model_type=ModelType.value_of(model_type), model=model, credential_id=credential_id
         )
+        ProviderConfigurationsCache.invalidate(tenant_id)
 
     def remove_model(self, tenant_id: str, provider: str, model_type: str, model: str):
         """
@@ -382,6 +392,7 @@ class ModelProviderService:
         """
         provider_configuration = self._get_provider_configuration(tenant_id, provider)
         provider_configuration.delete_custom_model(model_type=ModelType.value_of(model_type), model=model)
+        ProviderConfigurationsCache.invalidate(tenant_id)
 
     def get_models_by_model_type(self, tenant_id: str, model_type: str) -> list[ProviderWithModelsResponse]:
         """
@@ -547,6 +558,7 @@ class ModelProviderService:
 
         # Switch preferred provider type
         provider_configuration.switch_preferred_provider_type(preferred_provider_type_enum)
+        ProviderConfigurationsCache.invalidate(tenant_id)
 
     def enable_model(self, tenant_id: str, provider: str, model: str, model_type: str):
         """
@@ -560,6 +572,7 @@ class ModelProviderService:
         """
         provider_configuration = self._get_provider_configuration(tenant_id, provider)
         provider_configuration.enable_model(model=model, model_type=ModelType.value_of(model_type))
+        ProviderConfigurationsCache.invalidate(tenant_id)
 
     def disable_model(self, tenant_id: str, provider: str, model: str, model_type: str):
         """
@@ -573,3 +586,4 @@ class ModelProviderService:
         """
         provider_configuration = self._get_provider_configuration(tenant_id, provider)
         provider_configuration.disable_model(model=model, model_type=ModelType.value_of(model_type))
+        ProviderConfigurationsCache.invalidate(tenant_id)
@@ -356,6 +356,7 @@ class PluginMigration:
             # fetch plugin already installed
             installed_plugins = manager.list_plugins(tenant_id)
             installed_plugins_ids = [plugin.plugin_id for plugin in installed_plugins]
+            task_ids = []
             # at most 64 plugins one batch
             for i in range(0, len(plugin_ids), 64):
                 batch_plugin_ids = plugin_ids[i : i + 64]
@@ -364,7 +365,7 @@ class PluginMigration:
                     for plugin_id in batch_plugin_ids
                     if plugin_id not in installed_plugins_ids and plugin_id in plugins["plugins"]
                 ]
-                manager.install_from_identifiers(
+                response = manager.install_from_identifiers(
                     tenant_id,
                     batch_plugin_identifiers,
                     PluginInstallationSource.Marketplace,
@@ -375,6 +376,13 @@ class PluginMigration:
                         for identifier in batch_plugin_identifiers
                     ],
                 )
+                if not response.all_installed:
+                    task_ids.append(response.task_id)
+
+            # wait for the installations so the cached model providers of the tenant are invalidated
+            for task_id in task_ids:
+                if manager.wait_plugin_installation_task(tenant_id, task_id) is None:
+                    logger.warning("Plugin installation task %s of tenant %s is still running", task_id, tenant_id)
 
         with open(extracted_plugins) as f:
             """
@@ -13,6 +13,7 @@ from sqlalchemy.orm import Session
 from extensions.ext_database import db
 from models.enums import AppTriggerStatus
 from models.trigger import AppTrigger
+from services.trigger.webhook_route_cache import WebhookRouteCache
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +42,7 @@ class AppTriggerService:
                     .values(status=AppTriggerStatus.RATE_LIMITED)
                 )
                 session.commit()
+                WebhookRouteCache.invalidate_tenant(tenant_id)
                 logger.info("Marked all enabled triggers as rate limited for tenant %s", tenant_id)
         except Exception:
             logger.exception("Failed to mark all enabled triggers as rate limited for tenant %s", tenant_id)
@@ -0,0 +1,125 @@
+import logging
+from threading import Lock
+from typing import Any
+
+from cachetools import TTLCache
+from pydantic import BaseModel, ValidationError
+
+from configs import dify_config
+from extensions.ext_redis import redis_client, redis_fallback
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookRoute(BaseModel):
+    """
+    What the webhook ingress needs to run the published workflow of a webhook trigger, without loading the
+    trigger, its app trigger and the workflow graph again.
+    """
+
+    webhook_id: str
+    app_id: str
+    tenant_id: str
+    node_id: str
+    created_by: str
+    workflow_id: str
+    node_config: dict[str, Any]
+    # status of the app trigger, see AppTriggerStatus
+    status: str
+    # versions of the app and tenant trigger configs the route was loaded at, see WebhookRouteCache
+    config_version: str = ""
+
+
+class WebhookRouteCache:
+    """
+    Process-local and Redis cache of the routes of the webhooks, by webhook id.
+
+    A route is only used while the trigger config versions of its app and tenant in Redis are the ones it was
+    loaded at: `invalidate_app` is called when the webhook triggers, app triggers or published workflow of an
+    app change, `invalidate_tenant` when the triggers of a whole tenant are rate limited.
+    """
+
+    _entries: TTLCache[str, WebhookRoute] = TTLCache(
+        maxsize=dify_config.WEBHOOK_ROUTE_CACHE_MAX_ENTRIES,
+        ttl=max(dify_config.WEBHOOK_ROUTE_CACHE_TTL, 1),
+    )
+    _lock = Lock()
+
+    @classmethod
+    def enabled(cls) -> bool:
+        return dify_config.WEBHOOK_ROUTE_CACHE_TTL > 0
+
+    @classmethod
+    def get(cls, webhook_id: str) -> WebhookRoute | None:
+        """Get the route of a webhook if it is cached and still up to date."""
+        with cls._lock:
+            route = cls._entries.get(webhook_id)
+        if route is None:
+            route = cls._get_shared_route(webhook_id)
+            if route is None:
+                return None
+
+        if route.config_version != cls.get_config_version(route.app_id, route.tenant_id):
+            return None
+        with cls._lock:
+            cls._entries[webhook_id] = route
+        return route
+
+    @classmethod
+    def set(cls, route: WebhookRoute):
+        """Cache a route loaded at the config version it carries."""
+        with cls._lock:
+            cls._entries[route.webhook_id] = route
+        cls._set_shared_route(route)
+
+    @classmethod
+    @redis_fallback(default_return=None)
+    def get_config_version(cls, app_id: str, tenant_id: str) -> str | None:
+        """Get the trigger config version of an app, None when it can't be read and routes must not be cached."""
+        app_version, tenant_version = redis_client.mget(
+            [cls._app_version_key(app_id), cls._tenant_version_key(tenant_id)]
+        )
+        return f"{int(app_version or 0)}:{int(tenant_version or 0)}"
+
+    @classmethod
+    @redis_fallback()
+    def invalidate_app(cls, app_id: str):
+        """Drop the cached routes of the webhooks of an app in every process."""
+        redis_client.incr(cls._app_version_key(app_id))
+
+    @classmethod
+    @redis_fallback()
+    def invalidate_tenant(cls, tenant_id: str):
+        """Drop the cached routes of the webhooks of a tenant in every process."""
+        redis_client.incr(cls._tenant_version_key(tenant_id))
+
+    @staticmethod
+    def _route_key(webhook_id: str) -> str:
+        return f"webhook_routes:route:{webhook_id}"
+
+    @staticmethod
+    def _app_version_key(app_id: str) -> str:
+        return f"webhook_routes:version:app_id:{app_id}"
+
+    @staticmethod
+    def _tenant_version_key(tenant_id: str) -> str:
+        return f"webhook_routes:version:tenant_id:{tenant_id}"
+
+    @classmethod
+    @redis_fallback(default_return=None)
+    def _get_shared_route(cls, webhook_id: str) -> WebhookRoute | None:
+        cached_route = redis_client.get(cls._route_key(webhook_id))
+        if not cached_route:
+            return None
+        try:
+            return WebhookRoute.model_validate_json(cached_route)
+        except ValidationError:
+            logger.warning("Failed to decode cached route of webhook %s", webhook_id)
+            return None
+
+    @classmethod
+    @redis_fallback()
+    def _set_shared_route(cls, route: WebhookRoute):
+        redis_client.setex(
+            cls._route_key(route.webhook_id), dify_config.WEBHOOK_ROUTE_CACHE_TTL, route.model_dump_json()
+        )
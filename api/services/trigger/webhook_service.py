@@ -31,6 +31,7 @@ from services.async_workflow_service import AsyncWorkflowService
 from services.end_user_service import EndUserService
 from services.errors.app import QuotaExceededError
 from services.trigger.app_trigger_service import AppTriggerService
+from services.trigger.webhook_route_cache import WebhookRoute, WebhookRouteCache
 from services.workflow.entities import WebhookTriggerData
 
 try:
@@ -133,9 +134,85 @@ class WebhookService:
 
             return webhook_trigger, workflow, node_config
 
+    @classmethod
+    def get_webhook_route(cls, webhook_id: str) -> WebhookRoute:
+        """Get the route of a webhook to the node of its published workflow.
+
+        Routes are cached in each process and in Redis until the webhook triggers, app triggers or published
+        workflow of the app change, so most webhook calls don't query the database or parse the graph here.
+
+        Args:
+            webhook_id: The webhook ID to look up
+
+        Returns:
+            WebhookRoute: The enabled route of the webhook
+
+        Raises:
+            ValueError: If webhook not found, app trigger not found, trigger disabled, or workflow not found
+        """
+        route = WebhookRouteCache.get(webhook_id) if WebhookRouteCache.enabled() else None
+        if route is None:
+            route = cls._load_webhook_route(webhook_id)
+            if route.config_version:
+                WebhookRouteCache.set(route)
+
+        if route.status == AppTriggerStatus.RATE_LIMITED:
+            raise ValueError(f"Webhook trigger is rate limited for webhook {webhook_id}, please upgrade your plan.")
+        if route.status != AppTriggerStatus.ENABLED:
+            raise ValueError(f"Webhook trigger is disabled for webhook {webhook_id}")
+        return route
+
+    @classmethod
+    def _load_webhook_route(cls, webhook_id: str) -> WebhookRoute:
+        with Session(db.engine) as session:
+            webhook_trigger = session.scalar(
+                select(WorkflowWebhookTrigger).where(WorkflowWebhookTrigger.webhook_id == webhook_id)
+            )
+            if not webhook_trigger:
+                raise ValueError(f"Webhook not found: {webhook_id}")
+
+            # read before the app trigger and the workflow, a change made meanwhile then outdates the route
+            config_version = None
+            if WebhookRouteCache.enabled():
+                config_version = WebhookRouteCache.get_config_version(webhook_trigger.app_id, webhook_trigger.tenant_id)
+
+            app_trigger = session.scalar(
+                select(AppTrigger).where(
+                    AppTrigger.app_id == webhook_trigger.app_id,
+                    AppTrigger.node_id == webhook_trigger.node_id,
+                    AppTrigger.trigger_type == AppTriggerType.TRIGGER_WEBHOOK,
+                )
+            )
+            if not app_trigger:
+                raise ValueError(f"App trigger not found for webhook {webhook_id}")
+
+            workflow = session.scalar(
+                select(Workflow)
+                .where(
+                    Workflow.app_id == webhook_trigger.app_id,
+                    Workflow.version != Workflow.VERSION_DRAFT,
+                )
+                .order_by(Workflow.created_at.desc())
+                .limit(1)
+            )
+            if not workflow:
+                raise ValueError(f"Workflow not found for app {webhook_trigger.app_id}")
+
+            return WebhookRoute(
+                webhook_id=webhook_trigger.webhook_id,
+                app_id=webhook_trigger.app_id,
+                tenant_id=webhook_trigger.tenant_id,
+                node_id=webhook_trigger.node_id,
+                created_by=webhook_trigger.created_by,
+                workflow_id=workflow.id,
+                node_config=dict(workflow.get_node_config_by_id(webhook_trigger.node_id)),
+                status=app_trigger.status,
+                config_version=config_version or "",
+            )
+
     @classmethod
     def extract_and_validate_webhook_data(
-        cls, webhook_trigger: WorkflowWebhookTrigger, node_config: Mapping[str, Any]
+        cls, webhook_trigger: WorkflowWebhookTrigger | WebhookRoute, node_config: Mapping[str, Any]
     ) -> dict[str, Any]:
         """Extract and validate webhook data in a single unified process.
 
@@ -164,7 +241,7 @@ class WebhookService:
         return processed_data
 
     @classmethod
-    def extract_webhook_data(cls, webhook_trigger: WorkflowWebhookTrigger) -> dict[str, Any]:
+    def extract_webhook_data(cls, webhook_trigger: WorkflowWebhookTrigger | WebhookRoute) -> dict[str, Any]:
         """Extract raw data from incoming webhook request without type conversion.
 
         Args:
@@ -290,7 +367,9 @@ class WebhookService:
         return dict(request.form), {}
 
     @classmethod
-    def _extract_multipart_body(cls, webhook_trigger: WorkflowWebhookTrigger) -> tuple[dict[str, Any], dict[str, Any]]:
+    def _extract_multipart_body(
+        cls, webhook_trigger: WorkflowWebhookTrigger | WebhookRoute
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
         """Extract multipart/form-data body and files from request.
 
         Args:
@@ -307,7 +386,7 @@ class WebhookService:
 
     @classmethod
     def _extract_octet_stream_body(
-        cls, webhook_trigger: WorkflowWebhookTrigger
+        cls, webhook_trigger: WorkflowWebhookTrigger | WebhookRoute
     ) -> tuple[dict[str, Any], dict[str, Any]]:
         """Extract binary data as file from request.
 
@@ -361,7 +440,7 @@ class WebhookService:
 
     @classmethod
     def _process_file_uploads(
-        cls, files: Mapping[str, FileStorage], webhook_trigger: WorkflowWebhookTrigger
+        cls, files: Mapping[str, FileStorage], webhook_trigger: WorkflowWebhookTrigger | WebhookRoute
     ) -> dict[str, Any]:
         """Process file uploads using ToolFileManager.
 
@@ -389,7 +468,7 @@ class WebhookService:
 
     @classmethod
     def _create_file_from_binary(
-        cls, file_content: bytes, mimetype: str, webhook_trigger: WorkflowWebhookTrigger
+        cls, file_content: bytes, mimetype: str, webhook_trigger: WorkflowWebhookTrigger | WebhookRoute
     ) -> Any:
         """Create a file object from binary content using ToolFileManager.
 
@@ -729,14 +808,14 @@ class WebhookService:
 
     @classmethod
     def trigger_workflow_execution(
-        cls, webhook_trigger: WorkflowWebhookTrigger, webhook_data: dict[str, Any], workflow: Workflow
+        cls, webhook_trigger: WorkflowWebhookTrigger | WebhookRoute, webhook_data: dict[str, Any], workflow_id: str
     ) -> None:
         """Trigger workflow execution via AsyncWorkflowService.
 
         Args:
-            webhook_trigger: The webhook trigger object
+            webhook_trigger: The webhook trigger object or route
             webhook_data: Processed webhook data for workflow inputs
-            workflow: The workflow to execute
+            workflow_id: ID of the workflow to execute
 
         Raises:
             ValueError: If tenant owner is not found
@@ -751,7 +830,7 @@ class WebhookService:
                 # Create trigger data
                 trigger_data = WebhookTriggerData(
                     app_id=webhook_trigger.app_id,
-                    workflow_id=workflow.id,
+                    workflow_id=workflow_id,
                     root_node_id=webhook_trigger.node_id,  # Start from the webhook node
                     inputs=workflow_inputs,
                     tenant_id=webhook_trigger.tenant_id,
@@ -903,6 +982,7 @@ class WebhookService:
                         session.delete(nodes_id_in_db[node_id])
                         redis_client.delete(f"{cls.__WEBHOOK_NODE_CACHE_KEY__}:{app.id}:{node_id}")
                 session.commit()
+                WebhookRouteCache.invalidate_app(app.id)
             except Exception:
                 logger.exception("Failed to sync webhook relationships for app %s", app.id)
                 raise
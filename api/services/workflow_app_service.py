@@ -3,13 +3,18 @@ import uuid
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import Select, and_, func, or_, select, tuple_
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Session
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.expression import ClauseElement, Executable
 
+from configs import dify_config
 from core.workflow.enums import WorkflowExecutionStatus
 from models import Account, App, EndUser, WorkflowAppLog, WorkflowRun
 from models.enums import AppTriggerType, CreatorUserRole
 from models.trigger import WorkflowTriggerLog
+from services.errors.app import LastWorkflowAppLogNotExistsError
 from services.plugin.plugin_service import PluginService
 from services.workflow.entities import TriggerMetadata
 
@@ -34,6 +39,20 @@ class LogView:
         return getattr(self.log, name)
 
 
+class _Explain(Executable, ClauseElement):
+    """`EXPLAIN` of a statement, returning the plan of the PostgreSQL planner with its row estimate as JSON."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler: SQLCompiler, **kw: Any) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
 class WorkflowAppService:
     def get_paginate_workflow_app_logs(
         self,
@@ -49,6 +68,8 @@ class WorkflowAppService:
         detail: bool = False,
         created_by_end_user_session_id: str | None = None,
         created_by_account: str | None = None,
+        last_id: str | None = None,
+        include_total: bool = True,
     ):
         """
         Get paginate workflow app logs using SQLAlchemy 2.0 style
@@ -58,11 +79,14 @@ class WorkflowAppService:
         :param status: filter by status
         :param created_at_before: filter logs created before this timestamp
         :param created_at_after: filter logs created after this timestamp
-        :param page: page number
+        :param page: page number, ignored when last_id is given
         :param limit: items per page
         :param detail: whether to return detailed logs
         :param created_by_end_user_session_id: filter by end user session id
         :param created_by_account: filter by account email
+        :param last_id: id of the last log of the previous page, pages by (created_at, id) instead of an offset
+            so that deep pages cost as much as the first one
+        :param include_total: whether to count the logs, large totals are estimated
         :return: Pagination object
         """
         # Build base statement using SQLAlchemy 2.0 style
@@ -138,34 +162,74 @@ class WorkflowAppService:
                 ),
             )
 
-        stmt = stmt.order_by(WorkflowAppLog.created_at.desc())
-
         # Get total count using the same filters
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        total = session.scalar(count_stmt) or 0
+        total = self._count_workflow_app_logs(session, stmt) if include_total else None
 
         # Apply pagination limits
-        offset_stmt = stmt.offset((page - 1) * limit).limit(limit)
+        if last_id:
+            last_log = self._get_last_workflow_app_log(session, app_model, last_id)
+            page_stmt = stmt.where(
+                tuple_(WorkflowAppLog.created_at, WorkflowAppLog.id) < tuple_(last_log.created_at, last_log.id)
+            )
+        else:
+            page_stmt = stmt.offset((page - 1) * limit)
+        # fetch one more log to tell whether there is a next page without counting
+        page_stmt = page_stmt.order_by(WorkflowAppLog.created_at.desc(), WorkflowAppLog.id.desc()).limit(limit + 1)
 
         # wrapper moved to module scope as `LogView`
 
         # Execute query and get items
         if detail:
-            rows = session.execute(offset_stmt).all()
+            rows = session.execute(page_stmt).all()
             items = [
                 LogView(log, {"trigger_metadata": self.handle_trigger_metadata(app_model.tenant_id, meta_val)})
                 for log, meta_val in rows
             ]
         else:
-            items = [LogView(log, None) for log in session.scalars(offset_stmt).all()]
+            items = [LogView(log, None) for log in session.scalars(page_stmt).all()]
         return {
             "page": page,
             "limit": limit,
             "total": total,
-            "has_more": total > page * limit,
-            "data": items,
+            "has_more": len(items) > limit,
+            "data": items[:limit],
         }
 
+    def _get_last_workflow_app_log(self, session: Session, app_model: App, last_id: str) -> WorkflowAppLog:
+        last_log = None
+        if self._safe_parse_uuid(last_id):
+            last_log = session.scalar(
+                select(WorkflowAppLog).where(
+                    WorkflowAppLog.tenant_id == app_model.tenant_id,
+                    WorkflowAppLog.app_id == app_model.id,
+                    WorkflowAppLog.id == last_id,
+                )
+            )
+        if not last_log:
+            raise LastWorkflowAppLogNotExistsError()
+        return last_log
+
+    @staticmethod
+    def _count_workflow_app_logs(session: Session, stmt: Select) -> int:
+        """
+        Count the logs selected by stmt.
+
+        Counting reads every selected log, so on PostgreSQL it stops after WORKFLOW_APP_LOG_EXACT_COUNT_LIMIT
+        logs and larger totals are taken from the row estimate of the query planner.
+        """
+        exact_count_limit = dify_config.WORKFLOW_APP_LOG_EXACT_COUNT_LIMIT
+        if exact_count_limit <= 0 or session.get_bind().dialect.name != "postgresql":
+            return session.scalar(select(func.count()).select_from(stmt.subquery())) or 0
+
+        total = session.scalar(select(func.count()).select_from(stmt.limit(exact_count_limit + 1).subquery())) or 0
+        if total <= exact_count_limit:
+            return total
+
+        plan = session.scalar(_Explain(stmt))
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return max(int(plan[0]["Plan"]["Plan Rows"]), total)
+
     def handle_trigger_metadata(self, tenant_id: str, meta_val: str) -> dict[str, Any]:
         metadata: dict[str, Any] | None = self._safe_json_loads(meta_val)
         if not metadata:
@@ -1,22 +1,23 @@
+import hashlib
 import logging
 import time
 
 import click
 from celery import shared_task
-from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
 
 from core.rag.index_processor.index_processor_factory import IndexProcessorFactory
-from core.tools.utils.web_reader_tool import get_image_upload_file_ids
 from extensions.ext_database import db
-from extensions.ext_storage import storage
-from models.dataset import Dataset, DatasetMetadataBinding, DocumentSegment
-from models.model import UploadFile
+from models.dataset import Dataset, DatasetMetadataBinding, DocumentSegment, SegmentAttachmentBinding
+from services.dataset_cleanup_service import DatasetCleanupService
 
 logger = logging.getLogger(__name__)
 
 
-@shared_task(queue="dataset")
-def batch_clean_document_task(document_ids: list[str], dataset_id: str, doc_form: str | None, file_ids: list[str]):
+@shared_task(queue="dataset", bind=True, max_retries=3)
+def batch_clean_document_task(
+    self, document_ids: list[str], dataset_id: str, doc_form: str | None, file_ids: list[str]
+):
     """
     Clean document when document deleted.
     :param document_ids: document ids
@@ -25,6 +26,8 @@ def batch_clean_document_task(document_ids: list[str], dataset_id: str, doc_form
     :param file_ids: file ids
 
     Usage: batch_clean_document_task.delay(document_ids, dataset_id)
+
+    Database errors are retried, the retry resumes the cleanup after the last chunk it deleted.
     """
     logger.info(click.style("Start batch clean documents when documents deleted", fg="green"))
     start_at = time.perf_counter()
@@ -41,43 +44,20 @@ def batch_clean_document_task(document_ids: list[str], dataset_id: str, doc_form
             DatasetMetadataBinding.dataset_id == dataset_id,
             DatasetMetadataBinding.document_id.in_(document_ids),
         ).delete(synchronize_session=False)
+        db.session.commit()
 
-        segments = db.session.scalars(
-            select(DocumentSegment).where(DocumentSegment.document_id.in_(document_ids))
-        ).all()
-        # check segment is exist
-        if segments:
-            index_node_ids = [segment.index_node_id for segment in segments]
+        cleanup_id = hashlib.sha256(",".join(sorted(document_ids)).encode()).hexdigest()
+        with DatasetCleanupService(dataset, f"documents:{cleanup_id}") as cleanup:
             index_processor = IndexProcessorFactory(doc_form).init_index_processor()
-            index_processor.clean(dataset, index_node_ids, with_keywords=True, delete_child_chunks=True)
-
-            for segment in segments:
-                image_upload_file_ids = get_image_upload_file_ids(segment.content)
-                for upload_file_id in image_upload_file_ids:
-                    image_file = db.session.query(UploadFile).where(UploadFile.id == upload_file_id).first()
-                    try:
-                        if image_file and image_file.key:
-                            storage.delete(image_file.key)
-                    except Exception:
-                        logger.exception(
-                            "Delete image_files failed when storage deleted, \
-                                          image_upload_file_is: %s",
-                            upload_file_id,
-                        )
-                    db.session.delete(image_file)
-                db.session.delete(segment)
-
-            db.session.commit()
-        if file_ids:
-            files = db.session.scalars(select(UploadFile).where(UploadFile.id.in_(file_ids))).all()
-            for file in files:
-                try:
-                    storage.delete(file.key)
-                except Exception:
-                    logger.exception("Delete file failed when document deleted, file_id: %s", file.id)
-                db.session.delete(file)
-
-        db.session.commit()
+            cleanup.clean_segments(DocumentSegment.document_id.in_(document_ids), index_processor=index_processor)
+            cleanup.clean_attachments(
+                SegmentAttachmentBinding.tenant_id == dataset.tenant_id,
+                SegmentAttachmentBinding.dataset_id == dataset_id,
+                SegmentAttachmentBinding.document_id.in_(document_ids),
+            )
+            if file_ids:
+                cleanup.clean_upload_files(file_ids)
+            cleanup.finish()
 
         end_at = time.perf_counter()
         logger.info(
@@ -86,6 +66,10 @@ def batch_clean_document_task(document_ids: list[str], dataset_id: str, doc_form
                 fg="green",
             )
         )
+    except SQLAlchemyError as e:
+        logger.exception("Cleaned documents when documents deleted failed")
+        db.session.rollback()
+        raise self.retry(exc=e, countdown=60)
     except Exception:
         logger.exception("Cleaned documents when documents deleted failed")
     finally:
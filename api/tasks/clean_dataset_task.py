@@ -3,12 +3,10 @@ import time
 
 import click
 from celery import shared_task
-from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
 
 from core.rag.index_processor.index_processor_factory import IndexProcessorFactory
-from core.tools.utils.web_reader_tool import get_image_upload_file_ids
 from extensions.ext_database import db
-from extensions.ext_storage import storage
 from models import WorkflowType
 from models.dataset import (
     AppDatasetJoin,
@@ -22,15 +20,16 @@ from models.dataset import (
     Pipeline,
     SegmentAttachmentBinding,
 )
-from models.model import UploadFile
 from models.workflow import Workflow
+from services.dataset_cleanup_service import DatasetCleanupService
 
 logger = logging.getLogger(__name__)
 
 
 # Add import statement for ValueError
-@shared_task(queue="dataset")
+@shared_task(queue="dataset", bind=True, max_retries=3)
 def clean_dataset_task(
+    self,
     dataset_id: str,
     tenant_id: str,
     indexing_technique: str,
@@ -49,6 +48,8 @@ def clean_dataset_task(
     :param doc_form: dataset form
 
     Usage: clean_dataset_task.delay(dataset_id, tenant_id, indexing_technique, index_struct)
+
+    Database errors are retried, the retry resumes the cleanup after the last chunk it deleted.
     """
     logger.info(click.style(f"Start clean dataset when dataset deleted: {dataset_id}", fg="green"))
     start_at = time.perf_counter()
@@ -61,14 +62,6 @@ def clean_dataset_task(
             index_struct=index_struct,
             collection_binding_id=collection_binding_id,
         )
-        documents = db.session.scalars(select(Document).where(Document.dataset_id == dataset_id)).all()
-        segments = db.session.scalars(select(DocumentSegment).where(DocumentSegment.dataset_id == dataset_id)).all()
-        # Use JOIN to fetch attachments with bindings in a single query
-        attachments_with_bindings = db.session.execute(
-            select(SegmentAttachmentBinding, UploadFile)
-            .join(UploadFile, UploadFile.id == SegmentAttachmentBinding.attachment_id)
-            .where(SegmentAttachmentBinding.tenant_id == tenant_id, SegmentAttachmentBinding.dataset_id == dataset_id)
-        ).all()
 
         # Enhanced validation: Check if doc_form is None, empty string, or contains only whitespace
         # This ensures all invalid doc_form values are properly handled
@@ -81,99 +74,56 @@ def clean_dataset_task(
                 click.style(f"Invalid doc_form detected, using default index type for cleanup: {doc_form}", fg="yellow")
             )
 
-        # Add exception handling around IndexProcessorFactory.clean() to prevent single point of failure
-        # This ensures Document/Segment deletion can continue even if vector database cleanup fails
-        try:
-            index_processor = IndexProcessorFactory(doc_form).init_index_processor()
-            index_processor.clean(dataset, None, with_keywords=True, delete_child_chunks=True)
-            logger.info(click.style(f"Successfully cleaned vector database for dataset: {dataset_id}", fg="green"))
-        except Exception:
-            logger.exception(click.style(f"Failed to clean vector database for dataset {dataset_id}", fg="red"))
-            # Continue with document and segment deletion even if vector cleanup fails
+        with DatasetCleanupService(dataset, f"dataset:{dataset_id}") as cleanup:
+            # Add exception handling around IndexProcessorFactory.clean() to prevent single point of failure
+            # This ensures Document/Segment deletion can continue even if vector database cleanup fails
+            try:
+                index_processor = IndexProcessorFactory(doc_form).init_index_processor()
+                cleanup.clean_index(index_processor)
+                logger.info(click.style(f"Successfully cleaned vector database for dataset: {dataset_id}", fg="green"))
+            except Exception:
+                logger.exception(click.style(f"Failed to clean vector database for dataset {dataset_id}", fg="red"))
+                # Continue with document and segment deletion even if vector cleanup fails
+                logger.info(
+                    click.style(f"Continuing with document and segment deletion for dataset: {dataset_id}", fg="yellow")
+                )
+
+            # segments, attachments and documents are deleted chunk by chunk, with their files
+            segment_count = cleanup.clean_segments(DocumentSegment.dataset_id == dataset_id)
+            attachment_count = cleanup.clean_attachments(
+                SegmentAttachmentBinding.tenant_id == tenant_id, SegmentAttachmentBinding.dataset_id == dataset_id
+            )
+            document_count = cleanup.clean_documents(Document.dataset_id == dataset_id)
             logger.info(
-                click.style(f"Continuing with document and segment deletion for dataset: {dataset_id}", fg="yellow")
+                click.style(
+                    f"Deleted {document_count} documents, {segment_count} segments and {attachment_count} "
+                    f"attachments of dataset: {dataset_id}",
+                    fg="green",
+                )
             )
 
-        if documents is None or len(documents) == 0:
-            logger.info(click.style(f"No documents found for dataset: {dataset_id}", fg="green"))
-        else:
-            logger.info(click.style(f"Cleaning documents for dataset: {dataset_id}", fg="green"))
-
-            for document in documents:
-                db.session.delete(document)
-                # delete document file
-
-            for segment in segments:
-                image_upload_file_ids = get_image_upload_file_ids(segment.content)
-                for upload_file_id in image_upload_file_ids:
-                    image_file = db.session.query(UploadFile).where(UploadFile.id == upload_file_id).first()
-                    if image_file is None:
-                        continue
-                    try:
-                        storage.delete(image_file.key)
-                    except Exception:
-                        logger.exception(
-                            "Delete image_files failed when storage deleted, \
-                                          image_upload_file_is: %s",
-                            upload_file_id,
-                        )
-                    db.session.delete(image_file)
-                db.session.delete(segment)
-        # delete segment attachments
-        if attachments_with_bindings:
-            for binding, attachment_file in attachments_with_bindings:
-                try:
-                    storage.delete(attachment_file.key)
-                except Exception:
-                    logger.exception(
-                        "Delete attachment_file failed when storage deleted, \
-                                        attachment_file_id: %s",
-                        binding.attachment_id,
-                    )
-                db.session.delete(attachment_file)
-                db.session.delete(binding)
-
-        db.session.query(DatasetProcessRule).where(DatasetProcessRule.dataset_id == dataset_id).delete()
-        db.session.query(DatasetQuery).where(DatasetQuery.dataset_id == dataset_id).delete()
-        db.session.query(AppDatasetJoin).where(AppDatasetJoin.dataset_id == dataset_id).delete()
-        # delete dataset metadata
-        db.session.query(DatasetMetadata).where(DatasetMetadata.dataset_id == dataset_id).delete()
-        db.session.query(DatasetMetadataBinding).where(DatasetMetadataBinding.dataset_id == dataset_id).delete()
-        # delete pipeline and workflow
-        if pipeline_id:
-            db.session.query(Pipeline).where(Pipeline.id == pipeline_id).delete()
-            db.session.query(Workflow).where(
-                Workflow.tenant_id == tenant_id,
-                Workflow.app_id == pipeline_id,
-                Workflow.type == WorkflowType.RAG_PIPELINE,
-            ).delete()
-        # delete files
-        if documents:
-            for document in documents:
-                try:
-                    if document.data_source_type == "upload_file":
-                        if document.data_source_info:
-                            data_source_info = document.data_source_info_dict
-                            if data_source_info and "upload_file_id" in data_source_info:
-                                file_id = data_source_info["upload_file_id"]
-                                file = (
-                                    db.session.query(UploadFile)
-                                    .where(UploadFile.tenant_id == document.tenant_id, UploadFile.id == file_id)
-                                    .first()
-                                )
-                                if not file:
-                                    continue
-                                storage.delete(file.key)
-                                db.session.delete(file)
-                except Exception:
-                    continue
-
-        db.session.commit()
+            db.session.query(DatasetProcessRule).where(DatasetProcessRule.dataset_id == dataset_id).delete()
+            db.session.query(DatasetQuery).where(DatasetQuery.dataset_id == dataset_id).delete()
+            db.session.query(AppDatasetJoin).where(AppDatasetJoin.dataset_id == dataset_id).delete()
+            # delete dataset metadata
+            db.session.query(DatasetMetadata).where(DatasetMetadata.dataset_id == dataset_id).delete()
+            db.session.query(DatasetMetadataBinding).where(DatasetMetadataBinding.dataset_id == dataset_id).delete()
+            # delete pipeline and workflow
+            if pipeline_id:
+                db.session.query(Pipeline).where(Pipeline.id == pipeline_id).delete()
+                db.session.query(Workflow).where(
+                    Workflow.tenant_id == tenant_id,
+                    Workflow.app_id == pipeline_id,
+                    Workflow.type == WorkflowType.RAG_PIPELINE,
+                ).delete()
+
+            db.session.commit()
+            cleanup.finish()
         end_at = time.perf_counter()
         logger.info(
             click.style(f"Cleaned dataset when dataset deleted: {dataset_id} latency: {end_at - start_at}", fg="green")
         )
-    except Exception:
+    except Exception as e:
         # Add rollback to prevent dirty session state in case of exceptions
         # This ensures the database session is properly cleaned up
         try:
@@ -183,5 +133,7 @@ def clean_dataset_task(
             logger.exception("Failed to rollback database session")
 
         logger.exception("Cleaned dataset when dataset deleted failed")
+        if isinstance(e, SQLAlchemyError):
+            raise self.retry(exc=e, countdown=60)
     finally:
         db.session.close()
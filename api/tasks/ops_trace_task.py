@@ -1,11 +1,16 @@
 import json
 import logging
+import time
+from collections import defaultdict
+from typing import Any
 
 from celery import shared_task
 from flask import current_app
+from opentelemetry.metrics import get_meter
 
-from core.ops.entities.config_entity import OPS_FILE_PATH, OPS_TRACE_FAILED_KEY
-from core.ops.entities.trace_entity import trace_info_info_map
+from configs import dify_config
+from core.ops.entities.config_entity import OPS_BATCH_FILE_PATH, OPS_FILE_PATH, OPS_TRACE_FAILED_KEY
+from core.ops.entities.trace_entity import TaskBatchData, TaskData, trace_info_info_map
 from core.rag.models.document import Document
 from extensions.ext_redis import redis_client
 from extensions.ext_storage import storage
@@ -14,12 +19,36 @@ from models.workflow import WorkflowRun
 
 logger = logging.getLogger(__name__)
 
+meter = get_meter("ops_trace", version=dify_config.project.version)
+traces_counter = meter.create_counter(
+    "ops_trace.traces", unit="{trace}", description="Traces exported to the tracing providers"
+)
+queue_lag_histogram = meter.create_histogram(
+    "ops_trace.queue_lag", unit="s", description="Time from queueing a trace to exporting it"
+)
+
+
+def _build_trace_info(trace_info_type: str | None, trace_info: dict[str, Any]) -> Any:
+    if trace_info.get("message_data"):
+        trace_info["message_data"] = Message.from_dict(data=trace_info["message_data"])
+    if trace_info.get("workflow_data"):
+        trace_info["workflow_data"] = WorkflowRun.from_dict(data=trace_info["workflow_data"])
+    if trace_info.get("documents"):
+        trace_info["documents"] = [Document.model_validate(doc) for doc in trace_info["documents"]]
+
+    trace_type = trace_info_info_map.get(trace_info_type) if trace_info_type else None
+    if trace_type:
+        return trace_type(**trace_info)
+    return trace_info
+
 
 @shared_task(queue="ops_trace")
 def process_trace_tasks(file_info):
     """
     Async process trace tasks
     Usage: process_trace_tasks.delay(tasks_data)
+
+    Kept for the messages sent before the traces were batched, see process_trace_batch_tasks.
     """
     from core.ops.ops_trace_manager import OpsTraceManager
 
@@ -31,20 +60,10 @@ def process_trace_tasks(file_info):
     trace_info_type = file_data.get("trace_info_type")
     trace_instance = OpsTraceManager.get_ops_trace_instance(app_id)
 
-    if trace_info.get("message_data"):
-        trace_info["message_data"] = Message.from_dict(data=trace_info["message_data"])
-    if trace_info.get("workflow_data"):
-        trace_info["workflow_data"] = WorkflowRun.from_dict(data=trace_info["workflow_data"])
-    if trace_info.get("documents"):
-        trace_info["documents"] = [Document.model_validate(doc) for doc in trace_info["documents"]]
-
     try:
         if trace_instance:
             with current_app.app_context():
-                trace_type = trace_info_info_map.get(trace_info_type)
-                if trace_type:
-                    trace_info = trace_type(**trace_info)
-                trace_instance.trace(trace_info)
+                trace_instance.trace(_build_trace_info(trace_info_type, trace_info))
         logger.info("Processing trace tasks success, app_id: %s", app_id)
     except Exception as e:
         logger.info("error:\n\n\n%s\n\n\n\n", e)
@@ -53,3 +72,72 @@ def process_trace_tasks(file_info):
         logger.info("Processing trace tasks failed, app_id: %s", app_id)
     finally:
         storage.delete(file_path)
+
+
+@shared_task(queue="ops_trace")
+def process_trace_batch_tasks(batch_info):
+    """
+    Async process a batch of trace tasks saved in a single file
+    Usage: process_trace_batch_tasks.delay({"file_id": file_id})
+
+    The traces are grouped by app, so the tracing provider of an app is resolved once and exports its traces
+    one after the other.
+    """
+    from core.ops.ops_trace_manager import OpsTraceManager
+
+    file_path = f"{OPS_BATCH_FILE_PATH}{batch_info['file_id']}.json"
+    start_at = time.perf_counter()
+    tasks_by_app: dict[str, list[TaskData]] = defaultdict(list)
+    try:
+        batch = TaskBatchData.model_validate_json(storage.load(file_path))
+        for task in batch.tasks:
+            tasks_by_app[task.app_id].append(task)
+
+        for app_id, tasks in tasks_by_app.items():
+            try:
+                trace_instance = OpsTraceManager.get_ops_trace_instance(app_id)
+            except Exception:
+                # the traces of the other apps of the batch are still exported
+                logger.exception("Resolving tracing provider failed, app_id: %s", app_id)
+                for task in tasks:
+                    traces_counter.add(
+                        1, {"provider": "unknown", "trace_info_type": task.trace_info_type, "status": "failed"}
+                    )
+                redis_client.incr(f"{OPS_TRACE_FAILED_KEY}_{app_id}", len(tasks))
+                continue
+
+            provider = type(trace_instance).__name__ if trace_instance else "none"
+            failed_count = 0
+            with current_app.app_context():
+                for task in tasks:
+                    status = "success"
+                    try:
+                        if trace_instance:
+                            trace_instance.trace(_build_trace_info(task.trace_info_type, task.trace_info or {}))
+                    except Exception:
+                        logger.exception(
+                            "Processing trace task failed, app_id: %s, trace_info_type: %s",
+                            app_id,
+                            task.trace_info_type,
+                        )
+                        status = "failed"
+                        failed_count += 1
+
+                    attributes = {"provider": provider, "trace_info_type": task.trace_info_type}
+                    traces_counter.add(1, {**attributes, "status": status})
+                    if task.enqueued_at is not None:
+                        queue_lag_histogram.record(max(time.time() - task.enqueued_at, 0), attributes)
+            if failed_count:
+                redis_client.incr(f"{OPS_TRACE_FAILED_KEY}_{app_id}", failed_count)
+    finally:
+        storage.delete(file_path)
+
+    trace_count = sum(len(tasks) for tasks in tasks_by_app.values())
+    latency = time.perf_counter() - start_at
+    logger.info(
+        "Processed %s traces of %s apps in %.3fs, %.1f traces/s",
+        trace_count,
+        len(tasks_by_app),
+        latency,
+        trace_count / latency if latency > 0 else 0,
+    )
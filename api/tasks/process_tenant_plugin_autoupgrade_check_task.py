@@ -182,6 +182,7 @@ def process_tenant_plugin_autoupgrade_check_task(
         if not manifests:
             return
 
+        upgrade_task_ids: list[str] = []
         for manifest in manifests:
             for plugin_id, version, original_unique_identifier in plugin_ids:
                 if manifest.plugin_id != plugin_id:
@@ -218,7 +219,7 @@ def process_tenant_plugin_autoupgrade_check_task(
                                 fg="green",
                             )
                         )
-                        _ = manager.upgrade_plugin(
+                        response = manager.upgrade_plugin(
                             tenant_id,
                             original_unique_identifier,
                             new_unique_identifier,
@@ -227,11 +228,21 @@ def process_tenant_plugin_autoupgrade_check_task(
                                 "plugin_unique_identifier": new_unique_identifier,
                             },
                         )
+                        if not response.all_installed:
+                            upgrade_task_ids.append(response.task_id)
                 except Exception as e:
                     click.echo(click.style(f"Error when upgrading plugin: {e}", fg="red"))
                     # traceback.print_exc()
                 break
 
+        # nobody polls the upgrade tasks, wait for them so the cached model providers of the tenant are invalidated
+        for task_id in upgrade_task_ids:
+            try:
+                if manager.wait_plugin_installation_task(tenant_id, task_id) is None:
+                    click.echo(click.style(f"Upgrade task {task_id} is still running", fg="yellow"))
+            except Exception as e:
+                click.echo(click.style(f"Error when waiting for upgrade task {task_id}: {e}", fg="red"))
+
     except Exception as e:
         click.echo(click.style(f"Error when checking upgradable plugin: {e}", fg="red"))
         # traceback.print_exc()
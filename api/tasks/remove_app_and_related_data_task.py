@@ -14,6 +14,7 @@ from models import (
     ApiToken,
     AppAnnotationHitHistory,
     AppAnnotationSetting,
+    AppDailyStatistic,
     AppDatasetJoin,
     AppMCPServer,
     AppModelConfig,
@@ -42,6 +43,7 @@ from models.workflow import (
     WorkflowAppLog,
 )
 from repositories.factory import DifyAPIRepositoryFactory
+from services.trigger.webhook_route_cache import WebhookRouteCache
 
 logger = logging.getLogger(__name__)
 
@@ -77,6 +79,7 @@ def remove_app_and_related_data_task(self, tenant_id: str, app_id: str):
         _delete_workflow_webhook_triggers(tenant_id, app_id)
         _delete_workflow_schedule_plans(tenant_id, app_id)
         _delete_workflow_trigger_logs(tenant_id, app_id)
+        _delete_app_daily_statistics(app_id=app_id)
 
         end_at = time.perf_counter()
         logger.info(click.style(f"App and related data deleted: {app_id} latency: {end_at - start_at}", fg="green"))
@@ -277,6 +280,14 @@ def _delete_conversation_variables(*, app_id: str):
         logger.info(click.style(f"Deleted conversation variables for app {app_id}", fg="green"))
 
 
+def _delete_app_daily_statistics(*, app_id: str):
+    stmt = delete(AppDailyStatistic).where(AppDailyStatistic.app_id == app_id)
+    with db.engine.connect() as conn:
+        conn.execute(stmt)
+        conn.commit()
+        logger.info(click.style(f"Deleted daily statistics for app {app_id}", fg="green"))
+
+
 def _delete_app_messages(tenant_id: str, app_id: str):
     def del_message(message_id: str):
         db.session.query(MessageFeedback).where(MessageFeedback.message_id == message_id).delete(
@@ -530,6 +541,7 @@ def _delete_workflow_webhook_triggers(tenant_id: str, app_id: str):
         del_webhook_trigger,
         "workflow webhook trigger",
     )
+    WebhookRouteCache.invalidate_app(app_id)
 
 
 def _delete_workflow_schedule_plans(tenant_id: str, app_id: str):
@@ -0,0 +1,43 @@
+import os
+import resource
+import sys
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+
+import pytest
+from flask import Flask
+
+# Benchmarks are opt-in: run them with `pytest api/tests/benchmarks`.
+# Results can be compared between revisions with `--benchmark-autosave` and `--benchmark-compare`.
+ABS_PATH = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.abspath(os.path.join(ABS_PATH, os.pardir, os.pardir))
+sys.path.insert(0, PROJECT_DIR)
+
+CACHED_APP = Flask(__name__)
+
+
+@pytest.fixture(autouse=True)
+def _provide_app_context():
+    with CACHED_APP.app_context():
+        yield
+
+
+@contextmanager
+def _measure_memory(extra_info: dict[str, object]) -> Iterator[None]:
+    tracemalloc.start()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    try:
+        yield
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        # ru_maxrss is reported in KiB on Linux.
+        extra_info["peak_traced_bytes"] = peak
+        extra_info["peak_rss_growth_kib"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+
+
+@pytest.fixture
+def measure_memory(benchmark) -> Callable[[], AbstractContextManager[None]]:
+    """Record traced peak memory and peak RSS growth of a block in the benchmark's extra info."""
+    return lambda: _measure_memory(benchmark.extra_info)
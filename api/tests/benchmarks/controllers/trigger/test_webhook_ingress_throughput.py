@@ -0,0 +1,133 @@
+"""
+Measure how many calls per second the webhook endpoint accepts for a published workflow.
+
+The routing cache (`route_cache`) is compared against loading the webhook trigger, app trigger and latest
+published workflow and parsing its graph on every call (`no_route_cache`). The database is an in-memory SQLite
+database and Redis an in-process dict, so the gap is a lower bound of the one against a remote database.
+Enqueueing the workflow run is left out.
+"""
+
+import json
+import uuid
+from collections.abc import Iterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+import sqlalchemy as sa
+from flask import Flask
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from configs import dify_config
+from controllers.trigger import bp
+from models.enums import AppTriggerStatus, AppTriggerType
+from models.trigger import AppTrigger, WorkflowWebhookTrigger
+from models.workflow import Workflow
+from services.trigger.webhook_route_cache import WebhookRouteCache
+from services.trigger.webhook_service import WebhookService
+
+CALL_COUNT = 200
+# nodes in the published workflow besides the webhook node, its graph is parsed to find the node config
+NODE_COUNT = 50
+APP_ID = str(uuid.uuid4())
+TENANT_ID = str(uuid.uuid4())
+WEBHOOK_ID = "benchmark-webhook"
+NODE_ID = "webhook_node"
+
+
+class _DictRedis:
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value.encode() if isinstance(value, str) else value
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+
+
+def _graph() -> dict:
+    nodes = [
+        {
+            "id": NODE_ID,
+            "data": {
+                "type": "trigger-webhook",
+                "title": "Webhook",
+                "method": "post",
+                "content_type": "application/json",
+            },
+        }
+    ]
+    nodes.extend(
+        {"id": f"llm_{i}", "data": {"type": "llm", "title": f"LLM {i}", "prompt_template": [{"text": "x" * 500}]}}
+        for i in range(NODE_COUNT)
+    )
+    return {"nodes": nodes, "edges": []}
+
+
+@pytest.fixture(scope="module")
+def client() -> Iterator:
+    engine = sa.create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    for model in (WorkflowWebhookTrigger, AppTrigger, Workflow):
+        model.__table__.create(engine)
+    with Session(engine) as session:
+        session.add(
+            WorkflowWebhookTrigger(
+                app_id=APP_ID, node_id=NODE_ID, tenant_id=TENANT_ID, webhook_id=WEBHOOK_ID, created_by="account"
+            )
+        )
+        session.add(
+            AppTrigger(
+                tenant_id=TENANT_ID,
+                app_id=APP_ID,
+                node_id=NODE_ID,
+                trigger_type=AppTriggerType.TRIGGER_WEBHOOK,
+                title="Webhook",
+                status=AppTriggerStatus.ENABLED,
+            )
+        )
+        session.add(
+            Workflow.new(
+                tenant_id=TENANT_ID,
+                app_id=APP_ID,
+                type="workflow",
+                version="2025-01-01 00:00:00",
+                graph=json.dumps(_graph()),
+                features="{}",
+                created_by="account",
+                environment_variables=[],
+                conversation_variables=[],
+                rag_pipeline_variables=[],
+            )
+        )
+        session.commit()
+
+    app = Flask(__name__)
+    app.register_blueprint(bp)
+    with (
+        patch("services.trigger.webhook_service.db", MagicMock(engine=engine)),
+        patch("services.trigger.webhook_route_cache.redis_client", _DictRedis()),
+        patch.object(WebhookService, "trigger_workflow_execution"),
+    ):
+        yield app.test_client()
+
+
+def _call_webhook(client) -> None:
+    for _ in range(CALL_COUNT):
+        response = client.post(f"/triggers/webhook/{WEBHOOK_ID}", json={"message": "hello"})
+        assert response.status_code == 200
+
+
+@pytest.mark.parametrize("cached", [True, False], ids=["route_cache", "no_route_cache"])
+def test_webhook_ingress_throughput(benchmark, client, cached):
+    benchmark.group = "webhook-ingress"
+    WebhookRouteCache._entries.clear()
+    with patch.object(dify_config, "WEBHOOK_ROUTE_CACHE_TTL", 300 if cached else 0):
+        benchmark.pedantic(_call_webhook, args=(client,), rounds=5, iterations=1)
+    benchmark.extra_info["calls_per_second"] = CALL_COUNT / benchmark.stats.stats.mean
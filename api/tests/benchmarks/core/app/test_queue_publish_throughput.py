@@ -0,0 +1,66 @@
+"""
+Measure how many stream chunks per second `AppQueueManager.publish` can push into its queue.
+
+`publish` is compared against the previous behaviour of dumping and walking every event
+before queueing it, which is kept here as the `full_check` baseline.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.app.apps.base_app_queue_manager import AppQueueManager, PublishFrom
+from core.app.entities.app_invoke_entities import InvokeFrom
+from core.app.entities.queue_entities import AppQueueEvent, QueueLLMChunkEvent, QueueTextChunkEvent
+from core.model_runtime.entities.llm_entities import LLMResultChunk, LLMResultChunkDelta
+from core.model_runtime.entities.message_entities import AssistantPromptMessage
+
+CHUNK_COUNT = 10_000
+
+
+class _DrainingQueueManager(AppQueueManager):
+    def _publish(self, event: AppQueueEvent, pub_from: PublishFrom):
+        self._q.put(event)
+
+
+class _FullCheckQueueManager(_DrainingQueueManager):
+    def publish(self, event: AppQueueEvent, pub_from: PublishFrom):
+        self._check_for_sqlalchemy_models(event.model_dump())
+        self._publish(event, pub_from)
+
+
+def _text_chunks() -> list[AppQueueEvent]:
+    return [QueueTextChunkEvent(text=f"token {i} ", in_iteration_id="iteration") for i in range(CHUNK_COUNT)]
+
+
+def _llm_chunks() -> list[AppQueueEvent]:
+    return [
+        QueueLLMChunkEvent(
+            chunk=LLMResultChunk(
+                model="gpt-4o",
+                delta=LLMResultChunkDelta(index=i, message=AssistantPromptMessage(content=f"token {i} ")),
+            )
+        )
+        for i in range(CHUNK_COUNT)
+    ]
+
+
+def _publish_all(manager: AppQueueManager, events: list[AppQueueEvent]) -> None:
+    for event in events:
+        manager.publish(event, PublishFrom.APPLICATION_MANAGER)
+    # Drain so queue growth does not skew later rounds.
+    manager._q.queue.clear()
+
+
+@pytest.mark.parametrize("events_factory", [_text_chunks, _llm_chunks], ids=["text_chunk", "llm_chunk"])
+@pytest.mark.parametrize(
+    "manager_cls", [_DrainingQueueManager, _FullCheckQueueManager], ids=["fast_path", "full_check"]
+)
+def test_chunk_publish_throughput(benchmark, manager_cls, events_factory):
+    benchmark.group = f"publish-{events_factory.__name__}"
+    with patch("core.app.apps.base_app_queue_manager.redis_client", new=MagicMock()):
+        manager = manager_cls(task_id="task", user_id="user", invoke_from=InvokeFrom.SERVICE_API)
+    events = events_factory()
+
+    benchmark.pedantic(_publish_all, args=(manager, events), rounds=10, iterations=1)
+    benchmark.extra_info["chunks_per_second"] = CHUNK_COUNT / benchmark.stats.stats.mean
@@ -0,0 +1,87 @@
+"""
+Measure how many Jinja2 templates per second `CodeExecutor.execute_workflow_code_template` renders.
+
+The in-process sandboxed renderer (`local`) is compared against the code execution service (`sandbox`).
+The service is replaced by a local stub that runs the generated runner script with `exec` in its own
+thread, so the remote numbers leave out the process the real sandbox starts for each run and are a
+lower bound of the remote cost.
+"""
+
+import contextlib
+import io
+import json
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+from yarl import URL
+
+from core.helper.code_executor.code_executor import CodeExecutor, CodeLanguage
+from core.helper.http_client_pooling import close_all_pooled_clients
+
+RENDER_COUNT = 200
+TEMPLATE = """\
+You are helping {{ user.name }}.
+{% for document in documents %}
+[{{ loop.index }}] {{ document.title | upper }}: {{ document.content | truncate(80) }}
+{% endfor %}
+Question: {{ query }}"""
+INPUTS = {
+    "user": {"name": "Alice"},
+    "documents": [{"title": f"document {i}", "content": "lorem ipsum dolor sit amet " * 10} for i in range(10)],
+    "query": "What is in the documents?",
+}
+
+
+class _StubSandboxHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # send headers and body in one segment so delayed ACKs do not dominate the timings
+    disable_nagle_algorithm = True
+    wbufsize = -1
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            exec(request["preload"], {"__name__": "__main__"})  # noqa: S102
+            exec(request["code"], {"__name__": "__main__"})  # noqa: S102
+        body = json.dumps({"code": 0, "message": "", "data": {"stdout": stdout.getvalue()}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def stub_sandbox_url() -> Iterator[URL]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubSandboxHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield URL(f"http://127.0.0.1:{server.server_address[1]}")
+    finally:
+        server.shutdown()
+        server.server_close()
+        close_all_pooled_clients()
+
+
+def _render_templates() -> None:
+    for _ in range(RENDER_COUNT):
+        CodeExecutor.execute_workflow_code_template(language=CodeLanguage.JINJA2, code=TEMPLATE, inputs=INPUTS)
+
+
+@pytest.mark.parametrize("engine", ["local", "sandbox"])
+def test_jinja2_render_throughput(benchmark, stub_sandbox_url, engine):
+    benchmark.group = "jinja2-render"
+    with (
+        patch("core.helper.code_executor.code_executor.code_execution_endpoint_url", stub_sandbox_url),
+        patch("core.helper.code_executor.code_executor.dify_config.CODE_EXECUTION_JINJA2_ENGINE", engine),
+    ):
+        benchmark.pedantic(_render_templates, rounds=5, iterations=1)
+    benchmark.extra_info["renders_per_second"] = RENDER_COUNT / benchmark.stats.stats.mean
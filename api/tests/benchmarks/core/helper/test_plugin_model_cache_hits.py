@@ -0,0 +1,94 @@
+"""
+Measure a process-cache hit of `PluginModelCache.get_model_providers`, which `ModelProviderFactory` goes through
+for every provider lookup.
+
+`shared` is a hit as it is now, handing out the cached entities. `deep_copy` adds the deep copy each hit used to
+make of the whole provider list, with all the model declarations of the tenant.
+"""
+
+import copy
+from collections import Counter
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+from cachetools import TTLCache
+
+from core.helper.plugin_model_cache import PluginModelCache
+from core.model_runtime.entities.common_entities import I18nObject
+from core.model_runtime.entities.model_entities import AIModelEntity, FetchFrom, ModelType, ParameterRule, ParameterType
+from core.model_runtime.entities.provider_entities import ConfigurateMethod, ProviderEntity
+from core.plugin.entities.plugin_daemon import PluginModelProviderEntity
+
+LOOKUPS = 20
+PROVIDER_COUNTS = [5, 20]
+MODELS_PER_PROVIDER = 30
+
+
+def _model(name: str) -> AIModelEntity:
+    return AIModelEntity(
+        model=name,
+        label=I18nObject(en_US=name, zh_Hans=name),
+        model_type=ModelType.LLM,
+        fetch_from=FetchFrom.PREDEFINED_MODEL,
+        model_properties={"mode": "chat", "context_size": 128000},
+        parameter_rules=[
+            ParameterRule(
+                name=rule,
+                label=I18nObject(en_US=rule),
+                type=ParameterType.FLOAT,
+                help=I18nObject(en_US="lorem ipsum " * 10),
+                min=0,
+                max=2,
+            )
+            for rule in ("temperature", "top_p", "presence_penalty", "frequency_penalty")
+        ],
+    )
+
+
+def _providers(count: int) -> list[PluginModelProviderEntity]:
+    return [
+        PluginModelProviderEntity(
+            id=f"provider-{i}",
+            created_at=datetime(2025, 1, 1),
+            updated_at=datetime(2025, 1, 1),
+            provider=f"provider_{i}",
+            tenant_id="tenant",
+            plugin_unique_identifier=f"langgenius/provider_{i}:0.0.1",
+            plugin_id=f"langgenius/provider_{i}",
+            declaration=ProviderEntity(
+                provider=f"langgenius/provider_{i}/provider_{i}",
+                label=I18nObject(en_US=f"Provider {i}"),
+                supported_model_types=[ModelType.LLM],
+                configurate_methods=[ConfigurateMethod.PREDEFINED_MODEL],
+                models=[_model(f"model-{i}-{j}") for j in range(MODELS_PER_PROVIDER)],
+            ),
+        )
+        for i in range(count)
+    ]
+
+
+def _lookup(strategy: str) -> None:
+    for _ in range(LOOKUPS):
+        providers = PluginModelCache.get_model_providers("tenant", list)
+        if strategy == "deep_copy":
+            copy.deepcopy(providers)
+
+
+@pytest.mark.parametrize("strategy", ["deep_copy", "shared"])
+@pytest.mark.parametrize("provider_count", PROVIDER_COUNTS)
+def test_plugin_model_providers_cache_hit(benchmark, strategy: str, provider_count: int):
+    redis_client = MagicMock()
+    redis_client.get.return_value = None
+    with (
+        patch.object(PluginModelCache, "_entries", TTLCache(maxsize=16, ttl=600)),
+        patch.object(PluginModelCache, "_counters", Counter()),
+        patch("core.helper.plugin_model_cache.redis_client", redis_client),
+    ):
+        providers = _providers(provider_count)
+        PluginModelCache.get_model_providers("tenant", lambda: providers)
+        benchmark.group = f"providers={provider_count} models={provider_count * MODELS_PER_PROVIDER}"
+
+        benchmark(_lookup, strategy)
+
+        assert PluginModelCache.stats()["misses"] == 1
@@ -0,0 +1,76 @@
+"""
+Measure how many requests per second `BasePluginClient` can send to a local stub plugin daemon.
+
+The pooled client is compared against the previous behaviour of calling the module-level
+`httpx.request` for every call, which opens a new connection each time (`per_request_connection`).
+"""
+
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import httpx
+import pytest
+from yarl import URL
+
+from core.helper.http_client_pooling import close_all_pooled_clients
+from core.plugin.impl.base import BasePluginClient
+
+REQUEST_COUNT = 200
+_RESPONSE_BODY = b'{"code": 0, "message": "", "data": true}'
+
+
+class _StubDaemonHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # send headers and body in one segment so delayed ACKs do not dominate the timings
+    disable_nagle_algorithm = True
+    wbufsize = -1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(_RESPONSE_BODY)))
+        self.end_headers()
+        self.wfile.write(_RESPONSE_BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def stub_daemon_url() -> Iterator[URL]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubDaemonHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield URL(f"http://127.0.0.1:{server.server_address[1]}")
+    finally:
+        server.shutdown()
+        server.server_close()
+        close_all_pooled_clients()
+
+
+def _send_requests(client: BasePluginClient) -> None:
+    for _ in range(REQUEST_COUNT):
+        client._request_with_plugin_daemon_response(
+            "POST",
+            "plugin/tenant/dispatch/llm/num_tokens",
+            bool,
+            data={"data": {"prompt_messages": []}},
+            headers={"Content-Type": "application/json"},
+        )
+
+
+@pytest.mark.parametrize("pooled", [True, False], ids=["pooled_client", "per_request_connection"])
+def test_plugin_daemon_request_throughput(benchmark, stub_daemon_url, pooled):
+    benchmark.group = "plugin-daemon-requests"
+    with patch("core.plugin.impl.base.plugin_daemon_inner_api_baseurl", stub_daemon_url):
+        if pooled:
+            benchmark.pedantic(_send_requests, args=(BasePluginClient(),), rounds=5, iterations=1)
+        else:
+            # the httpx module functions open and close a connection per call
+            with patch("core.plugin.impl.base._get_plugin_daemon_client", return_value=httpx):
+                benchmark.pedantic(_send_requests, args=(BasePluginClient(),), rounds=5, iterations=1)
+    benchmark.extra_info["requests_per_second"] = REQUEST_COUNT / benchmark.stats.stats.mean
@@ -0,0 +1,62 @@
+"""
+Measure keyword scoring of rerank candidates with `keyword_cosine_similarities`.
+
+It is compared against the previous pure Python TF-IDF and cosine loops, kept here as the
+`python_loops` baseline. Keywords are extracted up front so only the scoring is measured.
+"""
+
+import math
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from core.rag.rerank.similarity import keyword_cosine_similarities
+
+VOCABULARY_SIZE = 20_000
+KEYWORDS_PER_DOCUMENT = 40
+
+
+def _python_loops(query_keywords: list[str], documents_keywords: list[list[str]]) -> list[float]:
+    total_documents = len(documents_keywords)
+    all_keywords: set[str] = set()
+    for document_keywords in documents_keywords:
+        all_keywords.update(document_keywords)
+
+    keyword_idf = {}
+    for keyword in all_keywords:
+        doc_count_containing_keyword = sum(1 for doc_keywords in documents_keywords if keyword in doc_keywords)
+        keyword_idf[keyword] = math.log((1 + total_documents) / (1 + doc_count_containing_keyword)) + 1
+
+    query_tfidf = {keyword: count * keyword_idf.get(keyword, 0) for keyword, count in Counter(query_keywords).items()}
+
+    similarities = []
+    for document_keywords in documents_keywords:
+        document_tfidf = {
+            keyword: count * keyword_idf[keyword] for keyword, count in Counter(document_keywords).items()
+        }
+        intersection = set(query_tfidf.keys()) & set(document_tfidf.keys())
+        numerator = sum(query_tfidf[x] * document_tfidf[x] for x in intersection)
+        denominator = math.sqrt(sum(v**2 for v in query_tfidf.values())) * math.sqrt(
+            sum(v**2 for v in document_tfidf.values())
+        )
+        similarities.append(numerator / denominator if denominator else 0.0)
+    return similarities
+
+
+def _candidates(document_count: int) -> tuple[list[str], list[set[str]]]:
+    rng = np.random.default_rng(document_count)
+    documents_keywords = [
+        {f"keyword{i}" for i in rng.integers(0, VOCABULARY_SIZE, KEYWORDS_PER_DOCUMENT)} for _ in range(document_count)
+    ]
+    return [f"keyword{i}" for i in rng.integers(0, VOCABULARY_SIZE, 8)], documents_keywords
+
+
+@pytest.mark.parametrize("document_count", [50, 500, 5_000])
+@pytest.mark.parametrize("scorer", [keyword_cosine_similarities, _python_loops], ids=["vectorized", "python_loops"])
+def test_keyword_scoring(benchmark, scorer, document_count):
+    benchmark.group = f"keyword-scoring-{document_count}"
+    query_keywords, documents_keywords = _candidates(document_count)
+
+    scores = benchmark.pedantic(scorer, args=(query_keywords, documents_keywords), rounds=5, iterations=1)
+    assert len(scores) == document_count
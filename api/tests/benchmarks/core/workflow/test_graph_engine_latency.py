@@ -0,0 +1,77 @@
+"""
+Measure the scheduling overhead the graph engine adds per node.
+
+The workflow is a linear chain of variable aggregator nodes which do no real work, so the
+wall time of a run is almost entirely dispatcher and worker wake-up latency.
+"""
+
+import time
+
+import pytest
+
+from core.workflow.entities import GraphInitParams
+from core.workflow.graph import Graph
+from core.workflow.graph_engine import GraphEngine
+from core.workflow.graph_engine.command_channels import InMemoryChannel
+from core.workflow.graph_events import GraphRunSucceededEvent
+from core.workflow.nodes.node_factory import DifyNodeFactory
+from core.workflow.runtime import GraphRuntimeState, VariablePool
+from core.workflow.system_variable import SystemVariable
+
+
+def _linear_graph_config(node_count: int) -> dict:
+    nodes: list[dict] = [{"id": "start", "data": {"type": "start", "title": "Start", "variables": []}}]
+    edges: list[dict] = []
+    previous = "start"
+    for i in range(node_count):
+        node_id = f"aggregator_{i}"
+        nodes.append(
+            {
+                "id": node_id,
+                "data": {
+                    "type": "variable-aggregator",
+                    "title": node_id,
+                    "output_type": "string",
+                    "variables": [["sys", "user_id"]],
+                },
+            }
+        )
+        edges.append({"source": previous, "target": node_id})
+        previous = node_id
+    nodes.append({"id": "end", "data": {"type": "end", "title": "End", "outputs": []}})
+    edges.append({"source": previous, "target": "end"})
+    return {"nodes": nodes, "edges": edges}
+
+
+def _run_workflow(graph_config: dict) -> None:
+    variable_pool = VariablePool(system_variables=SystemVariable(user_id="user", app_id="app", workflow_id="workflow"))
+    runtime_state = GraphRuntimeState(variable_pool=variable_pool, start_at=time.perf_counter())
+    init_params = GraphInitParams(
+        tenant_id="tenant",
+        app_id="app",
+        workflow_id="workflow",
+        graph_config=graph_config,
+        user_id="user",
+        user_from="account",
+        invoke_from="debugger",
+        call_depth=0,
+    )
+    node_factory = DifyNodeFactory(graph_init_params=init_params, graph_runtime_state=runtime_state)
+    graph = Graph.init(graph_config=graph_config, node_factory=node_factory)
+    engine = GraphEngine(
+        workflow_id="workflow",
+        graph=graph,
+        graph_runtime_state=runtime_state,
+        command_channel=InMemoryChannel(),
+    )
+    events = list(engine.run())
+    assert isinstance(events[-1], GraphRunSucceededEvent)
+
+
+@pytest.mark.parametrize("node_count", [10, 50])
+def test_linear_workflow_overhead(benchmark, node_count: int):
+    graph_config = _linear_graph_config(node_count)
+
+    benchmark.pedantic(_run_workflow, args=(graph_config,), rounds=10, iterations=1)
+    # Start and end nodes are trivial as well, count them in.
+    benchmark.extra_info["overhead_per_node_ms"] = benchmark.stats.stats.mean * 1000 / (node_count + 2)
@@ -0,0 +1,92 @@
+"""
+Compare building an iteration sub-graph per item from the full workflow config against
+instantiating it from a compiled `GraphTemplate`.
+"""
+
+import time
+
+import pytest
+
+from core.workflow.entities import GraphInitParams
+from core.workflow.graph import Graph, GraphTemplate
+from core.workflow.graph_engine import GraphEngine
+from core.workflow.graph_engine.command_channels import InMemoryChannel
+from core.workflow.nodes.node_factory import DifyNodeFactory
+from core.workflow.runtime import GraphRuntimeState, VariablePool
+from core.workflow.system_variable import SystemVariable
+
+ITEMS = 100
+
+
+def _code_node(node_id: str, **extra) -> dict:
+    return {
+        "id": node_id,
+        "data": {
+            "type": "code",
+            "title": node_id,
+            "code_language": "python3",
+            "code": "def main(x):\n    return {'result': x}\n",
+            "variables": [{"variable": "x", "value_selector": ["start", "x"]}],
+            "outputs": {"result": {"type": "string"}},
+            **extra,
+        },
+    }
+
+
+def _graph_config(outer_nodes: int) -> dict:
+    nodes = [{"id": "start", "data": {"type": "start", "title": "start", "variables": []}}]
+    edges = []
+    previous = "start"
+    for i in range(outer_nodes):
+        nodes.append(_code_node(f"outer_{i}"))
+        edges.append({"source": previous, "target": f"outer_{i}"})
+        previous = f"outer_{i}"
+    nodes.append({"id": "iteration_start", "data": {"type": "iteration-start", "title": "start"}})
+    previous = "iteration_start"
+    for i in range(3):
+        nodes.append(_code_node(f"inner_{i}", iteration_id="iteration"))
+        edges.append({"source": previous, "target": f"inner_{i}"})
+        previous = f"inner_{i}"
+    return {"nodes": nodes, "edges": edges}
+
+
+def _build_engines(graph_config: dict, strategy: str) -> None:
+    pool = VariablePool(system_variables=SystemVariable(user_id="user", app_id="app", workflow_id="workflow"))
+    init_params = GraphInitParams(
+        tenant_id="tenant",
+        app_id="app",
+        workflow_id="workflow",
+        graph_config=graph_config,
+        user_id="user",
+        user_from="account",
+        invoke_from="debugger",
+        call_depth=0,
+    )
+    template = GraphTemplate.from_graph_config(graph_config, root_node_id="iteration_start")
+    for _ in range(ITEMS):
+        runtime_state = GraphRuntimeState(variable_pool=pool.create_child(), start_at=time.perf_counter())
+        if strategy == "full_graph_config":
+            node_factory = DifyNodeFactory(graph_init_params=init_params, graph_runtime_state=runtime_state)
+            graph = Graph.init(graph_config=graph_config, node_factory=node_factory, root_node_id="iteration_start")
+        else:
+            node_factory = DifyNodeFactory(
+                graph_init_params=init_params,
+                graph_runtime_state=runtime_state,
+                node_data_cache=template.node_data_cache,
+            )
+            graph = Graph.init_from_template(template=template, node_factory=node_factory)
+        GraphEngine(
+            workflow_id="workflow",
+            graph=graph,
+            graph_runtime_state=runtime_state,
+            command_channel=InMemoryChannel(),
+        )
+
+
+@pytest.mark.parametrize("strategy", ["full_graph_config", "template"])
+@pytest.mark.parametrize("outer_nodes", [5, 50])
+def test_iteration_sub_graph_construction(benchmark, strategy: str, outer_nodes: int):
+    graph_config = _graph_config(outer_nodes)
+    benchmark.group = f"outer_nodes={outer_nodes} items={ITEMS}"
+
+    benchmark.pedantic(_build_engines, args=(graph_config, strategy), rounds=5, iterations=1)
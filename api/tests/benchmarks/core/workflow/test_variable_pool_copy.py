@@ -0,0 +1,50 @@
+"""
+Compare the per-item cost of isolating an iteration's variable pool.
+
+`deep_copy` is how iteration sub-graphs used to get their pool, `create_child` is the
+copy-on-write layer used now. Both are measured while the item count and the size of the
+upstream outputs grow.
+"""
+
+import pytest
+
+from core.variables.segments import ArrayObjectSegment, StringSegment
+from core.workflow.runtime import VariablePool
+from core.workflow.system_variable import SystemVariable
+
+ITEM_COUNTS = [10, 100, 1000]
+POOL_SIZES = [10, 100]
+
+
+def _build_pool(upstream_nodes: int) -> VariablePool:
+    pool = VariablePool(system_variables=SystemVariable(user_id="user", app_id="app", workflow_id="workflow"))
+    for i in range(upstream_nodes):
+        # Roughly a page of retrieved documents per upstream node.
+        documents = [{"content": "lorem ipsum " * 40, "metadata": {"score": 0.5, "position": j}} for j in range(20)]
+        pool.add((f"node_{i}", "result"), ArrayObjectSegment(value=documents))
+        pool.add((f"node_{i}", "text"), StringSegment(value="x" * 4096))
+    return pool
+
+
+def _isolate(pool: VariablePool, items: int, strategy: str) -> None:
+    for index in range(items):
+        if strategy == "deep_copy":
+            scoped = pool.model_copy(deep=True)
+        else:
+            scoped = pool.create_child()
+        scoped.add(("iteration", "index"), index)
+        scoped.add(("iteration", "item"), index)
+
+
+@pytest.mark.parametrize("strategy", ["deep_copy", "create_child"])
+@pytest.mark.parametrize("pool_size", POOL_SIZES)
+@pytest.mark.parametrize("items", ITEM_COUNTS)
+def test_iteration_pool_isolation(benchmark, measure_memory, strategy: str, pool_size: int, items: int):
+    if strategy == "deep_copy" and items * pool_size > 10_000:
+        pytest.skip("deep copy at this scale takes minutes")
+
+    pool = _build_pool(pool_size)
+    benchmark.group = f"pool_size={pool_size} items={items}"
+
+    with measure_memory():
+        benchmark.pedantic(_isolate, args=(pool, items, strategy), rounds=3, iterations=1)
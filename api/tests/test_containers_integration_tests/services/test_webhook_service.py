@@ -446,7 +446,7 @@ class TestWebhookService:
 
                     # Should not raise any exceptions
                     WebhookService.trigger_workflow_execution(
-                        test_data["webhook_trigger"], webhook_data, test_data["workflow"]
+                        test_data["webhook_trigger"], webhook_data, test_data["workflow"].id
                     )
 
                     # Verify AsyncWorkflowService was called
@@ -467,7 +467,7 @@ class TestWebhookService:
 
                 with pytest.raises(ValueError, match="Failed to create end user"):
                     WebhookService.trigger_workflow_execution(
-                        test_data["webhook_trigger"], webhook_data, test_data["workflow"]
+                        test_data["webhook_trigger"], webhook_data, test_data["workflow"].id
                     )
 
     def test_generate_webhook_response_default(self):
@@ -64,7 +64,7 @@ class TestCleanDatasetTask:
     def mock_external_service_dependencies(self):
         """Mock setup for external service dependencies."""
         with (
-            patch("tasks.clean_dataset_task.storage") as mock_storage,
+            patch("services.dataset_cleanup_service.storage") as mock_storage,
             patch("tasks.clean_dataset_task.IndexProcessorFactory") as mock_index_processor_factory,
         ):
             # Setup default mock returns
@@ -614,7 +614,7 @@ class TestCleanDatasetTask:
         db.session.commit()
 
         # Mock the get_image_upload_file_ids function to return our image file IDs
-        with patch("tasks.clean_dataset_task.get_image_upload_file_ids") as mock_get_image_ids:
+        with patch("services.dataset_cleanup_service.get_image_upload_file_ids") as mock_get_image_ids:
             mock_get_image_ids.return_value = [f.id for f in image_files]
 
             # Execute the task
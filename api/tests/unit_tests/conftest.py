@@ -102,3 +102,19 @@ def reset_secret_key():
         yield
     finally:
         dify_config.SECRET_KEY = original
+
+
+@pytest.fixture(autouse=True)
+def clear_process_caches(monkeypatch):
+    """Drop the process-wide caches so cached entries never leak between tests."""
+
+    from configs import dify_config
+    from core.file.file_content_cache import FileContentCache
+    from core.helper.plugin_model_cache import PluginModelCache
+    from core.helper.provider_configurations_cache import ProviderConfigurationsCache
+
+    PluginModelCache._entries.clear()
+    ProviderConfigurationsCache._entries.clear()
+    FileContentCache.clear()
+    # tests that cover the disk tier point it at their own directory
+    monkeypatch.setattr(dify_config, "FILE_CONTENT_CACHE_DISK_MAX_BYTES", 0)
@@ -0,0 +1,110 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.app.apps.base_app_queue_manager import (
+    AppQueueManager,
+    PublishFrom,
+    _fields_to_check_for_sqlalchemy_models,
+)
+from core.app.entities.app_invoke_entities import InvokeFrom
+from core.app.entities.queue_entities import (
+    AppQueueEvent,
+    QueueAgentLogEvent,
+    QueueLLMChunkEvent,
+    QueuePingEvent,
+    QueueStopEvent,
+    QueueTextChunkEvent,
+)
+
+
+class _FakeModel:
+    """Mimics a SQLAlchemy mapped instance."""
+
+    _sa_instance_state = object()
+
+
+class _CollectingQueueManager(AppQueueManager):
+    def __init__(self, task_id: str = "task-id"):
+        with patch("core.app.apps.base_app_queue_manager.redis_client"):
+            super().__init__(task_id=task_id, user_id="user-id", invoke_from=InvokeFrom.SERVICE_API)
+        self.published: list[AppQueueEvent] = []
+
+    def _publish(self, event: AppQueueEvent, pub_from: PublishFrom):
+        self.published.append(event)
+
+
+@pytest.mark.parametrize("event_type", [QueueTextChunkEvent, QueueLLMChunkEvent, QueuePingEvent])
+def test_plain_data_events_need_no_check(event_type):
+    assert _fields_to_check_for_sqlalchemy_models(event_type) == frozenset()
+
+
+def test_fields_that_may_hold_arbitrary_objects_are_checked():
+    assert _fields_to_check_for_sqlalchemy_models(QueueAgentLogEvent) == {"data", "metadata"}
+
+
+def test_publish_chunk_event_skips_model_dump():
+    manager = _CollectingQueueManager()
+    event = QueueTextChunkEvent(text="hello")
+
+    with patch.object(QueueTextChunkEvent, "model_dump", side_effect=AssertionError("should not dump")):
+        manager.publish(event, PublishFrom.APPLICATION_MANAGER)
+
+    assert manager.published == [event]
+
+
+def test_publish_rejects_sqlalchemy_model_in_untyped_field():
+    manager = _CollectingQueueManager()
+    event = QueueAgentLogEvent(
+        id="log-id",
+        label="label",
+        node_execution_id="node-execution-id",
+        status="success",
+        data={"nested": [{"record": _FakeModel()}]},
+        node_id="node-id",
+    )
+
+    with pytest.raises(TypeError, match="SQLAlchemy"):
+        manager.publish(event, PublishFrom.APPLICATION_MANAGER)
+
+    assert manager.published == []
+
+
+def test_is_stopped_checks_redis_at_most_once_per_interval():
+    manager = _CollectingQueueManager()
+
+    with patch("core.app.apps.base_app_queue_manager.redis_client", new=MagicMock()) as redis:
+        redis.get.return_value = None
+        assert not any(manager._is_stopped() for _ in range(1000))
+        assert redis.get.call_count == 1
+
+        manager._next_stop_check_at = 0.0
+        redis.get.return_value = b"1"
+        assert manager._is_stopped()
+        # a stop is sticky and needs no further round trips
+        assert manager._is_stopped()
+        assert redis.get.call_count == 2
+
+
+def test_stop_flag_reaches_local_manager_without_redis_check():
+    manager = _CollectingQueueManager(task_id="local-task-id")
+
+    with patch("core.app.apps.base_app_queue_manager.redis_client", new=MagicMock()) as redis:
+        AppQueueManager.set_stop_flag_no_user_check("local-task-id")
+
+        assert manager._is_stopped()
+        redis.get.assert_not_called()
+
+    assert len(manager.published) == 1
+    assert isinstance(manager.published[0], QueueStopEvent)
+
+
+def test_stop_listen_unregisters_local_manager():
+    manager = _CollectingQueueManager(task_id="finished-task-id")
+
+    with patch("core.app.apps.base_app_queue_manager.redis_client", new=MagicMock()):
+        manager.stop_listen()
+        AppQueueManager.set_stop_flag_no_user_check("finished-task-id")
+
+    assert manager.published == []
+    assert not manager._stopped
@@ -0,0 +1,186 @@
+import base64
+import os
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from core.file import File, FileTransferMethod, FileType, file_manager
+from core.file.file_content_cache import FileContentCache
+
+
+@pytest.fixture
+def mock_storage():
+    with patch("core.file.file_content_cache.storage") as mock:
+        mock.load.side_effect = lambda key, stream: f"content of {key}".encode()
+        yield mock
+
+
+@pytest.fixture
+def disk_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr("core.file.file_content_cache.dify_config.FILE_CONTENT_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr("core.file.file_content_cache.dify_config.FILE_CONTENT_CACHE_DISK_MAX_BYTES", 1024)
+    FileContentCache._disk_usage.clear()
+    yield tmp_path
+    FileContentCache._disk_usage.clear()
+
+
+def _response(status_code: int, content: bytes = b"", headers: dict | None = None) -> httpx.Response:
+    return httpx.Response(
+        status_code, content=content, headers=headers, request=httpx.Request("GET", "https://example.com/a.pdf")
+    )
+
+
+def test_storage_file_is_loaded_once(mock_storage):
+    assert FileContentCache.get_storage_file("upload_files/a.pdf") == b"content of upload_files/a.pdf"
+    assert FileContentCache.get_storage_file("upload_files/a.pdf") == b"content of upload_files/a.pdf"
+
+    mock_storage.load.assert_called_once_with("upload_files/a.pdf", stream=False)
+
+
+def test_base64_view_is_cached(mock_storage):
+    with patch("base64.b64encode", wraps=base64.b64encode) as encode:
+        first = FileContentCache.get_storage_file_base64("upload_files/a.pdf")
+        second = FileContentCache.get_storage_file_base64("upload_files/a.pdf")
+
+    assert first == second == "Y29udGVudCBvZiB1cGxvYWRfZmlsZXMvYS5wZGY="
+    encode.assert_called_once()
+    mock_storage.load.assert_called_once()
+
+
+def test_files_over_the_item_limit_are_not_cached(mock_storage):
+    with patch("core.file.file_content_cache.dify_config.FILE_CONTENT_CACHE_MAX_ITEM_BYTES", 4):
+        FileContentCache.get_storage_file("upload_files/a.pdf")
+        FileContentCache.get_storage_file("upload_files/a.pdf")
+
+    assert mock_storage.load.call_count == 2
+
+
+def test_disk_tier_is_shared_between_processes(mock_storage, disk_cache):
+    FileContentCache.get_storage_file("upload_files/a.pdf")
+    # another process starts with an empty memory tier
+    FileContentCache.clear()
+
+    assert FileContentCache.get_storage_file("upload_files/a.pdf") == b"content of upload_files/a.pdf"
+    mock_storage.load.assert_called_once()
+    assert len(list(disk_cache.iterdir())) == 1
+
+
+def test_disk_tier_evicts_least_recently_read_files(mock_storage, disk_cache):
+    mock_storage.load.side_effect = lambda key, stream: b"x" * 300
+    for index, key in enumerate(["a", "b", "c"]):
+        FileContentCache.get_storage_file(key)
+        path = FileContentCache._disk_path(f"storage:{key}")
+        assert path is not None
+        os.utime(path, (index, index))
+
+    FileContentCache.get_storage_file("d")
+
+    remaining = {path.name for path in disk_cache.iterdir()}
+    expected = {FileContentCache._disk_path(f"storage:{key}") for key in ["b", "c", "d"]}
+    assert remaining == {path.name for path in expected if path is not None}
+
+
+def test_disk_tier_accounts_for_files_written_by_other_processes(mock_storage, disk_cache):
+    mock_storage.load.side_effect = lambda key, stream: b"x" * 50
+    FileContentCache.get_storage_file("a")
+    # written by another process after this one scanned the directory
+    other_process_file = disk_cache / "other-process-file"
+    other_process_file.write_bytes(b"x" * 900)
+    os.utime(other_process_file, (0, 0))
+
+    mock_storage.load.side_effect = lambda key, stream: b"x" * 150
+    FileContentCache.get_storage_file("b")
+
+    assert not other_process_file.exists()
+    assert len(list(disk_cache.iterdir())) == 2
+
+
+def test_disk_tier_deletes_stale_temporary_files(mock_storage, disk_cache):
+    stale_file, partial_file = disk_cache / ".stale", disk_cache / ".partial"
+    stale_file.write_bytes(b"x")
+    os.utime(stale_file, (0, 0))
+    partial_file.write_bytes(b"x")
+
+    FileContentCache.get_storage_file("a")
+
+    assert not stale_file.exists()
+    # still being written by another process
+    assert partial_file.exists()
+
+
+def test_remote_file_is_revalidated_with_its_etag():
+    get = MagicMock(
+        side_effect=[
+            _response(200, b"remote", {"ETag": '"v1"', "Content-Type": "application/pdf"}),
+            _response(304),
+        ]
+    )
+    with patch("core.file.file_content_cache.ssrf_proxy.get", get):
+        first = FileContentCache.get_remote_file("https://example.com/a.pdf", follow_redirects=True)
+        second = FileContentCache.get_remote_file("https://example.com/a.pdf", follow_redirects=True)
+
+    assert first.content == second.content == b"remote"
+    assert second.headers["Content-Type"] == "application/pdf"
+    assert get.call_args_list[1].kwargs == {"headers": {"If-None-Match": '"v1"'}, "follow_redirects": True}
+
+
+def test_changed_remote_file_replaces_cached_contents():
+    get = MagicMock(
+        side_effect=[
+            _response(200, b"old", {"ETag": '"v1"'}),
+            _response(200, b"new", {"ETag": '"v2"'}),
+            _response(304),
+        ]
+    )
+    with patch("core.file.file_content_cache.ssrf_proxy.get", get):
+        assert FileContentCache.get_remote_file("https://example.com/a.pdf").content == b"old"
+        assert FileContentCache.get_remote_file("https://example.com/a.pdf").content == b"new"
+        assert FileContentCache.get_remote_file("https://example.com/a.pdf").content == b"new"
+
+    assert get.call_args_list[2].kwargs["headers"] == {"If-None-Match": '"v2"'}
+
+
+def test_remote_file_without_validator_is_not_cached():
+    get = MagicMock(side_effect=[_response(200, b"first"), _response(200, b"second")])
+    with patch("core.file.file_content_cache.ssrf_proxy.get", get):
+        assert FileContentCache.get_remote_file_base64("https://example.com/a.pdf") == "Zmlyc3Q="
+        assert FileContentCache.get_remote_file_base64("https://example.com/a.pdf") == "c2Vjb25k"
+
+    assert all("headers" not in call.kwargs for call in get.call_args_list)
+
+
+def test_file_manager_reads_file_once_across_download_and_base64(mock_storage):
+    file = File(
+        tenant_id="tenant",
+        type=FileType.DOCUMENT,
+        transfer_method=FileTransferMethod.LOCAL_FILE,
+        related_id="upload-file-id",
+        extension=".pdf",
+        mime_type="application/pdf",
+        storage_key="upload_files/a.pdf",
+    )
+
+    assert file_manager.download(file) == b"content of upload_files/a.pdf"
+    assert file_manager._get_encoded_string(file) == "Y29udGVudCBvZiB1cGxvYWRfZmlsZXMvYS5wZGY="
+    mock_storage.load.assert_called_once()
+
+
+def test_file_manager_streams_storage_files_unless_cached(mock_storage):
+    mock_storage.load_stream.side_effect = lambda key: iter([b"chunk 1", b"chunk 2"])
+    file = File(
+        tenant_id="tenant",
+        type=FileType.DOCUMENT,
+        transfer_method=FileTransferMethod.LOCAL_FILE,
+        related_id="upload-file-id",
+        extension=".csv",
+        mime_type="text/csv",
+        storage_key="upload_files/a.csv",
+    )
+
+    with patch("core.file.file_manager.storage", mock_storage):
+        assert list(file_manager.download_stream(file)) == [b"chunk 1", b"chunk 2"]
+
+        file_manager.download(file)
+        assert list(file_manager.download_stream(file)) == [b"content of upload_files/a.csv"]
+    mock_storage.load_stream.assert_called_once_with("upload_files/a.csv")
@@ -10,3 +10,12 @@ def test_get_runner_script():
     code_lines = code.splitlines()
     # Check that the first lines of script are exactly the same as code
     assert script_lines[: len(code_lines)] == code_lines
+
+
+def test_get_batch_runner_script():
+    code = JavascriptCodeProvider.get_default_code()
+    script, _ = NodeJsTemplateTransformer.transform_batch_caller(code, [{"arg1": "a", "arg2": "b"}] * 2)
+    script_lines = script.splitlines()
+    code_lines = code.splitlines()
+    assert script_lines[: len(code_lines)] == code_lines
+    assert NodeJsTemplateTransformer._inputs_placeholder not in script
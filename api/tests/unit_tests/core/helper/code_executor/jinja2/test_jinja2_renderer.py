@@ -0,0 +1,155 @@
+from unittest.mock import patch
+
+import pytest
+
+from core.helper.code_executor.code_executor import CodeExecutionError, CodeExecutor, CodeLanguage
+from core.helper.code_executor.jinja2.jinja2_renderer import (
+    Jinja2Renderer,
+    Jinja2RenderError,
+    Jinja2UnsafeTemplateError,
+)
+
+
+def test_render():
+    template = "Hello {{ name }}!{% for item in items %} {{ item.title }}{% endfor %}"
+    inputs = {"name": "World", "items": [{"title": "a"}, {"title": "b"}]}
+
+    assert Jinja2Renderer.render(template, inputs) == "Hello World! a b"
+
+
+def test_render_matches_sandbox_whitespace_handling():
+    assert Jinja2Renderer.render("{{ a }}\n", {"a": 1}) == "1"
+    assert Jinja2Renderer.render("{{ missing }}", {}) == ""
+
+
+def test_compiled_templates_are_cached():
+    template = "cached {{ value }}"
+    with patch.object(Jinja2Renderer._environment, "from_string", wraps=Jinja2Renderer._environment.from_string) as spy:
+        assert Jinja2Renderer.render(template, {"value": 1}) == "cached 1"
+        assert Jinja2Renderer.render(template, {"value": 2}) == "cached 2"
+
+    spy.assert_called_once_with(template)
+
+
+def test_unsafe_template_is_rejected():
+    with pytest.raises(Jinja2UnsafeTemplateError):
+        Jinja2Renderer.render("{{ ''.__class__.__mro__ }}{{ x.__init__.__globals__ }}", {"x": "a"})
+
+
+def test_syntax_error():
+    with pytest.raises(Jinja2RenderError, match="TemplateSyntaxError"):
+        Jinja2Renderer.render("{% for %}", {})
+
+
+def test_output_length_limit():
+    with patch(
+        "core.helper.code_executor.jinja2.jinja2_renderer.dify_config.CODE_EXECUTION_JINJA2_MAX_OUTPUT_LENGTH", 100
+    ):
+        with pytest.raises(Jinja2RenderError, match="exceeds 100 characters"):
+            Jinja2Renderer.render("{% for i in range(1000) %}{{ i }}{% endfor %}", {})
+        with pytest.raises(Jinja2RenderError, match="exceeds 100 characters"):
+            Jinja2Renderer.render("{{ 'a' * 1000 }}", {})
+        with pytest.raises(Jinja2RenderError, match="exceeds 100 characters"):
+            Jinja2Renderer.render("{{ 10 ** 1000 }}", {})
+
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        "{{ 'a' | center(10 ** 6) }}",
+        "{{ 'a'.ljust(10 ** 6) }}",
+        "{{ 'a'['rjust'](10 ** 6) }}",
+        "{{ 'a'.zfill(10 ** 6) }}",
+        "{{ ('a' ~ '\t').expandtabs(10 ** 6) }}",
+        "{{ ('a' * 50).replace('', 'b' * 50) }}",
+        "{{ ('a' * 50) | replace('a', 'b' * 50) }}",
+        "{{ ('a' * 50).join(range(50)) }}",
+        "{{ range(50) | join('a' * 50) }}",
+        "{{ '{:>1000000}'.format('a') }}",
+        "{{ '{:>{}}'.format('a', 10 ** 6) }}",
+        "{{ '{a:.1000000f}'.format_map({'a': 1}) }}",
+        "{{ '%1000000s' % 'a' }}",
+        "{{ '%*s' % (10 ** 6, 'a') }}",
+        "{{ '%1000000s' | format('a') }}",
+        "{{ ('a\n' * 50) | indent(10 ** 6) }}",
+        "{{ ('a ' * 50) | wordwrap(1, wrapstring='b' * 50) }}",
+        "{{ range(50) | list | tojson(10 ** 6) }}",
+        "{{ [1] | batch(10 ** 6, 0) | list }}",
+        "{{ [1] | slice(10 ** 6) | list }}",
+        "{% set items = ['a'] * 60 %}{% set _ = items.extend(items) %}",
+        "{% set text = 'a' * 60 %}{{ text + text }}",
+    ],
+)
+def test_output_length_limit_of_size_building_calls(template):
+    with patch(
+        "core.helper.code_executor.jinja2.jinja2_renderer.dify_config.CODE_EXECUTION_JINJA2_MAX_OUTPUT_LENGTH", 100
+    ):
+        with pytest.raises(Jinja2RenderError, match="exceeds 100 characters"):
+            Jinja2Renderer.render(template, {})
+
+
+def test_size_building_calls_within_the_limit():
+    template = (
+        "{{ 'a' | center(5) }}|{{ 'a'.ljust(3) }}|{{ 'a-b'.replace('-', '+') }}|{{ ','.join(['x', 'y']) }}|"
+        "{{ '{:>3}'.format(1) }}|{{ '%03d' % 7 }}|{{ 'line' | indent(2) }}|{{ [1, 2] | join(', ') }}"
+    )
+
+    assert Jinja2Renderer.render(template, {}) == "  a  |a  |a+b|x,y|  1|007|line|1, 2"
+
+
+def test_cpu_time_limit():
+    template = "{% for i in range(100000) %}{% for j in range(100000) %}{% endfor %}{% endfor %}"
+    with patch(
+        "core.helper.code_executor.jinja2.jinja2_renderer.dify_config.CODE_EXECUTION_JINJA2_CPU_TIME_LIMIT", 0.05
+    ):
+        with pytest.raises(Jinja2RenderError, match="CPU time limit"):
+            Jinja2Renderer.render(template, {})
+
+
+@pytest.fixture
+def local_engine():
+    with patch("core.helper.code_executor.code_executor.dify_config.CODE_EXECUTION_JINJA2_ENGINE", "local"):
+        yield
+
+
+def test_code_executor_renders_jinja2_locally(local_engine):
+    with patch.object(CodeExecutor, "execute_code") as execute_code:
+        result = CodeExecutor.execute_workflow_code_template(
+            language=CodeLanguage.JINJA2, code="Hello {{ template }}", inputs={"template": "World"}
+        )
+
+    assert result == {"result": "Hello World"}
+    execute_code.assert_not_called()
+
+
+def test_code_executor_falls_back_to_sandbox_for_unsafe_templates(local_engine):
+    with patch.object(CodeExecutor, "execute_code", return_value="<<RESULT>>ok<<RESULT>>\n") as execute_code:
+        result = CodeExecutor.execute_workflow_code_template(
+            language=CodeLanguage.JINJA2, code="{{ ''.__class__.__mro__ }}", inputs={}
+        )
+
+    assert result == {"result": "ok"}
+    execute_code.assert_called_once()
+
+
+def test_code_executor_without_fallback_raises(local_engine):
+    with (
+        patch("core.helper.code_executor.code_executor.dify_config.CODE_EXECUTION_JINJA2_SANDBOX_FALLBACK", False),
+        patch.object(CodeExecutor, "execute_code") as execute_code,
+    ):
+        with pytest.raises(CodeExecutionError):
+            CodeExecutor.execute_workflow_code_template(
+                language=CodeLanguage.JINJA2, code="{{ ''.__class__.__mro__ }}", inputs={}
+            )
+
+    execute_code.assert_not_called()
+
+
+def test_code_executor_sandbox_engine_by_default():
+    with patch.object(CodeExecutor, "execute_code", return_value="<<RESULT>>remote<<RESULT>>\n") as execute_code:
+        result = CodeExecutor.execute_workflow_code_template(
+            language=CodeLanguage.JINJA2, code="{{ a }}", inputs={"a": "local"}
+        )
+
+    assert result == {"result": "remote"}
+    execute_code.assert_called_once()
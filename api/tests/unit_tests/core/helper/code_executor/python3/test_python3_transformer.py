@@ -1,3 +1,6 @@
+import contextlib
+import io
+
 from core.helper.code_executor.python3.python3_code_provider import Python3CodeProvider
 from core.helper.code_executor.python3.python3_transformer import Python3TemplateTransformer
 
@@ -10,3 +13,17 @@ def test_get_runner_script():
     code_lines = code.splitlines()
     # Check that the first lines of script are exactly the same as code
     assert script_lines[: len(code_lines)] == code_lines
+
+
+def test_batch_runner_reports_each_call():
+    code = "def main(a: int) -> dict:\n    return {'b': 10 // a}\n"
+    runner, _ = Python3TemplateTransformer.transform_batch_caller(code, [{"a": 2}, {"a": 0}, {"a": 5}])
+    stdout = io.StringIO()
+    with contextlib.redirect_stdout(stdout):
+        exec(runner, {"__name__": "__main__"})  # noqa: S102
+
+    first, second, third = Python3TemplateTransformer.transform_batch_response(stdout.getvalue())
+    assert first == {"b": 5}
+    assert isinstance(second, ValueError)
+    assert "ZeroDivisionError" in str(second)
+    assert third == {"b": 2}
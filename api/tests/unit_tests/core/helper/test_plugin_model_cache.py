@@ -0,0 +1,134 @@
+from collections import Counter
+from unittest.mock import MagicMock, patch
+
+import pytest
+from cachetools import TTLCache
+
+from core.helper.plugin_model_cache import PluginModelCache
+from core.model_runtime.entities.common_entities import I18nObject
+from core.model_runtime.entities.model_entities import AIModelEntity, FetchFrom, ModelType
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    with (
+        patch.object(PluginModelCache, "_entries", TTLCache(maxsize=16, ttl=60)),
+        patch.object(PluginModelCache, "_counters", Counter()),
+    ):
+        yield
+
+
+@pytest.fixture
+def mock_redis_client():
+    with patch("core.helper.plugin_model_cache.redis_client") as mock:
+        mock.get.return_value = None
+        yield mock
+
+
+def _schema(model: str = "gpt-4o") -> AIModelEntity:
+    return AIModelEntity(
+        model=model,
+        label=I18nObject(en_US=model),
+        model_type=ModelType.LLM,
+        fetch_from=FetchFrom.PREDEFINED_MODEL,
+        model_properties={},
+    )
+
+
+def test_schema_is_loaded_once_and_shared(mock_redis_client):
+    loader = MagicMock(return_value=_schema())
+
+    first = PluginModelCache.get_model_schema("tenant-1", "key", loader)
+    second = PluginModelCache.get_model_schema("tenant-1", "key", loader)
+
+    loader.assert_called_once()
+    # hits hand out the cached instance without copying it
+    assert first is second
+    assert PluginModelCache.stats() == {"hits": 1, "redis_hits": 0, "misses": 1}
+
+
+def test_missing_schema_is_not_cached(mock_redis_client):
+    loader = MagicMock(return_value=None)
+
+    assert PluginModelCache.get_model_schema("tenant-1", "key", loader) is None
+    assert PluginModelCache.get_model_schema("tenant-1", "key", loader) is None
+
+    assert loader.call_count == 2
+
+
+def test_version_bump_invalidates_entries(mock_redis_client):
+    loader = MagicMock(side_effect=[_schema("a"), _schema("b")])
+    PluginModelCache.get_model_schema("tenant-1", "key", loader)
+
+    # another process bumped the version of the tenant
+    mock_redis_client.get.side_effect = lambda key: b"1" if key.startswith("plugin_model_cache:version") else None
+    schema = PluginModelCache.get_model_schema("tenant-1", "key", loader)
+
+    assert schema is not None
+    assert schema.model == "b"
+
+
+def test_invalidate_drops_local_entries_of_tenant(mock_redis_client):
+    providers_loader = MagicMock(return_value=[])
+    schema_loader = MagicMock(return_value=_schema())
+    PluginModelCache.get_model_providers("tenant-1", providers_loader)
+    PluginModelCache.get_model_schema("tenant-2", "key", schema_loader)
+
+    PluginModelCache.invalidate("tenant-1")
+    PluginModelCache.get_model_providers("tenant-1", providers_loader)
+    PluginModelCache.get_model_schema("tenant-2", "key", schema_loader)
+
+    assert providers_loader.call_count == 2
+    schema_loader.assert_called_once()
+    mock_redis_client.incr.assert_called_once_with("plugin_model_cache:version:tenant_id:tenant-1")
+
+
+def test_redis_tier_is_shared_between_processes(mock_redis_client):
+    cached = _schema().model_dump_json().encode()
+    mock_redis_client.get.side_effect = lambda key: None if key.startswith("plugin_model_cache:version") else cached
+    loader = MagicMock()
+
+    with patch("core.helper.plugin_model_cache.dify_config.PLUGIN_MODEL_CACHE_REDIS_ENABLED", True):
+        schema = PluginModelCache.get_model_schema("tenant-1", "key", loader)
+
+    loader.assert_not_called()
+    assert schema == _schema()
+    assert PluginModelCache.stats()["redis_hits"] == 1
+
+
+def test_zero_ttl_disables_cache(mock_redis_client):
+    loader = MagicMock(return_value=_schema())
+
+    with patch("core.helper.plugin_model_cache.dify_config.PLUGIN_MODEL_CACHE_TTL", 0):
+        PluginModelCache.get_model_schema("tenant-1", "key", loader)
+        PluginModelCache.get_model_schema("tenant-1", "key", loader)
+
+    assert loader.call_count == 2
+
+
+class _FakePipeline:
+    def __init__(self, claimed_keys: set[str]):
+        self._claimed_keys = claimed_keys
+        self._keys: list[str] = []
+
+    def set(self, key, value, nx, ex):
+        self._keys.append(key)
+
+    def execute(self):
+        results = [None if key in self._claimed_keys else True for key in self._keys]
+        self._claimed_keys.update(self._keys)
+        return results
+
+
+def test_finished_installation_task_invalidates_once(mock_redis_client):
+    claimed_keys: set[str] = set()
+    mock_redis_client.pipeline.side_effect = lambda transaction: _FakePipeline(claimed_keys)
+
+    with patch.object(PluginModelCache, "invalidate") as invalidate:
+        for _ in range(3):
+            PluginModelCache.invalidate_for_installation_tasks("tenant-1", ["task-1"])
+        PluginModelCache.invalidate_for_installation_tasks("tenant-1", ["task-1", "task-2"])
+        PluginModelCache.invalidate_for_installation_tasks("tenant-1", [])
+
+    assert [call.args[0] for call in invalidate.call_args_list] == ["tenant-1", "tenant-1"]
+    assert mock_redis_client.pipeline.call_count == 4
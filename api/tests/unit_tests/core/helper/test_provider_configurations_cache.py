@@ -0,0 +1,107 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import sqlalchemy as sa
+from redis import RedisError
+from sqlalchemy.orm import Session
+
+from core.helper.provider_configurations_cache import ProviderConfigurationsCache
+from models.provider import Provider
+
+
+@pytest.fixture
+def mock_redis_client():
+    with patch("core.helper.provider_configurations_cache.redis_client") as mock:
+        mock.get.return_value = None
+        yield mock
+
+
+def test_configurations_are_built_once_and_copied(mock_redis_client):
+    loader = MagicMock(return_value={"openai": ["gpt-4o"]})
+
+    first = ProviderConfigurationsCache.get("tenant-1", loader)
+    second = ProviderConfigurationsCache.get("tenant-1", loader)
+
+    loader.assert_called_once()
+    assert first == second
+    assert first is not second
+
+    second["openai"].append("gpt-4o-mini")
+    assert ProviderConfigurationsCache.get("tenant-1", loader) == {"openai": ["gpt-4o"]}
+
+
+def test_entries_are_kept_per_tenant(mock_redis_client):
+    loader = MagicMock(side_effect=[{"tenant": 1}, {"tenant": 2}])
+
+    assert ProviderConfigurationsCache.get("tenant-1", loader) == {"tenant": 1}
+    assert ProviderConfigurationsCache.get("tenant-2", loader) == {"tenant": 2}
+    assert ProviderConfigurationsCache.get("tenant-1", loader) == {"tenant": 1}
+    assert loader.call_count == 2
+
+
+def test_version_bump_from_another_process_rebuilds(mock_redis_client):
+    loader = MagicMock(side_effect=[{"version": 0}, {"version": 1}])
+
+    assert ProviderConfigurationsCache.get("tenant-1", loader) == {"version": 0}
+    mock_redis_client.get.return_value = b"1"
+    assert ProviderConfigurationsCache.get("tenant-1", loader) == {"version": 1}
+    assert ProviderConfigurationsCache.get("tenant-1", loader) == {"version": 1}
+    assert loader.call_count == 2
+
+
+def test_invalidate_drops_entry_and_bumps_version(mock_redis_client):
+    loader = MagicMock(side_effect=[{"version": 0}, {"version": 1}])
+    ProviderConfigurationsCache.get("tenant-1", loader)
+
+    ProviderConfigurationsCache.invalidate("tenant-1")
+
+    mock_redis_client.incr.assert_called_once_with("provider_configurations:version:tenant_id:tenant-1")
+    assert ProviderConfigurationsCache.get("tenant-1", loader) == {"version": 1}
+
+
+def test_zero_ttl_disables_cache(mock_redis_client):
+    loader = MagicMock(return_value={})
+
+    with patch("core.helper.provider_configurations_cache.dify_config.PROVIDER_CONFIGURATIONS_CACHE_TTL", 0):
+        ProviderConfigurationsCache.get("tenant-1", loader)
+        ProviderConfigurationsCache.get("tenant-1", loader)
+
+    assert loader.call_count == 2
+    mock_redis_client.get.assert_not_called()
+
+
+def test_redis_errors_fall_back_to_local_cache(mock_redis_client):
+    mock_redis_client.get.side_effect = RedisError("connection refused")
+    loader = MagicMock(return_value={})
+
+    ProviderConfigurationsCache.get("tenant-1", loader)
+    ProviderConfigurationsCache.get("tenant-1", loader)
+
+    loader.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    ("quota_limit", "quota_used", "invalidated"),
+    [(100, 99, False), (100, 100, True), (100, 120, True), (-1, 1000, False)],
+)
+def test_invalidate_if_quota_exhausted(mock_redis_client, quota_limit, quota_used, invalidated):
+    engine = sa.create_engine("sqlite://")
+    Provider.__table__.create(engine)
+    with Session(engine) as session:
+        session.add(
+            Provider(
+                tenant_id="tenant-1",
+                provider_name="openai",
+                provider_type="system",
+                quota_type="trial",
+                quota_limit=quota_limit,
+                quota_used=quota_used,
+            )
+        )
+        session.commit()
+
+        ProviderConfigurationsCache.invalidate_if_quota_exhausted(
+            session, "tenant-1", Provider.provider_name == "openai", Provider.quota_type == "trial"
+        )
+
+    assert mock_redis_client.incr.called is invalidated
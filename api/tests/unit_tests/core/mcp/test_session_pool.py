@@ -0,0 +1,147 @@
+"""Unit tests for the MCP session pool."""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.mcp.auth_client import MCPClientWithAuthRetry
+from core.mcp.error import MCPConnectionError
+from core.mcp.session_pool import MCPSessionPool
+
+
+def _pool(**kwargs) -> MCPSessionPool:
+    options = {"max_sessions_per_key": 2, "idle_timeout": 60, "health_check_interval": 15, "acquire_timeout": 1}
+    options.update(kwargs)
+    return MCPSessionPool(**options)
+
+
+def _factory() -> MagicMock:
+    def create_client():
+        client = MagicMock(spec=MCPClientWithAuthRetry)
+        client.headers = {"Authorization": "Bearer token"}
+        return client
+
+    return MagicMock(side_effect=create_client)
+
+
+def test_build_key_depends_on_credentials():
+    url = "https://mcp.example.com/mcp"
+    key = MCPSessionPool.build_key("tenant", "provider", url, {"Authorization": "Bearer secret"}, 10, 60)
+
+    assert key == MCPSessionPool.build_key("tenant", "provider", url, {"Authorization": "Bearer secret"}, 10, 60)
+    assert key != MCPSessionPool.build_key("tenant", "provider", url, {"Authorization": "Bearer other"}, 10, 60)
+    assert "secret" not in key
+
+
+def test_session_is_initialized_once_and_reused():
+    pool, factory = _pool(), _factory()
+
+    with pool.session("key", factory) as first:
+        first.invoke_tool("tool", {})
+    with pool.session("key", factory) as second:
+        second.invoke_tool("tool", {})
+
+    factory.assert_called_once()
+    assert second is first
+    first.__enter__.assert_called_once()
+    first.cleanup.assert_not_called()
+
+
+def test_sessions_are_kept_per_key():
+    pool, factory = _pool(), _factory()
+
+    with pool.session("key-1", factory) as first, pool.session("key-2", factory) as second:
+        assert first is not second
+
+    assert factory.call_count == 2
+
+
+def test_failed_call_closes_session():
+    pool, factory = _pool(), _factory()
+
+    with pytest.raises(RuntimeError), pool.session("key", factory) as client:
+        raise RuntimeError("connection reset")
+
+    client.cleanup.assert_called_once()
+    with pool.session("key", factory) as new_client:
+        assert new_client is not client
+
+
+def test_session_is_closed_after_token_refresh():
+    pool, factory = _pool(), _factory()
+
+    with pool.session("key", factory) as client:
+        # MCPClientWithAuthRetry reconnects with the refreshed token
+        client.headers = {"Authorization": "Bearer refreshed"}
+
+    client.cleanup.assert_called_once()
+    with pool.session("key", factory) as new_client:
+        assert new_client is not client
+
+
+def test_dead_session_is_replaced_after_health_check():
+    pool, factory = _pool(health_check_interval=0), _factory()
+    with pool.session("key", factory) as client:
+        pass
+    client.ping.side_effect = MCPConnectionError("stream closed")
+
+    with pool.session("key", factory) as new_client:
+        assert new_client is not client
+
+    client.cleanup.assert_called_once()
+
+
+def test_recently_used_session_is_not_pinged():
+    pool, factory = _pool(), _factory()
+    with pool.session("key", factory) as client:
+        pass
+
+    with pool.session("key", factory):
+        pass
+
+    client.ping.assert_not_called()
+
+
+def test_idle_sessions_are_evicted():
+    pool, factory = _pool(idle_timeout=0.01), _factory()
+    with pool.session("key", factory) as client:
+        pass
+
+    time.sleep(0.02)
+    pool.evict_idle_sessions()
+
+    client.cleanup.assert_called_once()
+    with pool.session("key", factory) as new_client:
+        assert new_client is not client
+
+
+def test_concurrent_sessions_are_capped():
+    pool, factory = _pool(max_sessions_per_key=1, acquire_timeout=0.05), _factory()
+
+    with pool.session("key", factory):
+        with pytest.raises(MCPConnectionError), pool.session("key", factory):
+            pass
+
+    assert factory.call_count == 1
+
+
+def test_waiting_caller_gets_released_session():
+    pool, factory = _pool(max_sessions_per_key=1, acquire_timeout=5), _factory()
+    acquired = threading.Event()
+    clients = []
+
+    def use_session():
+        with pool.session("key", factory) as client:
+            clients.append(client)
+
+    with pool.session("key", factory) as first:
+        thread = threading.Thread(target=lambda: (use_session(), acquired.set()))
+        thread.start()
+        assert not acquired.wait(0.05)
+    thread.join(timeout=5)
+
+    assert acquired.is_set()
+    assert clients == [first]
+    factory.assert_called_once()
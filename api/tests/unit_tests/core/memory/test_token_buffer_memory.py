@@ -0,0 +1,115 @@
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.memory.token_buffer_memory import TokenBufferMemory
+from core.model_runtime.entities import AssistantPromptMessage, UserPromptMessage
+from models.model import AppMode
+
+
+def _messages(count: int) -> list[SimpleNamespace]:
+    """Messages of a single thread, newest first as returned by the query."""
+    messages = []
+    for i in reversed(range(count)):
+        messages.append(
+            SimpleNamespace(
+                id=f"message-{i}",
+                parent_message_id=f"message-{i - 1}" if i else None,
+                query=f"query {i}",
+                answer=f"answer {i}",
+                answer_tokens=1,
+                updated_at=datetime(2025, 1, 1),
+            )
+        )
+    return messages
+
+
+def _model_instance() -> MagicMock:
+    model_instance = MagicMock()
+    model_instance.provider = "provider"
+    model_instance.model = "model"
+    # one token per prompt message
+    model_instance.get_llm_num_tokens.side_effect = lambda prompt_messages: len(prompt_messages)
+    return model_instance
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store: dict[str, bytes] = {}
+
+    def mget(self, keys):
+        return [self.store.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        pipeline = MagicMock()
+        pipeline.setex.side_effect = lambda key, ttl, value: self.store.__setitem__(key, str(value).encode())
+        return pipeline
+
+
+@pytest.fixture
+def fake_redis():
+    redis = _FakeRedis()
+    with patch("core.memory.token_buffer_memory.redis_client", redis):
+        yield redis
+
+
+def _get_history(memory: TokenBufferMemory, messages, max_token_limit: int):
+    session = MagicMock()
+    session.scalars.side_effect = [
+        MagicMock(all=MagicMock(return_value=messages)),
+        MagicMock(all=MagicMock(return_value=[])),
+    ]
+    with patch("core.memory.token_buffer_memory.db", SimpleNamespace(session=session)):
+        result = memory.get_history_prompt_messages(max_token_limit=max_token_limit)
+    return result, session
+
+
+def _memory(model_instance) -> TokenBufferMemory:
+    conversation = SimpleNamespace(id="conversation", mode=AppMode.CHAT, app=None)
+    return TokenBufferMemory(conversation=conversation, model_instance=model_instance)
+
+
+def test_history_within_limit_counts_tokens_once(fake_redis):
+    model_instance = _model_instance()
+
+    result, session = _get_history(_memory(model_instance), _messages(50), max_token_limit=1000)
+
+    assert len(result) == 100
+    assert isinstance(result[0], UserPromptMessage)
+    assert isinstance(result[-1], AssistantPromptMessage)
+    # one query for the messages and one for the files of all of them
+    assert session.scalars.call_count == 2
+    assert model_instance.get_llm_num_tokens.call_count == 1
+
+
+def test_history_is_pruned_with_running_sum(fake_redis):
+    model_instance = _model_instance()
+
+    result, _ = _get_history(_memory(model_instance), _messages(50), max_token_limit=5)
+
+    assert [message.content for message in result] == ["answer 47", "query 48", "answer 48", "query 49", "answer 49"]
+    # the whole history once, then only the kept messages and the first dropped one
+    assert model_instance.get_llm_num_tokens.call_count == 1 + 6
+
+
+def test_cached_token_counts_skip_the_tokenizer(fake_redis):
+    model_instance = _model_instance()
+    memory = _memory(model_instance)
+    _get_history(memory, _messages(50), max_token_limit=5)
+    model_instance.get_llm_num_tokens.reset_mock()
+
+    result, _ = _get_history(memory, _messages(50), max_token_limit=5)
+
+    assert len(result) == 5
+    model_instance.get_llm_num_tokens.assert_not_called()
+
+
+def test_newest_message_is_kept_even_if_it_exceeds_the_limit(fake_redis):
+    model_instance = _model_instance()
+    model_instance.get_llm_num_tokens.side_effect = lambda prompt_messages: 10 * len(prompt_messages)
+
+    result, _ = _get_history(_memory(model_instance), _messages(3), max_token_limit=5)
+
+    assert [message.content for message in result] == ["answer 2"]
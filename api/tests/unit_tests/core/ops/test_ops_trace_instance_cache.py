@@ -0,0 +1,91 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# imported before the trace manager, which is otherwise only partially initialized through a circular import
+import core.app.entities.app_invoke_entities  # noqa: F401
+from core.ops.ops_trace_manager import OpsTraceManager
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    OpsTraceManager.app_trace_instances_cache.clear()
+    yield
+    OpsTraceManager.app_trace_instances_cache.clear()
+
+
+@pytest.fixture
+def mock_redis_client():
+    with patch("core.ops.ops_trace_manager.redis_client") as mock:
+        mock.get.return_value = None
+        yield mock
+
+
+@pytest.fixture
+def mock_db():
+    with patch("core.ops.ops_trace_manager.db") as mock:
+        yield mock
+
+
+def _mock_app(mock_db, tracing: dict | None):
+    app = MagicMock(tracing=json.dumps(tracing) if tracing else None)
+    mock_db.session.query.return_value.where.return_value.first.return_value = app
+
+
+def test_disabled_tracing_is_cached(mock_redis_client, mock_db):
+    _mock_app(mock_db, None)
+
+    assert OpsTraceManager.get_ops_trace_instance("app-1") is None
+    assert OpsTraceManager.get_ops_trace_instance("app-1") is None
+
+    mock_db.session.query.assert_called_once()
+
+
+def test_tracing_instance_is_cached(mock_redis_client, mock_db):
+    _mock_app(mock_db, {"enabled": True, "tracing_provider": "langfuse"})
+    trace_instance = MagicMock()
+
+    with (
+        patch.object(OpsTraceManager, "get_decrypted_tracing_config", return_value={"host": "h"}) as mock_decrypt,
+        patch(
+            "core.ops.ops_trace_manager.provider_config_map",
+            {"langfuse": {"trace_instance": MagicMock(return_value=trace_instance), "config_class": MagicMock()}},
+        ),
+    ):
+        assert OpsTraceManager.get_ops_trace_instance("app-1") is trace_instance
+        assert OpsTraceManager.get_ops_trace_instance("app-1") is trace_instance
+
+    mock_decrypt.assert_called_once()
+
+
+def test_version_bump_from_another_process_resolves_again(mock_redis_client, mock_db):
+    _mock_app(mock_db, None)
+    OpsTraceManager.get_ops_trace_instance("app-1")
+
+    mock_redis_client.get.return_value = b"1"
+    OpsTraceManager.get_ops_trace_instance("app-1")
+    OpsTraceManager.get_ops_trace_instance("app-1")
+
+    assert mock_db.session.query.call_count == 2
+
+
+def test_invalidate_drops_entry_and_bumps_version(mock_redis_client, mock_db):
+    _mock_app(mock_db, None)
+    OpsTraceManager.get_ops_trace_instance("app-1")
+
+    OpsTraceManager.invalidate_app_trace_instance("app-1")
+
+    assert "app-1" not in OpsTraceManager.app_trace_instances_cache
+    mock_redis_client.incr.assert_called_once_with("ops_trace:config_version:app_id:app-1")
+
+
+def test_cache_disabled_with_zero_ttl(mock_redis_client, mock_db):
+    _mock_app(mock_db, None)
+
+    with patch("core.ops.ops_trace_manager.dify_config.OPS_TRACE_INSTANCE_CACHE_TTL", 0):
+        OpsTraceManager.get_ops_trace_instance("app-1")
+        OpsTraceManager.get_ops_trace_instance("app-1")
+
+    assert mock_db.session.query.call_count == 2
+    mock_redis_client.get.assert_not_called()
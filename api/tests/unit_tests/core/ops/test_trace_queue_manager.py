@@ -0,0 +1,74 @@
+from unittest.mock import MagicMock, patch
+
+from flask import Flask
+
+# imported before the trace manager, which is otherwise only partially initialized through a circular import
+import core.app.entities.app_invoke_entities  # noqa: F401
+from core.ops.entities.trace_entity import GenerateNameTraceInfo, TaskBatchData
+from core.ops.ops_trace_manager import TraceQueueManager, TraceTask
+
+
+def _trace_task(app_id: str | None, enqueued_at: float = 100.0) -> TraceTask:
+    task = MagicMock(spec=TraceTask)
+    task.app_id = app_id
+    task.enqueued_at = enqueued_at
+    task.trace_type = "generate_conversation_name"
+    task.execute.return_value = GenerateNameTraceInfo(
+        message_id="message", tenant_id="tenant", inputs={}, outputs={}, metadata={}
+    )
+    return task
+
+
+def _manager() -> TraceQueueManager:
+    manager = TraceQueueManager.__new__(TraceQueueManager)
+    manager.flask_app = Flask(__name__)
+    return manager
+
+
+def test_send_to_celery_sends_one_batch():
+    failing_task = _trace_task("app-2")
+    failing_task.execute.side_effect = RuntimeError("message not found")
+    tasks = [_trace_task("app-1"), _trace_task(None), failing_task, _trace_task("app-2", enqueued_at=200.0)]
+
+    with (
+        patch("core.ops.ops_trace_manager.storage") as mock_storage,
+        patch("core.ops.ops_trace_manager.process_trace_batch_tasks") as mock_task,
+    ):
+        _manager().send_to_celery(tasks)
+
+    mock_storage.save.assert_called_once()
+    file_path, content = mock_storage.save.call_args.args
+    file_id = mock_task.delay.call_args.args[0]["file_id"]
+    assert file_path == f"ops_trace/batches/{file_id}.json"
+    mock_task.delay.assert_called_once()
+
+    batch = TaskBatchData.model_validate_json(content)
+    assert [(task.app_id, task.enqueued_at) for task in batch.tasks] == [("app-1", 100.0), ("app-2", 200.0)]
+    assert batch.tasks[0].trace_info_type == "GenerateNameTraceInfo"
+
+
+def test_send_to_celery_skips_empty_batch():
+    with (
+        patch("core.ops.ops_trace_manager.storage") as mock_storage,
+        patch("core.ops.ops_trace_manager.process_trace_batch_tasks") as mock_task,
+    ):
+        _manager().send_to_celery([_trace_task(None)])
+
+    mock_storage.save.assert_not_called()
+    mock_task.delay.assert_not_called()
+
+
+def test_run_drains_the_queue_in_batches():
+    manager = _manager()
+    with (
+        patch("core.ops.ops_trace_manager.trace_manager_batch_size", 2),
+        patch("core.ops.ops_trace_manager.trace_manager_queue") as mock_queue,
+        patch.object(manager, "send_to_celery") as mock_send,
+    ):
+        tasks = [_trace_task("app-1") for _ in range(5)]
+        mock_queue.empty.side_effect = lambda: not tasks
+        mock_queue.get_nowait.side_effect = lambda: tasks.pop(0)
+
+        manager.run()
+
+    assert [len(call.args[0]) for call in mock_send.call_args_list] == [2, 2, 1]
@@ -748,6 +748,91 @@ class TestPluginTaskManagement:
             assert result[1].status == PluginInstallTaskStatus.Success
             mock_request.assert_called_once()
 
+    def test_fetch_plugin_installation_tasks_invalidates_model_cache_for_finished_tasks(self, plugin_installer):
+        """Test the cached model providers are invalidated for the tasks that finished."""
+        mock_tasks = [
+            PluginInstallTask(
+                id=f"task-{status}",
+                created_at=datetime.datetime.now(),
+                updated_at=datetime.datetime.now(),
+                status=status,
+                total_plugins=1,
+                completed_plugins=1,
+                plugins=[],
+            )
+            for status in PluginInstallTaskStatus
+        ]
+
+        with (
+            patch.object(plugin_installer, "_request_with_plugin_daemon_response", return_value=mock_tasks),
+            patch("core.plugin.impl.plugin.PluginModelCache") as mock_cache,
+        ):
+            plugin_installer.fetch_plugin_installation_tasks("test-tenant", page=1, page_size=10)
+
+        mock_cache.invalidate_for_installation_tasks.assert_called_once_with(
+            "test-tenant", ["task-success", "task-failed"]
+        )
+
+    @pytest.mark.parametrize("all_installed", [True, False])
+    def test_install_from_identifiers_invalidates_model_cache_only_when_installed(
+        self, plugin_installer, all_installed
+    ):
+        """Test the cached model providers are kept until the background installation finished."""
+        response = PluginInstallTaskStartResponse(all_installed=all_installed, task_id="task-123")
+
+        with (
+            patch.object(plugin_installer, "_request_with_plugin_daemon_response", return_value=response),
+            patch("core.plugin.impl.plugin.PluginModelCache") as mock_cache,
+        ):
+            plugin_installer.install_from_identifiers(
+                "test-tenant", ["plugin/1.0.0"], PluginInstallationSource.Marketplace, metas=[{}]
+            )
+            plugin_installer.upgrade_plugin(
+                "test-tenant", "plugin/1.0.0", "plugin/1.0.1", PluginInstallationSource.Marketplace, meta={}
+            )
+
+        assert mock_cache.invalidate.call_count == (2 if all_installed else 0)
+
+    def test_wait_plugin_installation_task_polls_until_finished(self, plugin_installer):
+        """Test waiting for a task polls it until it finished."""
+        statuses = [PluginInstallTaskStatus.Pending, PluginInstallTaskStatus.Running, PluginInstallTaskStatus.Success]
+        mock_tasks = [
+            PluginInstallTask(
+                id="task-123",
+                created_at=datetime.datetime.now(),
+                updated_at=datetime.datetime.now(),
+                status=status,
+                total_plugins=1,
+                completed_plugins=0,
+                plugins=[],
+            )
+            for status in statuses
+        ]
+
+        with (
+            patch.object(plugin_installer, "fetch_plugin_installation_task", side_effect=mock_tasks) as mock_fetch,
+            patch("core.plugin.impl.plugin.time.sleep"),
+        ):
+            result = plugin_installer.wait_plugin_installation_task("test-tenant", "task-123")
+
+        assert result is mock_tasks[-1]
+        assert mock_fetch.call_count == 3
+
+    def test_wait_plugin_installation_task_times_out(self, plugin_installer):
+        """Test waiting for a task still running after the timeout returns None."""
+        mock_task = PluginInstallTask(
+            id="task-123",
+            created_at=datetime.datetime.now(),
+            updated_at=datetime.datetime.now(),
+            status=PluginInstallTaskStatus.Running,
+            total_plugins=1,
+            completed_plugins=0,
+            plugins=[],
+        )
+
+        with patch.object(plugin_installer, "fetch_plugin_installation_task", return_value=mock_task):
+            assert plugin_installer.wait_plugin_installation_task("test-tenant", "task-123", timeout=0) is None
+
     def test_delete_plugin_installation_task(self, plugin_installer):
         """Test deleting a specific plugin installation task."""
         # Arrange: Mock successful deletion
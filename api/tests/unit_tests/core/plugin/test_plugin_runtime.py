@@ -114,7 +114,7 @@ class TestPluginRuntimeExecution:
         mock_response.status_code = 200
         mock_response.json.return_value = {"result": "success"}
 
-        with patch("httpx.request", return_value=mock_response) as mock_request:
+        with patch("httpx.Client.request", return_value=mock_response) as mock_request:
             # Act
             response = plugin_client._request("GET", "plugin/test-tenant/management/list")
 
@@ -132,7 +132,7 @@ class TestPluginRuntimeExecution:
         mock_response = MagicMock()
         mock_response.status_code = 200
 
-        with patch("httpx.request", return_value=mock_response) as mock_request:
+        with patch("httpx.Client.request", return_value=mock_response) as mock_request:
             # Act
             plugin_client._request("GET", "plugin/test-tenant/test")
 
@@ -143,7 +143,7 @@ class TestPluginRuntimeExecution:
     def test_request_connection_error(self, plugin_client, mock_config):
         """Test handling of connection errors during request."""
         # Arrange
-        with patch("httpx.request", side_effect=httpx.RequestError("Connection failed")):
+        with patch("httpx.Client.request", side_effect=httpx.RequestError("Connection failed")):
             # Act & Assert
             with pytest.raises(PluginDaemonInnerError) as exc_info:
                 plugin_client._request("GET", "plugin/test-tenant/test")
@@ -182,7 +182,7 @@ class TestPluginRuntimeSandboxIsolation:
         mock_response.status_code = 200
         mock_response.json.return_value = {"code": 0, "message": "", "data": True}
 
-        with patch("httpx.request", return_value=mock_response) as mock_request:
+        with patch("httpx.Client.request", return_value=mock_response) as mock_request:
             # Act
             plugin_client._request("GET", "plugin/test-tenant/test")
 
@@ -201,7 +201,7 @@ class TestPluginRuntimeSandboxIsolation:
         mock_response.status_code = 200
         mock_response.json.return_value = {"code": 0, "message": "", "data": {"result": "isolated_execution"}}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act
             result = plugin_client._request_with_plugin_daemon_response(
                 "POST", "plugin/test-tenant/dispatch/tool/invoke", TestResponse, data={"tool": "test"}
@@ -218,7 +218,7 @@ class TestPluginRuntimeSandboxIsolation:
         error_message = json.dumps({"error_type": "PluginDaemonUnauthorizedError", "message": "Unauthorized access"})
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(PluginDaemonUnauthorizedError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("GET", "plugin/test-tenant/test", bool)
@@ -234,7 +234,7 @@ class TestPluginRuntimeSandboxIsolation:
         )
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(PluginPermissionDeniedError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("POST", "plugin/test-tenant/test", bool)
@@ -272,7 +272,7 @@ class TestPluginRuntimeResourceLimits:
         mock_response = MagicMock()
         mock_response.status_code = 200
 
-        with patch("httpx.request", return_value=mock_response) as mock_request:
+        with patch("httpx.Client.request", return_value=mock_response) as mock_request:
             # Act
             plugin_client._request("GET", "plugin/test-tenant/test")
 
@@ -283,7 +283,7 @@ class TestPluginRuntimeResourceLimits:
     def test_timeout_error_handling(self, plugin_client, mock_config):
         """Test handling of timeout errors."""
         # Arrange
-        with patch("httpx.request", side_effect=httpx.TimeoutException("Request timeout")):
+        with patch("httpx.Client.request", side_effect=httpx.TimeoutException("Request timeout")):
             # Act & Assert
             with pytest.raises(PluginDaemonInnerError) as exc_info:
                 plugin_client._request("GET", "plugin/test-tenant/test")
@@ -292,7 +292,7 @@ class TestPluginRuntimeResourceLimits:
     def test_streaming_request_timeout(self, plugin_client, mock_config):
         """Test timeout handling for streaming requests."""
         # Arrange
-        with patch("httpx.stream", side_effect=httpx.TimeoutException("Stream timeout")):
+        with patch("httpx.Client.stream", side_effect=httpx.TimeoutException("Stream timeout")):
             # Act & Assert
             with pytest.raises(PluginDaemonInnerError) as exc_info:
                 list(plugin_client._stream_request("POST", "plugin/test-tenant/stream"))
@@ -308,7 +308,7 @@ class TestPluginRuntimeResourceLimits:
         )
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(PluginDaemonInternalServerError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("POST", "plugin/test-tenant/test", bool)
@@ -351,7 +351,7 @@ class TestPluginRuntimeErrorHandling:
         error_message = json.dumps({"error_type": "PluginInvokeError", "message": json.dumps(invoke_error)})
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(InvokeRateLimitError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("POST", "plugin/test-tenant/invoke", bool)
@@ -369,7 +369,7 @@ class TestPluginRuntimeErrorHandling:
         error_message = json.dumps({"error_type": "PluginInvokeError", "message": json.dumps(invoke_error)})
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(InvokeAuthorizationError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("POST", "plugin/test-tenant/invoke", bool)
@@ -387,7 +387,7 @@ class TestPluginRuntimeErrorHandling:
         error_message = json.dumps({"error_type": "PluginInvokeError", "message": json.dumps(invoke_error)})
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(InvokeBadRequestError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("POST", "plugin/test-tenant/invoke", bool)
@@ -405,7 +405,7 @@ class TestPluginRuntimeErrorHandling:
         error_message = json.dumps({"error_type": "PluginInvokeError", "message": json.dumps(invoke_error)})
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(InvokeConnectionError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("POST", "plugin/test-tenant/invoke", bool)
@@ -423,7 +423,7 @@ class TestPluginRuntimeErrorHandling:
         error_message = json.dumps({"error_type": "PluginInvokeError", "message": json.dumps(invoke_error)})
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(InvokeServerUnavailableError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("POST", "plugin/test-tenant/invoke", bool)
@@ -441,7 +441,7 @@ class TestPluginRuntimeErrorHandling:
         error_message = json.dumps({"error_type": "PluginInvokeError", "message": json.dumps(invoke_error)})
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(CredentialsValidateFailedError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("POST", "plugin/test-tenant/validate", bool)
@@ -457,7 +457,7 @@ class TestPluginRuntimeErrorHandling:
         )
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(PluginNotFoundError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("GET", "plugin/test-tenant/get", bool)
@@ -473,7 +473,7 @@ class TestPluginRuntimeErrorHandling:
         )
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(PluginUniqueIdentifierError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("POST", "plugin/test-tenant/install", bool)
@@ -489,7 +489,7 @@ class TestPluginRuntimeErrorHandling:
         )
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(PluginDaemonBadRequestError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("POST", "plugin/test-tenant/test", bool)
@@ -503,7 +503,7 @@ class TestPluginRuntimeErrorHandling:
         error_message = json.dumps({"error_type": "PluginDaemonNotFoundError", "message": "Resource not found"})
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(PluginDaemonNotFoundError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("GET", "plugin/test-tenant/resource", bool)
@@ -521,7 +521,7 @@ class TestPluginRuntimeErrorHandling:
         error_message = json.dumps({"error_type": "PluginInvokeError", "message": invoke_error_message})
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(PluginInvokeError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("POST", "plugin/test-tenant/invoke", bool)
@@ -535,7 +535,7 @@ class TestPluginRuntimeErrorHandling:
         error_message = json.dumps({"error_type": "UnknownErrorType", "message": "Unknown error occurred"})
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(Exception) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("POST", "plugin/test-tenant/test", bool)
@@ -550,7 +550,7 @@ class TestPluginRuntimeErrorHandling:
             "Server Error", request=MagicMock(), response=mock_response
         )
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(httpx.HTTPStatusError):
                 plugin_client._request_with_plugin_daemon_response("GET", "plugin/test-tenant/test", bool)
@@ -562,7 +562,7 @@ class TestPluginRuntimeErrorHandling:
         mock_response.status_code = 200
         mock_response.json.return_value = {"code": 0, "message": "", "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(ValueError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("GET", "plugin/test-tenant/test", bool)
@@ -605,7 +605,7 @@ class TestPluginRuntimeCommunication:
         mock_response.status_code = 200
         mock_response.json.return_value = {"code": 0, "message": "", "data": {"value": "test", "count": 42}}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act
             result = plugin_client._request_with_plugin_daemon_response(
                 "POST", "plugin/test-tenant/test", TestModel, data={"input": "data"}
@@ -632,7 +632,7 @@ class TestPluginRuntimeCommunication:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -662,7 +662,7 @@ class TestPluginRuntimeCommunication:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -684,7 +684,7 @@ class TestPluginRuntimeCommunication:
     def test_streaming_connection_error(self, plugin_client, mock_config):
         """Test connection error during streaming."""
         # Arrange
-        with patch("httpx.stream", side_effect=httpx.RequestError("Stream connection failed")):
+        with patch("httpx.Client.stream", side_effect=httpx.RequestError("Stream connection failed")):
             # Act & Assert
             with pytest.raises(PluginDaemonInnerError) as exc_info:
                 list(plugin_client._stream_request("POST", "plugin/test-tenant/stream"))
@@ -702,7 +702,7 @@ class TestPluginRuntimeCommunication:
         mock_response.status_code = 200
         mock_response.json.return_value = {"status": "success", "data": {"key": "value"}}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act
             result = plugin_client._request_with_model("GET", "plugin/test-tenant/direct", DirectModel)
 
@@ -727,7 +727,7 @@ class TestPluginRuntimeCommunication:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -759,7 +759,7 @@ class TestPluginRuntimeCommunication:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -809,7 +809,7 @@ class TestPluginToolManagerIntegration:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -839,7 +839,7 @@ class TestPluginToolManagerIntegration:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -863,7 +863,7 @@ class TestPluginToolManagerIntegration:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -887,7 +887,7 @@ class TestPluginToolManagerIntegration:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -940,7 +940,7 @@ class TestPluginInstallerIntegration:
             },
         }
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act
             result = installer.list_plugins("test-tenant")
 
@@ -954,7 +954,7 @@ class TestPluginInstallerIntegration:
         mock_response.status_code = 200
         mock_response.json.return_value = {"code": 0, "message": "", "data": True}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act
             result = installer.uninstall("test-tenant", "plugin-installation-id")
 
@@ -968,7 +968,7 @@ class TestPluginInstallerIntegration:
         mock_response.status_code = 200
         mock_response.json.return_value = {"code": 0, "message": "", "data": True}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act
             result = installer.fetch_plugin_by_identifier("test-tenant", "plugin-identifier")
 
@@ -1007,7 +1007,7 @@ class TestPluginRuntimeEdgeCases:
         mock_response.status_code = 200
         mock_response.json.side_effect = json.JSONDecodeError("Invalid JSON", "", 0)
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(ValueError):
                 plugin_client._request_with_plugin_daemon_response("GET", "plugin/test-tenant/test", bool)
@@ -1020,7 +1020,7 @@ class TestPluginRuntimeEdgeCases:
         # Missing required fields in response
         mock_response.json.return_value = {"invalid": "structure"}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(ValueError):
                 plugin_client._request_with_plugin_daemon_response("GET", "plugin/test-tenant/test", bool)
@@ -1036,7 +1036,7 @@ class TestPluginRuntimeEdgeCases:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -1060,7 +1060,7 @@ class TestPluginRuntimeEdgeCases:
         mock_response = MagicMock()
         mock_response.status_code = 200
 
-        with patch("httpx.request", return_value=mock_response) as mock_request:
+        with patch("httpx.Client.request", return_value=mock_response) as mock_request:
             # Act
             plugin_client._request("POST", "plugin/test-tenant/upload", data=b"binary data")
 
@@ -1076,7 +1076,7 @@ class TestPluginRuntimeEdgeCases:
 
         files = {"file": ("test.txt", b"file content", "text/plain")}
 
-        with patch("httpx.request", return_value=mock_response) as mock_request:
+        with patch("httpx.Client.request", return_value=mock_response) as mock_request:
             # Act
             plugin_client._request("POST", "plugin/test-tenant/upload", files=files)
 
@@ -1090,7 +1090,7 @@ class TestPluginRuntimeEdgeCases:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = []
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -1110,7 +1110,7 @@ class TestPluginRuntimeEdgeCases:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act & Assert
@@ -1131,7 +1131,7 @@ class TestPluginRuntimeEdgeCases:
         mock_response.status_code = 200
         mock_response.json.return_value = {"code": -1, "message": "Plain text error message", "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(ValueError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("GET", "plugin/test-tenant/test", bool)
@@ -1169,7 +1169,7 @@ class TestPluginRuntimeAdvancedScenarios:
         mock_response.status_code = 200
         mock_response.json.return_value = {"code": 0, "message": "", "data": True}
 
-        with patch("httpx.request", return_value=mock_response) as mock_request:
+        with patch("httpx.Client.request", return_value=mock_response) as mock_request:
             # Act
             for i in range(5):
                 result = plugin_client._request_with_plugin_daemon_response("GET", f"plugin/test-tenant/test/{i}", bool)
@@ -1198,7 +1198,7 @@ class TestPluginRuntimeAdvancedScenarios:
         mock_response.status_code = 200
         mock_response.json.return_value = {"code": 0, "message": "", "data": complex_data}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act
             result = plugin_client._request_with_plugin_daemon_response(
                 "POST", "plugin/test-tenant/complex", ComplexModel
@@ -1226,7 +1226,7 @@ class TestPluginRuntimeAdvancedScenarios:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -1257,7 +1257,7 @@ class TestPluginRuntimeAdvancedScenarios:
             mock_response.status_code = 200
             return mock_response
 
-        with patch("httpx.request", side_effect=side_effect):
+        with patch("httpx.Client.request", side_effect=side_effect):
             # Act & Assert - First two calls should fail
             with pytest.raises(PluginDaemonInnerError):
                 plugin_client._request("GET", "plugin/test-tenant/test")
@@ -1281,7 +1281,7 @@ class TestPluginRuntimeAdvancedScenarios:
         mock_response = MagicMock()
         mock_response.status_code = 200
 
-        with patch("httpx.request", return_value=mock_response) as mock_request:
+        with patch("httpx.Client.request", return_value=mock_response) as mock_request:
             # Act
             plugin_client._request("GET", "plugin/test-tenant/test", headers=custom_headers)
 
@@ -1307,7 +1307,7 @@ class TestPluginRuntimeAdvancedScenarios:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -1354,7 +1354,7 @@ class TestPluginRuntimeSecurityAndValidation:
         mock_response = MagicMock()
         mock_response.status_code = 200
 
-        with patch("httpx.request", return_value=mock_response) as mock_request:
+        with patch("httpx.Client.request", return_value=mock_response) as mock_request:
             # Act
             plugin_client._request("GET", "plugin/test-tenant/test")
 
@@ -1376,7 +1376,7 @@ class TestPluginRuntimeSecurityAndValidation:
         mock_response.status_code = 200
         mock_response.json.return_value = {"code": 0, "message": "", "data": True}
 
-        with patch("httpx.request", return_value=mock_response) as mock_request:
+        with patch("httpx.Client.request", return_value=mock_response) as mock_request:
             # Act
             plugin_client._request_with_plugin_daemon_response(
                 "POST",
@@ -1398,7 +1398,7 @@ class TestPluginRuntimeSecurityAndValidation:
         error_message = json.dumps({"error_type": "PluginDaemonUnauthorizedError", "message": "Invalid API key"})
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(PluginDaemonUnauthorizedError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response("GET", "plugin/test-tenant/test", bool)
@@ -1419,7 +1419,7 @@ class TestPluginRuntimeSecurityAndValidation:
         )
         mock_response.json.return_value = {"code": -1, "message": error_message, "data": None}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert
             with pytest.raises(PluginDaemonBadRequestError) as exc_info:
                 plugin_client._request_with_plugin_daemon_response(
@@ -1433,7 +1433,7 @@ class TestPluginRuntimeSecurityAndValidation:
         mock_response = MagicMock()
         mock_response.status_code = 200
 
-        with patch("httpx.request", return_value=mock_response) as mock_request:
+        with patch("httpx.Client.request", return_value=mock_response) as mock_request:
             # Act
             plugin_client._request(
                 "POST", "plugin/test-tenant/test", headers={"Content-Type": "application/json"}, data={"key": "value"}
@@ -1484,7 +1484,7 @@ class TestPluginRuntimePerformanceScenarios:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -1519,7 +1519,7 @@ class TestPluginRuntimePerformanceScenarios:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act - Process chunks one by one
@@ -1534,7 +1534,7 @@ class TestPluginRuntimePerformanceScenarios:
     def test_timeout_with_slow_response(self, plugin_client, mock_config):
         """Test timeout handling with slow response simulation."""
         # Arrange
-        with patch("httpx.request", side_effect=httpx.TimeoutException("Request timed out after 30s")):
+        with patch("httpx.Client.request", side_effect=httpx.TimeoutException("Request timed out after 30s")):
             # Act & Assert
             with pytest.raises(PluginDaemonInnerError) as exc_info:
                 plugin_client._request("GET", "plugin/test-tenant/slow-endpoint")
@@ -1549,7 +1549,7 @@ class TestPluginRuntimePerformanceScenarios:
 
         request_results = []
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act - Simulate 10 concurrent requests
             for i in range(10):
                 result = plugin_client._request_with_plugin_daemon_response(
@@ -1607,7 +1607,7 @@ class TestPluginToolManagerAdvanced:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -1636,7 +1636,7 @@ class TestPluginToolManagerAdvanced:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -1668,7 +1668,7 @@ class TestPluginToolManagerAdvanced:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -1699,7 +1699,7 @@ class TestPluginToolManagerAdvanced:
         mock_response = MagicMock()
         mock_response.iter_lines.return_value = [line.encode("utf-8") for line in stream_data]
 
-        with patch("httpx.stream") as mock_stream:
+        with patch("httpx.Client.stream") as mock_stream:
             mock_stream.return_value.__enter__.return_value = mock_response
 
             # Act
@@ -1765,7 +1765,7 @@ class TestPluginInstallerAdvanced:
             },
         }
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act
             result = installer.upload_pkg("test-tenant", plugin_package, verify_signature=False)
 
@@ -1783,7 +1783,7 @@ class TestPluginInstallerAdvanced:
             "data": {"content": "# Plugin README\n\nThis is a test plugin.", "language": "en"},
         }
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act
             result = installer.fetch_plugin_readme("test-tenant", "test-org/test-plugin", "en")
 
@@ -1802,7 +1802,7 @@ class TestPluginInstallerAdvanced:
 
         mock_response.raise_for_status = raise_for_status
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act & Assert - Should raise HTTPStatusError for 404
             with pytest.raises(httpx.HTTPStatusError):
                 installer.fetch_plugin_readme("test-tenant", "test-org/test-plugin", "en")
@@ -1821,7 +1821,7 @@ class TestPluginInstallerAdvanced:
             },
         }
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act
             result = installer.list_plugins_with_total("test-tenant", page=2, page_size=20)
 
@@ -1843,7 +1843,7 @@ class TestPluginInstallerAdvanced:
         mock_response.status_code = 200
         mock_response.json.return_value = {"code": 0, "message": "", "data": [True, False]}
 
-        with patch("httpx.request", return_value=mock_response):
+        with patch("httpx.Client.request", return_value=mock_response):
             # Act
             result = installer.check_tools_existence("test-tenant", provider_ids)
 
@@ -0,0 +1,191 @@
+from unittest.mock import MagicMock, PropertyMock, patch
+
+from sqlalchemy.dialects import postgresql
+
+from core.rag.datasource.keyword.jieba.jieba import Jieba
+from core.rag.datasource.keyword.jieba.keyword_index_store import KeywordIndexStore
+from core.rag.models.document import Document
+from models.dataset import DatasetKeywordTable
+
+STORE_MODULE = "core.rag.datasource.keyword.jieba.keyword_index_store"
+JIEBA_MODULE = "core.rag.datasource.keyword.jieba.jieba"
+
+
+def _dataset(keyword_table: DatasetKeywordTable | None) -> MagicMock:
+    dataset = MagicMock()
+    dataset.id = "dataset-1"
+    dataset.tenant_id = "tenant-1"
+    dataset.keyword_number = 10
+    dataset.dataset_keyword_table = keyword_table
+    return dataset
+
+
+def _keyword_table(data_source_type: str, keyword_table: str = "") -> DatasetKeywordTable:
+    return DatasetKeywordTable(dataset_id="dataset-1", keyword_table=keyword_table, data_source_type=data_source_type)
+
+
+def _multi_values(stmt) -> list[dict]:
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    rows = []
+    i = 0
+    while f"keyword_m{i}" in compiled.params:
+        rows.append(
+            {"keyword": compiled.params[f"keyword_m{i}"], "index_node_id": compiled.params[f"index_node_id_m{i}"]}
+        )
+        i += 1
+    return rows
+
+
+def test_store_add_skips_duplicate_and_oversized_keywords():
+    with (
+        patch(f"{STORE_MODULE}.db") as mock_db,
+        patch(f"{STORE_MODULE}.dify_config.DB_TYPE", "postgresql"),
+    ):
+        KeywordIndexStore("dataset-1").add({"node-1": ["a", "a", "x" * 256, ""], "node-2": ["a", "b"]})
+
+    stmt = mock_db.session.execute.call_args.args[0]
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT DO NOTHING" in sql
+    rows = {(p["keyword"], p["index_node_id"]) for p in _multi_values(stmt)}
+    assert rows == {("a", "node-1"), ("a", "node-2"), ("b", "node-2")}
+    mock_db.session.commit.assert_called_once()
+
+
+def test_store_search_ranks_by_matching_keywords_in_sql():
+    with patch(f"{STORE_MODULE}.db") as mock_db:
+        mock_db.session.scalars.return_value.all.return_value = ["node-2", "node-1"]
+        result = KeywordIndexStore("dataset-1").search(["a", "b", "a"], 2)
+
+    assert result == ["node-2", "node-1"]
+    stmt = mock_db.session.scalars.call_args.args[0]
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "GROUP BY dataset_keyword_indexes.index_node_id" in sql
+    assert "ORDER BY count(dataset_keyword_indexes.keyword) DESC" in sql
+
+
+def test_store_search_without_keywords_skips_query():
+    with patch(f"{STORE_MODULE}.db") as mock_db:
+        assert KeywordIndexStore("dataset-1").search([], 4) == []
+    mock_db.session.scalars.assert_not_called()
+
+
+def test_add_texts_writes_to_index_without_dataset_lock():
+    jieba = Jieba(_dataset(_keyword_table("index")))
+    texts = [Document(page_content="hello world", metadata={"doc_id": "node-1"})]
+
+    with (
+        patch(f"{JIEBA_MODULE}.KeywordIndexStore") as mock_store_cls,
+        patch(f"{JIEBA_MODULE}.redis_client") as mock_redis,
+        patch.object(jieba, "_update_segment_keywords") as mock_update_segment,
+    ):
+        jieba.add_texts(texts, keywords_list=[["hello", "world"]])
+
+    mock_store_cls.return_value.add.assert_called_once_with({"node-1": ["hello", "world"]})
+    mock_update_segment.assert_called_once_with("dataset-1", "node-1", ["hello", "world"])
+    mock_redis.lock.assert_not_called()
+
+
+def test_new_dataset_uses_index_when_configured():
+    dataset = _dataset(None)
+    jieba = Jieba(dataset)
+
+    with (
+        patch(f"{JIEBA_MODULE}.dify_config.KEYWORD_DATA_SOURCE_TYPE", "index"),
+        patch(f"{JIEBA_MODULE}.db") as mock_db,
+        patch(f"{JIEBA_MODULE}.redis_client") as mock_redis,
+    ):
+        keyword_index = jieba._get_or_create_keyword_index()
+
+    assert isinstance(keyword_index, KeywordIndexStore)
+    created = mock_db.session.add.call_args.args[0]
+    assert created.data_source_type == "index"
+    assert created.keyword_table == ""
+    mock_redis.lock.assert_called_once_with("keyword_indexing_lock_dataset-1", timeout=600)
+
+
+def test_keyword_table_created_by_another_worker_is_not_created_again():
+    dataset = _dataset(None)
+    # the other worker creates the keyword table while this one waits for the lock
+    type(dataset).dataset_keyword_table = PropertyMock(side_effect=[None, _keyword_table("index")])
+    jieba = Jieba(dataset)
+
+    with (
+        patch(f"{JIEBA_MODULE}.dify_config.KEYWORD_DATA_SOURCE_TYPE", "index"),
+        patch(f"{JIEBA_MODULE}.db") as mock_db,
+        patch(f"{JIEBA_MODULE}.redis_client"),
+    ):
+        keyword_index = jieba._get_or_create_keyword_index()
+
+    assert isinstance(keyword_index, KeywordIndexStore)
+    mock_db.session.add.assert_not_called()
+    mock_db.session.commit.assert_not_called()
+
+
+def test_legacy_table_is_migrated_to_index():
+    table = _keyword_table(
+        "database",
+        '{"__type__": "keyword_table", "__data__": {"index_id": "dataset-1", "summary": null, '
+        '"table": {"a": ["node-1", "node-2"], "b": ["node-2"]}}}',
+    )
+    jieba = Jieba(_dataset(table))
+
+    with (
+        patch(f"{JIEBA_MODULE}.dify_config.KEYWORD_DATA_SOURCE_TYPE", "index"),
+        patch(f"{JIEBA_MODULE}.db"),
+        patch(f"{JIEBA_MODULE}.redis_client"),
+        patch(f"{JIEBA_MODULE}.storage") as mock_storage,
+        patch("models.dataset.db"),
+        patch.object(KeywordIndexStore, "add") as mock_add,
+    ):
+        keyword_index = jieba._get_or_create_keyword_index()
+
+    assert isinstance(keyword_index, KeywordIndexStore)
+    assert mock_add.call_args.args[0] == {"node-1": {"a"}, "node-2": {"a", "b"}}
+    assert table.data_source_type == "index"
+    assert table.keyword_table == ""
+    mock_storage.delete.assert_not_called()
+
+
+def test_legacy_table_is_kept_without_index_config():
+    jieba = Jieba(_dataset(_keyword_table("database")))
+
+    with patch(f"{JIEBA_MODULE}.dify_config.KEYWORD_DATA_SOURCE_TYPE", "database"):
+        assert jieba._get_or_create_keyword_index() is None
+
+
+def test_reads_of_dataset_without_keyword_table_do_not_create_it():
+    jieba = Jieba(_dataset(None))
+
+    with (
+        patch(f"{JIEBA_MODULE}.dify_config.KEYWORD_DATA_SOURCE_TYPE", "index"),
+        patch(f"{JIEBA_MODULE}.db") as mock_db,
+    ):
+        assert jieba.search("hello world") == []
+        assert jieba.text_exists("node-1") is False
+
+    mock_db.session.add.assert_not_called()
+    mock_db.session.commit.assert_not_called()
+
+
+def test_reads_of_legacy_table_do_not_migrate_it():
+    table = _keyword_table(
+        "database",
+        '{"__type__": "keyword_table", "__data__": {"index_id": "dataset-1", "summary": null, '
+        '"table": {"hello": ["node-1"]}}}',
+    )
+    jieba = Jieba(_dataset(table))
+
+    with (
+        patch(f"{JIEBA_MODULE}.dify_config.KEYWORD_DATA_SOURCE_TYPE", "index"),
+        patch(f"{JIEBA_MODULE}.db") as mock_db,
+        patch(f"{JIEBA_MODULE}.redis_client") as mock_redis,
+        patch(f"{JIEBA_MODULE}.KeywordIndexStore") as mock_store_cls,
+        patch("models.dataset.db"),
+    ):
+        assert jieba.text_exists("node-1") is True
+        jieba.search("hello")
+
+    mock_redis.lock.assert_not_called()
+    mock_store_cls.assert_not_called()
+    mock_db.session.commit.assert_not_called()
+    assert table.data_source_type == "database"
@@ -0,0 +1,95 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+from core.rag.datasource.vdb.elasticsearch.elasticsearch_vector import ElasticSearchVector
+from core.rag.datasource.vdb.vector_base import TEXTS_EXIST_BATCH_SIZE, BaseVector
+from core.rag.datasource.vdb.vector_factory import Vector
+from core.rag.models.document import Document
+
+
+def _vector(embeddings: MagicMock, vector_processor: MagicMock) -> Vector:
+    vector = Vector.__new__(Vector)
+    vector._embeddings = embeddings
+    vector._vector_processor = vector_processor
+    return vector
+
+
+def test_create_overlaps_embedding_with_vector_store_writes():
+    documents = [Document(page_content=f"text {i}", metadata={"doc_id": str(i)}) for i in range(2500)]
+    events: list[str] = []
+    lock = threading.Lock()
+
+    def embed_documents(texts: list[str]) -> list[list[float]]:
+        with lock:
+            events.append(f"embed start {texts[0]}")
+        time.sleep(0.05)
+        with lock:
+            events.append(f"embed end {texts[0]}")
+        return [[float(text.split()[1])] for text in texts]
+
+    def create(texts: list[Document], embeddings: list[list[float]], **kwargs):
+        assert [document.page_content for document in texts] == [f"text {int(e[0])}" for e in embeddings]
+        with lock:
+            events.append(f"write start {texts[0].page_content}")
+        time.sleep(0.05)
+        with lock:
+            events.append(f"write end {texts[0].page_content}")
+
+    embeddings = MagicMock()
+    embeddings.embed_documents.side_effect = embed_documents
+    vector_processor = MagicMock()
+    vector_processor.create.side_effect = create
+
+    _vector(embeddings, vector_processor).create(texts=documents)
+
+    written = [call.kwargs["texts"] for call in vector_processor.create.call_args_list]
+    assert [len(batch) for batch in written] == [1000, 1000, 500]
+    assert [document for batch in written for document in batch] == documents
+    # the second batch is embedded while the first one is written
+    assert events.index("embed start text 1000") < events.index("write end text 0")
+
+
+def test_create_single_batch_runs_inline():
+    documents = [Document(page_content="text", metadata={"doc_id": "1"})]
+    embeddings = MagicMock()
+    embeddings.embed_documents.return_value = [[1.0]]
+    vector_processor = MagicMock()
+
+    _vector(embeddings, vector_processor).create(texts=documents, duplicate_check=True)
+
+    vector_processor.create.assert_called_once_with(texts=documents, embeddings=[[1.0]], duplicate_check=True)
+
+
+def test_add_texts_checks_duplicates_in_one_lookup():
+    documents = [Document(page_content=f"text {i}", metadata={"doc_id": str(i)}) for i in range(3)]
+    embeddings = MagicMock()
+    embeddings.embed_documents.return_value = [[0.0], [2.0]]
+    vector_processor = MagicMock()
+    vector_processor.texts_exist.return_value = {"1"}
+
+    _vector(embeddings, vector_processor).add_texts(documents, duplicate_check=True)
+
+    vector_processor.texts_exist.assert_called_once_with(["0", "1", "2"])
+    vector_processor.text_exists.assert_not_called()
+    assert vector_processor.create.call_args.kwargs["texts"] == [documents[0], documents[2]]
+
+
+def test_texts_exist_falls_back_to_text_exists():
+    vector_processor = MagicMock(spec=BaseVector)
+    vector_processor.text_exists.side_effect = lambda id: id != "2"
+
+    assert BaseVector.texts_exist(vector_processor, ["1", "2", "3"]) == {"1", "3"}
+
+
+def test_elasticsearch_texts_exist_batches_ids():
+    vector = ElasticSearchVector.__new__(ElasticSearchVector)
+    vector._collection_name = "collection"
+    vector._client = MagicMock()
+    vector._client.mget.side_effect = lambda index, ids, source: {
+        "docs": [{"_id": id, "found": int(id) % 2 == 0} for id in ids]
+    }
+    ids = [str(i) for i in range(TEXTS_EXIST_BATCH_SIZE + 10)]
+
+    assert vector.texts_exist(ids) == {id for id in ids if int(id) % 2 == 0}
+    assert [len(call.kwargs["ids"]) for call in vector._client.mget.call_args_list] == [TEXTS_EXIST_BATCH_SIZE, 10]
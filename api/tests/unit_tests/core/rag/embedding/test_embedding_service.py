@@ -44,11 +44,14 @@ Tests follow the Arrange-Act-Assert pattern for clarity.
 """
 
 import base64
+import threading
+import time
 from decimal import Decimal
 from unittest.mock import Mock, patch
 
 import numpy as np
 import pytest
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import IntegrityError
 
 from core.entities.embedding_type import EmbeddingInputType
@@ -59,7 +62,8 @@ from core.model_runtime.errors.invoke import (
     InvokeConnectionError,
     InvokeRateLimitError,
 )
-from core.rag.embedding.cached_embedding import CacheEmbedding
+from core.rag.embedding.cached_embedding import CACHE_LOOKUP_BATCH_SIZE, CACHE_WRITE_BATCH_SIZE, CacheEmbedding
+from libs import helper
 from models.dataset import Embedding
 
 
@@ -139,7 +143,7 @@ class TestCacheEmbeddingDocuments:
 
         # Mock database query to return no cached embedding (cache miss)
         with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
-            mock_session.query.return_value.filter_by.return_value.first.return_value = None
+            mock_session.execute.return_value.all.return_value = []
 
             # Mock model invocation
             mock_model_instance.invoke_text_embedding.return_value = sample_embedding_result
@@ -160,8 +164,8 @@ class TestCacheEmbeddingDocuments:
                 input_type=EmbeddingInputType.DOCUMENT,
             )
 
-            # Verify embedding was added to database cache
-            mock_session.add.assert_called_once()
+            # Verify one cache lookup and one cache insert
+            assert mock_session.execute.call_count == 2
             mock_session.commit.assert_called_once()
 
     def test_embed_multiple_documents_cache_miss(self, mock_model_instance):
@@ -204,7 +208,7 @@ class TestCacheEmbeddingDocuments:
         )
 
         with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
-            mock_session.query.return_value.filter_by.return_value.first.return_value = None
+            mock_session.execute.return_value.all.return_value = []
             mock_model_instance.invoke_text_embedding.return_value = embedding_result
 
             # Act
@@ -236,12 +240,11 @@ class TestCacheEmbeddingDocuments:
         cached_vector = np.random.randn(1536)
         normalized_cached = (cached_vector / np.linalg.norm(cached_vector)).tolist()
 
-        mock_cached_embedding = Mock(spec=Embedding)
-        mock_cached_embedding.get_embedding.return_value = normalized_cached
-
         with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
             # Mock database to return cached embedding (cache hit)
-            mock_session.query.return_value.filter_by.return_value.first.return_value = mock_cached_embedding
+            mock_session.execute.return_value.all.return_value = [
+                (helper.generate_text_hash(texts[0]), Embedding.dump_embedding(normalized_cached))
+            ]
 
             # Act
             result = cache_embedding.embed_documents(texts)
@@ -253,8 +256,9 @@ class TestCacheEmbeddingDocuments:
             # Verify model was NOT invoked (cache hit)
             mock_model_instance.invoke_text_embedding.assert_not_called()
 
-            # Verify no new cache entries were added
-            mock_session.add.assert_not_called()
+            # Verify only the lookup ran and no new cache entries were added
+            mock_session.execute.assert_called_once()
+            mock_session.commit.assert_not_called()
 
     def test_embed_documents_partial_cache_hit(self, mock_model_instance):
         """Test embedding documents with mixed cache hits and misses.
@@ -276,9 +280,6 @@ class TestCacheEmbeddingDocuments:
         cached_vector = np.random.randn(1536)
         normalized_cached = (cached_vector / np.linalg.norm(cached_vector)).tolist()
 
-        mock_cached_embedding = Mock(spec=Embedding)
-        mock_cached_embedding.get_embedding.return_value = normalized_cached
-
         # Create new embeddings for non-cached texts
         new_embeddings = []
         for _ in range(2):
@@ -314,19 +315,9 @@ class TestCacheEmbeddingDocuments:
                 mock_hash.side_effect = generate_hash
 
                 # Mock database to return cached embedding only for first text (hash_1)
-                call_count = [0]
-
-                def mock_filter_by(**kwargs):
-                    call_count[0] += 1
-                    mock_query = Mock()
-                    # First call (hash_1) returns cached, others return None
-                    if call_count[0] == 1:
-                        mock_query.first.return_value = mock_cached_embedding
-                    else:
-                        mock_query.first.return_value = None
-                    return mock_query
-
-                mock_session.query.return_value.filter_by = mock_filter_by
+                mock_session.execute.return_value.all.return_value = [
+                    ("hash_1", Embedding.dump_embedding(normalized_cached))
+                ]
                 mock_model_instance.invoke_text_embedding.return_value = embedding_result
 
                 # Act
@@ -393,7 +384,7 @@ class TestCacheEmbeddingDocuments:
             )
 
         with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
-            mock_session.query.return_value.filter_by.return_value.first.return_value = None
+            mock_session.execute.return_value.all.return_value = []
 
             # Mock model to return appropriate batch results
             batch_results = [
@@ -456,7 +447,7 @@ class TestCacheEmbeddingDocuments:
         )
 
         with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
-            mock_session.query.return_value.filter_by.return_value.first.return_value = None
+            mock_session.execute.return_value.all.return_value = []
             mock_model_instance.invoke_text_embedding.return_value = embedding_result
 
             with patch("core.rag.embedding.cached_embedding.logger") as mock_logger:
@@ -490,7 +481,7 @@ class TestCacheEmbeddingDocuments:
         texts = ["Test text"]
 
         with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
-            mock_session.query.return_value.filter_by.return_value.first.return_value = None
+            mock_session.execute.return_value.all.return_value = []
 
             # Mock model to raise connection error
             mock_model_instance.invoke_text_embedding.side_effect = InvokeConnectionError("Failed to connect to API")
@@ -516,7 +507,7 @@ class TestCacheEmbeddingDocuments:
         texts = ["Test text"]
 
         with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
-            mock_session.query.return_value.filter_by.return_value.first.return_value = None
+            mock_session.execute.return_value.all.return_value = []
 
             # Mock model to raise rate limit error
             mock_model_instance.invoke_text_embedding.side_effect = InvokeRateLimitError("Rate limit exceeded")
@@ -540,7 +531,7 @@ class TestCacheEmbeddingDocuments:
         texts = ["Test text"]
 
         with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
-            mock_session.query.return_value.filter_by.return_value.first.return_value = None
+            mock_session.execute.return_value.all.return_value = []
 
             # Mock model to raise authorization error
             mock_model_instance.invoke_text_embedding.side_effect = InvokeAuthorizationError("Invalid API key")
@@ -565,7 +556,7 @@ class TestCacheEmbeddingDocuments:
         texts = ["Test text"]
 
         with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
-            mock_session.query.return_value.filter_by.return_value.first.return_value = None
+            mock_session.execute.return_value.all.return_value = []
             mock_model_instance.invoke_text_embedding.return_value = sample_embedding_result
 
             # Mock database commit to raise IntegrityError
@@ -886,7 +877,7 @@ class TestEmbeddingModelSwitching:
         )
 
         with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
-            mock_session.query.return_value.filter_by.return_value.first.return_value = None
+            mock_session.execute.return_value.all.return_value = []
 
             model_instance_ada.invoke_text_embedding.return_value = result_ada
             model_instance_3_small.invoke_text_embedding.return_value = result_3_small
@@ -1049,7 +1040,7 @@ class TestEmbeddingDimensionValidation:
         )
 
         with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
-            mock_session.query.return_value.filter_by.return_value.first.return_value = None
+            mock_session.execute.return_value.all.return_value = []
             mock_model_instance.invoke_text_embedding.return_value = embedding_result
 
             # Act
@@ -1102,7 +1093,7 @@ class TestEmbeddingDimensionValidation:
         )
 
         with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
-            mock_session.query.return_value.filter_by.return_value.first.return_value = None
+            mock_session.execute.return_value.all.return_value = []
             mock_model_instance.invoke_text_embedding.return_value = embedding_result
 
             # Act
@@ -1188,7 +1179,7 @@ class TestEmbeddingDimensionValidation:
         )
 
         with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
-            mock_session.query.return_value.filter_by.return_value.first.return_value = None
+            mock_session.execute.return_value.all.return_value = []
 
             model_instance_ada.invoke_text_embedding.return_value = result_ada
             model_instance_cohere.invoke_text_embedding.return_value = result_cohere
@@ -1286,7 +1277,7 @@ class TestEmbeddingEdgeCases:
         )
 
         with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
-            mock_session.query.return_value.filter_by.return_value.first.return_value = None
+            mock_session.execute.return_value.all.return_value = []
             mock_model_instance.invoke_text_embedding.return_value = embedding_result
 
             # Act
@@ -1329,7 +1320,7 @@ class TestEmbeddingEdgeCases:
         )
 
         with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
-            mock_session.query.return_value.filter_by.return_value.first.return_value = None
+            mock_session.execute.return_value.all.return_value = []
             mock_model_instance.invoke_text_embedding.return_value = embedding_result
 
             # Act
@@ -1377,7 +1368,7 @@ class TestEmbeddingEdgeCases:
         )
 
         with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
-            mock_session.query.return_value.filter_by.return_value.first.return_value = None
+            mock_session.execute.return_value.all.return_value = []
             mock_model_instance.invoke_text_embedding.return_value = embedding_result
 
             # Act
@@ -1429,7 +1420,7 @@ class TestEmbeddingEdgeCases:
         )
 
         with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
-            mock_session.query.return_value.filter_by.return_value.first.return_value = None
+            mock_session.execute.return_value.all.return_value = []
             mock_model_instance.invoke_text_embedding.return_value = embedding_result
 
             # Act
@@ -1485,7 +1476,7 @@ class TestEmbeddingEdgeCases:
         )
 
         with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
-            mock_session.query.return_value.filter_by.return_value.first.return_value = None
+            mock_session.execute.return_value.all.return_value = []
             mock_model_instance.invoke_text_embedding.return_value = embedding_result
 
             # Act
@@ -1553,7 +1544,7 @@ class TestEmbeddingEdgeCases:
         )
 
         with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
-            mock_session.query.return_value.filter_by.return_value.first.return_value = None
+            mock_session.execute.return_value.all.return_value = []
             mock_model_instance.invoke_text_embedding.return_value = embedding_result
 
             # Act
@@ -1664,7 +1655,7 @@ class TestEmbeddingEdgeCases:
         )
 
         with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
-            mock_session.query.return_value.filter_by.return_value.first.return_value = None
+            mock_session.execute.return_value.all.return_value = []
             mock_model_instance.invoke_text_embedding.return_value = embedding_result
 
             # Act
@@ -1740,12 +1731,9 @@ class TestEmbeddingCachePerformance:
         vector = np.random.randn(1536)
         normalized = (vector / np.linalg.norm(vector)).tolist()
 
-        mock_cached_embedding = Mock(spec=Embedding)
-        mock_cached_embedding.get_embedding.return_value = normalized
-
         with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
             # First call: cache miss
-            mock_session.query.return_value.filter_by.return_value.first.return_value = None
+            mock_session.execute.return_value.all.return_value = []
 
             usage = EmbeddingUsage(
                 tokens=5,
@@ -1773,7 +1761,9 @@ class TestEmbeddingCachePerformance:
             assert len(result1) == 1
 
             # Arrange - Second call: cache hit
-            mock_session.query.return_value.filter_by.return_value.first.return_value = mock_cached_embedding
+            mock_session.execute.return_value.all.return_value = [
+                (helper.generate_text_hash(text), Embedding.dump_embedding(normalized))
+            ]
 
             # Act - Second call (cache hit)
             result2 = cache_embedding.embed_documents([text])
@@ -1833,7 +1823,7 @@ class TestEmbeddingCachePerformance:
             )
 
         with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
-            mock_session.query.return_value.filter_by.return_value.first.return_value = None
+            mock_session.execute.return_value.all.return_value = []
 
             # Mock model to return appropriate batch results
             batch_results = [
@@ -1919,3 +1909,124 @@ class TestEmbeddingCachePerformance:
             # Assert - TTL was extended
             mock_redis.expire.assert_called_once()
             assert mock_redis.expire.call_args[0][1] == 600
+
+    def test_cache_is_read_and_written_in_bulk(self, mock_model_instance):
+        """Test that the document cache is accessed with batched statements.
+
+        Verifies:
+        - Lookups use one IN query per CACHE_LOOKUP_BATCH_SIZE hashes
+        - Writes use one multi-row insert per CACHE_WRITE_BATCH_SIZE rows
+        - Duplicate texts are stored once
+        """
+        # Arrange
+        cache_embedding = CacheEmbedding(mock_model_instance)
+        unique_count = CACHE_LOOKUP_BATCH_SIZE + 1
+        texts = [f"text {i}" for i in range(unique_count)] + ["text 0"]
+
+        def invoke_text_embedding(texts, user, input_type):
+            return EmbeddingResult(
+                model="text-embedding-ada-002",
+                embeddings=[[1.0, 0.0] for _ in texts],
+                usage=EmbeddingUsage(
+                    tokens=1,
+                    total_tokens=1,
+                    unit_price=Decimal(0),
+                    price_unit=Decimal(1000),
+                    total_price=Decimal(0),
+                    currency="USD",
+                    latency=0.1,
+                ),
+            )
+
+        mock_model_instance.invoke_text_embedding.side_effect = invoke_text_embedding
+
+        with (
+            patch("core.rag.embedding.cached_embedding.db.session") as mock_session,
+            patch("core.rag.embedding.cached_embedding.dify_config.DB_TYPE", "postgresql"),
+        ):
+            mock_session.execute.return_value.all.return_value = []
+
+            # Act
+            result = cache_embedding.embed_documents(texts)
+
+            # Assert
+            assert len(result) == len(texts)
+            statements = [call.args[0] for call in mock_session.execute.call_args_list]
+            lookups = [stmt for stmt in statements if stmt.is_select]
+            inserts = [stmt for stmt in statements if stmt.is_insert]
+            assert len(lookups) == 2
+            assert len(inserts) == -(-unique_count // CACHE_WRITE_BATCH_SIZE)
+            assert "ON CONFLICT (model_name, hash, provider_name) DO NOTHING" in str(
+                inserts[0].compile(dialect=postgresql.dialect())
+            )
+            mock_session.commit.assert_called_once()
+
+    def test_concurrent_batches_keep_order(self, mock_model_instance):
+        """Test that batches embedded concurrently are returned in input order.
+
+        Verifies:
+        - Up to EMBEDDING_MAX_CONCURRENT_REQUESTS requests run at the same time
+        - Embeddings line up with their texts regardless of completion order
+        """
+        # Arrange
+        cache_embedding = CacheEmbedding(mock_model_instance)
+        texts = [f"text {i}" for i in range(40)]
+        in_flight = [0, 0]
+        lock = threading.Lock()
+
+        def invoke_text_embedding(texts, user, input_type):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight[1], in_flight[0])
+            # later batches finish first
+            time.sleep(0.05 / (1 + int(texts[0].split()[1])))
+            with lock:
+                in_flight[0] -= 1
+            return EmbeddingResult(
+                model="text-embedding-ada-002",
+                embeddings=[[1.0, float(text.split()[1])] for text in texts],
+                usage=EmbeddingUsage(
+                    tokens=1,
+                    total_tokens=1,
+                    unit_price=Decimal(0),
+                    price_unit=Decimal(1000),
+                    total_price=Decimal(0),
+                    currency="USD",
+                    latency=0.1,
+                ),
+            )
+
+        mock_model_instance.invoke_text_embedding.side_effect = invoke_text_embedding
+
+        with (
+            patch("core.rag.embedding.cached_embedding.db.session") as mock_session,
+            patch("core.rag.embedding.cached_embedding.dify_config.EMBEDDING_MAX_CONCURRENT_REQUESTS", 4),
+        ):
+            mock_session.execute.return_value.all.return_value = []
+
+            # Act
+            result = cache_embedding.embed_documents(texts)
+
+        # Assert
+        assert mock_model_instance.invoke_text_embedding.call_count == 4
+        assert 1 < in_flight[1] <= 4
+        for i, embedding in enumerate(result):
+            expected = np.array([1.0, float(i)]) / np.linalg.norm([1.0, float(i)])
+            assert np.allclose(embedding, expected)
+
+    def test_concurrent_batch_failure_is_raised(self, mock_model_instance):
+        """Test that a failed batch fails the whole call when batches run concurrently."""
+        # Arrange
+        cache_embedding = CacheEmbedding(mock_model_instance)
+        mock_model_instance.invoke_text_embedding.side_effect = InvokeRateLimitError("Rate limit exceeded")
+
+        with (
+            patch("core.rag.embedding.cached_embedding.db.session") as mock_session,
+            patch("core.rag.embedding.cached_embedding.dify_config.EMBEDDING_MAX_CONCURRENT_REQUESTS", 4),
+        ):
+            mock_session.execute.return_value.all.return_value = []
+
+            # Act & Assert
+            with pytest.raises(InvokeRateLimitError):
+                cache_embedding.embed_documents([f"text {i}" for i in range(40)])
+            mock_session.rollback.assert_called()
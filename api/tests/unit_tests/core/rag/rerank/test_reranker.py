@@ -409,7 +409,7 @@ class TestWeightRerankRunner:
     @pytest.fixture
     def mock_jieba_handler(self):
         """Mock JiebaKeywordTableHandler for keyword extraction."""
-        with patch("core.rag.rerank.weight_rerank.JiebaKeywordTableHandler") as mock_jieba:
+        with patch("core.rag.rerank.similarity.JiebaKeywordTableHandler") as mock_jieba:
             yield mock_jieba
 
     @pytest.fixture
@@ -1295,7 +1295,7 @@ class TestRerankEdgeCases:
 
         # Mock dependencies
         with (
-            patch("core.rag.rerank.weight_rerank.JiebaKeywordTableHandler") as mock_jieba,
+            patch("core.rag.rerank.similarity.JiebaKeywordTableHandler") as mock_jieba,
             patch("core.rag.rerank.weight_rerank.ModelManager") as mock_manager,
             patch("core.rag.rerank.weight_rerank.CacheEmbedding") as mock_cache,
         ):
@@ -1441,7 +1441,7 @@ class TestRerankPerformance:
         runner = WeightRerankRunner(tenant_id="tenant123", weights=weights)
 
         with (
-            patch("core.rag.rerank.weight_rerank.JiebaKeywordTableHandler") as mock_jieba,
+            patch("core.rag.rerank.similarity.JiebaKeywordTableHandler") as mock_jieba,
             patch("core.rag.rerank.weight_rerank.ModelManager") as mock_manager,
             patch("core.rag.rerank.weight_rerank.CacheEmbedding") as mock_cache,
         ):
@@ -1592,7 +1592,7 @@ class TestRerankErrorHandling:
         runner = WeightRerankRunner(tenant_id="tenant123", weights=weights)
 
         with (
-            patch("core.rag.rerank.weight_rerank.JiebaKeywordTableHandler") as mock_jieba,
+            patch("core.rag.rerank.similarity.JiebaKeywordTableHandler") as mock_jieba,
             patch("core.rag.rerank.weight_rerank.ModelManager") as mock_manager,
             patch("core.rag.rerank.weight_rerank.CacheEmbedding") as mock_cache,
         ):
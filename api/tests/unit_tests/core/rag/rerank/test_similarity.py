@@ -0,0 +1,52 @@
+import math
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from core.rag.rerank.similarity import keyword_cosine_similarities, vector_cosine_similarities
+
+
+def _reference_keyword_similarities(query_keywords: list[str], documents_keywords: list[list[str]]) -> list[float]:
+    total_documents = len(documents_keywords)
+    all_keywords = {keyword for document_keywords in documents_keywords for keyword in document_keywords}
+    keyword_idf = {
+        keyword: math.log((1 + total_documents) / (1 + sum(1 for doc in documents_keywords if keyword in doc))) + 1
+        for keyword in all_keywords
+    }
+    query_tfidf = {keyword: count * keyword_idf.get(keyword, 0) for keyword, count in Counter(query_keywords).items()}
+
+    similarities = []
+    for document_keywords in documents_keywords:
+        document_tfidf = {
+            keyword: count * keyword_idf[keyword] for keyword, count in Counter(document_keywords).items()
+        }
+        numerator = sum(query_tfidf[x] * document_tfidf[x] for x in set(query_tfidf) & set(document_tfidf))
+        denominator = math.sqrt(sum(v**2 for v in query_tfidf.values())) * math.sqrt(
+            sum(v**2 for v in document_tfidf.values())
+        )
+        similarities.append(numerator / denominator if denominator else 0.0)
+    return similarities
+
+
+def test_keyword_similarities_match_reference():
+    rng = np.random.default_rng(42)
+    documents_keywords = [[f"word{i}" for i in rng.integers(0, 200, rng.integers(0, 30))] for _ in range(100)]
+    query_keywords = [f"word{i}" for i in rng.integers(0, 200, 8)] + ["missing"]
+
+    scores = keyword_cosine_similarities(query_keywords, documents_keywords)
+
+    assert scores == pytest.approx(_reference_keyword_similarities(query_keywords, documents_keywords))
+
+
+def test_keyword_similarities_without_matches():
+    assert keyword_cosine_similarities(["a"], []) == []
+    assert keyword_cosine_similarities(["a"], [[], []]) == [0.0, 0.0]
+    assert keyword_cosine_similarities(["a"], [["b"], ["c"]]) == [0.0, 0.0]
+
+
+def test_vector_similarities():
+    scores = vector_cosine_similarities([1.0, 0.0], [[1.0, 0.0], [0.0, 2.0], [1.0, 1.0]])
+
+    assert scores == pytest.approx([1.0, 0.0, math.sqrt(0.5)])
+    assert vector_cosine_similarities([1.0, 0.0], []) == []
@@ -0,0 +1,159 @@
+"""Unit tests for compiling subgraph templates."""
+
+import time
+
+import pytest
+from pydantic import ValidationError
+
+from core.workflow.entities import GraphInitParams
+from core.workflow.graph import Graph, GraphTemplate
+from core.workflow.nodes.node_factory import DifyNodeFactory
+from core.workflow.nodes.variable_assigner.v2.node import VariableAssignerNode
+from core.workflow.runtime import GraphRuntimeState, VariablePool
+from core.workflow.system_variable import SystemVariable
+
+
+def _node(node_id: str, node_type: str = "code", **data) -> dict:
+    return {"id": node_id, "data": {"type": node_type, **data}}
+
+
+GRAPH_CONFIG = {
+    "nodes": [
+        _node("start", "start"),
+        _node("iteration", "iteration", start_node_id="iteration_start"),
+        _node("iteration_start", "iteration-start", iteration_id="iteration"),
+        _node("inner_a", iteration_id="iteration"),
+        _node("inner_b", iteration_id="iteration"),
+        _node("end", "end"),
+        {"id": "note", "type": "custom-note", "data": {"type": ""}},
+    ],
+    "edges": [
+        {"source": "start", "target": "iteration"},
+        {"source": "iteration", "target": "end"},
+        {"source": "iteration_start", "target": "inner_a"},
+        {"source": "inner_a", "target": "inner_b", "sourceHandle": "source"},
+    ],
+}
+
+
+class TestGraphTemplateFromGraphConfig:
+    def test_keeps_only_reachable_subgraph(self):
+        template = GraphTemplate.from_graph_config(GRAPH_CONFIG, root_node_id="iteration_start")
+
+        assert list(template.nodes) == ["iteration_start", "inner_a", "inner_b"]
+        assert [(edge["source"], edge["target"]) for edge in template.edges.values()] == [
+            ("iteration_start", "inner_a"),
+            ("inner_a", "inner_b"),
+        ]
+        # the ids of the full graph config
+        assert list(template.edges) == ["edge_2", "edge_3"]
+        assert template.root_ids == ["iteration_start"]
+
+    def test_to_graph_config_round_trip(self):
+        template = GraphTemplate.from_graph_config(GRAPH_CONFIG, root_node_id="iteration_start")
+
+        graph_config = template.to_graph_config()
+
+        assert [node["id"] for node in graph_config["nodes"]] == ["iteration_start", "inner_a", "inner_b"]
+        assert len(graph_config["edges"]) == 2
+
+    def test_unknown_root_raises(self):
+        with pytest.raises(ValueError, match="Root node id missing not found"):
+            GraphTemplate.from_graph_config(GRAPH_CONFIG, root_node_id="missing")
+
+    def test_template_is_immutable(self):
+        template = GraphTemplate.from_graph_config(GRAPH_CONFIG, root_node_id="iteration_start")
+
+        with pytest.raises(ValidationError):
+            template.root_ids = ["start"]
+
+
+def _code_node(node_id: str) -> dict:
+    return _node(
+        node_id,
+        title=node_id,
+        iteration_id="iteration",
+        code_language="python3",
+        code="def main():\n    return {}\n",
+        variables=[],
+        outputs={},
+    )
+
+
+def _http_request_node(node_id: str) -> dict:
+    return _node(
+        node_id,
+        "http-request",
+        title=node_id,
+        iteration_id="iteration",
+        method="get",
+        url="https://example.com",
+        authorization={"type": "no-auth"},
+        headers="",
+        params="",
+    )
+
+
+INSTANTIABLE_GRAPH_CONFIG = {
+    "nodes": [
+        _node("start", "start", title="start", variables=[]),
+        _node("iteration_start", "iteration-start", title="start", iteration_id="iteration"),
+        _code_node("code"),
+        _http_request_node("http_request"),
+    ],
+    "edges": [
+        {"source": "start", "target": "code"},
+        {"source": "iteration_start", "target": "code"},
+        {"source": "code", "target": "http_request"},
+    ],
+}
+
+
+def _node_factory(node_data_cache=None) -> DifyNodeFactory:
+    init_params = GraphInitParams(
+        tenant_id="tenant",
+        app_id="app",
+        workflow_id="workflow",
+        graph_config=INSTANTIABLE_GRAPH_CONFIG,
+        user_id="user",
+        user_from="account",
+        invoke_from="debugger",
+        call_depth=0,
+    )
+    runtime_state = GraphRuntimeState(
+        variable_pool=VariablePool(system_variables=SystemVariable(user_id="user")), start_at=time.perf_counter()
+    )
+    return DifyNodeFactory(
+        graph_init_params=init_params, graph_runtime_state=runtime_state, node_data_cache=node_data_cache
+    )
+
+
+class TestGraphInitFromTemplate:
+    def test_edges_keep_the_ids_of_the_full_graph(self):
+        template = GraphTemplate.from_graph_config(INSTANTIABLE_GRAPH_CONFIG, root_node_id="iteration_start")
+
+        graph = Graph.init_from_template(template=template, node_factory=_node_factory())
+        full_graph = Graph.init(
+            graph_config=INSTANTIABLE_GRAPH_CONFIG, node_factory=_node_factory(), root_node_id="iteration_start"
+        )
+
+        assert list(graph.edges) == ["edge_1", "edge_2"]
+        for edge_id, edge in graph.edges.items():
+            assert (edge.tail, edge.head) == (full_graph.edges[edge_id].tail, full_graph.edges[edge_id].head)
+        assert graph.out_edges["code"] == ["edge_2"]
+
+    def test_node_data_is_parsed_once_unless_the_node_mutates_it(self):
+        template = GraphTemplate.from_graph_config(INSTANTIABLE_GRAPH_CONFIG, root_node_id="iteration_start")
+
+        first = Graph.init_from_template(template=template, node_factory=_node_factory(template.node_data_cache))
+        second = Graph.init_from_template(template=template, node_factory=_node_factory(template.node_data_cache))
+
+        assert second.nodes["code"] is not first.nodes["code"]
+        assert second.nodes["code"].node_data is first.nodes["code"].node_data
+        # the HTTP request node renders its authorization in place
+        assert "http_request" not in template.node_data_cache
+        assert second.nodes["http_request"].node_data is not first.nodes["http_request"].node_data
+
+    def test_variable_assigner_parses_its_own_node_data(self):
+        # the values of variable inputs are resolved in place, so each run needs its own operation items
+        assert VariableAssignerNode.mutates_node_data
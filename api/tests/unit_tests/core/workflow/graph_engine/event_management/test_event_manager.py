@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import threading
 
 from core.workflow.graph_engine.event_management.event_manager import EventManager
 from core.workflow.graph_engine.layers.base import GraphEngineLayer
@@ -37,3 +38,20 @@ def test_event_manager_logs_layer_errors(caplog) -> None:
     log_record = error_logs[0]
     assert log_record.exc_info is not None
     assert isinstance(log_record.exc_info[1], RuntimeError)
+
+
+def test_emit_events_wakes_up_on_collect_and_complete() -> None:
+    """Ensure the emitter blocks until events arrive and stops once execution completes."""
+
+    event_manager = EventManager()
+    emitted: list[GraphEngineEvent] = []
+    consumer = threading.Thread(target=lambda: emitted.extend(event_manager.emit_events()))
+    consumer.start()
+
+    event = GraphEngineEvent()
+    event_manager.collect(event)
+    event_manager.mark_complete()
+    consumer.join(timeout=1)
+
+    assert not consumer.is_alive()
+    assert emitted == [event]
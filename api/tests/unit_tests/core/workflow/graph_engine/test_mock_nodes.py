@@ -25,7 +25,7 @@ from core.workflow.nodes.tool import ToolNode
 
 if TYPE_CHECKING:
     from core.workflow.entities import GraphInitParams
-    from core.workflow.runtime import GraphRuntimeState
+    from core.workflow.runtime import GraphRuntimeState, VariablePool
 
     from .test_mock_config import MockConfig
 
@@ -559,56 +559,28 @@ class MockIterationNode(MockNodeMixin, IterationNode):
         """Return the version of this mock node."""
         return "1"
 
-    def _create_graph_engine(self, index: int, item: Any):
+    def _create_graph_engine(self, index: int, item: Any, *, parent_pool: "VariablePool | None" = None):
         """Create a graph engine with MockNodeFactory instead of DifyNodeFactory."""
         # Import dependencies
-        from core.workflow.entities import GraphInitParams
         from core.workflow.graph import Graph
         from core.workflow.graph_engine import GraphEngine
         from core.workflow.graph_engine.command_channels import InMemoryChannel
-        from core.workflow.runtime import GraphRuntimeState
 
         # Import our MockNodeFactory instead of DifyNodeFactory
         from .test_mock_factory import MockNodeFactory
 
-        # Create GraphInitParams from node attributes
-        graph_init_params = GraphInitParams(
-            tenant_id=self.tenant_id,
-            app_id=self.app_id,
-            workflow_id=self.workflow_id,
-            graph_config=self.graph_config,
-            user_id=self.user_id,
-            user_from=self.user_from.value,
-            invoke_from=self.invoke_from.value,
-            call_depth=self.workflow_call_depth,
-        )
-
-        # Create a deep copy of the variable pool for each iteration
-        variable_pool_copy = self.graph_runtime_state.variable_pool.model_copy(deep=True)
-
-        # append iteration variable (item, index) to variable pool
-        variable_pool_copy.add([self._node_id, "index"], index)
-        variable_pool_copy.add([self._node_id, "item"], item)
-
-        # Create a new GraphRuntimeState for this iteration
-        graph_runtime_state_copy = GraphRuntimeState(
-            variable_pool=variable_pool_copy,
-            start_at=self.graph_runtime_state.start_at,
-            total_tokens=0,
-            node_run_steps=0,
-        )
+        # Create a new GraphRuntimeState with a copy-on-write child of the variable pool for each iteration
+        graph_runtime_state_copy = self._create_iteration_runtime_state(index, item, parent_pool=parent_pool)
 
         # Create a MockNodeFactory with the same mock_config
         node_factory = MockNodeFactory(
-            graph_init_params=graph_init_params,
+            graph_init_params=self.graph_init_params,
             graph_runtime_state=graph_runtime_state_copy,
             mock_config=self.mock_config,  # Pass the mock configuration
         )
 
         # Initialize the iteration graph with the mock node factory
-        iteration_graph = Graph.init(
-            graph_config=self.graph_config, node_factory=node_factory, root_node_id=self._node_data.start_node_id
-        )
+        iteration_graph = Graph.init_from_template(template=self._get_graph_template(), node_factory=node_factory)
 
         if not iteration_graph:
             from core.workflow.nodes.iteration.exc import IterationGraphNotFoundError
@@ -625,6 +597,10 @@ class MockIterationNode(MockNodeMixin, IterationNode):
 
         return graph_engine
 
+    def _get_batch_code_node_config(self):
+        """Run code nodes through the graph engines above so they are mocked by MockNodeFactory."""
+        return None
+
 
 class MockLoopNode(MockNodeMixin, LoopNode):
     """Mock implementation of LoopNode that preserves mock configuration."""
@@ -637,7 +613,6 @@ class MockLoopNode(MockNodeMixin, LoopNode):
     def _create_graph_engine(self, start_at, root_node_id: str):
         """Create a graph engine with MockNodeFactory instead of DifyNodeFactory."""
         # Import dependencies
-        from core.workflow.entities import GraphInitParams
         from core.workflow.graph import Graph
         from core.workflow.graph_engine import GraphEngine
         from core.workflow.graph_engine.command_channels import InMemoryChannel
@@ -646,18 +621,6 @@ class MockLoopNode(MockNodeMixin, LoopNode):
         # Import our MockNodeFactory instead of DifyNodeFactory
         from .test_mock_factory import MockNodeFactory
 
-        # Create GraphInitParams from node attributes
-        graph_init_params = GraphInitParams(
-            tenant_id=self.tenant_id,
-            app_id=self.app_id,
-            workflow_id=self.workflow_id,
-            graph_config=self.graph_config,
-            user_id=self.user_id,
-            user_from=self.user_from.value,
-            invoke_from=self.invoke_from.value,
-            call_depth=self.workflow_call_depth,
-        )
-
         # Create a new GraphRuntimeState for this iteration
         graph_runtime_state_copy = GraphRuntimeState(
             variable_pool=self.graph_runtime_state.variable_pool,
@@ -666,13 +629,15 @@ class MockLoopNode(MockNodeMixin, LoopNode):
 
         # Create a MockNodeFactory with the same mock_config
         node_factory = MockNodeFactory(
-            graph_init_params=graph_init_params,
+            graph_init_params=self.graph_init_params,
             graph_runtime_state=graph_runtime_state_copy,
             mock_config=self.mock_config,  # Pass the mock configuration
         )
 
         # Initialize the loop graph with the mock node factory
-        loop_graph = Graph.init(graph_config=self.graph_config, node_factory=node_factory, root_node_id=root_node_id)
+        loop_graph = Graph.init_from_template(
+            template=self._get_graph_template(root_node_id), node_factory=node_factory
+        )
 
         if not loop_graph:
             raise ValueError("loop graph not found")
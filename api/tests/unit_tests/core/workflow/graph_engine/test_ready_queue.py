@@ -0,0 +1,85 @@
+"""Tests for the in-memory ready queue."""
+
+import queue
+import threading
+import time
+
+import pytest
+
+from core.workflow.graph_engine.ready_queue import InMemoryReadyQueue
+
+
+def test_put_get_preserves_order():
+    ready_queue = InMemoryReadyQueue()
+    ready_queue.put("a")
+    ready_queue.put("b")
+
+    assert ready_queue.qsize() == 2
+    assert ready_queue.get(timeout=0) == "a"
+    assert ready_queue.get(timeout=0) == "b"
+    assert ready_queue.empty()
+
+
+def test_get_times_out_when_empty():
+    with pytest.raises(queue.Empty):
+        InMemoryReadyQueue().get(timeout=0.01)
+
+
+def test_blocked_get_wakes_on_put():
+    ready_queue = InMemoryReadyQueue()
+    results: list[str] = []
+    consumer = threading.Thread(target=lambda: results.append(ready_queue.get(timeout=5)))
+    consumer.start()
+
+    time.sleep(0.05)
+    ready_queue.put("node")
+    consumer.join(timeout=1)
+
+    assert results == ["node"]
+
+
+def test_wake_waiters_releases_blocked_consumers():
+    ready_queue = InMemoryReadyQueue()
+    errors: list[BaseException] = []
+
+    def consume():
+        try:
+            ready_queue.get(timeout=5)
+        except queue.Empty as e:
+            errors.append(e)
+
+    consumers = [threading.Thread(target=consume) for _ in range(3)]
+    for consumer in consumers:
+        consumer.start()
+    time.sleep(0.05)
+
+    started = time.monotonic()
+    ready_queue.wake_waiters()
+    for consumer in consumers:
+        consumer.join(timeout=1)
+
+    assert len(errors) == 3
+    assert time.monotonic() - started < 1
+
+
+def test_task_done_called_too_many_times():
+    ready_queue = InMemoryReadyQueue()
+    ready_queue.put("a")
+    ready_queue.get()
+    ready_queue.task_done()
+
+    with pytest.raises(ValueError):
+        ready_queue.task_done()
+
+
+def test_dumps_and_loads_round_trip():
+    ready_queue = InMemoryReadyQueue()
+    ready_queue.put("a")
+    ready_queue.put("b")
+
+    restored = InMemoryReadyQueue()
+    restored.loads(ready_queue.dumps())
+
+    assert ready_queue.qsize() == 2
+    assert restored.get(timeout=0) == "a"
+    assert restored.get(timeout=0) == "b"
@@ -0,0 +1,172 @@
+import contextlib
+import io
+import time
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+from core.app.entities.app_invoke_entities import InvokeFrom
+from core.helper.code_executor.code_executor import CodeExecutionError, CodeExecutor
+from core.workflow.entities import GraphInitParams
+from core.workflow.enums import WorkflowNodeExecutionStatus
+from core.workflow.graph_events import NodeRunFailedEvent, NodeRunIterationNextEvent, NodeRunSucceededEvent
+from core.workflow.nodes.iteration.iteration_node import IterationNode
+from core.workflow.runtime import GraphRuntimeState, VariablePool
+from core.workflow.system_variable import SystemVariable
+from models.enums import UserFrom
+
+CODE = """
+def main(x: int) -> dict:
+    return {"y": 10 // x}
+"""
+
+
+def _graph_config(error_handle_mode: str = "continue-on-error", **code_data) -> dict:
+    return {
+        "nodes": [
+            {"id": "start", "data": {"type": "start", "title": "Start"}},
+            {
+                "id": "iteration",
+                "data": {
+                    "type": "iteration",
+                    "title": "Iteration",
+                    "iterator_selector": ["start", "items"],
+                    "output_selector": ["code", "y"],
+                    "start_node_id": "iteration-start",
+                    "error_handle_mode": error_handle_mode,
+                },
+            },
+            {
+                "id": "iteration-start",
+                "data": {"type": "iteration-start", "title": "", "iteration_id": "iteration"},
+            },
+            {
+                "id": "code",
+                "data": {
+                    "type": "code",
+                    "title": "Code",
+                    "iteration_id": "iteration",
+                    "variables": [{"variable": "x", "value_selector": ["iteration", "item"]}],
+                    "code_language": "python3",
+                    "code": CODE,
+                    "outputs": {"y": {"type": "number"}},
+                    **code_data,
+                },
+            },
+        ],
+        "edges": [{"id": "edge", "source": "iteration-start", "target": "code"}],
+    }
+
+
+def _iteration_node(graph_config: dict, items: list[int]) -> IterationNode:
+    init_params = GraphInitParams(
+        tenant_id="1",
+        app_id="1",
+        workflow_id="1",
+        graph_config=graph_config,
+        user_id="1",
+        user_from=UserFrom.ACCOUNT,
+        invoke_from=InvokeFrom.DEBUGGER,
+        call_depth=0,
+    )
+    pool = VariablePool(system_variables=SystemVariable(user_id="aaa", files=[]), user_inputs={})
+    pool.add(["start", "items"], items)
+    return IterationNode(
+        id=str(uuid.uuid4()),
+        config=graph_config["nodes"][1],
+        graph_init_params=init_params,
+        graph_runtime_state=GraphRuntimeState(variable_pool=pool, start_at=time.perf_counter()),
+    )
+
+
+def _run_in_process(language, preload, code):
+    stdout = io.StringIO()
+    with contextlib.redirect_stdout(stdout):
+        exec(code, {"__name__": "__main__"})  # noqa: S102
+    return stdout.getvalue()
+
+
+@pytest.fixture
+def execute_code():
+    with patch.object(CodeExecutor, "execute_code", side_effect=_run_in_process) as mock:
+        yield mock
+
+
+@pytest.fixture(autouse=True)
+def batch_size():
+    with patch("core.workflow.nodes.iteration.iteration_node.dify_config.CODE_EXECUTION_BATCH_SIZE", 100):
+        yield
+
+
+def test_code_runs_once_per_batch(execute_code):
+    node = _iteration_node(_graph_config(), [1, 2, 5, 10])
+
+    with patch("core.workflow.nodes.iteration.iteration_node.dify_config.CODE_EXECUTION_BATCH_SIZE", 3):
+        events = list(node.run())
+
+    assert execute_code.call_count == 2
+    assert [event.index for event in events if isinstance(event, NodeRunIterationNextEvent)] == [0, 1, 2, 3]
+    succeeded = [event for event in events if isinstance(event, NodeRunSucceededEvent) and event.node_id == "code"]
+    assert [event.node_run_result.outputs for event in succeeded] == [{"y": 10}, {"y": 5}, {"y": 2}, {"y": 1}]
+    assert all(event.in_iteration_id == "iteration" for event in succeeded)
+
+    completed = events[-1]
+    assert isinstance(completed, NodeRunSucceededEvent)
+    assert completed.node_id == "iteration"
+    assert completed.node_run_result.status == WorkflowNodeExecutionStatus.SUCCEEDED
+    assert completed.node_run_result.outputs == {"output": [10, 5, 2, 1]}
+
+
+def test_iteration_terminating_on_error_is_not_batched(execute_code):
+    node = _iteration_node(_graph_config("terminated"), [1, 0, 2])
+
+    events = list(node.run())
+
+    # the item after the failing one is never executed
+    assert execute_code.call_count == 2
+    failed = [event for event in events if isinstance(event, NodeRunFailedEvent) and event.node_id == "code"]
+    assert len(failed) == 1
+    assert "division or modulo by zero" in failed[0].error
+    assert events[-1].node_run_result.status == WorkflowNodeExecutionStatus.FAILED
+
+
+@pytest.mark.parametrize(
+    ("error_handle_mode", "expected_output"),
+    [("continue-on-error", [10, None, 5]), ("remove-abnormal-output", [10, 5])],
+)
+def test_failing_item_with_error_handle_mode(execute_code, error_handle_mode, expected_output):
+    node = _iteration_node(_graph_config(error_handle_mode), [1, 0, 2])
+
+    events = list(node.run())
+
+    execute_code.assert_called_once()
+    assert events[-1].node_run_result.outputs == {"output": expected_output}
+
+
+def test_batching_is_disabled_by_default():
+    node = _iteration_node(_graph_config(), [1])
+
+    with patch("core.workflow.nodes.iteration.iteration_node.dify_config.CODE_EXECUTION_BATCH_SIZE", 1):
+        assert node._get_batch_code_node_config() is None
+
+
+def test_code_node_with_error_strategy_is_not_batched():
+    node = _iteration_node(_graph_config(error_strategy="default-value"), [1])
+
+    assert node._get_batch_code_node_config() is None
+
+
+def test_batch_falls_back_to_single_runs_when_the_sandbox_run_fails(execute_code):
+    def fail_batches(language, preload, code):
+        if "inputs_list" in code:
+            raise CodeExecutionError("timeout")
+        return _run_in_process(language, preload, code)
+
+    execute_code.side_effect = fail_batches
+    node = _iteration_node(_graph_config(), [1, 2])
+
+    events = list(node.run())
+
+    assert execute_code.call_count == 3
+    assert events[-1].node_run_result.outputs == {"output": [10, 5]}
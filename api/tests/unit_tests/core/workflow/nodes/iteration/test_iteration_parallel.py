@@ -0,0 +1,177 @@
+import contextlib
+import io
+import time
+import uuid
+from unittest.mock import MagicMock, patch
+
+from core.app.entities.app_invoke_entities import InvokeFrom
+from core.helper.code_executor.code_executor import CodeExecutor
+from core.variables.variables import IntegerVariable
+from core.workflow.constants import CONVERSATION_VARIABLE_NODE_ID
+from core.workflow.entities import GraphInitParams
+from core.workflow.enums import WorkflowNodeExecutionStatus
+from core.workflow.graph_events import NodeRunSucceededEvent
+from core.workflow.nodes.iteration.iteration_node import IterationNode
+from core.workflow.nodes.variable_assigner.v2.node import VariableAssignerNode
+from core.workflow.runtime import GraphRuntimeState, VariablePool
+from core.workflow.system_variable import SystemVariable
+from models.enums import UserFrom
+
+WAIT_CODE = """
+def main() -> dict:
+    return {"done": 1}
+"""
+
+READ_CODE = """
+def main(seen: int) -> dict:
+    return {"seen": seen}
+"""
+
+
+def _graph_config() -> dict:
+    return {
+        "nodes": [
+            {"id": "start", "data": {"type": "start", "title": "Start"}},
+            {
+                "id": "iteration",
+                "data": {
+                    "type": "iteration",
+                    "title": "Iteration",
+                    "iterator_selector": ["start", "items"],
+                    "output_selector": ["read", "seen"],
+                    "start_node_id": "iteration-start",
+                    "is_parallel": True,
+                    "parallel_nums": 1,
+                },
+            },
+            {
+                "id": "iteration-start",
+                "data": {"type": "iteration-start", "title": "", "iteration_id": "iteration"},
+            },
+            {
+                "id": "wait",
+                "data": {
+                    "type": "code",
+                    "title": "Wait",
+                    "iteration_id": "iteration",
+                    "variables": [],
+                    "code_language": "python3",
+                    "code": WAIT_CODE,
+                    "outputs": {"done": {"type": "number"}},
+                },
+            },
+            {
+                "id": "read",
+                "data": {
+                    "type": "code",
+                    "title": "Read",
+                    "iteration_id": "iteration",
+                    "variables": [{"variable": "seen", "value_selector": [CONVERSATION_VARIABLE_NODE_ID, "seen"]}],
+                    "code_language": "python3",
+                    "code": READ_CODE,
+                    "outputs": {"seen": {"type": "number"}},
+                },
+            },
+            {
+                "id": "assign",
+                "data": {
+                    "type": "assigner",
+                    "version": "2",
+                    "title": "Assign",
+                    "iteration_id": "iteration",
+                    "items": [
+                        {
+                            "variable_selector": [CONVERSATION_VARIABLE_NODE_ID, "seen"],
+                            "input_type": "variable",
+                            "operation": "over-write",
+                            "value": ["iteration", "item"],
+                        }
+                    ],
+                },
+            },
+        ],
+        "edges": [
+            {"id": "edge-1", "source": "iteration-start", "target": "wait"},
+            {"id": "edge-2", "source": "wait", "target": "read"},
+            {"id": "edge-3", "source": "read", "target": "assign"},
+        ],
+    }
+
+
+def _variable_pool(items: list[int]) -> VariablePool:
+    pool = VariablePool(
+        system_variables=SystemVariable(user_id="aaa", files=[]),
+        user_inputs={},
+        conversation_variables=[
+            IntegerVariable(name="seen", value=0, selector=[CONVERSATION_VARIABLE_NODE_ID, "seen"])
+        ],
+    )
+    pool.add(["start", "items"], items)
+    return pool
+
+
+def _iteration_node(pool: VariablePool) -> IterationNode:
+    graph_config = _graph_config()
+    init_params = GraphInitParams(
+        tenant_id="1",
+        app_id="1",
+        workflow_id="1",
+        graph_config=graph_config,
+        user_id="1",
+        user_from=UserFrom.ACCOUNT,
+        invoke_from=InvokeFrom.DEBUGGER,
+        call_depth=0,
+    )
+    return IterationNode(
+        id=str(uuid.uuid4()),
+        config=graph_config["nodes"][1],
+        graph_init_params=init_params,
+        graph_runtime_state=GraphRuntimeState(variable_pool=pool, start_at=time.perf_counter()),
+    )
+
+
+def test_parallel_items_do_not_read_conversation_variables_written_by_other_items():
+    node = _iteration_node(_variable_pool([1, 2, 3]))
+    live_pool = node.graph_runtime_state.variable_pool
+
+    def run_in_process(language, preload, code):
+        if WAIT_CODE in code:
+            # the items after the first one start reading once the first item was synced to the pool
+            deadline = time.monotonic() + 5
+            while execute_code.call_count > 1 and time.monotonic() < deadline:
+                seen = live_pool.get([CONVERSATION_VARIABLE_NODE_ID, "seen"])
+                if seen is not None and seen.value != 0:
+                    break
+                time.sleep(0.01)
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            exec(code, {"__name__": "__main__"})  # noqa: S102
+        return stdout.getvalue()
+
+    with (
+        patch.object(CodeExecutor, "execute_code", side_effect=run_in_process) as execute_code,
+        patch.object(VariableAssignerNode, "_conv_var_updater_factory", return_value=MagicMock()),
+    ):
+        events = list(node.run())
+
+    completed = events[-1]
+    assert isinstance(completed, NodeRunSucceededEvent)
+    assert completed.node_run_result.status == WorkflowNodeExecutionStatus.SUCCEEDED
+    # every item reads the value from before the iteration, whatever the order the items finished in
+    assert completed.node_run_result.outputs == {"output": [0, 0, 0]}
+    assert live_pool.get([CONVERSATION_VARIABLE_NODE_ID, "seen"]).value == 3
+
+
+def test_sync_removes_conversation_variables_inherited_by_a_nested_iteration():
+    outer_pool = _variable_pool([1])
+    outer_pool.add([CONVERSATION_VARIABLE_NODE_ID, "removed"], "value")
+    # the pool of an iteration nested in another one is a child of the outer iteration's pool
+    node = _iteration_node(outer_pool.create_child())
+
+    snapshot = node._extract_conversation_variable_snapshot(variable_pool=node.graph_runtime_state.variable_pool)
+    del snapshot["removed"]
+    node._sync_conversation_variables_from_snapshot(snapshot)
+
+    assert node.graph_runtime_state.variable_pool.get([CONVERSATION_VARIABLE_NODE_ID, "removed"]) is None
+    assert node.graph_runtime_state.variable_pool.get([CONVERSATION_VARIABLE_NODE_ID, "seen"]).value == 0
+    assert outer_pool.get([CONVERSATION_VARIABLE_NODE_ID, "removed"]).value == "value"
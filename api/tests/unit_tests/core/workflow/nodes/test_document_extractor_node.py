@@ -1,4 +1,5 @@
 import io
+import threading
 from unittest.mock import Mock, patch
 
 import pandas as pd
@@ -15,10 +16,13 @@ from core.workflow.enums import NodeType, WorkflowNodeExecutionStatus
 from core.workflow.node_events import NodeRunResult
 from core.workflow.nodes.document_extractor import DocumentExtractorNode, DocumentExtractorNodeData
 from core.workflow.nodes.document_extractor.node import (
+    _extract_text_from_csv_stream,
     _extract_text_from_docx,
     _extract_text_from_excel,
+    _extract_text_from_files,
     _extract_text_from_pdf,
     _extract_text_from_plain_text,
+    _extract_text_from_plain_text_stream,
 )
 from models.enums import UserFrom
 
@@ -142,16 +146,21 @@ def test_run_extract_text(
     mock_graph_runtime_state.variable_pool.get.return_value = mock_array_file_segment
 
     mock_download = Mock(return_value=file_content)
+    mock_download_stream = Mock(return_value=iter([file_content]))
     mock_ssrf_proxy_get = Mock()
     mock_ssrf_proxy_get.return_value.content = file_content
     mock_ssrf_proxy_get.return_value.raise_for_status = Mock()
 
     monkeypatch.setattr("core.file.file_manager.download", mock_download)
+    monkeypatch.setattr("core.file.file_manager.download_stream", mock_download_stream)
     monkeypatch.setattr("core.helper.ssrf_proxy.get", mock_ssrf_proxy_get)
 
     if mime_type == "application/pdf":
-        mock_pdf_extract = Mock(return_value=expected_text[0])
-        monkeypatch.setattr("core.workflow.nodes.document_extractor.node._extract_text_from_pdf", mock_pdf_extract)
+        # the PDF stream is spooled to disk before it is parsed, so consume it like the real extractor
+        mock_pdf_extract = Mock(side_effect=lambda chunks: list(chunks) and expected_text[0])
+        monkeypatch.setattr(
+            "core.workflow.nodes.document_extractor.node._extract_text_from_pdf_stream", mock_pdf_extract
+        )
     elif mime_type.startswith("application/vnd.openxmlformats"):
         mock_docx_extract = Mock(return_value=expected_text[0])
         monkeypatch.setattr("core.workflow.nodes.document_extractor.node._extract_text_from_docx", mock_docx_extract)
@@ -166,7 +175,7 @@ def test_run_extract_text(
     if transfer_method == FileTransferMethod.REMOTE_URL:
         mock_ssrf_proxy_get.assert_called_once_with("https://example.com/file.txt")
     elif transfer_method == FileTransferMethod.LOCAL_FILE:
-        mock_download.assert_called_once_with(mock_file)
+        mock_download_stream.assert_called_once_with(mock_file)
 
 
 def test_extract_text_from_plain_text():
@@ -382,3 +391,47 @@ def test_extract_text_from_excel_numeric_type_column(mock_excel_file):
     expected_manual = "| 1.0 | 1.1 |\n| --- | --- |\n| Test | Test |\n\n"
 
     assert expected_manual == result
+
+
+def test_extract_text_from_plain_text_stream_decodes_characters_split_across_chunks():
+    content = "héllo wörld\n".encode() * 10_000
+    chunks = [content[i : i + 1001] for i in range(0, len(content), 1001)]
+
+    assert _extract_text_from_plain_text_stream(chunks) == content.decode()
+
+
+def test_extract_text_from_csv_stream():
+    chunks = [b'name,note\nalice,"multi', b'\nline"\nbob,', b"plain\n"]
+
+    assert _extract_text_from_csv_stream(chunks) == (
+        "| name | note |\n| ---- | ---- |\n| alice | multi line |\n| bob | plain |\n"
+    )
+
+
+def test_stream_extraction_stops_reading_at_max_text_length():
+    read_chunks = []
+
+    def chunks():
+        for index in range(1000):
+            read_chunks.append(index)
+            yield b"row,value\n" * 10_000
+
+    with patch("core.workflow.nodes.document_extractor.node.dify_config.DOCUMENT_EXTRACTOR_MAX_TEXT_LENGTH", 100):
+        text = _extract_text_from_csv_stream(chunks())
+
+    assert len(text) == 100
+    assert len(read_chunks) == 1
+
+
+def test_extract_text_from_files_runs_concurrently_and_keeps_order(monkeypatch):
+    barrier = threading.Barrier(3, timeout=5)
+
+    def extract(file):
+        # every file waits for the others, so this only returns when all of them run at once
+        barrier.wait()
+        return file.filename
+
+    files = [Mock(spec=File, filename=f"file-{index}") for index in range(3)]
+    monkeypatch.setattr("core.workflow.nodes.document_extractor.node._extract_text_from_file", extract)
+
+    assert _extract_text_from_files(files) == ["file-0", "file-1", "file-2"]
@@ -434,3 +434,86 @@ def test_get_attr():
     res = vp.get(["node", "name", "output"])
     assert res is not None
     assert res.value == "hello"
+
+
+class TestVariablePoolChild:
+    def test_child_reads_through_to_parent(self, pool):
+        pool.add(("node_1", "var"), "parent")
+        child = pool.create_child()
+
+        assert child.get(("node_1", "var")).value == "parent"
+        assert child.get(("sys", "user_id")).value == "test_user_id"
+        assert dict(child.variable_dictionary) == {}
+
+    def test_child_writes_do_not_leak_into_parent(self, pool):
+        pool.add(("node_1", "var"), "parent")
+        child = pool.create_child()
+
+        child.add(("node_1", "var"), "child")
+        child.add(("node_2", "var"), 1)
+
+        assert child.get(("node_1", "var")).value == "child"
+        assert pool.get(("node_1", "var")).value == "parent"
+        assert pool.get(("node_2", "var")) is None
+
+    def test_child_sees_later_parent_writes(self, pool):
+        child = pool.create_child()
+        pool.add(("node_1", "var"), "late")
+
+        assert child.get(("node_1", "var")).value == "late"
+
+    def test_child_remove_hides_parent_variable(self, pool):
+        pool.add(("node_1", "a"), 1)
+        pool.add(("node_1", "b"), 2)
+        child = pool.create_child()
+
+        child.remove(("node_1", "a"))
+        assert child.get(("node_1", "a")) is None
+        assert child.get(("node_1", "b")).value == 2
+        assert pool.get(("node_1", "a")).value == 1
+
+        child.add(("node_1", "a"), 3)
+        assert child.get(("node_1", "a")).value == 3
+
+        child.remove(("node_1",))
+        assert child.get(("node_1", "b")) is None
+        assert child.get_node_variables("node_1") == {}
+        assert pool.get(("node_1", "b")).value == 2
+
+    def test_get_node_variables_merges_layers(self, pool):
+        pool.add(("node_1", "a"), 1)
+        pool.add(("node_1", "b"), 2)
+        child = pool.create_child()
+        child.add(("node_1", "b"), 20)
+        child.add(("node_1", "c"), 30)
+        grandchild = child.create_child()
+        grandchild.remove(("node_1", "a"))
+
+        assert {k: v.value for k, v in child.get_node_variables("node_1").items()} == {"a": 1, "b": 20, "c": 30}
+        assert {k: v.value for k, v in grandchild.get_node_variables("node_1").items()} == {"b": 20, "c": 30}
+        assert child.get_by_prefix("node_1") == {"a": 1, "b": 20, "c": 30}
+
+    def test_child_serializes_full_view(self, pool):
+        pool.add(("node_1", "a"), 1)
+        child = pool.create_child()
+        child.add(("node_2", "b"), "x")
+
+        loaded = VariablePool.model_validate_json(child.model_dump_json())
+
+        assert loaded.get(("node_1", "a")).value == 1
+        assert loaded.get(("node_2", "b")).value == "x"
+        assert loaded.get(("sys", "user_id")).value == "test_user_id"
+
+    def test_snapshot_does_not_see_later_writes(self, pool):
+        pool.add(("node_1", "a"), 1)
+        child = pool.create_child()
+        child.add(("node_1", "b"), 2)
+
+        snapshot = child.snapshot()
+        child.add(("node_1", "b"), 20)
+        child.remove(("node_1", "a"))
+        pool.add(("node_2", "c"), 3)
+
+        assert {k: v.value for k, v in snapshot.get_node_variables("node_1").items()} == {"a": 1, "b": 2}
+        assert snapshot.get(("node_2", "c")) is None
+        assert pool.snapshot() is not pool
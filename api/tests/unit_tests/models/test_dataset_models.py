@@ -756,6 +756,23 @@ class TestEmbeddingStorage:
         assert retrieved_data[0] == 0.0
         assert abs(retrieved_data[1535] - 1.535) < 0.0001  # Float comparison with tolerance
 
+    def test_embedding_float32_format(self):
+        """Test the compact float32 format is smaller and readable alongside pickled entries."""
+        # Arrange
+        embedding_data = [0.001 * i for i in range(1536)]
+        pickled = Embedding.dump_embedding(embedding_data)
+
+        # Act
+        with patch("models.dataset.dify_config.EMBEDDING_CACHE_FLOAT32_FORMAT", True):
+            compact = Embedding.dump_embedding(embedding_data)
+
+        # Assert
+        assert len(compact) < len(pickled) / 2
+        assert Embedding.load_embedding(pickled) == embedding_data
+        retrieved_data = Embedding.load_embedding(compact)
+        assert len(retrieved_data) == 1536
+        assert all(abs(a - b) < 1e-6 for a, b in zip(retrieved_data, embedding_data))
+
 
 class TestDatasetProcessRule:
     """Test suite for DatasetProcessRule model."""
@@ -0,0 +1,128 @@
+import uuid
+from datetime import UTC, date, datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+import pytz
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from models import AppDailyStatistic
+from services.app_daily_statistic_service import AppDailyStatisticService
+
+APP_ID = str(uuid.uuid4())
+TIMEZONE = "Asia/Shanghai"
+
+
+@pytest.fixture
+def session():
+    engine = sa.create_engine("sqlite://")
+    AppDailyStatistic.__table__.create(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def _add_rollups(session: Session, days: list[date]):
+    session.add_all(
+        AppDailyStatistic(app_id=APP_ID, timezone=TIMEZONE, stat_date=day, tenant_id="tenant", message_count=1)
+        for day in days
+    )
+    session.commit()
+
+
+def test_plan_without_rollups_scans_the_whole_range(session):
+    start = datetime(2025, 1, 1, tzinfo=UTC)
+
+    plan = AppDailyStatisticService.get_daily_statistics_plan(session, APP_ID, TIMEZONE, start, None)
+
+    assert plan.rollups == []
+    assert plan.raw_ranges == [(start, None)]
+
+
+def test_plan_serves_whole_days_from_rollups(session):
+    _add_rollups(session, [date(2025, 1, 1), date(2025, 1, 2), date(2025, 1, 3)])
+    # midnight of 2025-01-01 in Shanghai
+    start = datetime(2024, 12, 31, 16, tzinfo=UTC)
+
+    plan = AppDailyStatisticService.get_daily_statistics_plan(session, APP_ID, TIMEZONE, start, None)
+
+    assert [rollup.stat_date for rollup in plan.rollups] == [date(2025, 1, 1), date(2025, 1, 2), date(2025, 1, 3)]
+    # the days after the last rollup, such as the current day, are scanned
+    assert plan.raw_ranges == [(datetime(2025, 1, 3, 16), None)]
+
+
+def test_plan_scans_days_partly_in_the_range(session):
+    _add_rollups(session, [date(2025, 1, 1), date(2025, 1, 2), date(2025, 1, 3)])
+    # noon of 2025-01-01 to noon of 2025-01-03 in Shanghai
+    start = datetime(2025, 1, 1, 4, tzinfo=UTC)
+    end = datetime(2025, 1, 3, 4, tzinfo=UTC)
+
+    plan = AppDailyStatisticService.get_daily_statistics_plan(session, APP_ID, TIMEZONE, start, end)
+
+    assert [rollup.stat_date for rollup in plan.rollups] == [date(2025, 1, 2)]
+    assert plan.raw_ranges == [(start, datetime(2025, 1, 1, 16)), (datetime(2025, 1, 2, 16), end)]
+
+
+def test_plan_within_a_single_day_is_scanned(session):
+    _add_rollups(session, [date(2025, 1, 1)])
+    start = datetime(2025, 1, 1, 1, tzinfo=UTC)
+    end = datetime(2025, 1, 1, 2, tzinfo=UTC)
+
+    plan = AppDailyStatisticService.get_daily_statistics_plan(session, APP_ID, TIMEZONE, start, end)
+
+    assert plan.rollups == []
+    assert plan.raw_ranges == [(start, end)]
+
+
+def _rollup_session(last_date: date | None, message_rows: list, like_rows: list) -> MagicMock:
+    session = MagicMock()
+    session.scalar.return_value = last_date
+    session.execute.side_effect = [message_rows, like_rows, [], [], None]
+    return session
+
+
+def test_rollup_recomputes_recent_days_and_writes_empty_days():
+    today = datetime.now(pytz.timezone(TIMEZONE)).date()
+    yesterday = today - timedelta(days=1)
+    message_row = SimpleNamespace(
+        date=yesterday,
+        message_count=3,
+        conversation_count=2,
+        end_user_count=1,
+        token_count=30,
+        answer_tokens=20,
+        total_price=Decimal("0.0030000"),
+        provider_response_latency=1.5,
+    )
+    session = _rollup_session(yesterday, [message_row], [SimpleNamespace(date=yesterday, like_count=1)])
+    app_model = MagicMock(id=APP_ID, tenant_id="tenant")
+
+    with (
+        patch("services.app_daily_statistic_service.dify_config.APP_DAILY_STATISTICS_RECOMPUTE_DAYS", 2),
+        patch("services.app_daily_statistic_service.convert_datetime_to_date", lambda field: f"DATE({field})"),
+    ):
+        assert AppDailyStatisticService.rollup_app(session, app_model, TIMEZONE) == 2
+
+    statistics = {statistic.stat_date: statistic for statistic in session.add_all.call_args.args[0]}
+    assert set(statistics) == {today - timedelta(days=2), yesterday}
+    assert statistics[today - timedelta(days=2)].message_count == 0
+    assert statistics[yesterday].message_count == 3
+    assert statistics[yesterday].total_price == Decimal("0.0030000")
+    assert statistics[yesterday].like_count == 1
+    session.commit.assert_called_once()
+
+
+def test_first_rollup_starts_on_the_day_the_app_was_created():
+    today = datetime.now(pytz.timezone(TIMEZONE)).date()
+    session = _rollup_session(None, [], [])
+    created_at = datetime.now(UTC).replace(tzinfo=None) - timedelta(days=10)
+    app_model = MagicMock(id=APP_ID, tenant_id="tenant", created_at=created_at)
+
+    with patch("services.app_daily_statistic_service.convert_datetime_to_date", lambda field: f"DATE({field})"):
+        rolled_up_days = AppDailyStatisticService.rollup_app(session, app_model, TIMEZONE)
+
+    first_date = pytz.utc.localize(created_at).astimezone(pytz.timezone(TIMEZONE)).date()
+    assert rolled_up_days == (today - first_date).days
+    assert min(statistic.stat_date for statistic in session.add_all.call_args.args[0]) == first_date
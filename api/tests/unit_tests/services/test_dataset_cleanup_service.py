@@ -0,0 +1,233 @@
+import json
+import uuid
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+# imported before the web reader tool, which is otherwise only partially initialized through a circular import
+import core.app.entities.app_invoke_entities  # noqa: F401
+from models.dataset import Dataset, Document, DocumentSegment, SegmentAttachmentBinding
+from models.enums import CreatorUserRole
+from models.model import UploadFile
+from services.dataset_cleanup_service import DatasetCleanupService
+
+TENANT_ID = str(uuid.uuid4())
+DATASET_ID = str(uuid.uuid4())
+DOCUMENT_ID = str(uuid.uuid4())
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value.encode() if isinstance(value, str) else value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+@pytest.fixture
+def redis():
+    fake_redis = _FakeRedis()
+    with patch("services.dataset_cleanup_service.redis_client", fake_redis):
+        yield fake_redis
+
+
+@pytest.fixture
+def session():
+    engine = sa.create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    for model in (Document, DocumentSegment, SegmentAttachmentBinding, UploadFile):
+        model.__table__.create(engine)
+    with Session(engine) as session:
+        with patch("services.dataset_cleanup_service.db", MagicMock(session=session)):
+            yield session
+
+
+@pytest.fixture
+def storage():
+    with patch("services.dataset_cleanup_service.storage") as storage:
+        yield storage
+
+
+@pytest.fixture(autouse=True)
+def chunk_size():
+    with patch("services.dataset_cleanup_service.dify_config.DATASET_CLEANUP_CHUNK_SIZE", 2):
+        yield
+
+
+def _dataset() -> Dataset:
+    return Dataset(id=DATASET_ID, tenant_id=TENANT_ID, indexing_technique="high_quality")
+
+
+def _add_file(session: Session, tenant_id: str = TENANT_ID) -> UploadFile:
+    upload_file = UploadFile(
+        tenant_id=tenant_id,
+        storage_type="local",
+        key=f"upload_files/{uuid.uuid4()}.png",
+        name="image.png",
+        size=1,
+        extension="png",
+        mime_type="image/png",
+        created_by_role=CreatorUserRole.ACCOUNT,
+        created_by="account",
+        created_at=datetime(2025, 1, 1),
+        used=False,
+    )
+    session.add(upload_file)
+    return upload_file
+
+
+def _add_segment(session: Session, position: int, document_id: str = DOCUMENT_ID, content: str = "content"):
+    session.add(
+        DocumentSegment(
+            id=f"{position:08d}-0000-0000-0000-000000000000",
+            tenant_id=TENANT_ID,
+            dataset_id=DATASET_ID,
+            document_id=document_id,
+            position=position,
+            content=content,
+            word_count=1,
+            tokens=1,
+            index_node_id=f"node-{position}",
+            created_by="account",
+        )
+    )
+
+
+def _image_markdown(upload_file: UploadFile) -> str:
+    return f"![image](http://localhost/files/{upload_file.id}/image-preview)"
+
+
+def _count(session: Session, model) -> int:
+    return session.scalar(sa.select(sa.func.count()).select_from(model)) or 0
+
+
+def test_clean_segments_deletes_chunks_with_their_index_nodes_and_images(session, redis, storage):
+    image = _add_file(session)
+    for position in range(1, 6):
+        _add_segment(session, position, content=_image_markdown(image) if position == 3 else "content")
+    _add_segment(session, 6, document_id=str(uuid.uuid4()))
+    session.commit()
+    image_key = image.key
+    index_processor = MagicMock()
+
+    with DatasetCleanupService(_dataset(), "document") as cleanup:
+        deleted_count = cleanup.clean_segments(
+            DocumentSegment.document_id == DOCUMENT_ID, index_processor=index_processor
+        )
+
+    assert deleted_count == 5
+    assert [call.args[1] for call in index_processor.clean.call_args_list] == [
+        ["node-1", "node-2"],
+        ["node-3", "node-4"],
+        ["node-5"],
+    ]
+    storage.delete.assert_called_once_with(image_key)
+    assert _count(session, UploadFile) == 0
+    # only the segment of the other document is left
+    assert session.scalars(sa.select(DocumentSegment.position)).all() == [6]
+
+
+def test_files_are_deleted_even_when_storage_fails(session, redis, storage):
+    image = _add_file(session)
+    _add_segment(session, 1, content=_image_markdown(image))
+    session.commit()
+    image_key = image.key
+    storage.delete.side_effect = Exception("storage unavailable")
+
+    with DatasetCleanupService(_dataset(), "document") as cleanup:
+        cleanup.clean_segments(DocumentSegment.document_id == DOCUMENT_ID)
+
+    storage.delete.assert_called_once_with(image_key)
+    assert _count(session, UploadFile) == 0
+    assert _count(session, DocumentSegment) == 0
+
+
+def test_clean_documents_deletes_the_uploaded_files_of_the_tenant(session, redis, storage):
+    uploaded_file = _add_file(session)
+    other_tenant_file = _add_file(session, tenant_id=str(uuid.uuid4()))
+    for data_source_type, upload_file in (
+        ("upload_file", uploaded_file),
+        ("upload_file", other_tenant_file),
+        ("notion_import", None),
+    ):
+        session.add(
+            Document(
+                tenant_id=TENANT_ID,
+                dataset_id=DATASET_ID,
+                position=1,
+                data_source_type=data_source_type,
+                data_source_info=json.dumps({"upload_file_id": upload_file.id}) if upload_file else "not json",
+                batch="batch",
+                name="document",
+                created_from="web",
+                created_by="account",
+            )
+        )
+    session.commit()
+    uploaded_file_key, other_tenant_file_id = uploaded_file.key, other_tenant_file.id
+
+    with DatasetCleanupService(_dataset(), "dataset") as cleanup:
+        assert cleanup.clean_documents(Document.dataset_id == DATASET_ID) == 3
+
+    storage.delete.assert_called_once_with(uploaded_file_key)
+    assert _count(session, Document) == 0
+    assert session.scalars(sa.select(UploadFile.id)).all() == [other_tenant_file_id]
+
+
+def test_clean_attachments_deletes_bindings_and_attached_files(session, redis, storage):
+    attachments = [_add_file(session) for _ in range(3)]
+    for attachment in attachments:
+        session.add(
+            SegmentAttachmentBinding(
+                tenant_id=TENANT_ID,
+                dataset_id=DATASET_ID,
+                document_id=DOCUMENT_ID,
+                segment_id=str(uuid.uuid4()),
+                attachment_id=attachment.id,
+            )
+        )
+    session.commit()
+    attachment_keys = {attachment.key for attachment in attachments}
+
+    with DatasetCleanupService(_dataset(), "document") as cleanup:
+        assert cleanup.clean_attachments(SegmentAttachmentBinding.document_id == DOCUMENT_ID) == 3
+
+    assert {call.args[0] for call in storage.delete.call_args_list} == attachment_keys
+    assert _count(session, SegmentAttachmentBinding) == 0
+    assert _count(session, UploadFile) == 0
+
+
+def test_interrupted_cleanup_resumes_after_the_last_deleted_chunk(session, redis, storage):
+    for position in range(1, 6):
+        _add_segment(session, position)
+    session.commit()
+    index_processor = MagicMock()
+    index_processor.clean.side_effect = [None, None, Exception("vector database unavailable")]
+
+    with DatasetCleanupService(_dataset(), "dataset") as cleanup:
+        cleanup.clean_index(index_processor)
+        with pytest.raises(Exception, match="vector database unavailable"):
+            cleanup.clean_segments(DocumentSegment.document_id == DOCUMENT_ID, index_processor=index_processor)
+    session.rollback()
+    assert session.scalars(sa.select(DocumentSegment.position)).all() == [3, 4, 5]
+
+    index_processor.clean.reset_mock(side_effect=True)
+    with DatasetCleanupService(_dataset(), "dataset") as cleanup:
+        cleanup.clean_index(index_processor)
+        assert cleanup.clean_segments(DocumentSegment.document_id == DOCUMENT_ID, index_processor=index_processor) == 3
+        cleanup.finish()
+
+    # the whole index was already deleted, and the retry starts after the first chunk
+    assert [call.args[1] for call in index_processor.clean.call_args_list] == [["node-3", "node-4"], ["node-5"]]
+    assert _count(session, DocumentSegment) == 0
+    assert redis.data == {}
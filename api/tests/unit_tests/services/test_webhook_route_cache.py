@@ -0,0 +1,168 @@
+import json
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+import sqlalchemy as sa
+from redis import RedisError
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from models.enums import AppTriggerStatus, AppTriggerType
+from models.trigger import AppTrigger, WorkflowWebhookTrigger
+from models.workflow import Workflow
+from services.trigger.webhook_route_cache import WebhookRouteCache
+from services.trigger.webhook_service import WebhookService
+
+APP_ID = str(uuid.uuid4())
+TENANT_ID = str(uuid.uuid4())
+WEBHOOK_ID = "webhook-1"
+NODE_ID = "webhook_node"
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value.encode() if isinstance(value, str) else value
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+
+
+@pytest.fixture
+def redis():
+    fake_redis = _FakeRedis()
+    with patch("services.trigger.webhook_route_cache.redis_client", fake_redis):
+        yield fake_redis
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    WebhookRouteCache._entries.clear()
+    yield
+    WebhookRouteCache._entries.clear()
+
+
+@pytest.fixture
+def engine():
+    engine = sa.create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    for model in (WorkflowWebhookTrigger, AppTrigger, Workflow):
+        model.__table__.create(engine)
+    with Session(engine) as session:
+        session.add(
+            WorkflowWebhookTrigger(
+                app_id=APP_ID, node_id=NODE_ID, tenant_id=TENANT_ID, webhook_id=WEBHOOK_ID, created_by="account"
+            )
+        )
+        session.add(
+            AppTrigger(
+                tenant_id=TENANT_ID,
+                app_id=APP_ID,
+                node_id=NODE_ID,
+                trigger_type=AppTriggerType.TRIGGER_WEBHOOK,
+                title="Webhook",
+                status=AppTriggerStatus.ENABLED,
+            )
+        )
+        session.add(_workflow("2025-01-01 00:00:00"))
+        session.commit()
+    with patch("services.trigger.webhook_service.db", MagicMock(engine=engine)):
+        yield engine
+
+
+def _workflow(version: str) -> Workflow:
+    graph = {"nodes": [{"id": NODE_ID, "data": {"type": "trigger-webhook", "title": version}}], "edges": []}
+    return Workflow.new(
+        tenant_id=TENANT_ID,
+        app_id=APP_ID,
+        type="workflow",
+        version=version,
+        graph=json.dumps(graph),
+        features="{}",
+        created_by="account",
+        environment_variables=[],
+        conversation_variables=[],
+        rag_pipeline_variables=[],
+    )
+
+
+def test_route_is_loaded_once(engine, redis):
+    with patch.object(WebhookService, "_load_webhook_route", wraps=WebhookService._load_webhook_route) as mock_load:
+        first = WebhookService.get_webhook_route(WEBHOOK_ID)
+        second = WebhookService.get_webhook_route(WEBHOOK_ID)
+
+    mock_load.assert_called_once()
+    assert second == first
+    assert first.node_config["data"]["title"] == "2025-01-01 00:00:00"
+
+
+def test_route_is_shared_between_processes_through_redis(engine, redis):
+    route = WebhookService.get_webhook_route(WEBHOOK_ID)
+    # another process only has the Redis entry
+    WebhookRouteCache._entries.clear()
+
+    with patch.object(WebhookService, "_load_webhook_route") as mock_load:
+        assert WebhookService.get_webhook_route(WEBHOOK_ID) == route
+
+    mock_load.assert_not_called()
+
+
+def test_publishing_invalidates_route(engine, redis):
+    WebhookService.get_webhook_route(WEBHOOK_ID)
+    with Session(engine) as session:
+        published_workflow = _workflow("2025-01-02 00:00:00")
+        session.add(published_workflow)
+        session.commit()
+        published_workflow_id = published_workflow.id
+
+    WebhookRouteCache.invalidate_app(APP_ID)
+    route = WebhookService.get_webhook_route(WEBHOOK_ID)
+
+    assert route.workflow_id == published_workflow_id
+    assert route.node_config["data"]["title"] == "2025-01-02 00:00:00"
+
+
+def test_rate_limited_tenant_is_rejected_after_invalidation(engine, redis):
+    WebhookService.get_webhook_route(WEBHOOK_ID)
+    with Session(engine) as session:
+        session.execute(sa.update(AppTrigger).values(status=AppTriggerStatus.RATE_LIMITED))
+        session.commit()
+
+    WebhookRouteCache.invalidate_tenant(TENANT_ID)
+
+    with pytest.raises(ValueError, match="rate limited"):
+        WebhookService.get_webhook_route(WEBHOOK_ID)
+    # the disabled state is cached too
+    with (
+        patch.object(WebhookService, "_load_webhook_route") as mock_load,
+        pytest.raises(ValueError, match="rate limited"),
+    ):
+        WebhookService.get_webhook_route(WEBHOOK_ID)
+    mock_load.assert_not_called()
+
+
+def test_unknown_webhook_is_not_found(engine, redis):
+    with pytest.raises(ValueError, match="Webhook not found"):
+        WebhookService.get_webhook_route("unknown")
+
+
+def test_route_is_not_cached_without_redis(engine):
+    failing_redis = MagicMock()
+    failing_redis.get.side_effect = failing_redis.mget.side_effect = RedisError("down")
+    with (
+        patch("services.trigger.webhook_route_cache.redis_client", failing_redis),
+        patch.object(WebhookService, "_load_webhook_route", wraps=WebhookService._load_webhook_route) as mock_load,
+    ):
+        WebhookService.get_webhook_route(WEBHOOK_ID)
+        WebhookService.get_webhook_route(WEBHOOK_ID)
+
+    assert mock_load.call_count == 2
+    failing_redis.setex.assert_not_called()
@@ -544,22 +544,26 @@ class TestWebhookServiceUnit:
 
         # Mock the WebhookService methods
         with (
+            patch.object(WebhookService, "get_webhook_route") as mock_get_route,
             patch.object(WebhookService, "get_webhook_trigger_and_workflow") as mock_get_trigger,
             patch.object(WebhookService, "extract_and_validate_webhook_data") as mock_extract,
         ):
             mock_trigger = MagicMock()
-            mock_workflow = MagicMock()
+            mock_workflow = MagicMock(id="workflow-id")
             mock_config = {"data": {"test": "config"}}
             mock_data = {"test": "data"}
+            mock_route = MagicMock(workflow_id="workflow-id", node_config=mock_config)
 
+            mock_get_route.return_value = mock_route
             mock_get_trigger.return_value = (mock_trigger, mock_workflow, mock_config)
             mock_extract.return_value = mock_data
 
+            # the published workflow is reached through the cached route
             result = _prepare_webhook_execution("test_webhook", is_debug=False)
-            assert result == (mock_trigger, mock_workflow, mock_config, mock_data, None)
-
-            # Reset mock
-            mock_get_trigger.reset_mock()
+            assert result == (mock_route, "workflow-id", mock_config, mock_data, None)
+            mock_get_trigger.assert_not_called()
 
+            # the draft workflow is always loaded
             result = _prepare_webhook_execution("test_webhook", is_debug=True)
-            assert result == (mock_trigger, mock_workflow, mock_config, mock_data, None)
+            assert result == (mock_trigger, "workflow-id", mock_config, mock_data, None)
+            mock_get_trigger.assert_called_once_with("test_webhook", is_debug=True)
@@ -0,0 +1,112 @@
+import uuid
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from models import WorkflowAppLog
+from services.errors.app import LastWorkflowAppLogNotExistsError
+from services.workflow_app_service import WorkflowAppService, _Explain
+
+TENANT_ID = str(uuid.uuid4())
+APP_ID = str(uuid.uuid4())
+
+
+@pytest.fixture
+def session():
+    engine = sa.create_engine("sqlite://")
+    WorkflowAppLog.__table__.create(engine)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def app_model():
+    return MagicMock(tenant_id=TENANT_ID, id=APP_ID)
+
+
+def _create_logs(session: Session, count: int) -> list[WorkflowAppLog]:
+    base_time = datetime(2025, 1, 1)
+    logs = []
+    for index in range(count):
+        log = WorkflowAppLog(
+            tenant_id=TENANT_ID,
+            app_id=APP_ID,
+            workflow_id=str(uuid.uuid4()),
+            workflow_run_id=str(uuid.uuid4()),
+            created_from="service-api",
+            created_by_role="account",
+            created_by=str(uuid.uuid4()),
+        )
+        # pairs of logs share a creation time, so pages have to be ordered by id as well
+        log.created_at = base_time + timedelta(minutes=index // 2)
+        logs.append(log)
+    session.add_all(logs)
+    session.commit()
+    return sorted(logs, key=lambda log: (log.created_at, log.id), reverse=True)
+
+
+def test_offset_pagination(session, app_model):
+    logs = _create_logs(session, 5)
+
+    result = WorkflowAppService().get_paginate_workflow_app_logs(session=session, app_model=app_model, page=2, limit=2)
+
+    assert result["total"] == 5
+    assert result["has_more"] is True
+    assert [item.id for item in result["data"]] == [log.id for log in logs[2:4]]
+
+
+def test_last_id_pagination_walks_every_log_once(session, app_model):
+    logs = _create_logs(session, 5)
+    service = WorkflowAppService()
+
+    pages = []
+    last_id = None
+    while True:
+        result = service.get_paginate_workflow_app_logs(
+            session=session, app_model=app_model, limit=2, last_id=last_id, include_total=False
+        )
+        pages.append([item.id for item in result["data"]])
+        assert result["total"] is None
+        if not result["has_more"]:
+            break
+        last_id = result["data"][-1].id
+
+    assert pages == [[log.id for log in logs[i : i + 2]] for i in range(0, 5, 2)]
+
+
+@pytest.mark.parametrize("last_id", [str(uuid.uuid4()), "not-a-uuid"])
+def test_unknown_last_id(session, app_model, last_id):
+    _create_logs(session, 1)
+
+    with pytest.raises(LastWorkflowAppLogNotExistsError):
+        WorkflowAppService().get_paginate_workflow_app_logs(session=session, app_model=app_model, last_id=last_id)
+
+
+def test_large_totals_are_estimated_on_postgresql():
+    session = MagicMock()
+    session.get_bind.return_value.dialect.name = "postgresql"
+    session.scalar.side_effect = [101, [{"Plan": {"Plan Rows": 250000}}]]
+    stmt = sa.select(WorkflowAppLog).where(WorkflowAppLog.app_id == APP_ID)
+
+    with patch("services.workflow_app_service.dify_config.WORKFLOW_APP_LOG_EXACT_COUNT_LIMIT", 100):
+        assert WorkflowAppService._count_workflow_app_logs(session, stmt) == 250000
+
+    count_stmt = session.scalar.call_args_list[0].args[0]
+    assert "LIMIT" in str(count_stmt.compile(dialect=postgresql.dialect()))
+    explain_stmt = session.scalar.call_args_list[1].args[0]
+    assert str(explain_stmt.compile(dialect=postgresql.dialect())).startswith("EXPLAIN (FORMAT JSON) SELECT")
+
+
+def test_small_totals_are_counted_exactly_on_postgresql():
+    session = MagicMock()
+    session.get_bind.return_value.dialect.name = "postgresql"
+    session.scalar.return_value = 42
+    stmt = sa.select(WorkflowAppLog)
+
+    assert WorkflowAppService._count_workflow_app_logs(session, stmt) == 42
+    session.scalar.assert_called_once()
+    assert not isinstance(session.scalar.call_args.args[0], _Explain)
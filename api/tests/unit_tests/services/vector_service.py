@@ -433,6 +433,8 @@ class VectorServiceTestDataFactory:
 
         processor.text_exists = Mock(return_value=False)
 
+        processor.texts_exist = Mock(return_value=set())
+
         processor.delete_by_ids = Mock()
 
         processor.delete_by_metadata_field = Mock()
@@ -1360,7 +1362,7 @@ class TestVector:
 
         mock_vector_processor = VectorServiceTestDataFactory.create_vector_processor_mock()
 
-        mock_vector_processor.text_exists = Mock(return_value=True)  # Document exists
+        mock_vector_processor.texts_exist = Mock(return_value={"doc-123"})  # Document exists
 
         mock_init_vector.return_value = mock_vector_processor
 
@@ -1370,7 +1372,7 @@ class TestVector:
         vector.add_texts(documents, duplicate_check=True)
 
         # Assert
-        mock_vector_processor.text_exists.assert_called_once_with("doc-123")
+        mock_vector_processor.texts_exist.assert_called_once_with(["doc-123"])
 
         mock_embeddings.embed_documents.assert_not_called()
 
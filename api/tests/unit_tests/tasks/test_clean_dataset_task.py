@@ -2,78 +2,105 @@
 Unit tests for clean_dataset_task.
 
 This module tests the dataset cleanup task functionality including:
-- Basic cleanup of documents and segments
+- Chunked cleanup of documents and segments
 - Vector database cleanup with IndexProcessorFactory
 - Storage file deletion
 - Invalid doc_form handling with default fallback
-- Error handling and database session rollback
+- Error handling, database session rollback and retry
+- Upload file and image cleanup, skipping documents without an uploaded file
 - Pipeline and workflow deletion
 - Segment attachment cleanup
 """
 
+import json
 import uuid
+from datetime import datetime
 from unittest.mock import MagicMock, patch
 
 import pytest
-
+import sqlalchemy as sa
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from models.dataset import (
+    AppDatasetJoin,
+    DatasetMetadata,
+    DatasetMetadataBinding,
+    DatasetProcessRule,
+    DatasetQuery,
+    Document,
+    DocumentSegment,
+    Pipeline,
+    SegmentAttachmentBinding,
+)
+from models.enums import CreatorUserRole
+from models.model import UploadFile
+from models.workflow import Workflow
 from tasks.clean_dataset_task import clean_dataset_task
 
+TENANT_ID = str(uuid.uuid4())
+DATASET_ID = str(uuid.uuid4())
+OTHER_DATASET_ID = str(uuid.uuid4())
+
 # ============================================================================
 # Fixtures
 # ============================================================================
 
 
-@pytest.fixture
-def tenant_id():
-    """Generate a unique tenant ID for testing."""
-    return str(uuid.uuid4())
-
+class _FakeRedis:
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
 
-@pytest.fixture
-def dataset_id():
-    """Generate a unique dataset ID for testing."""
-    return str(uuid.uuid4())
+    def get(self, key):
+        return self.data.get(key)
 
+    def setex(self, key, ttl, value):
+        self.data[key] = value.encode() if isinstance(value, str) else value
 
-@pytest.fixture
-def collection_binding_id():
-    """Generate a unique collection binding ID for testing."""
-    return str(uuid.uuid4())
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
 
 
 @pytest.fixture
-def pipeline_id():
-    """Generate a unique pipeline ID for testing."""
-    return str(uuid.uuid4())
+def redis():
+    """Fake Redis keeping the cleanup checkpoints."""
+    fake_redis = _FakeRedis()
+    with patch("services.dataset_cleanup_service.redis_client", fake_redis):
+        yield fake_redis
 
 
 @pytest.fixture
-def mock_db_session():
-    """Mock database session with query capabilities."""
-    with patch("tasks.clean_dataset_task.db") as mock_db:
-        mock_session = MagicMock()
-        mock_db.session = mock_session
-
-        # Setup query chain
-        mock_query = MagicMock()
-        mock_session.query.return_value = mock_query
-        mock_query.where.return_value = mock_query
-        mock_query.delete.return_value = 0
-
-        # Setup scalars for select queries
-        mock_session.scalars.return_value.all.return_value = []
-
-        # Setup execute for JOIN queries
-        mock_session.execute.return_value.all.return_value = []
-
-        yield mock_db
+def session(redis):
+    """SQLite session shared by the task and the cleanup service."""
+    engine = sa.create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    for model in (
+        Document,
+        DocumentSegment,
+        SegmentAttachmentBinding,
+        UploadFile,
+        DatasetProcessRule,
+        DatasetQuery,
+        AppDatasetJoin,
+        DatasetMetadata,
+        DatasetMetadataBinding,
+        Pipeline,
+        Workflow,
+    ):
+        model.__table__.create(engine)
+    with Session(engine) as session:
+        with (
+            patch("tasks.clean_dataset_task.db", MagicMock(session=session)),
+            patch("services.dataset_cleanup_service.db", MagicMock(session=session)),
+        ):
+            yield session
 
 
 @pytest.fixture
 def mock_storage():
     """Mock storage client."""
-    with patch("tasks.clean_dataset_task.storage") as mock_storage:
-        mock_storage.delete.return_value = None
+    with patch("services.dataset_cleanup_service.storage") as mock_storage:
         yield mock_storage
 
 
@@ -82,55 +109,88 @@ def mock_index_processor_factory():
     """Mock IndexProcessorFactory."""
     with patch("tasks.clean_dataset_task.IndexProcessorFactory") as mock_factory:
         mock_processor = MagicMock()
-        mock_processor.clean.return_value = None
-        mock_factory_instance = MagicMock()
-        mock_factory_instance.init_index_processor.return_value = mock_processor
-        mock_factory.return_value = mock_factory_instance
+        mock_factory.return_value.init_index_processor.return_value = mock_processor
+        yield {"factory": mock_factory, "processor": mock_processor}
 
-        yield {
-            "factory": mock_factory,
-            "factory_instance": mock_factory_instance,
-            "processor": mock_processor,
-        }
 
+@pytest.fixture(autouse=True)
+def chunk_size():
+    with patch("services.dataset_cleanup_service.dify_config.DATASET_CLEANUP_CHUNK_SIZE", 2):
+        yield
 
-@pytest.fixture
-def mock_get_image_upload_file_ids():
-    """Mock get_image_upload_file_ids function."""
-    with patch("tasks.clean_dataset_task.get_image_upload_file_ids") as mock_func:
-        mock_func.return_value = []
-        yield mock_func
 
+def _run_task(doc_form: str | None = "paragraph_index", pipeline_id: str | None = None):
+    clean_dataset_task(
+        dataset_id=DATASET_ID,
+        tenant_id=TENANT_ID,
+        indexing_technique="high_quality",
+        index_struct='{"type": "paragraph"}',
+        collection_binding_id=str(uuid.uuid4()),
+        doc_form=doc_form,
+        pipeline_id=pipeline_id,
+    )
 
-@pytest.fixture
-def mock_document():
-    """Create a mock Document object."""
-    doc = MagicMock()
-    doc.id = str(uuid.uuid4())
-    doc.tenant_id = str(uuid.uuid4())
-    doc.dataset_id = str(uuid.uuid4())
-    doc.data_source_type = "upload_file"
-    doc.data_source_info = '{"upload_file_id": "test-file-id"}'
-    doc.data_source_info_dict = {"upload_file_id": "test-file-id"}
-    return doc
 
+def _add_file(session: Session) -> UploadFile:
+    upload_file = UploadFile(
+        tenant_id=TENANT_ID,
+        storage_type="local",
+        key=f"upload_files/{uuid.uuid4()}.txt",
+        name="file.txt",
+        size=1,
+        extension="txt",
+        mime_type="text/plain",
+        created_by_role=CreatorUserRole.ACCOUNT,
+        created_by="account",
+        created_at=datetime(2025, 1, 1),
+        used=False,
+    )
+    session.add(upload_file)
+    return upload_file
 
-@pytest.fixture
-def mock_segment():
-    """Create a mock DocumentSegment object."""
-    segment = MagicMock()
-    segment.id = str(uuid.uuid4())
-    segment.content = "Test segment content"
-    return segment
 
+def _add_document(
+    session: Session,
+    dataset_id: str = DATASET_ID,
+    upload_file: UploadFile | None = None,
+    data_source_type: str | None = None,
+    data_source_info: str | None = None,
+) -> Document:
+    if upload_file:
+        data_source_info = json.dumps({"upload_file_id": upload_file.id})
+    document = Document(
+        id=str(uuid.uuid4()),
+        tenant_id=TENANT_ID,
+        dataset_id=dataset_id,
+        position=1,
+        data_source_type=data_source_type or ("upload_file" if upload_file else "website_crawl"),
+        data_source_info=data_source_info,
+        batch="batch",
+        name="document",
+        created_from="web",
+        created_by="account",
+    )
+    session.add(document)
+    return document
+
+
+def _add_segment(session: Session, document: Document, content: str = "content"):
+    session.add(
+        DocumentSegment(
+            tenant_id=TENANT_ID,
+            dataset_id=document.dataset_id,
+            document_id=document.id,
+            position=1,
+            content=content,
+            word_count=1,
+            tokens=1,
+            created_by="account",
+        )
+    )
 
-@pytest.fixture
-def mock_upload_file():
-    """Create a mock UploadFile object."""
-    upload_file = MagicMock()
-    upload_file.id = str(uuid.uuid4())
-    upload_file.key = f"test_files/{uuid.uuid4()}.txt"
-    return upload_file
+
+def _count(session: Session, model, *conditions) -> int:
+    return session.scalar(sa.select(sa.func.count()).select_from(model).where(*conditions)) or 0
 
 
 # ============================================================================
@@ -141,133 +201,72 @@ def mock_upload_file():
 class TestBasicCleanup:
     """Test cases for basic dataset cleanup functionality."""
 
-    def test_clean_dataset_task_empty_dataset(
-        self,
-        dataset_id,
-        tenant_id,
-        collection_binding_id,
-        mock_db_session,
-        mock_storage,
-        mock_index_processor_factory,
-        mock_get_image_upload_file_ids,
-    ):
+    def test_clean_dataset_task_empty_dataset(self, session, redis, mock_storage, mock_index_processor_factory):
         """
         Test cleanup of an empty dataset with no documents or segments.
 
-        Scenario:
-        - Dataset has no documents or segments
-        - Should still clean vector database and delete related records
-
         Expected behavior:
-        - IndexProcessorFactory is called to clean vector database
+        - IndexProcessorFactory is called to clean the whole vector database of the dataset
         - No storage deletions occur
-        - Related records (DatasetProcessRule, etc.) are deleted
-        - Session is committed and closed
+        - The cleanup checkpoint is cleared
         """
-        # Arrange
-        mock_db_session.session.scalars.return_value.all.return_value = []
-
-        # Act
-        clean_dataset_task(
-            dataset_id=dataset_id,
-            tenant_id=tenant_id,
-            indexing_technique="high_quality",
-            index_struct='{"type": "paragraph"}',
-            collection_binding_id=collection_binding_id,
-            doc_form="paragraph_index",
-        )
+        _run_task()
 
-        # Assert
         mock_index_processor_factory["factory"].assert_called_once_with("paragraph_index")
-        mock_index_processor_factory["processor"].clean.assert_called_once()
+        clean_args = mock_index_processor_factory["processor"].clean.call_args
+        assert clean_args.args[0].id == DATASET_ID
+        assert clean_args.args[1] is None
+        assert clean_args.kwargs == {"with_keywords": True, "delete_child_chunks": True}
         mock_storage.delete.assert_not_called()
-        mock_db_session.session.commit.assert_called_once()
-        mock_db_session.session.close.assert_called_once()
-
-    def test_clean_dataset_task_with_documents_and_segments(
-        self,
-        dataset_id,
-        tenant_id,
-        collection_binding_id,
-        mock_db_session,
-        mock_storage,
-        mock_index_processor_factory,
-        mock_get_image_upload_file_ids,
-        mock_document,
-        mock_segment,
-    ):
-        """
-        Test cleanup of dataset with documents and segments.
-
-        Scenario:
-        - Dataset has one document and one segment
-        - No image files in segment content
+        assert redis.data == {}
 
-        Expected behavior:
-        - Documents and segments are deleted
-        - Vector database is cleaned
-        - Session is committed
-        """
-        # Arrange
-        mock_db_session.session.scalars.return_value.all.side_effect = [
-            [mock_document],  # documents
-            [mock_segment],  # segments
-        ]
-        mock_get_image_upload_file_ids.return_value = []
-
-        # Act
-        clean_dataset_task(
-            dataset_id=dataset_id,
-            tenant_id=tenant_id,
-            indexing_technique="high_quality",
-            index_struct='{"type": "paragraph"}',
-            collection_binding_id=collection_binding_id,
-            doc_form="paragraph_index",
-        )
-
-        # Assert
-        mock_db_session.session.delete.assert_any_call(mock_document)
-        mock_db_session.session.delete.assert_any_call(mock_segment)
-        mock_db_session.session.commit.assert_called_once()
-
-    def test_clean_dataset_task_deletes_related_records(
-        self,
-        dataset_id,
-        tenant_id,
-        collection_binding_id,
-        mock_db_session,
-        mock_storage,
-        mock_index_processor_factory,
-        mock_get_image_upload_file_ids,
+    def test_clean_dataset_task_with_documents_segments_and_files(
+        self, session, mock_storage, mock_index_processor_factory
     ):
         """
-        Test that all related records are deleted.
+        Test cleanup of a dataset larger than a chunk.
 
         Expected behavior:
-        - DatasetProcessRule records are deleted
-        - DatasetQuery records are deleted
-        - AppDatasetJoin records are deleted
-        - DatasetMetadata records are deleted
-        - DatasetMetadataBinding records are deleted
-        """
-        # Arrange
-        mock_query = mock_db_session.session.query.return_value
-        mock_query.where.return_value = mock_query
-        mock_query.delete.return_value = 1
-
-        # Act
-        clean_dataset_task(
-            dataset_id=dataset_id,
-            tenant_id=tenant_id,
-            indexing_technique="high_quality",
-            index_struct='{"type": "paragraph"}',
-            collection_binding_id=collection_binding_id,
-            doc_form="paragraph_index",
+        - Documents, segments, their upload files and images are deleted, from storage too
+        - The rows of other datasets are kept
+        """
+        image = _add_file(session)
+        documents = [_add_document(session, upload_file=_add_file(session)) for _ in range(3)]
+        for document in documents:
+            _add_segment(session, document)
+            _add_segment(session, document, content=f"![image](http://localhost/files/{image.id}/file-preview)")
+        _add_segment(session, _add_document(session, dataset_id=OTHER_DATASET_ID))
+        session.commit()
+
+        _run_task()
+
+        assert _count(session, Document, Document.dataset_id == DATASET_ID) == 0
+        assert _count(session, DocumentSegment, DocumentSegment.dataset_id == DATASET_ID) == 0
+        assert _count(session, UploadFile) == 0
+        assert mock_storage.delete.call_count == 4
+        assert _count(session, Document) == 1
+        assert _count(session, DocumentSegment) == 1
+
+    def test_clean_dataset_task_deletes_related_records(self, session, mock_storage, mock_index_processor_factory):
+        """
+        Test that the records related to the dataset are deleted.
+        """
+        session.add(DatasetProcessRule(dataset_id=DATASET_ID, created_by="account"))
+        session.add(
+            DatasetMetadataBinding(
+                tenant_id=TENANT_ID,
+                dataset_id=DATASET_ID,
+                metadata_id=str(uuid.uuid4()),
+                document_id=str(uuid.uuid4()),
+                created_by="account",
+            )
         )
+        session.commit()
+
+        _run_task()
 
-        # Assert - verify query.where.delete was called multiple times
-        # for different models (DatasetProcessRule, DatasetQuery, etc.)
-        assert mock_query.delete.call_count >= 5
+        assert _count(session, DatasetProcessRule) == 0
+        assert _count(session, DatasetMetadataBinding) == 0
 
 
 # ============================================================================
@@ -278,88 +277,27 @@ class TestBasicCleanup:
 class TestDocFormValidation:
     """Test cases for doc_form validation and default fallback."""
 
-    @pytest.mark.parametrize(
-        "invalid_doc_form",
-        [
-            None,
-            "",
-            "   ",
-            "\t",
-            "\n",
-            "  \t\n  ",
-        ],
-    )
+    @pytest.mark.parametrize("invalid_doc_form", [None, "", "   ", "\t", "\n", "  \t\n  "])
     def test_clean_dataset_task_invalid_doc_form_uses_default(
-        self,
-        invalid_doc_form,
-        dataset_id,
-        tenant_id,
-        collection_binding_id,
-        mock_db_session,
-        mock_storage,
-        mock_index_processor_factory,
-        mock_get_image_upload_file_ids,
+        self, invalid_doc_form, session, mock_storage, mock_index_processor_factory
     ):
         """
         Test that invalid doc_form values use default paragraph index type.
-
-        Scenario:
-        - doc_form is None, empty, or whitespace-only
-        - Should use default IndexStructureType.PARAGRAPH_INDEX
-
-        Expected behavior:
-        - Default index type is used for cleanup
-        - No errors are raised
-        - Cleanup proceeds normally
         """
-        # Arrange - import to verify the default value
         from core.rag.index_processor.constant.index_type import IndexStructureType
 
-        # Act
-        clean_dataset_task(
-            dataset_id=dataset_id,
-            tenant_id=tenant_id,
-            indexing_technique="high_quality",
-            index_struct='{"type": "paragraph"}',
-            collection_binding_id=collection_binding_id,
-            doc_form=invalid_doc_form,
-        )
+        _run_task(doc_form=invalid_doc_form)
 
-        # Assert - IndexProcessorFactory should be called with default type
         mock_index_processor_factory["factory"].assert_called_once_with(IndexStructureType.PARAGRAPH_INDEX)
         mock_index_processor_factory["processor"].clean.assert_called_once()
 
-    def test_clean_dataset_task_valid_doc_form_used_directly(
-        self,
-        dataset_id,
-        tenant_id,
-        collection_binding_id,
-        mock_db_session,
-        mock_storage,
-        mock_index_processor_factory,
-        mock_get_image_upload_file_ids,
-    ):
+    def test_clean_dataset_task_valid_doc_form_used_directly(self, session, mock_storage, mock_index_processor_factory):
         """
         Test that valid doc_form values are used directly.
-
-        Expected behavior:
-        - Provided doc_form is passed to IndexProcessorFactory
         """
-        # Arrange
-        valid_doc_form = "qa_index"
-
-        # Act
-        clean_dataset_task(
-            dataset_id=dataset_id,
-            tenant_id=tenant_id,
-            indexing_technique="high_quality",
-            index_struct='{"type": "paragraph"}',
-            collection_binding_id=collection_binding_id,
-            doc_form=valid_doc_form,
-        )
+        _run_task(doc_form="qa_index")
 
-        # Assert
-        mock_index_processor_factory["factory"].assert_called_once_with(valid_doc_form)
+        mock_index_processor_factory["factory"].assert_called_once_with("qa_index")
 
 
 # ============================================================================
@@ -371,527 +309,170 @@ class TestErrorHandling:
     """Test cases for error handling and recovery."""
 
     def test_clean_dataset_task_vector_cleanup_failure_continues(
-        self,
-        dataset_id,
-        tenant_id,
-        collection_binding_id,
-        mock_db_session,
-        mock_storage,
-        mock_index_processor_factory,
-        mock_get_image_upload_file_ids,
-        mock_document,
-        mock_segment,
+        self, session, mock_storage, mock_index_processor_factory
     ):
         """
         Test that document cleanup continues even if vector cleanup fails.
-
-        Scenario:
-        - IndexProcessor.clean() raises an exception
-        - Document and segment deletion should still proceed
-
-        Expected behavior:
-        - Exception is caught and logged
-        - Documents and segments are still deleted
-        - Session is committed
         """
-        # Arrange
-        mock_db_session.session.scalars.return_value.all.side_effect = [
-            [mock_document],  # documents
-            [mock_segment],  # segments
-        ]
+        _add_segment(session, _add_document(session))
+        session.commit()
         mock_index_processor_factory["processor"].clean.side_effect = Exception("Vector database error")
 
-        # Act
-        clean_dataset_task(
-            dataset_id=dataset_id,
-            tenant_id=tenant_id,
-            indexing_technique="high_quality",
-            index_struct='{"type": "paragraph"}',
-            collection_binding_id=collection_binding_id,
-            doc_form="paragraph_index",
-        )
+        _run_task()
 
-        # Assert - documents and segments should still be deleted
-        mock_db_session.session.delete.assert_any_call(mock_document)
-        mock_db_session.session.delete.assert_any_call(mock_segment)
-        mock_db_session.session.commit.assert_called_once()
+        assert _count(session, Document) == 0
+        assert _count(session, DocumentSegment) == 0
 
     def test_clean_dataset_task_storage_delete_failure_continues(
-        self,
-        dataset_id,
-        tenant_id,
-        collection_binding_id,
-        mock_db_session,
-        mock_storage,
-        mock_index_processor_factory,
-        mock_get_image_upload_file_ids,
+        self, session, mock_storage, mock_index_processor_factory
     ):
         """
-        Test that cleanup continues even if storage deletion fails.
-
-        Scenario:
-        - Segment contains image file references
-        - Storage.delete() raises an exception
-        - Cleanup should continue
-
-        Expected behavior:
-        - Exception is caught and logged
-        - Image file record is still deleted from database
-        - Other cleanup operations proceed
+        Test that the upload files are deleted from the database even if their deletion from storage fails.
         """
-        # Arrange
-        # Need at least one document for segment processing to occur (code is in else block)
-        mock_document = MagicMock()
-        mock_document.id = str(uuid.uuid4())
-        mock_document.tenant_id = tenant_id
-        mock_document.data_source_type = "website"  # Non-upload type to avoid file deletion
-
-        mock_segment = MagicMock()
-        mock_segment.id = str(uuid.uuid4())
-        mock_segment.content = "Test content with image"
-
-        mock_upload_file = MagicMock()
-        mock_upload_file.id = str(uuid.uuid4())
-        mock_upload_file.key = "images/test-image.jpg"
-
-        image_file_id = mock_upload_file.id
-
-        mock_db_session.session.scalars.return_value.all.side_effect = [
-            [mock_document],  # documents - need at least one for segment processing
-            [mock_segment],  # segments
-        ]
-        mock_get_image_upload_file_ids.return_value = [image_file_id]
-        mock_db_session.session.query.return_value.where.return_value.first.return_value = mock_upload_file
+        _add_document(session, upload_file=_add_file(session))
+        session.commit()
         mock_storage.delete.side_effect = Exception("Storage service unavailable")
 
-        # Act
-        clean_dataset_task(
-            dataset_id=dataset_id,
-            tenant_id=tenant_id,
-            indexing_technique="high_quality",
-            index_struct='{"type": "paragraph"}',
-            collection_binding_id=collection_binding_id,
-            doc_form="paragraph_index",
-        )
+        _run_task()
+
+        mock_storage.delete.assert_called_once()
+        assert _count(session, UploadFile) == 0
+        assert _count(session, Document) == 0
 
-        # Assert - storage delete was attempted for image file
-        mock_storage.delete.assert_called_with(mock_upload_file.key)
-        # Image file should still be deleted from database
-        mock_db_session.session.delete.assert_any_call(mock_upload_file)
-
-    def test_clean_dataset_task_database_error_rollback(
-        self,
-        dataset_id,
-        tenant_id,
-        collection_binding_id,
-        mock_db_session,
-        mock_storage,
-        mock_index_processor_factory,
-        mock_get_image_upload_file_ids,
+    def test_clean_dataset_task_database_error_rollback_and_retry(
+        self, session, redis, mock_storage, mock_index_processor_factory
     ):
         """
-        Test that database session is rolled back on error.
-
-        Scenario:
-        - Database operation raises an exception
-        - Session should be rolled back to prevent dirty state
+        Test that database errors roll back the session and retry the task, which resumes the cleanup.
 
         Expected behavior:
-        - Session.rollback() is called
-        - Session.close() is called in finally block
-        """
-        # Arrange
-        mock_db_session.session.commit.side_effect = Exception("Database commit failed")
-
-        # Act
-        clean_dataset_task(
-            dataset_id=dataset_id,
-            tenant_id=tenant_id,
-            indexing_technique="high_quality",
-            index_struct='{"type": "paragraph"}',
-            collection_binding_id=collection_binding_id,
-            doc_form="paragraph_index",
-        )
-
-        # Assert
-        mock_db_session.session.rollback.assert_called_once()
-        mock_db_session.session.close.assert_called_once()
+        - The chunks deleted before the error stay deleted
+        - The session is rolled back and closed
+        - The task is retried, called directly the error is raised
+        - The checkpoint keeps the progress of the cleanup
+        """
+        for _ in range(3):
+            _add_segment(session, _add_document(session))
+        session.commit()
+        commit = session.commit
+        commits = iter([commit, OperationalError("DELETE", {}, Exception("connection lost"))])
+
+        def fail_second_commit():
+            outcome = next(commits, commit)
+            if isinstance(outcome, Exception):
+                raise outcome
+            outcome()
+
+        with (
+            patch.object(session, "commit", side_effect=fail_second_commit),
+            patch.object(session, "rollback", wraps=session.rollback) as rollback,
+            patch.object(session, "close", wraps=session.close) as close,
+            pytest.raises(OperationalError),
+        ):
+            _run_task()
+
+        rollback.assert_called_once()
+        close.assert_called_once()
+        assert _count(session, DocumentSegment) == 1
+        assert redis.data
+
+        mock_index_processor_factory["processor"].clean.reset_mock()
+        _run_task()
+
+        # the index was cleaned before the error
+        mock_index_processor_factory["processor"].clean.assert_not_called()
+        assert _count(session, DocumentSegment) == 0
+        assert _count(session, Document) == 0
+        assert redis.data == {}
 
     def test_clean_dataset_task_rollback_failure_still_closes_session(
-        self,
-        dataset_id,
-        tenant_id,
-        collection_binding_id,
-        mock_db_session,
-        mock_storage,
-        mock_index_processor_factory,
-        mock_get_image_upload_file_ids,
+        self, session, mock_storage, mock_index_processor_factory
     ):
         """
-        Test that session is closed even if rollback fails.
-
-        Scenario:
-        - Database commit fails
-        - Rollback also fails
-        - Session should still be closed
+        Test that the session is closed even if its rollback fails.
 
         Expected behavior:
-        - Session.close() is called regardless of rollback failure
+        - The commit error is not retried, as it is not a database error
+        - Session.close() is called regardless of the rollback failure
         """
-        # Arrange
-        mock_db_session.session.commit.side_effect = Exception("Commit failed")
-        mock_db_session.session.rollback.side_effect = Exception("Rollback failed")
-
-        # Act
-        clean_dataset_task(
-            dataset_id=dataset_id,
-            tenant_id=tenant_id,
-            indexing_technique="high_quality",
-            index_struct='{"type": "paragraph"}',
-            collection_binding_id=collection_binding_id,
-            doc_form="paragraph_index",
-        )
-
-        # Assert
-        mock_db_session.session.close.assert_called_once()
+        with (
+            patch.object(session, "commit", side_effect=Exception("Commit failed")),
+            patch.object(session, "rollback", side_effect=Exception("Rollback failed")) as rollback,
+            patch.object(session, "close", wraps=session.close) as close,
+        ):
+            _run_task()
 
+        rollback.assert_called_once()
+        close.assert_called_once()
 
-# ============================================================================
-# Test Pipeline and Workflow Deletion
-# ============================================================================
-
-
-class TestPipelineAndWorkflowDeletion:
-    """Test cases for pipeline and workflow deletion."""
-
-    def test_clean_dataset_task_with_pipeline_id(
-        self,
-        dataset_id,
-        tenant_id,
-        collection_binding_id,
-        pipeline_id,
-        mock_db_session,
-        mock_storage,
-        mock_index_processor_factory,
-        mock_get_image_upload_file_ids,
-    ):
+    def test_clean_dataset_task_session_always_closed(self, session, mock_storage, mock_index_processor_factory):
         """
-        Test that pipeline and workflow are deleted when pipeline_id is provided.
-
-        Expected behavior:
-        - Pipeline record is deleted
-        - Related workflow record is deleted
+        Test that the database session is closed when the cleanup succeeds too.
         """
-        # Arrange
-        mock_query = mock_db_session.session.query.return_value
-        mock_query.where.return_value = mock_query
-        mock_query.delete.return_value = 1
-
-        # Act
-        clean_dataset_task(
-            dataset_id=dataset_id,
-            tenant_id=tenant_id,
-            indexing_technique="high_quality",
-            index_struct='{"type": "paragraph"}',
-            collection_binding_id=collection_binding_id,
-            doc_form="paragraph_index",
-            pipeline_id=pipeline_id,
-        )
+        _add_segment(session, _add_document(session))
+        session.commit()
 
-        # Assert - verify delete was called for pipeline-related queries
-        # The actual count depends on total queries, but pipeline deletion should add 2 more
-        assert mock_query.delete.call_count >= 7  # 5 base + 2 pipeline/workflow
-
-    def test_clean_dataset_task_without_pipeline_id(
-        self,
-        dataset_id,
-        tenant_id,
-        collection_binding_id,
-        mock_db_session,
-        mock_storage,
-        mock_index_processor_factory,
-        mock_get_image_upload_file_ids,
-    ):
-        """
-        Test that pipeline/workflow deletion is skipped when pipeline_id is None.
+        with patch.object(session, "close", wraps=session.close) as close:
+            _run_task()
 
-        Expected behavior:
-        - Pipeline and workflow deletion queries are not executed
-        """
-        # Arrange
-        mock_query = mock_db_session.session.query.return_value
-        mock_query.where.return_value = mock_query
-        mock_query.delete.return_value = 1
-
-        # Act
-        clean_dataset_task(
-            dataset_id=dataset_id,
-            tenant_id=tenant_id,
-            indexing_technique="high_quality",
-            index_struct='{"type": "paragraph"}',
-            collection_binding_id=collection_binding_id,
-            doc_form="paragraph_index",
-            pipeline_id=None,
-        )
-
-        # Assert - verify delete was called only for base queries (5 times)
-        assert mock_query.delete.call_count == 5
+        close.assert_called_once()
+        assert _count(session, Document) == 0
 
 
 # ============================================================================
-# Test Segment Attachment Cleanup
+# Test Upload File Cleanup
 # ============================================================================
 
 
-class TestSegmentAttachmentCleanup:
-    """Test cases for segment attachment cleanup."""
-
-    def test_clean_dataset_task_with_attachments(
-        self,
-        dataset_id,
-        tenant_id,
-        collection_binding_id,
-        mock_db_session,
-        mock_storage,
-        mock_index_processor_factory,
-        mock_get_image_upload_file_ids,
-    ):
-        """
-        Test that segment attachments are cleaned up properly.
-
-        Scenario:
-        - Dataset has segment attachments with associated files
-        - Both binding and file records should be deleted
-
-        Expected behavior:
-        - Storage.delete() is called for each attachment file
-        - Attachment file records are deleted from database
-        - Binding records are deleted from database
-        """
-        # Arrange
-        mock_binding = MagicMock()
-        mock_binding.attachment_id = str(uuid.uuid4())
-
-        mock_attachment_file = MagicMock()
-        mock_attachment_file.id = mock_binding.attachment_id
-        mock_attachment_file.key = f"attachments/{uuid.uuid4()}.pdf"
-
-        # Setup execute to return attachment with binding
-        mock_db_session.session.execute.return_value.all.return_value = [(mock_binding, mock_attachment_file)]
-
-        # Act
-        clean_dataset_task(
-            dataset_id=dataset_id,
-            tenant_id=tenant_id,
-            indexing_technique="high_quality",
-            index_struct='{"type": "paragraph"}',
-            collection_binding_id=collection_binding_id,
-            doc_form="paragraph_index",
-        )
+class TestUploadFileCleanup:
+    """Test cases for the cleanup of the files the documents were uploaded from."""
 
-        # Assert
-        mock_storage.delete.assert_called_with(mock_attachment_file.key)
-        mock_db_session.session.delete.assert_any_call(mock_attachment_file)
-        mock_db_session.session.delete.assert_any_call(mock_binding)
-
-    def test_clean_dataset_task_attachment_storage_failure(
-        self,
-        dataset_id,
-        tenant_id,
-        collection_binding_id,
-        mock_db_session,
-        mock_storage,
-        mock_index_processor_factory,
-        mock_get_image_upload_file_ids,
-    ):
+    def test_clean_dataset_task_handles_missing_upload_file(self, session, mock_storage, mock_index_processor_factory):
         """
-        Test that cleanup continues even if attachment storage deletion fails.
-
-        Expected behavior:
-        - Exception is caught and logged
-        - Attachment file and binding are still deleted from database
+        Test that a document referencing an upload file that doesn't exist is deleted without error.
         """
-        # Arrange
-        mock_binding = MagicMock()
-        mock_binding.attachment_id = str(uuid.uuid4())
-
-        mock_attachment_file = MagicMock()
-        mock_attachment_file.id = mock_binding.attachment_id
-        mock_attachment_file.key = f"attachments/{uuid.uuid4()}.pdf"
-
-        mock_db_session.session.execute.return_value.all.return_value = [(mock_binding, mock_attachment_file)]
-        mock_storage.delete.side_effect = Exception("Storage error")
-
-        # Act
-        clean_dataset_task(
-            dataset_id=dataset_id,
-            tenant_id=tenant_id,
-            indexing_technique="high_quality",
-            index_struct='{"type": "paragraph"}',
-            collection_binding_id=collection_binding_id,
-            doc_form="paragraph_index",
+        _add_document(
+            session, data_source_type="upload_file", data_source_info=json.dumps({"upload_file_id": "nonexistent"})
         )
+        session.commit()
 
-        # Assert - storage delete was attempted
-        mock_storage.delete.assert_called_once()
-        # Records should still be deleted from database
-        mock_db_session.session.delete.assert_any_call(mock_attachment_file)
-        mock_db_session.session.delete.assert_any_call(mock_binding)
-
-
-# ============================================================================
-# Test Upload File Cleanup
-# ============================================================================
+        _run_task()
 
+        mock_storage.delete.assert_not_called()
+        assert _count(session, Document) == 0
 
-class TestUploadFileCleanup:
-    """Test cases for upload file cleanup."""
-
-    def test_clean_dataset_task_deletes_document_upload_files(
-        self,
-        dataset_id,
-        tenant_id,
-        collection_binding_id,
-        mock_db_session,
-        mock_storage,
-        mock_index_processor_factory,
-        mock_get_image_upload_file_ids,
+    def test_clean_dataset_task_handles_non_upload_file_data_source(
+        self, session, mock_storage, mock_index_processor_factory
     ):
         """
-        Test that document upload files are deleted.
-
-        Scenario:
-        - Document has data_source_type = "upload_file"
-        - data_source_info contains upload_file_id
-
-        Expected behavior:
-        - Upload file is deleted from storage
-        - Upload file record is deleted from database
+        Test that the files referenced by documents of other data source types are not deleted.
         """
-        # Arrange
-        mock_document = MagicMock()
-        mock_document.id = str(uuid.uuid4())
-        mock_document.tenant_id = tenant_id
-        mock_document.data_source_type = "upload_file"
-        mock_document.data_source_info = '{"upload_file_id": "test-file-id"}'
-        mock_document.data_source_info_dict = {"upload_file_id": "test-file-id"}
-
-        mock_upload_file = MagicMock()
-        mock_upload_file.id = "test-file-id"
-        mock_upload_file.key = "uploads/test-file.txt"
-
-        mock_db_session.session.scalars.return_value.all.side_effect = [
-            [mock_document],  # documents
-            [],  # segments
-        ]
-        mock_db_session.session.query.return_value.where.return_value.first.return_value = mock_upload_file
-
-        # Act
-        clean_dataset_task(
-            dataset_id=dataset_id,
-            tenant_id=tenant_id,
-            indexing_technique="high_quality",
-            index_struct='{"type": "paragraph"}',
-            collection_binding_id=collection_binding_id,
-            doc_form="paragraph_index",
+        upload_file = _add_file(session)
+        _add_document(
+            session, data_source_type="website_crawl", data_source_info=json.dumps({"upload_file_id": upload_file.id})
         )
+        session.commit()
 
-        # Assert
-        mock_storage.delete.assert_called_with(mock_upload_file.key)
-        mock_db_session.session.delete.assert_any_call(mock_upload_file)
-
-    def test_clean_dataset_task_handles_missing_upload_file(
-        self,
-        dataset_id,
-        tenant_id,
-        collection_binding_id,
-        mock_db_session,
-        mock_storage,
-        mock_index_processor_factory,
-        mock_get_image_upload_file_ids,
-    ):
-        """
-        Test that missing upload files are handled gracefully.
-
-        Scenario:
-        - Document references an upload_file_id that doesn't exist
-
-        Expected behavior:
-        - No error is raised
-        - Cleanup continues normally
-        """
-        # Arrange
-        mock_document = MagicMock()
-        mock_document.id = str(uuid.uuid4())
-        mock_document.tenant_id = tenant_id
-        mock_document.data_source_type = "upload_file"
-        mock_document.data_source_info = '{"upload_file_id": "nonexistent-file"}'
-        mock_document.data_source_info_dict = {"upload_file_id": "nonexistent-file"}
-
-        mock_db_session.session.scalars.return_value.all.side_effect = [
-            [mock_document],  # documents
-            [],  # segments
-        ]
-        mock_db_session.session.query.return_value.where.return_value.first.return_value = None
-
-        # Act - should not raise exception
-        clean_dataset_task(
-            dataset_id=dataset_id,
-            tenant_id=tenant_id,
-            indexing_technique="high_quality",
-            index_struct='{"type": "paragraph"}',
-            collection_binding_id=collection_binding_id,
-            doc_form="paragraph_index",
-        )
+        _run_task()
 
-        # Assert
         mock_storage.delete.assert_not_called()
-        mock_db_session.session.commit.assert_called_once()
+        assert _count(session, Document) == 0
+        assert _count(session, UploadFile) == 1
 
-    def test_clean_dataset_task_handles_non_upload_file_data_source(
-        self,
-        dataset_id,
-        tenant_id,
-        collection_binding_id,
-        mock_db_session,
-        mock_storage,
-        mock_index_processor_factory,
-        mock_get_image_upload_file_ids,
+    @pytest.mark.parametrize("data_source_info", [None, "", "{}", "[]", "not json", '{"upload_file_id": null}'])
+    def test_clean_dataset_task_document_with_empty_data_source_info(
+        self, data_source_info, session, mock_storage, mock_index_processor_factory
     ):
         """
-        Test that non-upload_file data sources are skipped.
-
-        Scenario:
-        - Document has data_source_type = "website"
-
-        Expected behavior:
-        - No file deletion is attempted
+        Test that upload_file documents with an empty or invalid data_source_info are deleted without error.
         """
-        # Arrange
-        mock_document = MagicMock()
-        mock_document.id = str(uuid.uuid4())
-        mock_document.tenant_id = tenant_id
-        mock_document.data_source_type = "website"
-        mock_document.data_source_info = None
-
-        mock_db_session.session.scalars.return_value.all.side_effect = [
-            [mock_document],  # documents
-            [],  # segments
-        ]
-
-        # Act
-        clean_dataset_task(
-            dataset_id=dataset_id,
-            tenant_id=tenant_id,
-            indexing_technique="high_quality",
-            index_struct='{"type": "paragraph"}',
-            collection_binding_id=collection_binding_id,
-            doc_form="paragraph_index",
-        )
+        _add_document(session, data_source_type="upload_file", data_source_info=data_source_info)
+        session.commit()
+
+        _run_task()
 
-        # Assert - storage delete should not be called for document files
-        # (only for image files in segments, which are empty here)
         mock_storage.delete.assert_not_called()
+        assert _count(session, Document) == 0
 
 
 # ============================================================================
@@ -902,331 +483,103 @@ class TestUploadFileCleanup:
 class TestImageFileCleanup:
     """Test cases for image file cleanup in segments."""
 
-    def test_clean_dataset_task_deletes_image_files_in_segments(
-        self,
-        dataset_id,
-        tenant_id,
-        collection_binding_id,
-        mock_db_session,
-        mock_storage,
-        mock_index_processor_factory,
-        mock_get_image_upload_file_ids,
-    ):
+    def test_clean_dataset_task_handles_missing_image_file(self, session, mock_storage, mock_index_processor_factory):
         """
-        Test that image files referenced in segment content are deleted.
-
-        Scenario:
-        - Segment content contains image file references
-        - get_image_upload_file_ids returns file IDs
-
-        Expected behavior:
-        - Each image file is deleted from storage
-        - Each image file record is deleted from database
+        Test that a segment referencing an image that doesn't exist in the database is deleted without error.
         """
-        # Arrange
-        # Need at least one document for segment processing to occur (code is in else block)
-        mock_document = MagicMock()
-        mock_document.id = str(uuid.uuid4())
-        mock_document.tenant_id = tenant_id
-        mock_document.data_source_type = "website"  # Non-upload type
-
-        mock_segment = MagicMock()
-        mock_segment.id = str(uuid.uuid4())
-        mock_segment.content = '<img src="file://image-1"> <img src="file://image-2">'
-
-        image_file_ids = ["image-1", "image-2"]
-        mock_get_image_upload_file_ids.return_value = image_file_ids
-
-        mock_image_files = []
-        for file_id in image_file_ids:
-            mock_file = MagicMock()
-            mock_file.id = file_id
-            mock_file.key = f"images/{file_id}.jpg"
-            mock_image_files.append(mock_file)
-
-        mock_db_session.session.scalars.return_value.all.side_effect = [
-            [mock_document],  # documents - need at least one for segment processing
-            [mock_segment],  # segments
-        ]
-
-        # Setup a mock query chain that returns files in sequence
-        mock_query = MagicMock()
-        mock_where = MagicMock()
-        mock_query.where.return_value = mock_where
-        mock_where.first.side_effect = mock_image_files
-        mock_db_session.session.query.return_value = mock_query
-
-        # Act
-        clean_dataset_task(
-            dataset_id=dataset_id,
-            tenant_id=tenant_id,
-            indexing_technique="high_quality",
-            index_struct='{"type": "paragraph"}',
-            collection_binding_id=collection_binding_id,
-            doc_form="paragraph_index",
+        _add_segment(
+            session, _add_document(session), content=f"![image](http://localhost/files/{uuid.uuid4()}/file-preview)"
         )
+        session.commit()
 
-        # Assert
-        assert mock_storage.delete.call_count == 2
-        mock_storage.delete.assert_any_call("images/image-1.jpg")
-        mock_storage.delete.assert_any_call("images/image-2.jpg")
-
-    def test_clean_dataset_task_handles_missing_image_file(
-        self,
-        dataset_id,
-        tenant_id,
-        collection_binding_id,
-        mock_db_session,
-        mock_storage,
-        mock_index_processor_factory,
-        mock_get_image_upload_file_ids,
-    ):
-        """
-        Test that missing image files are handled gracefully.
-
-        Scenario:
-        - Segment references image file ID that doesn't exist in database
+        _run_task()
 
-        Expected behavior:
-        - No error is raised
-        - Cleanup continues
-        """
-        # Arrange
-        # Need at least one document for segment processing to occur (code is in else block)
-        mock_document = MagicMock()
-        mock_document.id = str(uuid.uuid4())
-        mock_document.tenant_id = tenant_id
-        mock_document.data_source_type = "website"  # Non-upload type
-
-        mock_segment = MagicMock()
-        mock_segment.id = str(uuid.uuid4())
-        mock_segment.content = '<img src="file://nonexistent-image">'
-
-        mock_get_image_upload_file_ids.return_value = ["nonexistent-image"]
-
-        mock_db_session.session.scalars.return_value.all.side_effect = [
-            [mock_document],  # documents - need at least one for segment processing
-            [mock_segment],  # segments
-        ]
-
-        # Image file not found
-        mock_db_session.session.query.return_value.where.return_value.first.return_value = None
-
-        # Act - should not raise exception
-        clean_dataset_task(
-            dataset_id=dataset_id,
-            tenant_id=tenant_id,
-            indexing_technique="high_quality",
-            index_struct='{"type": "paragraph"}',
-            collection_binding_id=collection_binding_id,
-            doc_form="paragraph_index",
-        )
-
-        # Assert
         mock_storage.delete.assert_not_called()
-        mock_db_session.session.commit.assert_called_once()
+        assert _count(session, DocumentSegment) == 0
 
 
 # ============================================================================
-# Test Edge Cases
+# Test Pipeline and Workflow Deletion
 # ============================================================================
 
 
-class TestEdgeCases:
-    """Test edge cases and boundary conditions."""
+class TestPipelineAndWorkflowDeletion:
+    """Test cases for pipeline and workflow deletion."""
 
-    def test_clean_dataset_task_multiple_documents_and_segments(
-        self,
-        dataset_id,
-        tenant_id,
-        collection_binding_id,
-        mock_db_session,
-        mock_storage,
-        mock_index_processor_factory,
-        mock_get_image_upload_file_ids,
-    ):
+    def test_clean_dataset_task_with_pipeline_id(self, session, mock_storage, mock_index_processor_factory):
         """
-        Test cleanup of multiple documents and segments.
-
-        Scenario:
-        - Dataset has 5 documents and 10 segments
-
-        Expected behavior:
-        - All documents and segments are deleted
+        Test that the pipeline of a RAG pipeline dataset is deleted.
         """
-        # Arrange
-        mock_documents = []
-        for i in range(5):
-            doc = MagicMock()
-            doc.id = str(uuid.uuid4())
-            doc.tenant_id = tenant_id
-            doc.data_source_type = "website"  # Non-upload type
-            mock_documents.append(doc)
-
-        mock_segments = []
-        for i in range(10):
-            seg = MagicMock()
-            seg.id = str(uuid.uuid4())
-            seg.content = f"Segment content {i}"
-            mock_segments.append(seg)
-
-        mock_db_session.session.scalars.return_value.all.side_effect = [
-            mock_documents,
-            mock_segments,
-        ]
-        mock_get_image_upload_file_ids.return_value = []
-
-        # Act
-        clean_dataset_task(
-            dataset_id=dataset_id,
-            tenant_id=tenant_id,
-            indexing_technique="high_quality",
-            index_struct='{"type": "paragraph"}',
-            collection_binding_id=collection_binding_id,
-            doc_form="paragraph_index",
-        )
+        pipeline = Pipeline(tenant_id=TENANT_ID, name="pipeline")
+        session.add(pipeline)
+        session.commit()
 
-        # Assert - all documents and segments should be deleted
-        delete_calls = mock_db_session.session.delete.call_args_list
-        deleted_items = [call[0][0] for call in delete_calls]
+        _run_task(pipeline_id=pipeline.id)
 
-        for doc in mock_documents:
-            assert doc in deleted_items
-        for seg in mock_segments:
-            assert seg in deleted_items
+        assert _count(session, Pipeline) == 0
 
-    def test_clean_dataset_task_document_with_empty_data_source_info(
-        self,
-        dataset_id,
-        tenant_id,
-        collection_binding_id,
-        mock_db_session,
-        mock_storage,
-        mock_index_processor_factory,
-        mock_get_image_upload_file_ids,
-    ):
+    def test_clean_dataset_task_without_pipeline_id(self, session, mock_storage, mock_index_processor_factory):
         """
-        Test handling of document with empty data_source_info.
-
-        Scenario:
-        - Document has data_source_type = "upload_file"
-        - data_source_info is None or empty
-
-        Expected behavior:
-        - No error is raised
-        - File deletion is skipped
+        Test that pipelines are left alone without a pipeline_id.
         """
-        # Arrange
-        mock_document = MagicMock()
-        mock_document.id = str(uuid.uuid4())
-        mock_document.tenant_id = tenant_id
-        mock_document.data_source_type = "upload_file"
-        mock_document.data_source_info = None
-
-        mock_db_session.session.scalars.return_value.all.side_effect = [
-            [mock_document],  # documents
-            [],  # segments
-        ]
-
-        # Act - should not raise exception
-        clean_dataset_task(
-            dataset_id=dataset_id,
-            tenant_id=tenant_id,
-            indexing_technique="high_quality",
-            index_struct='{"type": "paragraph"}',
-            collection_binding_id=collection_binding_id,
-            doc_form="paragraph_index",
-        )
+        session.add(Pipeline(tenant_id=TENANT_ID, name="pipeline"))
+        session.commit()
 
-        # Assert
-        mock_storage.delete.assert_not_called()
-        mock_db_session.session.commit.assert_called_once()
-
-    def test_clean_dataset_task_session_always_closed(
-        self,
-        dataset_id,
-        tenant_id,
-        collection_binding_id,
-        mock_db_session,
-        mock_storage,
-        mock_index_processor_factory,
-        mock_get_image_upload_file_ids,
-    ):
-        """
-        Test that database session is always closed regardless of success or failure.
+        _run_task()
 
-        Expected behavior:
-        - Session.close() is called in finally block
-        """
-        # Act
-        clean_dataset_task(
-            dataset_id=dataset_id,
-            tenant_id=tenant_id,
-            indexing_technique="high_quality",
-            index_struct='{"type": "paragraph"}',
-            collection_binding_id=collection_binding_id,
-            doc_form="paragraph_index",
-        )
-
-        # Assert
-        mock_db_session.session.close.assert_called_once()
+        assert _count(session, Pipeline) == 1
 
 
 # ============================================================================
-# Test IndexProcessor Parameters
+# Test Segment Attachment Cleanup
 # ============================================================================
 
 
-class TestIndexProcessorParameters:
-    """Test cases for IndexProcessor clean method parameters."""
+class TestSegmentAttachmentCleanup:
+    """Test cases for segment attachment cleanup."""
 
-    def test_clean_dataset_task_passes_correct_parameters_to_index_processor(
-        self,
-        dataset_id,
-        tenant_id,
-        collection_binding_id,
-        mock_db_session,
-        mock_storage,
-        mock_index_processor_factory,
-        mock_get_image_upload_file_ids,
-    ):
+    def test_clean_dataset_task_with_attachments(self, session, mock_storage, mock_index_processor_factory):
         """
-        Test that correct parameters are passed to IndexProcessor.clean().
+        Test that segment attachments are deleted with their files.
+        """
+        attachment = _add_file(session)
+        session.add(
+            SegmentAttachmentBinding(
+                tenant_id=TENANT_ID,
+                dataset_id=DATASET_ID,
+                document_id=str(uuid.uuid4()),
+                segment_id=str(uuid.uuid4()),
+                attachment_id=attachment.id,
+            )
+        )
+        session.commit()
+        attachment_key = attachment.key
 
-        Expected behavior:
-        - with_keywords=True is passed
-        - delete_child_chunks=True is passed
-        - Dataset object with correct attributes is passed
+        _run_task()
+
+        mock_storage.delete.assert_called_once_with(attachment_key)
+        assert _count(session, SegmentAttachmentBinding) == 0
+        assert _count(session, UploadFile) == 0
+
+    def test_clean_dataset_task_attachment_storage_failure(self, session, mock_storage, mock_index_processor_factory):
         """
-        # Arrange
-        indexing_technique = "high_quality"
-        index_struct = '{"type": "paragraph"}'
-
-        # Act
-        clean_dataset_task(
-            dataset_id=dataset_id,
-            tenant_id=tenant_id,
-            indexing_technique=indexing_technique,
-            index_struct=index_struct,
-            collection_binding_id=collection_binding_id,
-            doc_form="paragraph_index",
+        Test that attachments are deleted from the database even if their deletion from storage fails.
+        """
+        attachment = _add_file(session)
+        session.add(
+            SegmentAttachmentBinding(
+                tenant_id=TENANT_ID,
+                dataset_id=DATASET_ID,
+                document_id=str(uuid.uuid4()),
+                segment_id=str(uuid.uuid4()),
+                attachment_id=attachment.id,
+            )
         )
+        session.commit()
+        mock_storage.delete.side_effect = Exception("Storage error")
 
-        # Assert
-        mock_index_processor_factory["processor"].clean.assert_called_once()
-        call_args = mock_index_processor_factory["processor"].clean.call_args
-
-        # Verify positional arguments
-        dataset_arg = call_args[0][0]
-        assert dataset_arg.id == dataset_id
-        assert dataset_arg.tenant_id == tenant_id
-        assert dataset_arg.indexing_technique == indexing_technique
-        assert dataset_arg.index_struct == index_struct
-        assert dataset_arg.collection_binding_id == collection_binding_id
-
-        # Verify None is passed as second argument
-        assert call_args[0][1] is None
-
-        # Verify keyword arguments
-        assert call_args[1]["with_keywords"] is True
-        assert call_args[1]["delete_child_chunks"] is True
+        _run_task()
+
+        mock_storage.delete.assert_called_once()
+        assert _count(session, SegmentAttachmentBinding) == 0
+        assert _count(session, UploadFile) == 0
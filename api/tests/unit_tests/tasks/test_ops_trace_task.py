@@ -0,0 +1,90 @@
+import time
+from unittest.mock import MagicMock, patch
+
+from flask import Flask
+
+# imported before the ops trace manager, which is otherwise only partially initialized through a circular import
+import core.app.entities.app_invoke_entities  # noqa: F401
+from core.ops.entities.config_entity import OPS_TRACE_FAILED_KEY
+from core.ops.entities.trace_entity import GenerateNameTraceInfo, TaskBatchData, TaskData
+from tasks.ops_trace_task import process_trace_batch_tasks
+
+
+def _task_data(app_id: str) -> TaskData:
+    trace_info = GenerateNameTraceInfo(
+        message_id="message", tenant_id="tenant", inputs={}, outputs={}, metadata={}, conversation_id="conversation"
+    )
+    return TaskData(
+        app_id=app_id,
+        trace_info_type=type(trace_info).__name__,
+        trace_info=trace_info.model_dump(),
+        enqueued_at=time.time() - 3,
+    )
+
+
+def test_process_trace_batch_tasks_groups_traces_by_app():
+    batch = TaskBatchData(tasks=[_task_data("app-1"), _task_data("app-2"), _task_data("app-1")])
+    trace_instances = {"app-1": MagicMock(), "app-2": MagicMock()}
+    trace_instances["app-2"].trace.side_effect = RuntimeError("provider unavailable")
+
+    with (
+        Flask(__name__).app_context(),
+        patch("tasks.ops_trace_task.storage") as mock_storage,
+        patch("tasks.ops_trace_task.redis_client") as mock_redis,
+        patch("tasks.ops_trace_task.queue_lag_histogram") as mock_histogram,
+        patch(
+            "core.ops.ops_trace_manager.OpsTraceManager.get_ops_trace_instance", side_effect=trace_instances.get
+        ) as mock_get_instance,
+    ):
+        mock_storage.load.return_value = batch.model_dump_json().encode("utf-8")
+
+        process_trace_batch_tasks({"file_id": "batch"})
+
+    assert [call.args[0] for call in mock_get_instance.call_args_list] == ["app-1", "app-2"]
+    assert trace_instances["app-1"].trace.call_count == 2
+    assert isinstance(trace_instances["app-1"].trace.call_args.args[0], GenerateNameTraceInfo)
+    mock_redis.incr.assert_called_once_with(f"{OPS_TRACE_FAILED_KEY}_app-2", 1)
+    assert mock_histogram.record.call_count == 3
+    assert all(call.args[0] >= 3 for call in mock_histogram.record.call_args_list)
+    mock_storage.delete.assert_called_once_with("ops_trace/batches/batch.json")
+
+
+def test_process_trace_batch_tasks_counts_traces_of_unresolvable_app_as_failed():
+    batch = TaskBatchData(tasks=[_task_data("app-1"), _task_data("app-2"), _task_data("app-1")])
+    trace_instance = MagicMock()
+
+    def get_ops_trace_instance(app_id):
+        if app_id == "app-1":
+            raise RuntimeError("invalid tracing config")
+        return trace_instance
+
+    with (
+        Flask(__name__).app_context(),
+        patch("tasks.ops_trace_task.storage") as mock_storage,
+        patch("tasks.ops_trace_task.redis_client") as mock_redis,
+        patch("tasks.ops_trace_task.traces_counter") as mock_counter,
+        patch("core.ops.ops_trace_manager.OpsTraceManager.get_ops_trace_instance", side_effect=get_ops_trace_instance),
+    ):
+        mock_storage.load.return_value = batch.model_dump_json().encode("utf-8")
+
+        process_trace_batch_tasks({"file_id": "batch"})
+
+    trace_instance.trace.assert_called_once()
+    mock_redis.incr.assert_called_once_with(f"{OPS_TRACE_FAILED_KEY}_app-1", 2)
+    assert [call.args[1]["status"] for call in mock_counter.add.call_args_list] == ["failed", "failed", "success"]
+    mock_storage.delete.assert_called_once_with("ops_trace/batches/batch.json")
+
+
+def test_process_trace_batch_tasks_deletes_unreadable_batch():
+    with (
+        Flask(__name__).app_context(),
+        patch("tasks.ops_trace_task.storage") as mock_storage,
+    ):
+        mock_storage.load.return_value = b"not json"
+
+        try:
+            process_trace_batch_tasks({"file_id": "batch"})
+        except ValueError:
+            pass
+
+    mock_storage.delete.assert_called_once_with("ops_trace/batches/batch.json")
@@ -0,0 +1,8 @@
+#!/bin/bash
+set -x
+
+SCRIPT_DIR="$(dirname "$(realpath "$0")")"
+cd "$SCRIPT_DIR/../.."
+
+# micro benchmarks, pass e.g. `--benchmark-autosave` or `--benchmark-compare` to compare revisions
+pytest --no-cov api/tests/benchmarks "$@"